@@ -0,0 +1,67 @@
+"""
+Benchmark das aritméticas monetárias (float x centavos inteiros).
+
+Mede o tempo dos dois métodos da CalculadoraRendimento para horizontes
+curtos e longos e mostra a diferença entre os saldos finais de rendimento
+e resgate em cada aritmética.
+
+Uso:
+    python -m benchmarks.bench_aritmetica [--repeticoes 200]
+"""
+import argparse
+import timeit
+from datetime import datetime
+
+from src.domain.services.aritmetica_monetaria import AritmeticaCentavos, AritmeticaFloat
+from src.domain.services.calculadora_rendimento import CalculadoraRendimento
+
+
+HORIZONTES_MESES = (12, 60, 600, 1200)
+
+
+def criar_calculadora(meses: int, aritmetica) -> CalculadoraRendimento:
+    """Cria uma calculadora com parâmetros típicos e o horizonte informado"""
+    data_inicial = datetime(2025, 1, 1)
+    total = data_inicial.month - 1 + meses - 1
+    return CalculadoraRendimento(
+        valor_inicial=10000.0,
+        aporte_mensal=1000.0,
+        ano_final=data_inicial.year + total // 12,
+        mes_final=total % 12 + 1,
+        taxa_cdi_anual=13.25 * 1.1,
+        data_inicial=data_inicial,
+        aritmetica=aritmetica,
+    )
+
+
+def medir(funcao, repeticoes: int) -> float:
+    """Retorna o melhor tempo médio (ms) de 7 rodadas (menos sensível ao ruído da máquina)"""
+    return min(timeit.repeat(funcao, number=repeticoes, repeat=7)) / repeticoes * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark float x centavos")
+    parser.add_argument("--repeticoes", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'meses':>6} {'método':10} {'float (ms)':>11} {'centavos (ms)':>14} {'razão':>7} "
+          f"{'drift float (R$)':>17} {'drift centavos (R$)':>20}")
+    for meses in HORIZONTES_MESES:
+        calc_float = criar_calculadora(meses, AritmeticaFloat())
+        calc_centavos = criar_calculadora(meses, AritmeticaCentavos())
+
+        # Diferença entre o saldo final do rendimento e do resgate em cada aritmética
+        drift_float = abs(calc_float.calcular()[0][-1][1] - calc_float.calcular_impostos_resgate()[0][-1][1])
+        drift_centavos = abs(
+            calc_centavos.calcular()[0][-1][1] - calc_centavos.calcular_impostos_resgate()[0][-1][1]
+        )
+
+        for metodo in ("calcular", "calcular_impostos_resgate"):
+            tempo_float = medir(getattr(calc_float, metodo), args.repeticoes)
+            tempo_centavos = medir(getattr(calc_centavos, metodo), args.repeticoes)
+            print(f"{meses:>6} {metodo[:10]:10} {tempo_float:>11.3f} {tempo_centavos:>14.3f} "
+                  f"{tempo_centavos / tempo_float:>7.2f} {drift_float:>17.2f} {drift_centavos:>20.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark do núcleo compilado (Numba) do resgate.
+
+Mede `AritmeticaFloat.serie_resgate` no laço em Python e no núcleo compilado,
+e o `calcular_impostos_resgate` completo da calculadora, para horizontes de
+12 a 1200 meses, conferindo que os resultados são idênticos bit a bit.
+
+Uso:
+    python -m benchmarks.bench_nucleo_compilado [--repeticoes 200]
+"""
+import argparse
+import struct
+import time
+
+from src.domain.services.aritmetica_monetaria import AritmeticaFloat
+from src.domain.services.nucleo_compilado import NucleoCompilado
+from benchmarks.bench_aritmetica import criar_calculadora, medir
+
+
+HORIZONTES_MESES = (12, 60, 120, 360, 600, 1200)
+
+
+def bits(valores) -> bytes:
+    """Representação binária exata de uma lista de floats"""
+    return b"".join(struct.pack("<d", valor) for valor in valores)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do núcleo compilado do resgate")
+    parser.add_argument("--repeticoes", type=int, default=200)
+    args = parser.parse_args()
+
+    if not NucleoCompilado.disponivel():
+        print("Núcleo compilado indisponível: instale o pacote 'numba' (e verifique NUCLEO_JIT).")
+        return
+
+    inicio = time.perf_counter()
+    NucleoCompilado.compilar()
+    print(f"Compilação (ou carga do cache): {(time.perf_counter() - inicio) * 1000:.0f} ms\n")
+
+    minimo_meses = NucleoCompilado.MINIMO_MESES
+    print(f"{'meses':>6} {'etapa':12} {'python (ms)':>12} {'numba (ms)':>11} {'ganho':>7} {'idêntico':>9}")
+    for meses in HORIZONTES_MESES:
+        calculadora = criar_calculadora(meses, AritmeticaFloat())
+        taxa = AritmeticaFloat.preparar_taxa(calculadora.taxa_cdi_anual)
+        aliquotas_ir, aliquotas_iof = calculadora._aliquotas_por_mes(meses, True, True, None)
+        argumentos = (calculadora.valor_inicial, calculadora.aporte_mensal, taxa, aliquotas_ir, aliquotas_iof)
+
+        # Laço: o mínimo de meses controla qual caminho serie_resgate usa
+        NucleoCompilado.MINIMO_MESES = meses + 1
+        esperado = AritmeticaFloat.serie_resgate(*argumentos)
+        tempo_python = medir(lambda: AritmeticaFloat.serie_resgate(*argumentos), args.repeticoes)
+        obtido = NucleoCompilado.serie_resgate(*argumentos)
+        tempo_numba = medir(lambda: NucleoCompilado.serie_resgate(*argumentos), args.repeticoes)
+        identico = (obtido is not None and bits(esperado[0]) == bits(obtido[0])
+                    and bits(esperado[1]) == bits(obtido[1]) and bits([esperado[2]]) == bits([obtido[2]]))
+        print(f"{meses:>6} {'serie':12} {tempo_python:>12.3f} {tempo_numba:>11.3f} "
+              f"{tempo_python / tempo_numba:>6.1f}x {'sim' if identico else 'NÃO':>9}")
+
+        # Cálculo completo do endpoint de resgate (rótulos, alíquotas e montagem das tuplas incluídos)
+        NucleoCompilado.MINIMO_MESES = meses + 1
+        esperado = calculadora.calcular_impostos_resgate()
+        tempo_python = medir(calculadora.calcular_impostos_resgate, args.repeticoes)
+        NucleoCompilado.MINIMO_MESES = 0
+        obtido = calculadora.calcular_impostos_resgate()
+        tempo_numba = medir(calculadora.calcular_impostos_resgate, args.repeticoes)
+        identico = esperado == obtido and bits(linha[1] for linha in esperado[0]) == bits(linha[1] for linha in obtido[0])
+        print(f"{meses:>6} {'resgate':12} {tempo_python:>12.3f} {tempo_numba:>11.3f} "
+              f"{tempo_python / tempo_numba:>6.1f}x {'sim' if identico else 'NÃO':>9}")
+    NucleoCompilado.MINIMO_MESES = minimo_meses
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Executor de testes de carga da API de Cálculo de Rendimentos.
+
+Dispara um perfil de tráfego com N trabalhadores concorrentes durante um
+tempo fixo e relata vazão, latências de cauda e taxa de erro.
+
+Uso:
+    python -m loadtest.executar --alvo http://localhost:8000 --perfil padrao_web \\
+        --concorrencia 32 --duracao 60
+
+Para não depender do Banco Central, suba antes o servidor falso
+(`python -m loadtest.servidor_sgs_falso`) e inicie a API com `BCB_API_URL`
+apontando para ele.
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import requests
+
+from loadtest.perfis import PERFIS, PerfilCarga, listar_perfis
+
+
+@dataclass
+class Amostra:
+    """Resultado de uma única requisição"""
+    rotulo: str
+    latencia: float
+    status: Optional[int]
+
+    @property
+    def sucesso(self) -> bool:
+        return self.status is not None and self.status < 400
+
+
+@dataclass
+class ColetorAmostras:
+    """Acumula amostras de todas as threads trabalhadoras"""
+    amostras: List[Amostra] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def adicionar(self, amostra: Amostra) -> None:
+        with self._lock:
+            self.amostras.append(amostra)
+
+
+def percentil(valores_ordenados: List[float], p: float) -> float:
+    """
+    Calcula o percentil pelo método do vizinho mais próximo.
+
+    Args:
+        valores_ordenados: Valores já ordenados
+        p: Percentil desejado (0-100)
+
+    Returns:
+        Valor do percentil, ou 0.0 se não houver valores
+    """
+    if not valores_ordenados:
+        return 0.0
+    indice = max(0, math.ceil(p / 100 * len(valores_ordenados)) - 1)
+    return valores_ordenados[indice]
+
+
+def resumir(amostras: List[Amostra], duracao: float) -> Dict:
+    """
+    Consolida as amostras em um relatório.
+
+    Args:
+        amostras: Amostras coletadas
+        duracao: Duração efetiva do teste em segundos
+
+    Returns:
+        Dicionário com vazão, latências (ms) e taxa de erro, geral e por endpoint
+    """
+    def _bloco(grupo: List[Amostra]) -> Dict:
+        latencias = sorted(a.latencia * 1000 for a in grupo)
+        erros = sum(1 for a in grupo if not a.sucesso)
+        return {
+            "requisicoes": len(grupo),
+            "vazao_rps": round(len(grupo) / duracao, 2) if duracao > 0 else 0.0,
+            "taxa_erro": round(erros / len(grupo), 4) if grupo else 0.0,
+            "latencia_ms": {
+                "p50": round(percentil(latencias, 50), 2),
+                "p90": round(percentil(latencias, 90), 2),
+                "p99": round(percentil(latencias, 99), 2),
+                "p999": round(percentil(latencias, 99.9), 2),
+                "max": round(latencias[-1], 2) if latencias else 0.0,
+            },
+        }
+
+    por_rotulo: Dict[str, List[Amostra]] = {}
+    status: Dict[str, int] = {}
+    for amostra in amostras:
+        por_rotulo.setdefault(amostra.rotulo, []).append(amostra)
+        chave = str(amostra.status) if amostra.status is not None else "falha_conexao"
+        status[chave] = status.get(chave, 0) + 1
+
+    return {
+        "duracao_segundos": round(duracao, 2),
+        "geral": _bloco(amostras),
+        "status": status,
+        "por_endpoint": {rotulo: _bloco(grupo) for rotulo, grupo in sorted(por_rotulo.items())},
+    }
+
+
+def _trabalhador(alvo: str, perfil: PerfilCarga, fim: float, coletor: ColetorAmostras,
+                 semente: int, barreira: Optional[threading.Barrier], timeout: float) -> None:
+    """Laço fechado: dispara a próxima requisição assim que a anterior termina"""
+    rng = random.Random(semente)
+    sessao = requests.Session()
+
+    while time.monotonic() < fim:
+        if barreira is not None:
+            try:
+                barreira.wait(timeout=max(0.0, fim - time.monotonic()))
+            except threading.BrokenBarrierError:
+                break
+
+        requisicao = perfil.gerar(rng)
+        inicio = time.perf_counter()
+        try:
+            resposta = sessao.request(requisicao.metodo, alvo + requisicao.caminho,
+                                      json=requisicao.corpo, timeout=timeout)
+            status = resposta.status_code
+        except requests.RequestException:
+            status = None
+        coletor.adicionar(Amostra(requisicao.rotulo, time.perf_counter() - inicio, status))
+
+        if perfil.rajada and perfil.intervalo_rajada:
+            time.sleep(perfil.intervalo_rajada)
+
+
+def executar(alvo: str, perfil: PerfilCarga, concorrencia: int, duracao: float,
+             semente: int = 42, timeout: float = 30.0) -> Dict:
+    """
+    Executa um perfil de carga e retorna o relatório consolidado.
+
+    Args:
+        alvo: URL base da API (ex: http://localhost:8000)
+        perfil: Perfil de tráfego
+        concorrencia: Número de trabalhadores simultâneos
+        duracao: Duração do teste em segundos
+        semente: Semente do sorteio, para execuções reprodutíveis
+        timeout: Timeout de cada requisição em segundos
+
+    Returns:
+        Relatório gerado por `resumir`
+    """
+    coletor = ColetorAmostras()
+    barreira = threading.Barrier(concorrencia) if perfil.rajada else None
+    inicio = time.monotonic()
+    fim = inicio + duracao
+
+    threads = [
+        threading.Thread(
+            target=_trabalhador,
+            args=(alvo.rstrip("/"), perfil, fim, coletor, semente + indice, barreira, timeout),
+            daemon=True,
+        )
+        for indice in range(concorrencia)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=duracao + timeout + 5)
+    if barreira is not None:
+        barreira.abort()
+
+    relatorio = resumir(coletor.amostras, time.monotonic() - inicio)
+    relatorio["perfil"] = perfil.nome
+    relatorio["concorrencia"] = concorrencia
+    return relatorio
+
+
+def imprimir_relatorio(relatorio: Dict) -> None:
+    """Exibe o relatório em formato tabular no terminal"""
+    print(f"Perfil: {relatorio['perfil']} | concorrência: {relatorio['concorrencia']} | "
+          f"duração: {relatorio['duracao_segundos']}s")
+    print(f"Status: {relatorio['status']}")
+    cabecalho = f"{'endpoint':40} {'req':>7} {'rps':>8} {'erro':>7} {'p50':>8} {'p90':>8} {'p99':>8} {'p99.9':>8} {'max':>8}"
+    print(cabecalho)
+    print("-" * len(cabecalho))
+    linhas = list(relatorio["por_endpoint"].items()) + [("TOTAL", relatorio["geral"])]
+    for rotulo, bloco in linhas:
+        lat = bloco["latencia_ms"]
+        print(f"{rotulo:40} {bloco['requisicoes']:>7} {bloco['vazao_rps']:>8} "
+              f"{bloco['taxa_erro'] * 100:>6.2f}% {lat['p50']:>8} {lat['p90']:>8} "
+              f"{lat['p99']:>8} {lat['p999']:>8} {lat['max']:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Teste de carga da API de Cálculo de Rendimentos")
+    parser.add_argument("--alvo", default="http://localhost:8000")
+    parser.add_argument("--perfil", choices=listar_perfis(), default="padrao_web")
+    parser.add_argument("--concorrencia", type=int, default=16)
+    parser.add_argument("--duracao", type=float, default=30.0, help="Duração em segundos")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida-json", help="Arquivo para gravar o relatório em JSON")
+    args = parser.parse_args()
+
+    relatorio = executar(args.alvo, PERFIS[args.perfil], args.concorrencia, args.duracao,
+                         semente=args.semente, timeout=args.timeout)
+    imprimir_relatorio(relatorio)
+
+    if args.saida_json:
+        with open(args.saida_json, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
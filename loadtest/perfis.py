@@ -0,0 +1,132 @@
+"""
+Perfis de tráfego usados pelo executor de testes de carga.
+
+Cada perfil sorteia requisições (método, caminho, corpo) que imitam um
+padrão de uso real da API.
+"""
+import random
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass
+class Requisicao:
+    """Requisição a ser disparada contra a API"""
+    metodo: str
+    caminho: str
+    corpo: Optional[Dict] = None
+
+    @property
+    def rotulo(self) -> str:
+        """Nome usado para agrupar as métricas por endpoint"""
+        return f"{self.metodo} {self.caminho}"
+
+
+@dataclass
+class PerfilCarga:
+    """
+    Perfil de tráfego.
+
+    Attributes:
+        nome: Identificador usado na linha de comando
+        descricao: Descrição do cenário simulado
+        gerar: Função que sorteia a próxima requisição
+        rajada: Se verdadeiro, os trabalhadores disparam juntos (sincronizados)
+        intervalo_rajada: Pausa em segundos entre rajadas
+    """
+    nome: str
+    descricao: str
+    gerar: Callable[[random.Random], Requisicao]
+    rajada: bool = False
+    intervalo_rajada: float = 0.0
+
+
+def _parametros_base(rng: random.Random, anos_min: int, anos_max: int,
+                     informar_cdi: bool = True) -> Dict:
+    """Sorteia parâmetros de cálculo dentro de um horizonte em anos"""
+    hoje = datetime.today()
+    parametros = {
+        "valor_inicial": rng.choice([1000.0, 5000.0, 10000.0, 50000.0]),
+        "aporte_mensal": rng.choice([0.0, 200.0, 500.0, 1000.0]),
+        "ano_final": hoje.year + rng.randint(anos_min, anos_max),
+        "mes_final": rng.randint(1, 12),
+        "percentual_sobre_cdi": rng.choice([100.0, 110.0, 120.0]),
+    }
+    if informar_cdi:
+        parametros["taxa_cdi_anual"] = 13.25
+    return parametros
+
+
+def _padrao_web(rng: random.Random) -> Requisicao:
+    # Reproduz a página: carrega o CDI, depois calcula rendimento ou resgate
+    sorteio = rng.random()
+    if sorteio < 0.2:
+        return Requisicao("GET", "/api/v1/cdi_atual")
+    caminho = "/api/v1/calcular_rendimento" if sorteio < 0.65 else "/api/v1/calcular_resgate"
+    return Requisicao("POST", caminho, _parametros_base(rng, 1, 10))
+
+
+def _horizontes_longos(rng: random.Random) -> Requisicao:
+    # Até 99 anos: com 100 o prazo pode passar do limite de 1.200 meses da API (HORIZONTE_MAXIMO_MESES)
+    caminho = rng.choice(["/api/v1/calcular_rendimento", "/api/v1/calcular_resgate"])
+    return Requisicao("POST", caminho, _parametros_base(rng, 50, 99))
+
+
+def _varredura_lote(rng: random.Random) -> Requisicao:
+    # Simula um script que varre uma grade de percentuais e horizontes
+    hoje = datetime.today()
+    parametros = {
+        "valor_inicial": 10000.0,
+        "aporte_mensal": float(rng.randrange(0, 5001, 250)),
+        "ano_final": hoje.year + rng.randint(1, 30),
+        "mes_final": 12,
+        "taxa_cdi_anual": 13.25,
+        "percentual_sobre_cdi": float(rng.randrange(80, 151, 5)),
+    }
+    caminho = rng.choice(["/api/v1/calcular_rendimento", "/api/v1/calcular_resgate"])
+    return Requisicao("POST", caminho, parametros)
+
+
+def _tempestade_cache(rng: random.Random) -> Requisicao:
+    # Sem taxa informada: toda requisição passa pelo CDIService
+    if rng.random() < 0.5:
+        return Requisicao("GET", "/api/v1/cdi_atual")
+    return Requisicao("POST", "/api/v1/calcular_rendimento",
+                      _parametros_base(rng, 1, 5, informar_cdi=False))
+
+
+PERFIS: Dict[str, PerfilCarga] = {
+    perfil.nome: perfil for perfil in [
+        PerfilCarga(
+            nome="padrao_web",
+            descricao="Mistura da página web: CDI atual, rendimento e resgate de 1 a 10 anos",
+            gerar=_padrao_web,
+        ),
+        PerfilCarga(
+            nome="horizontes_longos",
+            descricao="Cálculos de 50 a 99 anos (até 1.200 meses)",
+            gerar=_horizontes_longos,
+        ),
+        PerfilCarga(
+            nome="varredura_lote",
+            descricao="Varredura de grade de percentuais, aportes e horizontes",
+            gerar=_varredura_lote,
+        ),
+        PerfilCarga(
+            nome="tempestade_cache",
+            descricao=(
+                "Rajadas sincronizadas sem taxa CDI informada; execute a API com "
+                "CDI_CACHE_TTL_SEGUNDOS baixo para forçar expirações do cache"
+            ),
+            gerar=_tempestade_cache,
+            rajada=True,
+            intervalo_rajada=1.0,
+        ),
+    ]
+}
+
+
+def listar_perfis() -> List[str]:
+    """Retorna os nomes dos perfis disponíveis"""
+    return sorted(PERFIS)
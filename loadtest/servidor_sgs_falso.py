@@ -0,0 +1,259 @@
+"""
+Servidor local que imita a API SGS do Banco Central do Brasil.
+
+Usado nos testes de carga para que o `CDIService` nunca consulte o
+`api.bcb.gov.br` de verdade. Permite injetar latência, erros HTTP e
+respostas malformadas para observar o comportamento da API sob falhas.
+
+Uso:
+    python -m loadtest.servidor_sgs_falso --porta 9000 --latencia-ms 200 --taxa-erro 0.1
+
+E, no processo da API:
+    BCB_API_URL="http://localhost:9000/dados/serie/bcdata.sgs.12/dados/ultimos/30?formato=json"
+    BCB_IPCA_URL="http://localhost:9000/dados/serie/bcdata.sgs.433/dados?formato=json"
+
+A série 433 (IPCA) é servida a partir de `loadtest/fixtures/ipca_433.json`,
+respeitando os parâmetros `dataInicial` e `dataFinal` como a API real.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlsplit
+
+
+ROTA_SERIE = re.compile(r"^/dados/serie/bcdata\.sgs\.(\d+)/dados")
+
+SERIE_IPCA = "433"
+ARQUIVO_FIXTURE_IPCA = os.path.join(os.path.dirname(__file__), "fixtures", "ipca_433.json")
+
+
+@dataclass
+class ConfiguracaoFalhas:
+    """
+    Parâmetros de injeção de falhas do servidor falso.
+    As taxas são probabilidades entre 0 e 1 sorteadas a cada requisição.
+    """
+    valor_diario: float = 0.049037
+    latencia_ms: float = 0.0
+    jitter_ms: float = 0.0
+    taxa_erro: float = 0.0
+    taxa_malformado: float = 0.0
+    taxa_travamento: float = 0.0
+    travamento_segundos: float = 30.0
+    quantidade_registros: int = 30
+
+
+@dataclass
+class EstatisticasServidor:
+    """Contadores das requisições atendidas, expostos em /__estatisticas"""
+    total: int = 0
+    por_resultado: Dict[str, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def registrar(self, resultado: str) -> None:
+        """Contabiliza uma requisição pelo tipo de resposta enviada"""
+        with self._lock:
+            self.total += 1
+            self.por_resultado[resultado] = self.por_resultado.get(resultado, 0) + 1
+
+    def como_dict(self) -> Dict:
+        """Retorna uma cópia serializável dos contadores"""
+        with self._lock:
+            return {"total": self.total, "por_resultado": dict(self.por_resultado)}
+
+
+def gerar_serie(valor_diario: float, quantidade: int) -> List[Dict[str, str]]:
+    """
+    Gera uma série no mesmo formato da API SGS (lista de {data, valor}).
+
+    Args:
+        valor_diario: Taxa diária em percentual usada em todos os registros
+        quantidade: Quantidade de registros retornados
+
+    Returns:
+        Lista de registros com datas dos últimos dias
+    """
+    hoje = date.today()
+    return [
+        {
+            "data": (hoje - timedelta(days=quantidade - indice)).strftime("%d/%m/%Y"),
+            "valor": f"{valor_diario:.6f}",
+        }
+        for indice in range(quantidade)
+    ]
+
+
+def filtrar_periodo(registros: List[Dict[str, str]], caminho: str) -> List[Dict[str, str]]:
+    """
+    Aplica os parâmetros `dataInicial` e `dataFinal` (dd/mm/aaaa) da URL aos registros.
+
+    Args:
+        registros: Registros {data, valor} da série
+        caminho: Caminho da requisição, com a query string
+
+    Returns:
+        Registros dentro do período pedido
+    """
+    parametros = parse_qs(urlsplit(caminho).query)
+
+    def limite(nome: str, padrao: date) -> date:
+        valor = parametros.get(nome)
+        return datetime.strptime(valor[0], "%d/%m/%Y").date() if valor else padrao
+
+    inicio = limite("dataInicial", date.min)
+    fim = limite("dataFinal", date.max)
+    return [
+        registro for registro in registros
+        if inicio <= datetime.strptime(registro["data"], "%d/%m/%Y").date() <= fim
+    ]
+
+
+# Variações de payload inválido que a API real já devolveu ou pode devolver
+PAYLOADS_MALFORMADOS = [
+    b"[]",
+    b'[{"data": "01/01/2024"}]',
+    b'[{"data": "01/01/2024", "valor": "abc"}]',
+    b'{"erro": "Serie indisponivel"}',
+    b'[{"data": "01/01/2024", "valor": "0.04',
+    b"<html><body>Manutencao</body></html>",
+]
+
+
+def criar_handler(config: ConfiguracaoFalhas, estatisticas: EstatisticasServidor):
+    """
+    Cria a classe de handler HTTP vinculada à configuração de falhas.
+
+    Args:
+        config: Configuração de falhas do servidor
+        estatisticas: Contadores compartilhados entre as threads
+
+    Returns:
+        Classe de handler para o ThreadingHTTPServer
+    """
+
+    class HandlerSGSFalso(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, formato, *args):  # noqa: D401 - silencia o log padrão
+            pass
+
+        def do_GET(self):
+            if self.path.startswith("/__estatisticas"):
+                self._responder(200, json.dumps(estatisticas.como_dict()).encode())
+                return
+
+            if not ROTA_SERIE.match(self.path):
+                estatisticas.registrar("nao_encontrado")
+                self._responder(404, b'{"erro": "Serie nao encontrada"}')
+                return
+
+            self._aplicar_latencia()
+            sorteio = random.random()
+
+            if sorteio < config.taxa_travamento:
+                estatisticas.registrar("travamento")
+                time.sleep(config.travamento_segundos)
+                self._responder(504, b"")
+            elif sorteio < config.taxa_travamento + config.taxa_erro:
+                estatisticas.registrar("erro")
+                self._responder(random.choice([500, 502, 503]), b'{"erro": "Falha simulada"}')
+            elif sorteio < config.taxa_travamento + config.taxa_erro + config.taxa_malformado:
+                estatisticas.registrar("malformado")
+                self._responder(200, random.choice(PAYLOADS_MALFORMADOS))
+            else:
+                estatisticas.registrar("ok")
+                if ROTA_SERIE.match(self.path).group(1) == SERIE_IPCA:
+                    with open(ARQUIVO_FIXTURE_IPCA, encoding="utf-8") as arquivo:
+                        serie = filtrar_periodo(json.load(arquivo), self.path)
+                    if not serie:
+                        # Como a API real: período sem registros responde 404
+                        self._responder(404, b'{"erro": "Valor(es) nao encontrado(s)"}')
+                        return
+                else:
+                    serie = gerar_serie(config.valor_diario, config.quantidade_registros)
+                self._responder(200, json.dumps(serie).encode())
+
+        def _aplicar_latencia(self) -> None:
+            atraso_ms = config.latencia_ms + random.uniform(0, config.jitter_ms)
+            if atraso_ms > 0:
+                time.sleep(atraso_ms / 1000)
+
+        def _responder(self, status: int, corpo: bytes) -> None:
+            try:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+            except (BrokenPipeError, ConnectionResetError):
+                # O cliente desistiu (timeout) antes da resposta; esperado nos cenários de travamento
+                pass
+
+    return HandlerSGSFalso
+
+
+def criar_servidor(host: str, porta: int, config: ConfiguracaoFalhas) -> ThreadingHTTPServer:
+    """
+    Cria o servidor falso sem iniciá-lo, útil para uso embutido em scripts.
+
+    Args:
+        host: Endereço de escuta
+        porta: Porta de escuta (0 escolhe uma porta livre)
+        config: Configuração de falhas
+
+    Returns:
+        Servidor HTTP pronto para `serve_forever`
+    """
+    estatisticas = EstatisticasServidor()
+    servidor = ThreadingHTTPServer((host, porta), criar_handler(config, estatisticas))
+    servidor.daemon_threads = True
+    servidor.estatisticas = estatisticas
+    return servidor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servidor SGS falso para testes de carga")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=9000)
+    parser.add_argument("--valor-diario", type=float, default=0.049037,
+                        help="Taxa CDI diária em percentual devolvida pela série")
+    parser.add_argument("--latencia-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--taxa-erro", type=float, default=0.0,
+                        help="Fração de respostas 5xx")
+    parser.add_argument("--taxa-malformado", type=float, default=0.0,
+                        help="Fração de respostas 200 com payload inválido")
+    parser.add_argument("--taxa-travamento", type=float, default=0.0,
+                        help="Fração de requisições que ficam presas até o timeout do cliente")
+    parser.add_argument("--travamento-segundos", type=float, default=30.0)
+    args = parser.parse_args()
+
+    config = ConfiguracaoFalhas(
+        valor_diario=args.valor_diario,
+        latencia_ms=args.latencia_ms,
+        jitter_ms=args.jitter_ms,
+        taxa_erro=args.taxa_erro,
+        taxa_malformado=args.taxa_malformado,
+        taxa_travamento=args.taxa_travamento,
+        travamento_segundos=args.travamento_segundos,
+    )
+    servidor = criar_servidor(args.host, args.porta, config)
+    print(f"Servidor SGS falso em http://{args.host}:{servidor.server_address[1]}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
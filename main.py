@@ -1,11 +1,12 @@
 import uvicorn
 import os
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
-from src.presentation.api import app as api_app  # Importar o app já criado
+from src.presentation.api import app as api_app, _origens_cors  # Importar o app já criado
+from src.presentation.servidor import ServidorComDrenagem
 
 # Carregar variáveis de ambiente
 load_dotenv()
@@ -14,36 +15,56 @@ load_dotenv()
 def create_static_app():
     static_app = FastAPI(title="Calculadora de Rendimentos - Site")
     
-    # Configuração de CORS
+    # Configuração de CORS com as mesmas origens da API (CORS_ORIGENS)
+    origens = _origens_cors()
     static_app.add_middleware(
         CORSMiddleware,
-        allow_origins=["*"],
-        allow_credentials=True,
-        allow_methods=["*"],
+        allow_origins=origens,
+        # Credenciais não podem ser combinadas com a origem curinga "*"
+        allow_credentials="*" not in origens,
+        allow_methods=["GET", "OPTIONS"],
         allow_headers=["*"],
     )
     
+    montar_site(static_app)
+    
+    return static_app
+
+# Adicionar o site a um app (rotas registradas depois das existentes)
+def montar_site(app: FastAPI):
+    diretorio_web = os.path.abspath("web")
+    
     # Monta os arquivos estáticos da pasta web/assets
-    static_app.mount("/assets", StaticFiles(directory="web/assets"), name="assets")
+    app.mount("/assets", StaticFiles(directory="web/assets"), name="assets")
     
     # Rota específica para a raiz
-    @static_app.get("/")
+    @app.get("/", include_in_schema=False)
     async def serve_root():
         return FileResponse("web/index.html")
     
     # Rota para outros caminhos
-    @static_app.get("/{full_path:path}")
+    @app.get("/{full_path:path}", include_in_schema=False)
     async def serve_site(full_path: str):
-        if os.path.exists(f"web/{full_path}"):
-            return FileResponse(f"web/{full_path}")
+        # Rotas inexistentes da API não devem receber a página do site
+        if full_path.startswith("api/"):
+            raise HTTPException(status_code=404, detail="Not Found")
+        caminho = os.path.abspath(os.path.join(diretorio_web, full_path))
+        if caminho.startswith(diretorio_web + os.sep) and os.path.isfile(caminho):
+            return FileResponse(caminho)
         return FileResponse("web/index.html")
-    
-    return static_app
+
+# Criar app com o site e a API na mesma origem: o navegador não faz preflight
+# CORS e reaproveita a conexão (keep-alive) que carregou a página
+def create_combined_app():
+    montar_site(api_app)
+    return api_app
 
 # Escolher o app com base na variável de ambiente
 app_type = os.environ.get("APP_TYPE", "api")
 if app_type == "static":
     app = create_static_app()
+elif app_type == "combinado":
+    app = create_combined_app()
 else:
     app = api_app  # Usar o app já criado em api.py
 
@@ -54,9 +75,13 @@ if __name__ == "__main__":
     # Obter o host da variável de ambiente
     host = os.environ.get("HOST", "0.0.0.0")
     
-    uvicorn.run(
-        "main:app",
-        host=host,
-        port=port,
-        reload=True
-    ) 
\ No newline at end of file
+    # Mantém conexões ociosas abertas por mais tempo que o proxy/balanceador,
+    # para que ele reaproveite a conexão em vez de reabri-la
+    timeout_keep_alive = int(os.environ.get("KEEP_ALIVE_SEGUNDOS", 75))
+    
+    if os.environ.get("RECARREGAR", "0") == "1":
+        # Desenvolvimento: reinicia a cada alteração no código (sem drenagem no SIGTERM)
+        uvicorn.run("main:app", host=host, port=port, reload=True, timeout_keep_alive=timeout_keep_alive)
+    else:
+        # No SIGTERM: prontidão 503, fecha o socket, drena as requisições e grava logs e spans
+        ServidorComDrenagem.executar("main:app", host=host, port=port, timeout_keep_alive=timeout_keep_alive) 
\ No newline at end of file
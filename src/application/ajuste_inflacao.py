@@ -0,0 +1,48 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.infrastructure.external.ipca_service import IPCAService
+
+
+class AjusteInflacao:
+    """
+    Deflaciona pelo IPCA os valores mensais de um cálculo.
+
+    A inflação acumulada de todos os meses é calculada uma única vez por
+    requisição (produto acumulado sobre a série do IPCA) e cada valor real é
+    o valor nominal dividido pelo fator do seu mês, em moeda do primeiro mês.
+    Informes de uma granularidade trimestral ou anual usam o fator do próprio
+    mês, contado a partir do início do cálculo.
+    """
+
+    @staticmethod
+    def deflacionar(informes: List, colunas: Dict[str, str], inicio: Optional[datetime] = None) -> float:
+        """
+        Preenche as colunas de valores reais de cada informe mensal.
+
+        Args:
+            informes: Informes mensais em ordem cronológica (com o atributo `data`)
+            colunas: Atributo nominal -> atributo real (ex: {"saldo": "saldo_real"})
+            inicio: Primeiro mês do cálculo (padrão: o mês do primeiro informe)
+
+        Returns:
+            Variação mensal do IPCA (%) projetada para os meses ainda não divulgados
+        """
+        serie = IPCAService.obter_serie()
+        projecao = IPCAService.projecao_mensal(serie)
+        if not informes:
+            return projecao
+
+        primeiro_mes = inicio or informes[0].data
+        deslocamentos = [
+            (informe.data.year - primeiro_mes.year) * 12 + informe.data.month - primeiro_mes.month
+            for informe in informes
+        ]
+        fatores = serie.fatores_acumulados(primeiro_mes.year, primeiro_mes.month, deslocamentos[-1] + 1, projecao)
+
+        for informe, deslocamento in zip(informes, deslocamentos):
+            fator = fatores[deslocamento]
+            for nominal, real in colunas.items():
+                setattr(informe, real, getattr(informe, nominal) / fator)
+
+        return projecao
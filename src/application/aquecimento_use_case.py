@@ -0,0 +1,114 @@
+import logging
+import os
+import threading
+import time
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, Dict, Tuple
+
+from src.domain.entities.models import ParametrosCalculoJurosSaque as ParametrosCalculoResgate
+from src.domain.services.nucleo_compilado import NucleoCompilado
+from src.domain.services.tabela_fatores import RegistroTabelasFatores
+from src.infrastructure.external.bcb_service import CDIService
+from src.infrastructure.execucao.ciclo_vida import CicloVida
+from src.infrastructure.execucao.executor_calculos import ExecutorCalculos
+from src.application.rendimento_use_case import RendimentoUseCase
+from src.application.resgate_use_case import ResgateUseCase
+from src.application.calculo_completo_use_case import CalculoCompletoUseCase
+
+
+def _exercitar_calculos(taxa_cdi_anual: float = CDIService.VALOR_CDI_PADRAO) -> None:
+    """
+    Compila os núcleos JIT e executa um plano de exemplo em cada endpoint de
+    cálculo e em cada aritmética.
+
+    Função de módulo para poder ser enviada aos trabalhadores do pool no modo "processo".
+    """
+    NucleoCompilado.compilar()
+    hoje = datetime.now()
+    plano = ParametrosCalculoResgate(
+        valor_inicial=10000.0,
+        aporte_mensal=1000.0,
+        ano_final=hoje.year + AquecimentoUseCase.HORIZONTE_ANOS,
+        mes_final=hoje.month,
+        taxa_cdi_anual=taxa_cdi_anual
+    )
+    for aritmetica in ("float", "centavos"):
+        parametros = replace(plano, aritmetica=aritmetica)
+        RendimentoUseCase.calcular_rendimento(parametros)
+        ResgateUseCase.calcular_impostos_resgate(parametros)
+        CalculoCompletoUseCase.calcular_completo(parametros)
+
+
+class AquecimentoUseCase:
+    """
+    Caso de uso para o aquecimento da instância e a verificação de prontidão.
+
+    O aquecimento roda uma vez na inicialização, antes de a instância ser
+    declarada pronta: preenche o cache da taxa CDI, constrói as tabelas de
+    fatores dos percentuais pré-calculados, compila os núcleos JIT (se o Numba
+    estiver instalado) e exercita os caminhos de cálculo (na thread de
+    aquecimento e em cada trabalhador do pool), para que as primeiras
+    requisições não paguem esse custo.
+    """
+
+    HABILITADO = os.environ.get("AQUECIMENTO_HABILITADO", "1") == "1"
+    # Prazo do plano de exemplo (curto: basta passar pelo código, não medir desempenho)
+    HORIZONTE_ANOS = 2
+
+    @classmethod
+    def iniciar(cls) -> None:
+        """Dispara o aquecimento em segundo plano (a sonda de vida responde desde já)"""
+        if not cls.HABILITADO:
+            CicloVida.marcar_aquecido()
+            return
+        threading.Thread(target=cls.aquecer, name="aquecimento", daemon=True).start()
+
+    @staticmethod
+    def aquecer() -> None:
+        """Executa o aquecimento e marca a instância como aquecida, mesmo em caso de erro"""
+        inicio = time.perf_counter()
+        erro = None
+        try:
+            taxa = CDIService.obter_cotacao().valor
+            RegistroTabelasFatores.reconstruir(taxa)
+            _exercitar_calculos(taxa)
+            ExecutorCalculos.aquecer(_exercitar_calculos)
+        except Exception as excecao:
+            logging.exception("Erro no aquecimento da instância")
+            erro = str(excecao)
+        CicloVida.marcar_aquecido(erro)
+        logging.info(f"Aquecimento concluído em {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+    @staticmethod
+    def verificar_prontidao() -> Tuple[bool, Dict[str, Any]]:
+        """
+        Verifica se a instância pode receber tráfego.
+
+        Pronta quando o aquecimento terminou, a taxa CDI já foi consultada (com
+        sucesso ou com falha, caso em que o valor padrão é usado), as tabelas
+        de fatores da taxa atual existem e o processo não está encerrando.
+
+        Returns:
+            Tupla (pronta, verificações individuais)
+        """
+        estado_cdi = CDIService.estado_cache()
+        taxa = CDIService.valor_em_cache()
+        if taxa is None:
+            taxa = CDIService.VALOR_CDI_PADRAO
+        verificacoes: Dict[str, Any] = {
+            "aquecimento": "concluido" if CicloVida.aquecido() else "em_andamento",
+            "cdi": estado_cdi,
+            "tabelas_fatores": "prontas" if RegistroTabelasFatores.prontas(taxa) else "pendentes",
+            "encerrando": CicloVida.encerrando(),
+        }
+        if CicloVida.erro_aquecimento():
+            verificacoes["erro_aquecimento"] = CicloVida.erro_aquecimento()
+
+        pronta = (
+            CicloVida.aquecido()
+            and estado_cdi != "vazio"
+            and verificacoes["tabelas_fatores"] == "prontas"
+            and not CicloVida.encerrando()
+        )
+        return pronta, verificacoes
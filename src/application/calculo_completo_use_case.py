@@ -0,0 +1,138 @@
+from datetime import datetime
+from typing import List
+
+from src.domain.entities.models import (
+    ParametrosCalculoJurosSaque as ParametrosCalculoResgate,
+    ResultadoCalculoCompleto,
+    InformeCompletoMensal
+)
+from src.domain.services.aritmetica_monetaria import SerieCompleta, obter_aritmetica
+from src.domain.services.calculadora_rendimento import CalculadoraRendimento
+from src.infrastructure.external.bcb_service import CDIService
+from src.application.resgate_use_case import ResgateUseCase
+from src.application.ajuste_inflacao import AjusteInflacao
+
+
+class CalculoCompletoUseCase:
+    """
+    Caso de uso para o cálculo completo de um investimento.
+
+    Calcula, em uma única passada da calculadora, o rendimento bruto e os impostos
+    (IR e IOF) de resgate de cada mês, evitando que o cliente precise chamar os
+    cálculos de rendimento e de resgate separadamente com os mesmos parâmetros.
+    """
+
+    @staticmethod
+    def calcular_completo(parametros: ParametrosCalculoResgate) -> ResultadoCalculoCompleto:
+        """
+        Realiza o cálculo completo usando os parâmetros de domínio.
+
+        Args:
+            parametros: Parâmetros para o cálculo (os mesmos do cálculo de resgate)
+
+        Returns:
+            Objeto de resultado com os dados calculados
+
+        Raises:
+            ValueError: Se algum parâmetro for inválido
+        """
+        # Validação dos dados (mesmas regras do cálculo de resgate)
+        ResgateUseCase._validar_parametros(parametros)
+
+        # Complementa a taxa CDI se não fornecida
+        if parametros.taxa_cdi_anual is None:
+            parametros.taxa_cdi_anual = CDIService.obter_cdi_anual()
+
+        # Calcula rendimentos e impostos na mesma passada
+        calculadora = CalculoCompletoUseCase._criar_calculadora(parametros)
+        serie = calculadora.calcular_completo(
+            considerar_ir=parametros.considerar_ir,
+            considerar_iof=parametros.considerar_iof,
+            produto=parametros.produto,
+            granularidade=parametros.granularidade
+        )
+
+        # Converte as colunas em objetos de domínio
+        informes_mensais = CalculoCompletoUseCase._converter_serie_para_informes(serie)
+
+        # Calcula valor total aplicado
+        valor_total_aplicado = ResgateUseCase._calcular_valor_total_aplicado(parametros)
+
+        # Rendimento bruto e líquido a partir do saldo final
+        saldo_final = serie.saldos[-1] if serie.saldos else parametros.valor_inicial
+        rendimento_bruto = saldo_final - valor_total_aplicado
+        rendimento_liquido = rendimento_bruto - serie.total_impostos
+
+        # Deflaciona saldos e valores líquidos pelo IPCA, se solicitado
+        ipca_projetado_mensal = None
+        if parametros.ajustar_inflacao:
+            ipca_projetado_mensal = AjusteInflacao.deflacionar(
+                informes_mensais, {"saldo": "saldo_real", "valor_liquido": "valor_liquido_real"},
+                calculadora.data_inicial
+            )
+
+        return ResultadoCalculoCompleto(
+            informes_mensais=informes_mensais,
+            total_rendimento=serie.total_rendimento,
+            total_impostos=serie.total_impostos,
+            valor_total_aplicado=valor_total_aplicado,
+            taxa_cdi_utilizada=parametros.taxa_cdi_anual,
+            percentual_sobre_cdi=parametros.percentual_sobre_cdi,
+            considera_ir=parametros.considerar_ir,
+            considera_iof=parametros.considerar_iof,
+            rendimento_liquido=rendimento_liquido,
+            rendimento_bruto=rendimento_bruto,
+            ipca_projetado_mensal=ipca_projetado_mensal
+        )
+
+    @staticmethod
+    def _criar_calculadora(parametros: ParametrosCalculoResgate) -> CalculadoraRendimento:
+        """
+        Cria uma instância da calculadora de rendimentos com os parâmetros fornecidos.
+
+        Args:
+            parametros: Parâmetros para inicializar a calculadora
+
+        Returns:
+            Calculadora inicializada
+        """
+        # Calcula a taxa efetiva considerando o percentual sobre CDI
+        taxa_efetiva = parametros.taxa_cdi_anual * (parametros.percentual_sobre_cdi / 100.0)
+
+        return CalculadoraRendimento(
+            valor_inicial=parametros.valor_inicial,
+            aporte_mensal=parametros.aporte_mensal,
+            ano_final=parametros.ano_final,
+            mes_final=parametros.mes_final,
+            taxa_cdi_anual=taxa_efetiva,
+            data_inicial=parametros.data_inicial,
+            aritmetica=obter_aritmetica(parametros.aritmetica)
+        )
+
+    @staticmethod
+    def _converter_serie_para_informes(serie: SerieCompleta) -> List[InformeCompletoMensal]:
+        """
+        Converte as colunas mensais da calculadora para objetos de domínio.
+
+        Args:
+            serie: Colunas mensais do cálculo completo
+
+        Returns:
+            Lista de objetos InformeCompletoMensal
+        """
+        informes = []
+
+        for indice, mes_ano in enumerate(serie.rotulos):
+            mes, ano = map(int, mes_ano.split('/'))
+
+            informes.append(InformeCompletoMensal(
+                data=datetime(ano, mes, 1),
+                saldo=serie.saldos[indice],
+                rendimento=serie.rendimentos[indice],
+                aliquota_ir=serie.aliquotas_ir[indice],
+                iof=serie.iofs[indice],
+                imposto=serie.impostos[indice],
+                valor_liquido=serie.valores_liquidos[indice]
+            ))
+
+        return informes
@@ -0,0 +1,138 @@
+import os
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from src.domain.entities.models import (
+    ParametrosComparacao,
+    ParametrosVariante,
+    ResultadoComparacao,
+    ResultadoVariante
+)
+from src.domain.services.aritmetica_monetaria import obter_aritmetica
+from src.domain.services.calculadora_rendimento import CalculadoraRendimento
+from src.infrastructure.external.bcb_service import CDIService
+from src.application.resgate_use_case import ResgateUseCase
+
+
+class ComparacaoUseCase:
+    """
+    Caso de uso para comparação de cenários sobre um mesmo plano de aportes.
+
+    O plano base define valor inicial, aportes, prazo e impostos; cada variante
+    sobrescreve a taxa CDI, o percentual sobre o CDI, o produto e/ou a isenção de IR. Meses,
+    aportes e faixas de IR/IOF são montados uma única vez e todas as variantes
+    são calculadas na mesma passada pelos meses.
+    """
+
+    MAXIMO_VARIANTES = int(os.environ.get("COMPARACAO_MAXIMO_VARIANTES", 50))
+
+    @staticmethod
+    def comparar(parametros: ParametrosComparacao) -> ResultadoComparacao:
+        """
+        Realiza a comparação de cenários usando os parâmetros de domínio.
+
+        Args:
+            parametros: Plano base e variantes
+
+        Returns:
+            Objeto de resultado com as séries alinhadas de cada variante
+
+        Raises:
+            ValueError: Se algum parâmetro for inválido
+        """
+        ComparacaoUseCase._validar_parametros(parametros)
+        base = parametros.base
+
+        # Complementa a taxa CDI se alguma variante depender dela
+        if base.taxa_cdi_anual is None and any(v.taxa_cdi_anual is None for v in parametros.variantes):
+            base.taxa_cdi_anual = CDIService.obter_cdi_anual()
+
+        variantes = [ComparacaoUseCase._resolver_variante(base, v) for v in parametros.variantes]
+        taxas_efetivas = [taxa * (percentual / 100.0) for taxa, percentual, _ in variantes]
+
+        calculadora = CalculadoraRendimento(
+            valor_inicial=base.valor_inicial,
+            aporte_mensal=base.aporte_mensal,
+            ano_final=base.ano_final,
+            mes_final=base.mes_final,
+            taxa_cdi_anual=taxas_efetivas[0],
+            data_inicial=base.data_inicial,
+            aritmetica=obter_aritmetica(base.aritmetica)
+        )
+        series = calculadora.calcular_completo_variantes(
+            taxas_efetivas,
+            [isento_ir for _, _, isento_ir in variantes],
+            considerar_ir=base.considerar_ir,
+            considerar_iof=base.considerar_iof,
+            produtos=[v.produto or base.produto for v in parametros.variantes]
+        )
+
+        valor_total_aplicado = ResgateUseCase._calcular_valor_total_aplicado(base)
+
+        resultados = []
+        for variante, (taxa, percentual, isento_ir), serie in zip(parametros.variantes, variantes, series):
+            saldo_final = serie.saldos[-1] if serie.saldos else base.valor_inicial
+            rendimento_bruto = saldo_final - valor_total_aplicado
+            resultados.append(ResultadoVariante(
+                nome=variante.nome or ComparacaoUseCase._nome_padrao(
+                    percentual, isento_ir, variante.produto or base.produto
+                ),
+                taxa_cdi_utilizada=taxa,
+                percentual_sobre_cdi=percentual,
+                isento_ir=isento_ir,
+                serie=serie,
+                rendimento_bruto=rendimento_bruto,
+                rendimento_liquido=rendimento_bruto - serie.total_impostos
+            ))
+
+        return ResultadoComparacao(
+            datas=ComparacaoUseCase._converter_rotulos(series[0].rotulos),
+            variantes=resultados,
+            valor_total_aplicado=valor_total_aplicado,
+            considera_ir=base.considerar_ir,
+            considera_iof=base.considerar_iof
+        )
+
+    @staticmethod
+    def _validar_parametros(parametros: ParametrosComparacao) -> None:
+        """
+        Valida o plano base e as variantes.
+
+        Raises:
+            ValueError: Se algum parâmetro for inválido
+        """
+        ResgateUseCase._validar_parametros(parametros.base)
+
+        if not parametros.variantes:
+            raise ValueError("Informe ao menos uma variante.")
+        if len(parametros.variantes) > ComparacaoUseCase.MAXIMO_VARIANTES:
+            raise ValueError(f"A comparação aceita no máximo {ComparacaoUseCase.MAXIMO_VARIANTES} variantes.")
+
+        for variante in parametros.variantes:
+            if variante.taxa_cdi_anual is not None and variante.taxa_cdi_anual < 0:
+                raise ValueError("A taxa de CDI não pode ser negativa.")
+            if variante.percentual_sobre_cdi is not None and variante.percentual_sobre_cdi < 0:
+                raise ValueError("O percentual sobre CDI não pode ser negativo.")
+
+    @staticmethod
+    def _resolver_variante(base, variante: ParametrosVariante) -> Tuple[float, float, bool]:
+        """Retorna (taxa CDI, percentual sobre CDI, isento de IR) da variante, completados pelo plano base"""
+        taxa = variante.taxa_cdi_anual if variante.taxa_cdi_anual is not None else base.taxa_cdi_anual
+        percentual = (variante.percentual_sobre_cdi if variante.percentual_sobre_cdi is not None
+                      else base.percentual_sobre_cdi)
+        return taxa, percentual, variante.isento_ir
+
+    @staticmethod
+    def _nome_padrao(percentual: float, isento_ir: bool, produto: Optional[str] = None) -> str:
+        """Gera o nome de uma variante sem nome informado (ex: 'LCI 90% do CDI', '110% do CDI isento de IR')"""
+        nome = f"{produto} {percentual:g}% do CDI" if produto else f"{percentual:g}% do CDI"
+        return nome + (" isento de IR" if isento_ir else "")
+
+    @staticmethod
+    def _converter_rotulos(rotulos: List[str]) -> List[datetime]:
+        """Converte os rótulos 'mm/aaaa' da calculadora em datas"""
+        datas = []
+        for mes_ano in rotulos:
+            mes, ano = map(int, mes_ano.split('/'))
+            datas.append(datetime(ano, mes, 1))
+        return datas
@@ -0,0 +1,118 @@
+from src.domain.entities.models import ParametrosCalculoRendimento
+from src.infrastructure.exportacao.binarios import SerializadorArrow
+from src.application.rendimento_use_case import RendimentoUseCase
+from src.application.resgate_use_case import ResgateUseCase
+from src.application.calculo_completo_use_case import CalculoCompletoUseCase
+
+
+class CronogramaArrowUseCase:
+    """
+    Caso de uso para a resposta em Arrow IPC dos endpoints de cálculo.
+
+    Cada operação usa a mesma calculadora e o mesmo método da resposta JSON,
+    mas as colunas mensais saem direto da calculadora, sem montar informes
+    nem DTOs, com os mesmos arredondamentos do JSON. A coluna `mes` é o
+    ordinal do mês (1 = mês inicial, informado em `mes_inicial` nos metadados);
+    com granularidade trimestral ou anual, apenas os meses registrados saem.
+    """
+
+    COLUNAS = {
+        "rendimento": (
+            ("mes", "int"),
+            ("saldo", "float"),
+            ("rendimento", "float"),
+        ),
+        "resgate": (
+            ("mes", "int"),
+            ("saldo", "float"),
+            ("imposto", "float"),
+            ("aliquota_ir", "float"),
+        ),
+        "completo": (
+            ("mes", "int"),
+            ("saldo", "float"),
+            ("rendimento", "float"),
+            ("aliquota_ir", "float"),
+            ("iof", "float"),
+            ("imposto", "float"),
+            ("valor_liquido", "float"),
+        ),
+    }
+
+    @staticmethod
+    def serializar(parametros: ParametrosCalculoRendimento, operacao: str) -> bytes:
+        """
+        Calcula o plano e serializa o cronograma mensal em Arrow IPC.
+
+        Args:
+            parametros: Parâmetros do plano, com a taxa CDI já resolvida
+            operacao: "rendimento", "resgate" ou "completo"
+
+        Returns:
+            Stream Arrow IPC com uma linha por mês e o resumo nos metadados
+
+        Raises:
+            ValueError: Se algum parâmetro for inválido ou o ajuste pela inflação for pedido
+            FormatoIndisponivelError: Se o pacote `pyarrow` não estiver instalado
+        """
+        if parametros.ajustar_inflacao:
+            raise ValueError("Os valores reais (ajustar_inflacao) não estão disponíveis em Arrow; use JSON ou MessagePack.")
+
+        if operacao == "rendimento":
+            RendimentoUseCase._validar_parametros(parametros)
+            calculadora = RendimentoUseCase._criar_calculadora(parametros)
+            tuplas, total_rendimento = calculadora.calcular(parametros.granularidade)
+            _, saldos, rendimentos = CronogramaArrowUseCase._colunas(tuplas, 3)
+            bloco = {"rendimento": [round(valor, 2) for valor in rendimentos]}
+            totais = {"total_rendimento": total_rendimento}
+        elif operacao == "resgate":
+            ResgateUseCase._validar_parametros(parametros)
+            calculadora = ResgateUseCase._criar_calculadora(parametros)
+            tuplas, total_impostos = calculadora.calcular_impostos_resgate(
+                considerar_ir=parametros.considerar_ir,
+                considerar_iof=parametros.considerar_iof,
+                produto=parametros.produto,
+                granularidade=parametros.granularidade
+            )
+            _, saldos, impostos, aliquotas_ir = CronogramaArrowUseCase._colunas(tuplas, 4)
+            bloco = {
+                "imposto": [round(valor, 2) for valor in impostos],
+                "aliquota_ir": [float(aliquota) for aliquota in aliquotas_ir],
+            }
+            totais = {"total_impostos": total_impostos}
+        else:
+            ResgateUseCase._validar_parametros(parametros)
+            calculadora = CalculoCompletoUseCase._criar_calculadora(parametros)
+            serie = calculadora.calcular_completo(
+                considerar_ir=parametros.considerar_ir,
+                considerar_iof=parametros.considerar_iof,
+                produto=parametros.produto,
+                granularidade=parametros.granularidade
+            )
+            saldos = serie.saldos
+            bloco = {
+                "rendimento": [round(valor, 2) for valor in serie.rendimentos],
+                "aliquota_ir": [float(aliquota) for aliquota in serie.aliquotas_ir],
+                "iof": [round(valor, 2) for valor in serie.iofs],
+                "imposto": [round(valor, 2) for valor in serie.impostos],
+                "valor_liquido": [round(valor, 2) for valor in serie.valores_liquidos],
+            }
+            totais = {"total_rendimento": serie.total_rendimento, "total_impostos": serie.total_impostos}
+
+        bloco["mes"] = [indice + 1 for indice in calculadora.meses_registrados]
+        bloco["saldo"] = [round(valor, 2) for valor in saldos]
+
+        metadados = {
+            "operacao": operacao,
+            "mes_inicial": calculadora.data_inicial.strftime("%m/%Y"),
+            "valor_total_aplicado": round(ResgateUseCase._calcular_valor_total_aplicado(parametros), 2),
+            "taxa_cdi_utilizada": parametros.taxa_cdi_anual,
+            "percentual_sobre_cdi": parametros.percentual_sobre_cdi,
+            **{nome: round(valor, 2) for nome, valor in totais.items()},
+        }
+        return SerializadorArrow.serializar(CronogramaArrowUseCase.COLUNAS[operacao], bloco, metadados)
+
+    @staticmethod
+    def _colunas(tuplas, quantidade: int) -> tuple:
+        """Transpõe as tuplas mensais da calculadora em colunas"""
+        return tuple(zip(*tuplas)) if tuplas else ((),) * quantidade
@@ -0,0 +1,123 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from src.domain.entities.cronograma import Cronograma
+from src.domain.entities.models import (
+    ParametrosCalculoJurosSaque as ParametrosCalculoResgate,
+    InformeCompletoMensal
+)
+from src.infrastructure.cache.cache_cronogramas import CacheCronogramas
+from src.infrastructure.external.bcb_service import CDIService
+from src.application.resgate_use_case import ResgateUseCase
+from src.application.calculo_completo_use_case import CalculoCompletoUseCase
+
+
+class CronogramaNaoEncontradoError(Exception):
+    """Lançada quando o handle do cronograma não existe ou expirou"""
+
+
+class CronogramaUseCase:
+    """
+    Caso de uso para consultas repetidas sobre o cronograma de um plano.
+
+    O plano é calculado uma única vez (cálculo completo) e o cronograma fica em
+    cache sob um handle; as consultas seguintes (mês, intervalo e primeiro mês
+    em que um valor é atingido) não recalculam o plano.
+    """
+
+    @staticmethod
+    def calcular(parametros: ParametrosCalculoResgate) -> Cronograma:
+        """
+        Calcula o cronograma completo de um plano.
+
+        Args:
+            parametros: Parâmetros para o cálculo (os mesmos do cálculo de resgate)
+
+        Returns:
+            Cronograma em colunas
+
+        Raises:
+            ValueError: Se algum parâmetro for inválido
+        """
+        ResgateUseCase._validar_parametros(parametros)
+
+        if parametros.taxa_cdi_anual is None:
+            parametros.taxa_cdi_anual = CDIService.obter_cdi_anual()
+
+        calculadora = CalculoCompletoUseCase._criar_calculadora(parametros)
+        serie = calculadora.calcular_completo(
+            considerar_ir=parametros.considerar_ir,
+            considerar_iof=parametros.considerar_iof,
+            produto=parametros.produto
+        )
+
+        return Cronograma.de_serie(
+            serie,
+            valor_total_aplicado=ResgateUseCase._calcular_valor_total_aplicado(parametros),
+            taxa_cdi_utilizada=parametros.taxa_cdi_anual,
+            percentual_sobre_cdi=parametros.percentual_sobre_cdi,
+            considera_ir=parametros.considerar_ir,
+            considera_iof=parametros.considerar_iof
+        )
+
+    @staticmethod
+    def registrar(cronograma: Cronograma) -> Tuple[str, datetime]:
+        """
+        Guarda o cronograma em cache.
+
+        Args:
+            cronograma: Cronograma calculado
+
+        Returns:
+            Tupla (handle, data/hora de expiração)
+        """
+        return CacheCronogramas.armazenar(cronograma)
+
+    @staticmethod
+    def obter(handle: str) -> Cronograma:
+        """
+        Obtém o cronograma de um handle.
+
+        Raises:
+            CronogramaNaoEncontradoError: Se o handle não existir ou tiver expirado
+        """
+        cronograma = CacheCronogramas.obter(handle)
+        if cronograma is None:
+            raise CronogramaNaoEncontradoError(f"Cronograma não encontrado ou expirado: {handle}")
+        return cronograma
+
+    @staticmethod
+    def consultar_mes(handle: str, mes: int) -> InformeCompletoMensal:
+        """
+        Retorna os valores de um mês do plano.
+
+        Raises:
+            CronogramaNaoEncontradoError: Se o handle não existir ou tiver expirado
+            ValueError: Se o mês estiver fora do cronograma
+        """
+        return CronogramaUseCase.obter(handle).linha(mes)
+
+    @staticmethod
+    def consultar_intervalo(handle: str, inicio: int, fim: int) -> List[InformeCompletoMensal]:
+        """
+        Retorna os valores dos meses `inicio` a `fim` (inclusive).
+
+        Raises:
+            CronogramaNaoEncontradoError: Se o handle não existir ou tiver expirado
+            ValueError: Se o intervalo for inválido
+        """
+        return CronogramaUseCase.obter(handle).intervalo(inicio, fim)
+
+    @staticmethod
+    def buscar_limiar(handle: str, coluna: str, valor: float) -> Optional[int]:
+        """
+        Encontra o primeiro mês em que a coluna atinge o valor informado.
+
+        Returns:
+            Número do mês (1 = primeiro mês) ou None se o valor não for atingido
+
+        Raises:
+            CronogramaNaoEncontradoError: Se o handle não existir ou tiver expirado
+            ValueError: Se a coluna não for pesquisável
+        """
+        return CronogramaUseCase.obter(handle).primeiro_mes_atingindo(coluna, valor)
@@ -0,0 +1,162 @@
+import math
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from src.domain.entities.models import ParametrosCalculoRendimento
+from src.domain.services.aritmetica_monetaria import ARITMETICA_PADRAO
+
+
+class EstimadorCusto:
+    """
+    Estima o custo computacional de um cálculo a partir dos seus parâmetros.
+
+    A unidade de custo é "um mês calculado": o trabalho da calculadora e o
+    tamanho da resposta crescem linearmente com o número de meses. O custo é
+    meses x peso da operação x peso da aritmética x tamanho do lote, e é usado
+    tanto pelo ExecutorCalculos (inline ou pool) quanto pelo limite de taxa
+    por cliente.
+    """
+
+    # Maior horizonte aceito, em meses a partir da data inicial
+    HORIZONTE_MAXIMO_MESES = int(os.environ.get("HORIZONTE_MAXIMO_MESES", 1200))
+
+    # Trabalho relativo de cada operação em relação ao cálculo de rendimento
+    PESOS_OPERACAO = {
+        "rendimento": 1.0,
+        "resgate": 1.5,
+        "completo": 1.75,
+        "comparar": 1.5,  # por variante (meses e faixas de imposto são compartilhados)
+    }
+
+    # Operação de cada plano de uma exportação em lote (o custo é a soma dos planos)
+    OPERACAO_PLANO_LOTE = "completo"
+
+    # Trabalho relativo de cada aritmética monetária
+    PESOS_ARITMETICA = {
+        "float": 1.0,
+        "centavos": 1.25,
+    }
+
+    @staticmethod
+    def meses_ate(ano_final: int, mes_final: int, data_inicial: Optional[datetime] = None) -> int:
+        """
+        Calcula quantos meses a calculadora vai percorrer até o mês final.
+
+        Args:
+            ano_final: Ano final do cálculo
+            mes_final: Mês final do cálculo
+            data_inicial: Data inicial (padrão: hoje)
+
+        Returns:
+            Número de meses (mínimo 1)
+        """
+        data_inicial = data_inicial or datetime.today()
+        meses = (ano_final - data_inicial.year) * 12 + mes_final - data_inicial.month + 1
+        return max(1, meses)
+
+    @staticmethod
+    def meses(parametros: ParametrosCalculoRendimento) -> int:
+        """
+        Calcula quantos meses a calculadora vai percorrer.
+
+        Args:
+            parametros: Parâmetros do cálculo
+
+        Returns:
+            Número de meses (mínimo 1)
+        """
+        return EstimadorCusto.meses_ate(parametros.ano_final, parametros.mes_final, parametros.data_inicial)
+
+    @classmethod
+    def validar_horizonte(cls, parametros: ParametrosCalculoRendimento) -> None:
+        """
+        Verifica se o horizonte do cálculo está dentro do máximo configurado.
+
+        Args:
+            parametros: Parâmetros do cálculo
+
+        Raises:
+            ValueError: Se o horizonte exceder HORIZONTE_MAXIMO_MESES
+        """
+        if cls.meses(parametros) > cls.HORIZONTE_MAXIMO_MESES:
+            raise ValueError(
+                f"O horizonte do cálculo não pode exceder {cls.HORIZONTE_MAXIMO_MESES} meses."
+            )
+
+    @classmethod
+    def _peso(cls, operacao: str, aritmetica: Optional[str]) -> float:
+        peso_operacao = cls.PESOS_OPERACAO.get(operacao, 1.0)
+        peso_aritmetica = cls.PESOS_ARITMETICA.get(aritmetica or ARITMETICA_PADRAO, 1.0)
+        return peso_operacao * peso_aritmetica
+
+    @classmethod
+    def estimar(cls, parametros: ParametrosCalculoRendimento,
+                operacao: str = "rendimento", lote: int = 1) -> int:
+        """
+        Estima o custo de um cálculo.
+
+        Args:
+            parametros: Parâmetros do cálculo
+            operacao: "rendimento", "resgate", "completo" ou "comparar"
+            lote: Quantidade de cálculos com o mesmo horizonte
+
+        Returns:
+            Custo estimado em meses calculados
+        """
+        peso = cls._peso(operacao, parametros.aritmetica)
+        return math.ceil(cls.meses(parametros) * peso * max(1, lote))
+
+    @classmethod
+    def estimar_requisicao(cls, operacao: str, corpo: Dict[str, Any], lote: int = 1) -> int:
+        """
+        Estima o custo a partir do corpo JSON ainda não validado de uma requisição.
+
+        Usado antes da validação (no middleware de limite de taxa): campos
+        ausentes ou inválidos resultam no custo mínimo, já que a requisição
+        será rejeitada pela validação sem executar o cálculo.
+
+        Args:
+            operacao: "rendimento", "resgate", "completo", "comparar", "lote",
+                "job_lote" ou "job_varredura"
+            corpo: Corpo da requisição decodificado
+            lote: Quantidade de cálculos com o mesmo horizonte
+
+        Returns:
+            Custo estimado em meses calculados
+        """
+        # A exportação em lote e o job de lote trazem uma lista de planos, cada um com o próprio horizonte
+        if operacao in ("lote", "job_lote"):
+            planos = corpo.get("planos")
+            if not isinstance(planos, list):
+                return 1
+            return max(1, sum(
+                cls.estimar_requisicao(cls.OPERACAO_PLANO_LOTE, plano)
+                for plano in planos if isinstance(plano, dict)
+            ))
+        
+        # O job de varredura calcula o plano base uma vez para cada combinação dos eixos
+        if operacao == "job_varredura":
+            eixos = corpo.get("eixos")
+            combinacoes = 1
+            if isinstance(eixos, dict):
+                for valores in eixos.values():
+                    combinacoes *= len(valores) if isinstance(valores, list) and valores else 1
+            base = corpo.get("base") if isinstance(corpo.get("base"), dict) else {}
+            return cls.estimar_requisicao(cls.OPERACAO_PLANO_LOTE, base, combinacoes)
+        
+        # A comparação de cenários traz o plano em "base" e uma variante por cálculo
+        if operacao == "comparar":
+            variantes = corpo.get("variantes")
+            lote = len(variantes) if isinstance(variantes, list) else 1
+            corpo = corpo.get("base") if isinstance(corpo.get("base"), dict) else {}
+
+        try:
+            meses = cls.meses_ate(int(corpo["ano_final"]), int(corpo["mes_final"]))
+        except (KeyError, TypeError, ValueError):
+            return 1
+
+        aritmetica = corpo.get("aritmetica")
+        peso = cls._peso(operacao, aritmetica if isinstance(aritmetica, str) else None)
+        meses = min(meses, cls.HORIZONTE_MAXIMO_MESES)
+        return math.ceil(meses * peso * max(1, lote))
@@ -0,0 +1,155 @@
+import os
+from typing import Iterator, List, Optional
+
+from src.domain.entities.models import ParametrosCalculoJurosSaque as ParametrosCalculoResgate
+from src.domain.services.aritmetica_monetaria import SerieCompleta
+from src.infrastructure.external.bcb_service import CDIService
+from src.infrastructure.exportacao.escritores import Bloco, criar_escritor
+from src.application.resgate_use_case import ResgateUseCase
+from src.application.calculo_completo_use_case import CalculoCompletoUseCase
+
+
+class ExportacaoUseCase:
+    """
+    Caso de uso para exportação do cronograma de um ou mais planos em arquivo.
+
+    As linhas saem direto das colunas mensais da calculadora (SerieCompleta),
+    sem montar DTOs, e os planos são calculados um a um à medida que o arquivo
+    é escrito: a memória usada é a de um plano, independentemente do tamanho
+    do lote.
+    """
+
+    MAXIMO_PLANOS = int(os.environ.get("EXPORTACAO_MAXIMO_PLANOS", 1000))
+
+    # Colunas (nome, tipo) de cada linha exportada; "plano" só aparece na exportação em lote
+    COLUNA_PLANO = ("plano", "int")
+    COLUNAS = (
+        ("mes", "int"),
+        ("mes_ano", "str"),
+        ("valor_total", "float"),
+        ("rendimento_mensal", "float"),
+        ("aliquota_ir", "float"),
+        ("iof", "float"),
+        ("imposto_resgate", "float"),
+        ("valor_liquido", "float"),
+    )
+
+    @staticmethod
+    def preparar(planos: List[ParametrosCalculoResgate]) -> None:
+        """
+        Valida os planos e completa a taxa CDI dos que não a informaram.
+
+        Chamado antes de iniciar a resposta, para que erros de validação ainda
+        possam ser devolvidos como 400.
+
+        Raises:
+            ValueError: Se algum plano for inválido ou houver planos demais
+        """
+        if not planos:
+            raise ValueError("Informe ao menos um plano.")
+        if len(planos) > ExportacaoUseCase.MAXIMO_PLANOS:
+            raise ValueError(f"A exportação aceita no máximo {ExportacaoUseCase.MAXIMO_PLANOS} planos.")
+
+        for plano in planos:
+            ResgateUseCase._validar_parametros(plano)
+
+        if any(plano.taxa_cdi_anual is None for plano in planos):
+            taxa_cdi_anual = CDIService.obter_cdi_anual()
+            for plano in planos:
+                if plano.taxa_cdi_anual is None:
+                    plano.taxa_cdi_anual = taxa_cdi_anual
+
+    @staticmethod
+    def colunas(lote: bool) -> tuple:
+        """Retorna as colunas exportadas (com a coluna "plano" na exportação em lote)"""
+        return ((ExportacaoUseCase.COLUNA_PLANO,) if lote else ()) + ExportacaoUseCase.COLUNAS
+
+    @staticmethod
+    def blocos(planos: List[ParametrosCalculoResgate], lote: bool) -> Iterator[Bloco]:
+        """
+        Calcula os planos um a um, gerando um bloco de linhas por plano.
+
+        Args:
+            planos: Planos já preparados (ver `preparar`)
+            lote: Se deve incluir a coluna "plano" (1 = primeiro plano)
+
+        Yields:
+            Colunas mensais de cada plano
+        """
+        for numero, plano in enumerate(planos, start=1):
+            yield ExportacaoUseCase._calcular_bloco(plano, numero if lote else None)
+
+    @staticmethod
+    def cabecalho_csv(lote: bool, dialeto: str = "excel_br") -> str:
+        """
+        Início do CSV (BOM e nomes das colunas), enviado antes dos planos.
+
+        Args:
+            lote: Se é uma exportação em lote
+            dialeto: "excel_br" ou "rfc4180"
+        """
+        return criar_escritor("csv", dialeto).cabecalho(ExportacaoUseCase.colunas(lote))
+
+    @staticmethod
+    def gerar_csv_plano(plano: ParametrosCalculoResgate, numero: Optional[int], dialeto: str = "excel_br") -> str:
+        """
+        Calcula um plano e gera as suas linhas do CSV.
+
+        Chamado uma vez por plano, no pool de cálculos, enquanto o arquivo é transmitido.
+
+        Args:
+            plano: Plano já preparado (ver `preparar`)
+            numero: Número do plano na exportação em lote (None fora do lote)
+            dialeto: "excel_br" ou "rfc4180"
+
+        Returns:
+            Linhas do plano em CSV
+        """
+        bloco = ExportacaoUseCase._calcular_bloco(plano, numero)
+        return criar_escritor("csv", dialeto).texto(ExportacaoUseCase.colunas(numero is not None), bloco)
+
+    @staticmethod
+    def exportar_arquivo(formato: str, planos: List[ParametrosCalculoResgate], lote: bool, caminho: str) -> None:
+        """
+        Calcula os planos e escreve o arquivo XLSX ou Parquet.
+
+        Args:
+            formato: "xlsx" ou "parquet"
+            planos: Planos já preparados (ver `preparar`)
+            lote: Se é uma exportação em lote
+            caminho: Arquivo de destino
+
+        Raises:
+            FormatoIndisponivelError: Se o pacote do formato não estiver instalado
+        """
+        escritor = criar_escritor(formato)
+        escritor.escrever(caminho, ExportacaoUseCase.colunas(lote), ExportacaoUseCase.blocos(planos, lote))
+
+    @staticmethod
+    def _calcular_bloco(plano: ParametrosCalculoResgate, numero: Optional[int]) -> Bloco:
+        """Calcula um plano e converte as suas colunas em um bloco"""
+        calculadora = CalculoCompletoUseCase._criar_calculadora(plano)
+        serie = calculadora.calcular_completo(
+            considerar_ir=plano.considerar_ir,
+            considerar_iof=plano.considerar_iof,
+            produto=plano.produto
+        )
+        return ExportacaoUseCase._bloco(serie, numero)
+
+    @staticmethod
+    def _bloco(serie: SerieCompleta, plano: Optional[int]) -> Bloco:
+        """Converte as colunas da calculadora em um bloco com os nomes e arredondamentos exportados"""
+        meses = len(serie.rotulos)
+        bloco: Bloco = {
+            "mes": list(range(1, meses + 1)),
+            "mes_ano": serie.rotulos,
+            "valor_total": [round(valor, 2) for valor in serie.saldos],
+            "rendimento_mensal": [round(valor, 2) for valor in serie.rendimentos],
+            "aliquota_ir": [float(aliquota) for aliquota in serie.aliquotas_ir],
+            "iof": [round(valor, 2) for valor in serie.iofs],
+            "imposto_resgate": [round(valor, 2) for valor in serie.impostos],
+            "valor_liquido": [round(valor, 2) for valor in serie.valores_liquidos],
+        }
+        if plano is not None:
+            bloco["plano"] = [plano] * meses
+        return bloco
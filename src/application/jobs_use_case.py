@@ -0,0 +1,333 @@
+import itertools
+import logging
+import os
+import secrets
+import threading
+from collections import deque
+from concurrent.futures import Executor
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.infrastructure.external.bcb_service import CDIService
+from src.infrastructure.exportacao.escritores import Bloco, EscritorCSV
+from src.infrastructure.jobs.fila_jobs import criar_fila_jobs
+from src.application.recalculo_lote_use_case import RecalculoLoteUseCase
+
+
+class JobNaoEncontradoError(Exception):
+    """Lançada quando o job não existe ou já expirou"""
+
+
+class FilaJobsCheiaError(Exception):
+    """Lançada quando a fila de jobs atingiu o limite de jobs aguardando"""
+
+
+class JobsUseCase:
+    """
+    Caso de uso para cálculos grandes executados de forma assíncrona (jobs).
+
+    Tipos de job:
+        - "lote": lista de planos, cada um resumido em uma linha (mesmo cálculo
+          e mesmas colunas do recálculo em lote)
+        - "varredura": um plano base e eixos de valores; cada combinação dos
+          eixos (produto cartesiano, na ordem informada) é um plano
+
+    O job é enfileirado com a taxa CDI e o mês de referência já resolvidos, e
+    um trabalhador o executa em partes de `TAMANHO_PARTE` planos, gravando cada
+    parte assim que calculada: o resultado pode ser baixado parte a parte
+    durante a execução. Estado e partes ficam na fila de jobs configurada
+    (memória ou Redis) até `TTL_SEGUNDOS` depois do fim do job.
+    """
+
+    TAMANHO_PARTE = int(os.environ.get("JOBS_TAMANHO_PARTE", 2000))
+    MAXIMO_ITENS = int(os.environ.get("JOBS_MAXIMO_ITENS", 200000))
+    LIMITE_FILA = int(os.environ.get("JOBS_LIMITE_FILA", 100))
+    TTL_SEGUNDOS = int(os.environ.get("JOBS_TTL_SEGUNDOS", 3600))
+
+    # Prazo para um job ainda não concluído (ex: trabalhador interrompido) ser descartado
+    TTL_PENDENTE_SEGUNDOS = 86400
+
+    # Partes em cálculo simultâneo por processo do pool
+    PARTES_POR_PROCESSO = 2
+
+    TIPOS = ("lote", "varredura")
+    STATUS_FINAIS = ("concluido", "falhou", "cancelado")
+
+    # Campos do plano que podem variar em uma varredura
+    EIXOS_VARREDURA = ("valor_inicial", "aporte_mensal", "percentual_sobre_cdi",
+                       "taxa_cdi_anual", "ano_final", "mes_final")
+    EIXOS_INTEIROS = ("ano_final", "mes_final")
+
+    _fila = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def fila(cls):
+        """Retorna a fila de jobs do processo, criada na primeira utilização"""
+        with cls._lock:
+            if cls._fila is None:
+                cls._fila = criar_fila_jobs()
+            return cls._fila
+
+    @classmethod
+    def submeter_lote(cls, planos: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Enfileira um job de recálculo de uma lista de planos.
+
+        Planos inválidos não interrompem o job: saem com a coluna "erro" preenchida.
+
+        Args:
+            planos: Planos com as colunas do recálculo em lote (id, valor_inicial,
+                aporte_mensal, ano_final, mes_final...)
+
+        Returns:
+            Estado inicial do job
+
+        Raises:
+            ValueError: Se a lista estiver vazia ou exceder MAXIMO_ITENS
+            FilaJobsCheiaError: Se a fila estiver cheia
+        """
+        if not planos:
+            raise ValueError("Informe ao menos um plano.")
+        if len(planos) > cls.MAXIMO_ITENS:
+            raise ValueError(f"Um job aceita no máximo {cls.MAXIMO_ITENS} planos.")
+        return cls._submeter("lote", {"planos": planos}, len(planos))
+
+    @classmethod
+    def submeter_varredura(cls, base: Dict[str, Any], eixos: Dict[str, List[Any]]) -> Dict[str, Any]:
+        """
+        Enfileira um job de varredura: um plano para cada combinação dos eixos.
+
+        Args:
+            base: Plano base (campos de `/calcular_completo`)
+            eixos: Campo -> valores (ver EIXOS_VARREDURA)
+
+        Returns:
+            Estado inicial do job
+
+        Raises:
+            ValueError: Se os eixos forem inválidos ou gerarem mais de MAXIMO_ITENS planos
+            FilaJobsCheiaError: Se a fila estiver cheia
+        """
+        if not eixos:
+            raise ValueError("Informe ao menos um eixo da varredura.")
+        total = 1
+        for campo, valores in eixos.items():
+            if campo not in cls.EIXOS_VARREDURA:
+                raise ValueError(
+                    f"Eixo de varredura inválido: {campo}. Use {', '.join(cls.EIXOS_VARREDURA)}."
+                )
+            if not valores:
+                raise ValueError(f"O eixo {campo} não tem valores.")
+            total *= len(valores)
+        if total > cls.MAXIMO_ITENS:
+            raise ValueError(f"A varredura gera {total} planos; o máximo por job é {cls.MAXIMO_ITENS}.")
+
+        carga = {
+            "base": base,
+            "eixos": [
+                [campo, [int(valor) if campo in cls.EIXOS_INTEIROS else valor for valor in valores]]
+                for campo, valores in eixos.items()
+            ]
+        }
+        return cls._submeter("varredura", carga, total)
+
+    @classmethod
+    def _submeter(cls, tipo: str, carga: Dict[str, Any], total: int) -> Dict[str, Any]:
+        fila = cls.fila()
+        if fila.tamanho() >= cls.LIMITE_FILA:
+            raise FilaJobsCheiaError("Fila de jobs cheia. Tente novamente mais tarde.")
+
+        job_id = secrets.token_urlsafe(16)
+        tarefa = {
+            "tipo": tipo,
+            "carga": carga,
+            # Resolvidos uma única vez, para que todas as partes usem os mesmos valores
+            "taxa_cdi_anual": CDIService.obter_cdi_anual(),
+            "data_referencia": date.today().replace(day=1).isoformat(),
+        }
+        estado = {
+            "job_id": job_id,
+            "tipo": tipo,
+            "status": "na_fila",
+            "total": total,
+            "processados": 0,
+            "erros": 0,
+            "partes": 0,
+            "tamanho_parte": cls.TAMANHO_PARTE,
+            "colunas": [list(coluna) for coluna in cls.colunas(tipo, carga)],
+            "taxa_cdi_anual": tarefa["taxa_cdi_anual"],
+            "criado_em": datetime.now().isoformat(timespec="seconds"),
+            "iniciado_em": None,
+            "concluido_em": None,
+            "erro": None,
+        }
+        fila.salvar_estado(job_id, estado)
+        fila.expirar(job_id, cls.TTL_PENDENTE_SEGUNDOS)
+        fila.enfileirar(job_id, tarefa)
+        return estado
+
+    @classmethod
+    def consultar(cls, job_id: str) -> Dict[str, Any]:
+        """
+        Obtém o estado e o progresso de um job.
+
+        Raises:
+            JobNaoEncontradoError: Se o job não existir ou tiver expirado
+        """
+        estado = cls.fila().obter_estado(job_id)
+        if estado is None:
+            raise JobNaoEncontradoError(f"Job {job_id} não encontrado ou expirado")
+        return estado
+
+    @classmethod
+    def parte(cls, job_id: str, indice: int) -> Tuple[Dict[str, Any], Optional[List[List[Any]]]]:
+        """
+        Obtém uma parte do resultado (partes ficam disponíveis à medida que são calculadas).
+
+        Args:
+            job_id: Identificador do job
+            indice: Índice da parte (0 = primeira)
+
+        Returns:
+            Tupla (estado do job, linhas da parte ou None se ainda não calculada)
+
+        Raises:
+            JobNaoEncontradoError: Se o job não existir ou tiver expirado
+        """
+        estado = cls.consultar(job_id)
+        if indice < 0 or indice >= estado["partes"]:
+            return estado, None
+        return estado, cls.fila().obter_parte(job_id, indice)
+
+    @classmethod
+    def gerar_csv(cls, job_id: str, dialeto: str = "excel_br") -> Iterator[str]:
+        """
+        Gera o CSV com todas as partes do resultado, uma parte por vez.
+
+        Raises:
+            JobNaoEncontradoError: Se o job não existir ou tiver expirado
+        """
+        estado = cls.consultar(job_id)
+        colunas = [tuple(coluna) for coluna in estado["colunas"]]
+        nomes = [nome for nome, _ in colunas]
+
+        def blocos() -> Iterator[Bloco]:
+            for indice in range(estado["partes"]):
+                linhas = cls.fila().obter_parte(job_id, indice) or []
+                yield {nome: [linha[posicao] for linha in linhas] for posicao, nome in enumerate(nomes)}
+
+        return EscritorCSV(dialeto).gerar(colunas, blocos())
+
+    @classmethod
+    def cancelar(cls, job_id: str) -> Dict[str, Any]:
+        """
+        Cancela um job: na fila, ele é descartado ao ser retirado; em execução,
+        para depois da parte em andamento (as partes já calculadas continuam disponíveis).
+
+        Raises:
+            JobNaoEncontradoError: Se o job não existir ou tiver expirado
+        """
+        estado = cls.consultar(job_id)
+        if estado["status"] not in cls.STATUS_FINAIS:
+            cls.fila().cancelar(job_id)
+        return estado
+
+    @staticmethod
+    def colunas(tipo: str, carga: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """Colunas (nome, tipo) das linhas do resultado"""
+        eixos = [
+            (campo, "int" if campo in JobsUseCase.EIXOS_INTEIROS else "float")
+            for campo, _ in carga["eixos"]
+        ] if tipo == "varredura" else []
+        resumo = [
+            (nome, "str" if nome in ("id", "erro") else "int" if nome == "meses" else "float")
+            for nome in RecalculoLoteUseCase.COLUNAS_SAIDA
+        ]
+        return eixos + resumo
+
+    @staticmethod
+    def _planos(tipo: str, carga: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Gera os planos do job (na varredura, sob demanda a partir dos eixos)"""
+        if tipo == "lote":
+            for indice, plano in enumerate(carga["planos"]):
+                yield plano if "id" in plano else {**plano, "id": indice}
+            return
+
+        campos = [campo for campo, _ in carga["eixos"]]
+        valores = [lista for _, lista in carga["eixos"]]
+        for indice, combinacao in enumerate(itertools.product(*valores)):
+            yield {**carga["base"], **dict(zip(campos, combinacao)), "id": indice}
+
+    @classmethod
+    def executar(cls, job_id: str, tarefa: Dict[str, Any], pool: Executor) -> None:
+        """
+        Executa um job retirado da fila (chamado pelos trabalhadores).
+
+        As partes são calculadas no pool de processos, com no máximo
+        `processos x PARTES_POR_PROCESSO` em andamento, e gravadas na ordem.
+
+        Args:
+            job_id: Identificador do job
+            tarefa: Tarefa enfileirada por `_submeter`
+            pool: Pool de processos dos cálculos
+        """
+        fila = cls.fila()
+        estado = fila.obter_estado(job_id)
+        if estado is None:
+            return
+        if fila.cancelado(job_id):
+            cls._finalizar(job_id, estado, "cancelado")
+            return
+
+        estado.update(status="executando", iniciado_em=datetime.now().isoformat(timespec="seconds"))
+        fila.salvar_estado(job_id, estado)
+        logging.info(f"Job {job_id} ({tarefa['tipo']}, {estado['total']} planos) iniciado")
+
+        tipo, carga = tarefa["tipo"], tarefa["carga"]
+        campos_eixos = [campo for campo, _ in carga["eixos"]] if tipo == "varredura" else []
+        argumentos = (tarefa["taxa_cdi_anual"], datetime.fromisoformat(tarefa["data_referencia"]))
+        janela = max(1, getattr(pool, "_max_workers", 1)) * cls.PARTES_POR_PROCESSO
+        pendentes = deque()
+
+        def gravar_mais_antiga() -> None:
+            prefixos, futuro = pendentes.popleft()
+            linhas, erros = futuro.result()
+            fila.adicionar_parte(job_id, [list(prefixo) + list(linha) for prefixo, linha in zip(prefixos, linhas)])
+            estado["processados"] += len(linhas)
+            estado["erros"] += erros
+            estado["partes"] += 1
+            fila.salvar_estado(job_id, estado)
+
+        try:
+            planos = cls._planos(tipo, carga)
+            cancelado = False
+            while True:
+                bloco = list(itertools.islice(planos, cls.TAMANHO_PARTE))
+                if not bloco:
+                    break
+                if fila.cancelado(job_id):
+                    cancelado = True
+                    break
+                prefixos = [tuple(plano[campo] for campo in campos_eixos) for plano in bloco]
+                pendentes.append((prefixos, pool.submit(RecalculoLoteUseCase.processar_bloco, bloco, *argumentos)))
+                while len(pendentes) >= janela:
+                    gravar_mais_antiga()
+
+            while pendentes:
+                gravar_mais_antiga()
+            cls._finalizar(job_id, estado, "cancelado" if cancelado else "concluido")
+        except Exception as erro:
+            logging.exception(f"Erro ao executar o job {job_id}")
+            for _, futuro in pendentes:
+                futuro.cancel()
+            estado["erro"] = str(erro)
+            cls._finalizar(job_id, estado, "falhou")
+
+    @classmethod
+    def _finalizar(cls, job_id: str, estado: Dict[str, Any], status: str) -> None:
+        fila = cls.fila()
+        estado.update(status=status, concluido_em=datetime.now().isoformat(timespec="seconds"))
+        fila.salvar_estado(job_id, estado)
+        fila.expirar(job_id, cls.TTL_SEGUNDOS)
+        logging.info(f"Job {job_id} {status}: {estado['processados']}/{estado['total']} planos, {estado['erros']} erros")
@@ -0,0 +1,162 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.domain.entities.models import ParametrosCalculoJurosSaque as ParametrosCalculoResgate
+from src.application.resgate_use_case import ResgateUseCase
+from src.application.calculo_completo_use_case import CalculoCompletoUseCase
+
+
+class RecalculoLoteUseCase:
+    """
+    Caso de uso para o recálculo em lote de planos de clientes, fora da API.
+
+    Cada plano passa pelo mesmo cálculo completo da API (rendimento + IR/IOF de
+    resgate em uma passada), mas o resultado é resumido em uma linha, sem montar
+    os informes mensais. A taxa CDI e o mês de referência são resolvidos uma
+    única vez pelo chamador e aplicados a todos os planos, de modo que um lote
+    retomado depois de interrompido produz os mesmos valores.
+    """
+
+    # Colunas da linha de resultado de cada plano
+    COLUNAS_SAIDA = (
+        "id",
+        "meses",
+        "valor_total_aplicado",
+        "saldo_final",
+        "rendimento_bruto",
+        "total_impostos",
+        "rendimento_liquido",
+        "valor_liquido_final",
+        "taxa_cdi_utilizada",
+        "erro",
+    )
+
+    VALORES_VERDADEIROS = ("1", "true", "sim", "s", "yes", "y")
+
+    @staticmethod
+    def processar_bloco(linhas: List[Dict[str, Any]], taxa_cdi_anual: float,
+                        data_referencia: datetime) -> Tuple[List[Tuple], int]:
+        """
+        Recalcula um bloco de planos (executado nos processos do pool).
+
+        Erros de um plano não interrompem o bloco: a linha de resultado sai com
+        a coluna "erro" preenchida e os valores vazios.
+
+        Args:
+            linhas: Planos lidos do arquivo de entrada (coluna -> valor)
+            taxa_cdi_anual: Taxa CDI usada nos planos que não informam a própria
+            data_referencia: Mês inicial dos cálculos
+
+        Returns:
+            Tupla (linhas de resultado na ordem de COLUNAS_SAIDA, quantidade de erros)
+        """
+        resultados = []
+        erros = 0
+        for linha in linhas:
+            identificador = linha.get("id")
+            try:
+                parametros = RecalculoLoteUseCase._parametros_da_linha(linha, taxa_cdi_anual, data_referencia)
+                resultados.append((identificador,) + RecalculoLoteUseCase._resumir(parametros) + ("",))
+            except (ValueError, TypeError, KeyError) as erro:
+                erros += 1
+                mensagem = f"Coluna obrigatória ausente: {erro}" if isinstance(erro, KeyError) else str(erro)
+                resultados.append((identificador,) + ("",) * 8 + (mensagem,))
+        return resultados, erros
+
+    @staticmethod
+    def _resumir(parametros: ParametrosCalculoResgate) -> Tuple:
+        """
+        Calcula o plano e resume o resultado.
+
+        Raises:
+            ValueError: Se algum parâmetro for inválido
+        """
+        ResgateUseCase._validar_parametros(parametros)
+
+        calculadora = CalculoCompletoUseCase._criar_calculadora(parametros)
+        serie = calculadora.calcular_completo(
+            considerar_ir=parametros.considerar_ir,
+            considerar_iof=parametros.considerar_iof,
+            produto=parametros.produto
+        )
+
+        valor_total_aplicado = ResgateUseCase._calcular_valor_total_aplicado(parametros)
+        saldo_final = serie.saldos[-1] if serie.saldos else parametros.valor_inicial
+        rendimento_bruto = saldo_final - valor_total_aplicado
+        valor_liquido_final = serie.valores_liquidos[-1] if serie.valores_liquidos else saldo_final
+
+        return (
+            len(serie.saldos),
+            round(valor_total_aplicado, 2),
+            round(saldo_final, 2),
+            round(rendimento_bruto, 2),
+            round(serie.total_impostos, 2),
+            round(rendimento_bruto - serie.total_impostos, 2),
+            round(valor_liquido_final, 2),
+            parametros.taxa_cdi_anual,
+        )
+
+    @staticmethod
+    def _parametros_da_linha(linha: Dict[str, Any], taxa_cdi_anual: float,
+                             data_referencia: datetime) -> ParametrosCalculoResgate:
+        """
+        Converte uma linha do arquivo de entrada em parâmetros de domínio.
+
+        Colunas obrigatórias: valor_inicial, aporte_mensal, ano_final e mes_final.
+        Opcionais: percentual_sobre_cdi (100), taxa_cdi_anual, considerar_ir,
+        considerar_iof, produto e aritmetica.
+
+        Raises:
+            KeyError: Se faltar uma coluna obrigatória
+            ValueError: Se algum valor não puder ser convertido ou se os valores
+                reais (ajustar_inflacao), que o resumo não traz, forem pedidos
+        """
+        numero = RecalculoLoteUseCase._numero
+        opcional = RecalculoLoteUseCase._opcional
+        logico = RecalculoLoteUseCase._logico
+
+        if logico(opcional(linha, "ajustar_inflacao"), False):
+            raise ValueError("Os valores reais (ajustar_inflacao) não estão disponíveis no recálculo em lote.")
+
+        taxa_plano = opcional(linha, "taxa_cdi_anual")
+        percentual = opcional(linha, "percentual_sobre_cdi")
+
+        return ParametrosCalculoResgate(
+            valor_inicial=numero(linha["valor_inicial"]),
+            aporte_mensal=numero(linha["aporte_mensal"]),
+            ano_final=int(numero(linha["ano_final"])),
+            mes_final=int(numero(linha["mes_final"])),
+            taxa_cdi_anual=numero(taxa_plano) if taxa_plano is not None else taxa_cdi_anual,
+            percentual_sobre_cdi=numero(percentual) if percentual is not None else 100.0,
+            data_inicial=data_referencia,
+            aritmetica=opcional(linha, "aritmetica"),
+            considerar_ir=logico(opcional(linha, "considerar_ir"), True),
+            considerar_iof=logico(opcional(linha, "considerar_iof"), True),
+            produto=opcional(linha, "produto")
+        )
+
+    @staticmethod
+    def _opcional(linha: Dict[str, Any], coluna: str) -> Optional[Any]:
+        """Retorna o valor da coluna, ou None se ausente ou vazio"""
+        valor = linha.get(coluna)
+        if valor is None or (isinstance(valor, str) and not valor.strip()):
+            return None
+        return valor.strip() if isinstance(valor, str) else valor
+
+    @staticmethod
+    def _numero(valor: Any) -> float:
+        """Converte números do arquivo, aceitando vírgula decimal ("1234,56")"""
+        if isinstance(valor, str):
+            valor = valor.strip()
+            if "," in valor and "." not in valor:
+                valor = valor.replace(",", ".")
+        return float(valor)
+
+    @staticmethod
+    def _logico(valor: Any, padrao: bool) -> bool:
+        """Converte booleanos do arquivo ("1", "true", "sim"...)"""
+        if valor is None:
+            return padrao
+        if isinstance(valor, str):
+            return valor.lower() in RecalculoLoteUseCase.VALORES_VERDADEIROS
+        return bool(valor)
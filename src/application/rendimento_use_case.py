@@ -7,8 +7,12 @@ from src.domain.entities.models import (
     ResultadoCalculoRendimento,
     InformeRendimentoMensal
 )
+from src.domain.services.aritmetica_monetaria import obter_aritmetica
 from src.domain.services.calculadora_rendimento import CalculadoraRendimento
+from src.domain.services.tabela_fatores import RegistroTabelasFatores
 from src.infrastructure.external.bcb_service import CDIService
+from src.application.estimativa_custo import EstimadorCusto
+from src.application.ajuste_inflacao import AjusteInflacao
 
 
 # Configuração de localização para formatação de datas em português
@@ -52,7 +56,7 @@ class RendimentoUseCase:
         
         # Calcula os rendimentos
         calculadora = RendimentoUseCase._criar_calculadora(parametros)
-        tuplas_resultado, total_rendimento = calculadora.calcular()
+        tuplas_resultado, total_rendimento = calculadora.calcular(parametros.granularidade)
         
         # Converte tuplas em objetos de domínio
         informes_mensais = RendimentoUseCase._converter_tuplas_para_informes(tuplas_resultado)
@@ -60,13 +64,21 @@ class RendimentoUseCase:
         # Calcula valor total aplicado
         valor_total_aplicado = RendimentoUseCase._calcular_valor_total_aplicado(parametros)
         
+        # Deflaciona os saldos pelo IPCA, se solicitado
+        ipca_projetado_mensal = None
+        if parametros.ajustar_inflacao:
+            ipca_projetado_mensal = AjusteInflacao.deflacionar(
+                informes_mensais, {"saldo": "saldo_real"}, calculadora.data_inicial
+            )
+        
         # Cria e retorna o resultado
         return ResultadoCalculoRendimento(
             informes_mensais=informes_mensais,
             total_rendimento=total_rendimento,
             valor_total_aplicado=valor_total_aplicado,
             taxa_cdi_utilizada=parametros.taxa_cdi_anual,
-            percentual_sobre_cdi=parametros.percentual_sobre_cdi
+            percentual_sobre_cdi=parametros.percentual_sobre_cdi,
+            ipca_projetado_mensal=ipca_projetado_mensal
         )
     
     @staticmethod
@@ -91,12 +103,15 @@ class RendimentoUseCase:
         if parametros.percentual_sobre_cdi < 0:
             raise ValueError("O percentual sobre CDI não pode ser negativo.")
         
-        data_atual = datetime.today()
+        # Com data inicial (recálculo em lote), a data final é comparada com ela e não com hoje
+        data_atual = datetime.today() if parametros.data_inicial is None else parametros.data_inicial
         if parametros.ano_final < data_atual.year or (
                 parametros.ano_final == data_atual.year and 
                 parametros.mes_final < data_atual.month):
             raise ValueError("A data final deve ser posterior à data atual.")
     
+        EstimadorCusto.validar_horizonte(parametros)
+    
     @staticmethod
     def _criar_calculadora(parametros: ParametrosCalculoRendimento) -> CalculadoraRendimento:
         """
@@ -117,7 +132,12 @@ class RendimentoUseCase:
             ano_final=parametros.ano_final,
             mes_final=parametros.mes_final,
             taxa_cdi_anual=taxa_efetiva,
-            data_inicial=parametros.data_inicial
+            data_inicial=parametros.data_inicial,
+            tabela_fatores=RegistroTabelasFatores.obter(
+                parametros.taxa_cdi_anual,
+                parametros.percentual_sobre_cdi
+            ),
+            aritmetica=obter_aritmetica(parametros.aritmetica)
         )
     
     @staticmethod
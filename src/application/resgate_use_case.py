@@ -6,8 +6,11 @@ from src.domain.entities.models import (
     ResultadoCalculoResgate,
     InformeResgateMensal
 )
+from src.domain.services.aritmetica_monetaria import obter_aritmetica
 from src.domain.services.calculadora_rendimento import CalculadoraRendimento
 from src.infrastructure.external.bcb_service import CDIService
+from src.application.estimativa_custo import EstimadorCusto
+from src.application.ajuste_inflacao import AjusteInflacao
 
 
 class ResgateUseCase:
@@ -43,7 +46,9 @@ class ResgateUseCase:
         calculadora = ResgateUseCase._criar_calculadora(parametros)
         tuplas_resultado, total_impostos = calculadora.calcular_impostos_resgate(
             considerar_ir=parametros.considerar_ir,
-            considerar_iof=parametros.considerar_iof
+            considerar_iof=parametros.considerar_iof,
+            produto=parametros.produto,
+            granularidade=parametros.granularidade
         )
         
         # Converte tuplas em objetos de domínio
@@ -59,6 +64,13 @@ class ResgateUseCase:
         # Calcula o rendimento líquido (rendimento bruto - total impostos)
         rendimento_liquido = rendimento_bruto - total_impostos
         
+        # Deflaciona os saldos pelo IPCA, se solicitado
+        ipca_projetado_mensal = None
+        if parametros.ajustar_inflacao:
+            ipca_projetado_mensal = AjusteInflacao.deflacionar(
+                informes_mensais, {"saldo": "saldo_real"}, calculadora.data_inicial
+            )
+        
         # Cria e retorna o resultado
         return ResultadoCalculoResgate(
             informes_mensais=informes_mensais,
@@ -69,7 +81,8 @@ class ResgateUseCase:
             considera_ir=parametros.considerar_ir,
             considera_iof=parametros.considerar_iof,
             rendimento_liquido=rendimento_liquido,
-            rendimento_bruto=rendimento_bruto
+            rendimento_bruto=rendimento_bruto,
+            ipca_projetado_mensal=ipca_projetado_mensal
         )
     
     @staticmethod
@@ -94,12 +107,15 @@ class ResgateUseCase:
         if parametros.percentual_sobre_cdi < 0:
             raise ValueError("O percentual sobre CDI não pode ser negativo.")
         
-        data_atual = datetime.today()
+        # Com data inicial (recálculo em lote), a data final é comparada com ela e não com hoje
+        data_atual = datetime.today() if parametros.data_inicial is None else parametros.data_inicial
         if parametros.ano_final < data_atual.year or (
                 parametros.ano_final == data_atual.year and 
                 parametros.mes_final < data_atual.month):
             raise ValueError("A data final deve ser posterior à data atual.")
     
+        EstimadorCusto.validar_horizonte(parametros)
+    
     @staticmethod
     def _criar_calculadora(parametros: ParametrosCalculoResgate) -> CalculadoraRendimento:
         """
@@ -120,7 +136,8 @@ class ResgateUseCase:
             ano_final=parametros.ano_final,
             mes_final=parametros.mes_final,
             taxa_cdi_anual=taxa_efetiva,
-            data_inicial=parametros.data_inicial
+            data_inicial=parametros.data_inicial,
+            aritmetica=obter_aritmetica(parametros.aritmetica)
         )
     
     @staticmethod
@@ -0,0 +1,157 @@
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.domain.entities.models import InformeCompletoMensal
+from src.domain.services.aritmetica_monetaria import SerieCompleta
+
+
+@dataclass
+class Cronograma:
+    """
+    Cronograma mensal de um plano já calculado, armazenado em colunas.
+
+    Cada coluna é um `array('d')` indexado pelo mês do plano (mês 1 = índice 0),
+    o que mantém o cronograma compacto em memória e permite consultas pontuais
+    em O(1) e buscas por limiar em O(log n) sobre as colunas monótonas.
+    """
+    ano_inicial: int
+    mes_inicial: int
+    saldos: array
+    rendimentos: array
+    aliquotas_ir: array
+    iofs: array
+    impostos: array
+    valores_liquidos: array
+    total_rendimento: float
+    total_impostos: float
+    valor_total_aplicado: float
+    taxa_cdi_utilizada: float
+    percentual_sobre_cdi: float
+    considera_ir: bool
+    considera_iof: bool
+    _monotonas: Dict[str, bool] = field(default_factory=dict, repr=False, compare=False)
+
+    # Colunas aceitas na busca por limiar (nome exposto -> atributo)
+    COLUNAS_PESQUISAVEIS = {
+        "valor_total": "saldos",
+        "valor_liquido": "valores_liquidos",
+    }
+
+    @classmethod
+    def de_serie(cls, serie: SerieCompleta, **resumo) -> "Cronograma":
+        """
+        Cria o cronograma a partir das colunas do cálculo completo.
+
+        Args:
+            serie: Colunas mensais produzidas pela calculadora
+            **resumo: Totais e parâmetros do cálculo (demais campos do cronograma)
+
+        Returns:
+            Cronograma com as colunas convertidas para array('d')
+        """
+        mes_inicial, ano_inicial = map(int, serie.rotulos[0].split('/'))
+        return cls(
+            ano_inicial=ano_inicial,
+            mes_inicial=mes_inicial,
+            saldos=array('d', serie.saldos),
+            rendimentos=array('d', serie.rendimentos),
+            aliquotas_ir=array('d', serie.aliquotas_ir),
+            iofs=array('d', serie.iofs),
+            impostos=array('d', serie.impostos),
+            valores_liquidos=array('d', serie.valores_liquidos),
+            total_rendimento=serie.total_rendimento,
+            total_impostos=serie.total_impostos,
+            **resumo
+        )
+
+    def __len__(self) -> int:
+        return len(self.saldos)
+
+    def data_do_mes(self, mes: int) -> datetime:
+        """Retorna o primeiro dia do mês `mes` do plano (1 = primeiro mês)"""
+        indice = self.mes_inicial - 1 + mes - 1
+        return datetime(self.ano_inicial + indice // 12, indice % 12 + 1, 1)
+
+    def linha(self, mes: int) -> InformeCompletoMensal:
+        """
+        Retorna os valores de um mês do plano.
+
+        Args:
+            mes: Número do mês no plano (1 = primeiro mês)
+
+        Returns:
+            Informe do mês
+
+        Raises:
+            ValueError: Se o mês estiver fora do cronograma
+        """
+        if mes < 1 or mes > len(self):
+            raise ValueError(f"O mês deve estar entre 1 e {len(self)}.")
+
+        indice = mes - 1
+        return InformeCompletoMensal(
+            data=self.data_do_mes(mes),
+            saldo=self.saldos[indice],
+            rendimento=self.rendimentos[indice],
+            aliquota_ir=self.aliquotas_ir[indice],
+            iof=self.iofs[indice],
+            imposto=self.impostos[indice],
+            valor_liquido=self.valores_liquidos[indice]
+        )
+
+    def intervalo(self, inicio: int, fim: int) -> List[InformeCompletoMensal]:
+        """
+        Retorna os valores dos meses `inicio` a `fim` (inclusive).
+
+        Raises:
+            ValueError: Se o intervalo for vazio ou estiver fora do cronograma
+        """
+        if inicio > fim:
+            raise ValueError("O mês inicial do intervalo deve ser menor ou igual ao final.")
+        self.linha(inicio)
+        self.linha(fim)
+        return [self.linha(mes) for mes in range(inicio, fim + 1)]
+
+    def primeiro_mes_atingindo(self, coluna: str, valor: float) -> Optional[int]:
+        """
+        Encontra o primeiro mês em que a coluna atinge (>=) o valor informado.
+
+        Usa busca binária quando a coluna é não decrescente (o caso normal, com
+        taxa e aportes não negativos) e varredura linear caso contrário.
+
+        Args:
+            coluna: "valor_total" ou "valor_liquido"
+            valor: Limiar procurado
+
+        Returns:
+            Número do mês (1 = primeiro mês) ou None se o limiar não for atingido
+
+        Raises:
+            ValueError: Se a coluna não for pesquisável
+        """
+        atributo = self.COLUNAS_PESQUISAVEIS.get(coluna)
+        if atributo is None:
+            raise ValueError(
+                f"Coluna inválida: {coluna}. Use {', '.join(repr(c) for c in self.COLUNAS_PESQUISAVEIS)}."
+            )
+        valores = getattr(self, atributo)
+
+        if self._coluna_monotona(atributo, valores):
+            indice = bisect_left(valores, valor)
+            return indice + 1 if indice < len(valores) else None
+
+        for indice, atual in enumerate(valores):
+            if atual >= valor:
+                return indice + 1
+        return None
+
+    def _coluna_monotona(self, atributo: str, valores: array) -> bool:
+        """Verifica (uma única vez por coluna) se a coluna é não decrescente"""
+        monotona = self._monotonas.get(atributo)
+        if monotona is None:
+            monotona = all(anterior <= atual for anterior, atual in zip(valores, valores[1:]))
+            self._monotonas[atributo] = monotona
+        return monotona
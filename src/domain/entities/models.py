@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Optional
 
+from src.domain.services.aritmetica_monetaria import SerieCompleta
+
 
 @dataclass
 class ParametrosCalculoRendimento:
@@ -16,6 +18,9 @@ class ParametrosCalculoRendimento:
     taxa_cdi_anual: Optional[float] = None
     percentual_sobre_cdi: float = 100.0
     data_inicial: Optional[datetime] = None
+    aritmetica: Optional[str] = None
+    ajustar_inflacao: bool = False
+    granularidade: str = "mensal"
 
 
 @dataclass
@@ -26,6 +31,30 @@ class ParametrosCalculoJurosSaque(ParametrosCalculoRendimento):
     """
     considerar_ir: bool = True
     considerar_iof: bool = True
+    produto: Optional[str] = None
+
+
+@dataclass
+class ParametrosVariante:
+    """
+    Modelo de domínio para uma variante de uma comparação de cenários.
+    Campos não informados (None) usam o valor do plano base.
+    """
+    nome: Optional[str] = None
+    percentual_sobre_cdi: Optional[float] = None
+    taxa_cdi_anual: Optional[float] = None
+    isento_ir: bool = False
+    produto: Optional[str] = None
+
+
+@dataclass
+class ParametrosComparacao:
+    """
+    Modelo de domínio para os parâmetros de uma comparação de cenários:
+    um plano base (aportes, prazo e impostos) e as variantes de taxa a comparar.
+    """
+    base: ParametrosCalculoJurosSaque
+    variantes: List[ParametrosVariante]
 
 
 @dataclass
@@ -37,6 +66,7 @@ class InformeRendimentoMensal:
     data: datetime
     saldo: float
     rendimento: float
+    saldo_real: Optional[float] = None
     
     @property
     def mes_ano_formatado(self) -> str:
@@ -54,6 +84,29 @@ class InformeResgateMensal:
     saldo: float
     imposto: float
     aliquota_ir: float
+    saldo_real: Optional[float] = None
+    
+    @property
+    def mes_ano_formatado(self) -> str:
+        """Retorna mês/ano formatado"""
+        return self.data.strftime("%B/%Y")
+
+
+@dataclass
+class InformeCompletoMensal:
+    """
+    Modelo de domínio para um informe mensal do cálculo completo.
+    Reúne, para um mês específico, o rendimento bruto e os impostos de um resgate.
+    """
+    data: datetime
+    saldo: float
+    rendimento: float
+    aliquota_ir: float
+    iof: float
+    imposto: float
+    valor_liquido: float
+    saldo_real: Optional[float] = None
+    valor_liquido_real: Optional[float] = None
     
     @property
     def mes_ano_formatado(self) -> str:
@@ -72,6 +125,7 @@ class ResultadoCalculoRendimento:
     total_rendimento: float
     valor_total_aplicado: float
     data_calculo: Optional[datetime] = None
+    ipca_projetado_mensal: Optional[float] = None
     
     def __post_init__(self):
         if self.data_calculo is None:
@@ -98,6 +152,35 @@ class ResultadoCalculoResgate:
     rendimento_liquido: float
     rendimento_bruto: float
     data_calculo: Optional[datetime] = None
+    ipca_projetado_mensal: Optional[float] = None
+    
+    def __post_init__(self):
+        if self.data_calculo is None:
+            self.data_calculo = datetime.now()
+            
+    @property
+    def data_calculo_formatada(self) -> str:
+        """Retorna a data e hora do cálculo no formato DD/MM/AAAA HH:mm"""
+        return self.data_calculo.strftime("%d/%m/%Y %H:%M") 
+
+
+@dataclass
+class ResultadoCalculoCompleto:
+    """
+    Modelo de domínio para o resultado do cálculo completo (rendimento e resgate).
+    """
+    taxa_cdi_utilizada: float
+    percentual_sobre_cdi: float
+    considera_ir: bool
+    considera_iof: bool
+    informes_mensais: List[InformeCompletoMensal]
+    total_rendimento: float
+    total_impostos: float
+    valor_total_aplicado: float
+    rendimento_liquido: float
+    rendimento_bruto: float
+    data_calculo: Optional[datetime] = None
+    ipca_projetado_mensal: Optional[float] = None
     
     def __post_init__(self):
         if self.data_calculo is None:
@@ -106,4 +189,41 @@ class ResultadoCalculoResgate:
     @property
     def data_calculo_formatada(self) -> str:
         """Retorna a data e hora do cálculo no formato DD/MM/AAAA HH:mm"""
-        return self.data_calculo.strftime("%d/%m/%Y %H:%M") 
\ No newline at end of file
+        return self.data_calculo.strftime("%d/%m/%Y %H:%M")
+
+
+@dataclass
+class ResultadoVariante:
+    """
+    Modelo de domínio para o resultado de uma variante da comparação de cenários.
+    """
+    nome: str
+    taxa_cdi_utilizada: float
+    percentual_sobre_cdi: float
+    isento_ir: bool
+    serie: SerieCompleta
+    rendimento_bruto: float
+    rendimento_liquido: float
+
+
+@dataclass
+class ResultadoComparacao:
+    """
+    Modelo de domínio para o resultado de uma comparação de cenários.
+    As séries de todas as variantes estão alinhadas às mesmas datas.
+    """
+    datas: List[datetime]
+    variantes: List[ResultadoVariante]
+    valor_total_aplicado: float
+    considera_ir: bool
+    considera_iof: bool
+    data_calculo: Optional[datetime] = None
+    
+    def __post_init__(self):
+        if self.data_calculo is None:
+            self.data_calculo = datetime.now()
+    
+    @property
+    def data_calculo_formatada(self) -> str:
+        """Retorna a data e hora do cálculo no formato DD/MM/AAAA HH:mm"""
+        return self.data_calculo.strftime("%d/%m/%Y %H:%M")
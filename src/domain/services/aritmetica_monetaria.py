@@ -0,0 +1,518 @@
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from decimal import Decimal, ROUND_HALF_EVEN as DECIMAL_ROUND_HALF_EVEN
+from fractions import Fraction
+from typing import Container, List, Optional, Tuple
+
+from src.domain.services.nucleo_compilado import NucleoCompilado
+
+
+# Modos de arredondamento (mesmos nomes do módulo decimal)
+ROUND_HALF_EVEN = "ROUND_HALF_EVEN"
+ROUND_HALF_UP = "ROUND_HALF_UP"
+ROUND_DOWN = "ROUND_DOWN"
+ROUND_UP = "ROUND_UP"
+
+MODOS_ARREDONDAMENTO = (ROUND_HALF_EVEN, ROUND_HALF_UP, ROUND_DOWN, ROUND_UP)
+
+
+def dividir_arredondando(numerador: int, denominador: int, modo: str) -> int:
+    """
+    Divide dois inteiros arredondando o quociente conforme o modo informado.
+
+    Args:
+        numerador: Dividendo
+        denominador: Divisor (positivo)
+        modo: Um dos MODOS_ARREDONDAMENTO
+
+    Returns:
+        Quociente inteiro arredondado
+    """
+    sinal = -1 if numerador < 0 else 1
+    quociente, resto = divmod(abs(numerador), denominador)
+
+    if resto:
+        if modo == ROUND_HALF_EVEN:
+            dobro = 2 * resto
+            if dobro > denominador or (dobro == denominador and quociente % 2 == 1):
+                quociente += 1
+        elif modo == ROUND_HALF_UP:
+            if 2 * resto >= denominador:
+                quociente += 1
+        elif modo == ROUND_UP:
+            quociente += 1
+        elif modo != ROUND_DOWN:
+            raise ValueError(f"Modo de arredondamento inválido: {modo}")
+
+    return sinal * quociente
+
+
+def preparar_divisao(denominador: int, modo: str) -> Tuple[int, int, bool]:
+    """
+    Prepara a divisão arredondada de inteiros não negativos por um denominador
+    fixo, para os laços mês a mês fazerem uma única divisão inteira:
+    quociente = (2 * numerador + deslocamento) // divisor, menos 1 nos empates
+    com quociente ímpar se `desempatar` (ROUND_HALF_EVEN). Para numeradores
+    não negativos, o resultado é o mesmo de `dividir_arredondando`.
+
+    Args:
+        denominador: Divisor (positivo)
+        modo: Um dos MODOS_ARREDONDAMENTO
+
+    Returns:
+        Tupla (deslocamento, divisor, desempatar)
+    """
+    deslocamentos = {
+        ROUND_HALF_EVEN: denominador,
+        ROUND_HALF_UP: denominador,
+        ROUND_DOWN: 0,
+        ROUND_UP: 2 * denominador - 1,
+    }
+    if modo not in deslocamentos:
+        raise ValueError(f"Modo de arredondamento inválido: {modo}")
+    return deslocamentos[modo], 2 * denominador, modo == ROUND_HALF_EVEN
+
+
+@dataclass(frozen=True)
+class RegrasArredondamento:
+    """
+    Regras de arredondamento aplicadas a cada etapa do cálculo em centavos.
+
+    Attributes:
+        rendimento: Arredondamento do rendimento creditado a cada mês
+        imposto: Arredondamento do imposto (IR + IOF) de cada mês
+    """
+    rendimento: str = ROUND_HALF_EVEN
+    imposto: str = ROUND_HALF_EVEN
+
+    def __post_init__(self):
+        for modo in (self.rendimento, self.imposto):
+            if modo not in MODOS_ARREDONDAMENTO:
+                raise ValueError(f"Modo de arredondamento inválido: {modo}")
+
+    @classmethod
+    def do_ambiente(cls) -> "RegrasArredondamento":
+        """Cria as regras a partir das variáveis ARREDONDAMENTO_RENDIMENTO e ARREDONDAMENTO_IMPOSTO"""
+        return cls(
+            rendimento=os.environ.get("ARREDONDAMENTO_RENDIMENTO", ROUND_HALF_EVEN),
+            imposto=os.environ.get("ARREDONDAMENTO_IMPOSTO", ROUND_HALF_EVEN),
+        )
+
+
+@dataclass
+class SerieCompleta:
+    """
+    Colunas mensais do cálculo completo (rendimento + resgate em uma passada).
+
+    Attributes:
+        rotulos: Mês/ano ('mm/aaaa') de cada linha, preenchido pela calculadora
+        aliquotas_ir: Alíquota de IR (%) de cada mês, preenchida pela calculadora
+        saldos: Saldo bruto ao fim de cada mês
+        rendimentos: Rendimento do mês como em `serie_rendimento` (saldo ao fim do
+            mês vezes a taxa), para que `rendimento_mensal` tenha o mesmo valor em
+            todos os endpoints; o IR e o IOF incidem sobre o rendimento creditado
+        iofs: IOF incidente sobre o rendimento do mês
+        impostos: Imposto total (IR + IOF) sobre o rendimento do mês
+        valores_liquidos: Saldo menos os impostos acumulados até o mês
+        total_rendimento: Soma dos rendimentos do período
+        total_impostos: Soma dos impostos do período
+    """
+    rotulos: List[str] = field(default_factory=list)
+    aliquotas_ir: List[float] = field(default_factory=list)
+    saldos: List[float] = field(default_factory=list)
+    rendimentos: List[float] = field(default_factory=list)
+    iofs: List[float] = field(default_factory=list)
+    impostos: List[float] = field(default_factory=list)
+    valores_liquidos: List[float] = field(default_factory=list)
+    total_rendimento: float = 0.0
+    total_impostos: float = 0.0
+
+
+class AritmeticaFloat:
+    """
+    Aritmética em ponto flutuante binário, com os arredondamentos históricos
+    da calculadora (`round(..., 2)` no registro e no saldo do resgate).
+    """
+
+    nome = "float"
+
+    @staticmethod
+    def preparar_taxa(taxa_anual: float) -> float:
+        """Converte a taxa anual em percentual para a taxa mensal usada nos laços"""
+        return taxa_anual / 100 / 12
+
+    @staticmethod
+    def serie_rendimento(valor_inicial: float, aporte_mensal: float, taxa: float,
+                         meses: int, registrar: Optional[Container[int]] = None
+                         ) -> Tuple[List[float], List[float], float]:
+        """
+        Compõe o rendimento mês a mês.
+
+        Args:
+            valor_inicial: Valor inicial do investimento
+            aporte_mensal: Aporte feito no início de cada mês (exceto no primeiro, se houver valor inicial)
+            taxa: Taxa preparada por `preparar_taxa`
+            meses: Número de meses do cálculo
+            registrar: Índices (0 = primeiro mês) dos meses registrados nas listas;
+                None registra todos. Os totais sempre consideram todos os meses.
+
+        Returns:
+            Tupla (saldos registrados, rendimentos registrados, rendimento total)
+        """
+        saldo = valor_inicial
+        total_rendimento = 0.0
+        saldos = []
+        rendimentos = []
+
+        for mes in range(meses):
+            if mes > 0 or not valor_inicial > 0:
+                saldo += aporte_mensal
+            rendimento = saldo * taxa
+            saldo += rendimento
+            total_rendimento += rendimento
+            if registrar is None or mes in registrar:
+                saldos.append(round(saldo, 2))
+                rendimentos.append(round(saldo * taxa, 2))
+
+        return saldos, rendimentos, total_rendimento
+
+    @staticmethod
+    def serie_resgate(valor_inicial: float, aporte_mensal: float, taxa: float,
+                      aliquotas_ir: List[float], aliquotas_iof: List[float],
+                      registrar: Optional[Container[int]] = None) -> Tuple[List[float], List[float], float]:
+        """
+        Compõe o saldo mês a mês calculando o imposto de resgate de cada mês.
+
+        Args:
+            valor_inicial: Valor inicial do investimento
+            aporte_mensal: Aporte feito a partir do segundo mês
+            taxa: Taxa preparada por `preparar_taxa`
+            aliquotas_ir: Alíquota de IR (%) de cada mês
+            aliquotas_iof: Alíquota de IOF (%) de cada mês
+            registrar: Índices dos meses registrados nas listas (None registra todos)
+
+        Returns:
+            Tupla (saldos, impostos de cada mês, total de impostos)
+        """
+        # Com o Numba instalado, horizontes longos usam o mesmo laço compilado (resultados idênticos)
+        if NucleoCompilado.usar(len(aliquotas_ir)):
+            resultado = NucleoCompilado.serie_resgate(
+                valor_inicial, aporte_mensal, taxa, aliquotas_ir, aliquotas_iof, registrar
+            )
+            if resultado is not None:
+                return resultado
+
+        saldo = valor_inicial
+        total_impostos = 0.0
+        saldos = []
+        impostos = []
+        ultimo_mes = len(aliquotas_ir) - 1
+
+        for mes, aliquota_ir in enumerate(aliquotas_ir):
+            rendimento = saldo * taxa
+            saldo += rendimento
+            saldo = round(saldo, 2)
+
+            imposto_renda = rendimento * (aliquota_ir / 100)
+            iof = rendimento * (aliquotas_iof[mes] / 100)
+            imposto_total = round(imposto_renda + iof, 2)
+            total_impostos += imposto_total
+
+            if registrar is None or mes in registrar:
+                saldos.append(saldo)
+                impostos.append(imposto_total)
+
+            if mes < ultimo_mes:
+                saldo += aporte_mensal
+
+        return saldos, impostos, round(total_impostos, 2)
+
+    @staticmethod
+    def serie_completa(valor_inicial: float, aporte_mensal: float, taxa: float,
+                       aliquotas_ir: List[float], aliquotas_iof: List[float],
+                       registrar: Optional[Container[int]] = None) -> SerieCompleta:
+        """
+        Compõe o saldo com a regra de aportes de `serie_rendimento` e, na mesma
+        passada, calcula o rendimento bruto, o IOF, o imposto e o valor líquido de cada mês.
+
+        Args:
+            valor_inicial: Valor inicial do investimento
+            aporte_mensal: Aporte feito no início de cada mês (exceto no primeiro, se houver valor inicial)
+            taxa: Taxa preparada por `preparar_taxa`
+            aliquotas_ir: Alíquota de IR (%) de cada mês
+            aliquotas_iof: Alíquota de IOF (%) de cada mês
+            registrar: Índices dos meses registrados nas colunas (None registra todos)
+
+        Returns:
+            Colunas mensais e totais do período
+        """
+        serie = SerieCompleta()
+        saldo = valor_inicial
+        total_rendimento = 0.0
+        total_impostos = 0.0
+
+        for mes, aliquota_ir in enumerate(aliquotas_ir):
+            if mes > 0 or not valor_inicial > 0:
+                saldo += aporte_mensal
+            rendimento = saldo * taxa
+            saldo += rendimento
+            total_rendimento += rendimento
+
+            imposto_renda = rendimento * (aliquota_ir / 100)
+            iof = rendimento * (aliquotas_iof[mes] / 100)
+            imposto_total = round(imposto_renda + iof, 2)
+            total_impostos += imposto_total
+
+            if registrar is None or mes in registrar:
+                serie.saldos.append(round(saldo, 2))
+                serie.rendimentos.append(round(saldo * taxa, 2))
+                serie.iofs.append(round(iof, 2))
+                serie.impostos.append(imposto_total)
+                serie.valores_liquidos.append(round(saldo - total_impostos, 2))
+
+        serie.total_rendimento = total_rendimento
+        serie.total_impostos = round(total_impostos, 2)
+        return serie
+
+    @staticmethod
+    def series_completas(valor_inicial: float, aporte_mensal: float, taxas: List[float],
+                         aliquotas_ir: List[List[float]], aliquotas_iof: List[float]) -> List[SerieCompleta]:
+        """
+        Calcula `serie_completa` para várias taxas em uma única passada pelos meses.
+
+        Os aportes e as alíquotas de IOF são lidos uma vez por mês e aplicados a
+        todas as variantes; os valores de cada variante são idênticos aos de
+        `serie_completa` chamada separadamente com a mesma taxa.
+
+        Args:
+            valor_inicial: Valor inicial do investimento
+            aporte_mensal: Aporte feito no início de cada mês (exceto no primeiro, se houver valor inicial)
+            taxas: Taxa preparada por `preparar_taxa` de cada variante
+            aliquotas_ir: Alíquotas de IR (%) de cada mês, por variante (listas iguais podem ser compartilhadas)
+            aliquotas_iof: Alíquota de IOF (%) de cada mês
+
+        Returns:
+            Uma SerieCompleta por variante, na ordem de `taxas`
+        """
+        variantes = range(len(taxas))
+        series = [SerieCompleta() for _ in variantes]
+        saldos = [valor_inicial for _ in variantes]
+        totais_rendimento = [0.0 for _ in variantes]
+        totais_impostos = [0.0 for _ in variantes]
+
+        # Fatores de IR (alíquota / 100) calculados uma vez por lista distinta de alíquotas
+        fatores_por_lista = {}
+        for lista in aliquotas_ir:
+            if id(lista) not in fatores_por_lista:
+                fatores_por_lista[id(lista)] = [aliquota / 100 for aliquota in lista]
+        fatores_ir = [fatores_por_lista[id(lista)] for lista in aliquotas_ir]
+
+        for mes in range(len(aliquotas_iof)):
+            aporta = mes > 0 or not valor_inicial > 0
+            fator_iof = aliquotas_iof[mes] / 100
+
+            for k in variantes:
+                saldo = saldos[k]
+                if aporta:
+                    saldo += aporte_mensal
+                rendimento = saldo * taxas[k]
+                saldo += rendimento
+                saldos[k] = saldo
+                totais_rendimento[k] += rendimento
+
+                iof = rendimento * fator_iof
+                imposto_total = round(rendimento * fatores_ir[k][mes] + iof, 2)
+                totais_impostos[k] += imposto_total
+
+                serie = series[k]
+                serie.saldos.append(round(saldo, 2))
+                serie.rendimentos.append(round(saldo * taxas[k], 2))
+                serie.iofs.append(round(iof, 2))
+                serie.impostos.append(imposto_total)
+                serie.valores_liquidos.append(round(saldo - totais_impostos[k], 2))
+
+        for k in variantes:
+            series[k].total_rendimento = totais_rendimento[k]
+            series[k].total_impostos = round(totais_impostos[k], 2)
+        return series
+
+
+class AritmeticaCentavos:
+    """
+    Aritmética de ponto fixo em centavos inteiros.
+
+    Saldos, rendimentos e impostos são inteiros em centavos; a taxa mensal é
+    uma fração exata derivada da representação decimal da taxa anual. Cada
+    etapa arredonda uma única vez, segundo as `RegrasArredondamento`, de modo
+    que rendimento e resgate usam exatamente os mesmos valores.
+    """
+
+    nome = "centavos"
+
+    # Casas decimais consideradas na taxa anual efetiva (remove ruído binário, ex: 14.575000000000001)
+    CASAS_DECIMAIS_TAXA = 10
+
+    def __init__(self, regras: Optional[RegrasArredondamento] = None):
+        self.regras = regras or RegrasArredondamento.do_ambiente()
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def preparar_taxa(taxa_anual: float) -> Tuple[int, int]:
+        """Converte a taxa anual em percentual na fração exata (numerador, denominador) da taxa mensal"""
+        fracao = Fraction(Decimal(repr(round(taxa_anual, AritmeticaCentavos.CASAS_DECIMAIS_TAXA)))) / 1200
+        return fracao.numerator, fracao.denominator
+
+    @staticmethod
+    def para_centavos(valor: float) -> int:
+        """Converte um valor em reais para centavos, pelo seu valor decimal"""
+        return int(Decimal(repr(valor)).quantize(Decimal("0.01"), rounding=DECIMAL_ROUND_HALF_EVEN) * 100)
+
+    def serie_rendimento(self, valor_inicial: float, aporte_mensal: float, taxa: Tuple[int, int],
+                         meses: int, registrar: Optional[Container[int]] = None
+                         ) -> Tuple[List[float], List[float], float]:
+        """Equivalente em centavos de `AritmeticaFloat.serie_rendimento`"""
+        numerador, denominador = taxa
+        modo = self.regras.rendimento
+        saldo = self.para_centavos(valor_inicial)
+        aporte = self.para_centavos(aporte_mensal)
+        total_rendimento = 0
+        saldos = []
+        rendimentos = []
+
+        for mes in range(meses):
+            if mes > 0 or not valor_inicial > 0:
+                saldo += aporte
+            rendimento = dividir_arredondando(saldo * numerador, denominador, modo)
+            saldo += rendimento
+            total_rendimento += rendimento
+            if registrar is None or mes in registrar:
+                saldos.append(saldo / 100)
+                rendimentos.append(dividir_arredondando(saldo * numerador, denominador, modo) / 100)
+
+        return saldos, rendimentos, total_rendimento / 100
+
+    def serie_resgate(self, valor_inicial: float, aporte_mensal: float, taxa: Tuple[int, int],
+                      aliquotas_ir: List[float], aliquotas_iof: List[float],
+                      registrar: Optional[Container[int]] = None) -> Tuple[List[float], List[float], float]:
+        """
+        Equivalente em centavos de `AritmeticaFloat.serie_resgate`.
+
+        As duas divisões arredondadas de cada mês são feitas em linha, com os
+        parâmetros de `preparar_divisao` calculados antes do laço (mesmos
+        resultados de `dividir_arredondando`, sem uma chamada por divisão).
+
+        Raises:
+            ValueError: Se o valor inicial, o aporte, a taxa ou uma alíquota for negativo
+        """
+        numerador, denominador = taxa
+        saldo = self.para_centavos(valor_inicial)
+        aporte = self.para_centavos(aporte_mensal)
+        total_impostos = 0
+        saldos = []
+        impostos = []
+        ultimo_mes = len(aliquotas_ir) - 1
+
+        # Alíquotas em centésimos de ponto percentual (22.5% -> 2250 / 10000)
+        aliquotas = [
+            round(aliquota_ir * 100) + round(aliquota_iof * 100)
+            for aliquota_ir, aliquota_iof in zip(aliquotas_ir, aliquotas_iof)
+        ]
+        if min(numerador, saldo, aporte, *aliquotas) < 0:
+            raise ValueError("O cálculo em centavos não aceita valores, taxas ou alíquotas negativos.")
+
+        deslocamento_rendimento, divisor_rendimento, desempatar_rendimento = preparar_divisao(
+            denominador, self.regras.rendimento
+        )
+        deslocamento_imposto, divisor_imposto, desempatar_imposto = preparar_divisao(10000, self.regras.imposto)
+        dobro_numerador = 2 * numerador
+
+        for mes, aliquota in enumerate(aliquotas):
+            rendimento, resto = divmod(saldo * dobro_numerador + deslocamento_rendimento, divisor_rendimento)
+            if desempatar_rendimento and not resto and rendimento & 1:
+                rendimento -= 1
+            saldo += rendimento
+
+            imposto, resto = divmod(2 * rendimento * aliquota + deslocamento_imposto, divisor_imposto)
+            if desempatar_imposto and not resto and imposto & 1:
+                imposto -= 1
+            total_impostos += imposto
+
+            if registrar is None or mes in registrar:
+                saldos.append(saldo / 100)
+                impostos.append(imposto / 100)
+
+            if mes < ultimo_mes:
+                saldo += aporte
+
+        return saldos, impostos, total_impostos / 100
+
+    def serie_completa(self, valor_inicial: float, aporte_mensal: float, taxa: Tuple[int, int],
+                       aliquotas_ir: List[float], aliquotas_iof: List[float],
+                       registrar: Optional[Container[int]] = None) -> SerieCompleta:
+        """Equivalente em centavos de `AritmeticaFloat.serie_completa`"""
+        numerador, denominador = taxa
+        modo_rendimento = self.regras.rendimento
+        modo_imposto = self.regras.imposto
+        saldo = self.para_centavos(valor_inicial)
+        aporte = self.para_centavos(aporte_mensal)
+        total_rendimento = 0
+        total_impostos = 0
+        serie = SerieCompleta()
+
+        for mes, aliquota_ir in enumerate(aliquotas_ir):
+            if mes > 0 or not valor_inicial > 0:
+                saldo += aporte
+            rendimento = dividir_arredondando(saldo * numerador, denominador, modo_rendimento)
+            saldo += rendimento
+            total_rendimento += rendimento
+
+            aliquota_iof = round(aliquotas_iof[mes] * 100)
+            iof = dividir_arredondando(rendimento * aliquota_iof, 10000, modo_imposto)
+            imposto = dividir_arredondando(
+                rendimento * (round(aliquota_ir * 100) + aliquota_iof), 10000, modo_imposto
+            )
+            total_impostos += imposto
+
+            if registrar is None or mes in registrar:
+                serie.saldos.append(saldo / 100)
+                serie.rendimentos.append(dividir_arredondando(saldo * numerador, denominador, modo_rendimento) / 100)
+                serie.iofs.append(iof / 100)
+                serie.impostos.append(imposto / 100)
+                serie.valores_liquidos.append((saldo - total_impostos) / 100)
+
+        serie.total_rendimento = total_rendimento / 100
+        serie.total_impostos = total_impostos / 100
+        return serie
+
+    def series_completas(self, valor_inicial: float, aporte_mensal: float, taxas: List[Tuple[int, int]],
+                         aliquotas_ir: List[List[float]], aliquotas_iof: List[float]) -> List[SerieCompleta]:
+        """Equivalente em centavos de `AritmeticaFloat.series_completas` (uma passada por variante)"""
+        return [
+            self.serie_completa(valor_inicial, aporte_mensal, taxa, aliquotas_ir_variante, aliquotas_iof)
+            for taxa, aliquotas_ir_variante in zip(taxas, aliquotas_ir)
+        ]
+
+
+ARITMETICA_PADRAO = os.environ.get("ARITMETICA_MONETARIA", AritmeticaFloat.nome)
+
+
+def obter_aritmetica(nome: Optional[str] = None):
+    """
+    Retorna a implementação de aritmética monetária pelo nome.
+
+    Args:
+        nome: "float" ou "centavos". Se None, usa ARITMETICA_MONETARIA (padrão "float").
+
+    Returns:
+        Instância de AritmeticaFloat ou AritmeticaCentavos
+
+    Raises:
+        ValueError: Se o nome não corresponder a nenhuma aritmética
+    """
+    nome = nome or ARITMETICA_PADRAO
+    if nome == AritmeticaFloat.nome:
+        return AritmeticaFloat()
+    if nome == AritmeticaCentavos.nome:
+        return AritmeticaCentavos()
+    raise ValueError(f"Aritmética monetária inválida: {nome}. Use 'float' ou 'centavos'.")
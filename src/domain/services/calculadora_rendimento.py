@@ -1,6 +1,10 @@
 from datetime import datetime
 from typing import List, Tuple, Optional
 
+from src.domain.services.aritmetica_monetaria import AritmeticaFloat, SerieCompleta
+from src.domain.services.tabela_fatores import TabelaFatores
+from src.domain.services.regras_tributarias import RegistroRegrasTributarias, RegrasTributarias
+
 
 class CalculadoraRendimento:
     """
@@ -10,9 +14,16 @@ class CalculadoraRendimento:
     Segue o princípio de responsabilidade única, focando apenas na lógica de cálculo.
     """
     
+    # Granularidade -> intervalo em meses entre as linhas registradas (fim de
+    # trimestre/ano civil). "final" registra apenas o último mês.
+    GRANULARIDADES = {"mensal": 1, "trimestral": 3, "anual": 12, "final": None}
+    
     def __init__(self, valor_inicial: float, aporte_mensal: float, 
                  ano_final: int, mes_final: int, taxa_cdi_anual: float, 
-                 data_inicial: Optional[datetime] = None):
+                 data_inicial: Optional[datetime] = None,
+                 tabela_fatores: Optional[TabelaFatores] = None,
+                 aritmetica=None,
+                 regras_tributarias: Optional[RegrasTributarias] = None):
         """
         Inicializa a calculadora de rendimentos.
         
@@ -23,21 +34,37 @@ class CalculadoraRendimento:
             mes_final: Mês final para o cálculo (1-12)
             taxa_cdi_anual: Taxa de CDI anual em percentual
             data_inicial: Data inicial do cálculo. Se None, usa a data atual.
+            tabela_fatores: Tabela de fatores pré-calculados para a mesma taxa mensal.
+                Se informada (e compatível), os saldos são obtidos por consulta à tabela,
+                na forma fechada (pode diferir em centavos do laço mês a mês).
+            aritmetica: Aritmética monetária (AritmeticaFloat ou AritmeticaCentavos).
+                Se None, usa ponto flutuante como historicamente.
+            regras_tributarias: Regras de IR/IOF. Se None, usa as do arquivo de
+                regras (RegistroRegrasTributarias).
         """
         self.valor_inicial = valor_inicial
         self.aporte_mensal = aporte_mensal
         self.data_final = datetime(ano_final, mes_final, 1)
+        self.taxa_cdi_anual = taxa_cdi_anual
         self.taxa_cdi_mensal = taxa_cdi_anual / 100 / 12  # Converte a taxa anual para mensal
         self.data_inicial = data_inicial or datetime.today()
+        self.tabela_fatores = tabela_fatores
+        self.aritmetica = aritmetica or AritmeticaFloat()
+        self.regras_tributarias = regras_tributarias
         
         self.saldo = 0.0
         self.total_rendimento = 0.0
         self.historico = []
+        self.meses_registrados = []
     
-    def calcular(self) -> Tuple[List[Tuple[str, float, float]], float]:
+    def calcular(self, granularidade: str = "mensal") -> Tuple[List[Tuple[str, float, float]], float]:
         """
         Calcula os rendimentos mês a mês até a data final.
         
+        Args:
+            granularidade: Meses registrados no histórico (ver `GRANULARIDADES`);
+                o total considera sempre todos os meses
+        
         Returns:
             Tupla contendo:
                 - Lista de tuplas (mês/ano, saldo, rendimento mensal)
@@ -46,14 +73,112 @@ class CalculadoraRendimento:
         self._inicializar_calculo()
         self._validar_datas()
         
-        data_atual = self.data_inicial
+        rotulos = self._gerar_rotulos_meses()
+        registrar = self._registrar(len(rotulos), granularidade)
+        
+        if self._tabela_cobre_periodo(len(rotulos)):
+            saldos, rendimentos, self.total_rendimento = self._serie_com_tabela(len(rotulos), registrar)
+        else:
+            saldos, rendimentos, self.total_rendimento = self.aritmetica.serie_rendimento(
+                self.valor_inicial,
+                self.aporte_mensal,
+                self.aritmetica.preparar_taxa(self.taxa_cdi_anual),
+                len(rotulos),
+                registrar
+            )
         
-        while data_atual <= self.data_final:
-            self._processar_mes(data_atual)
-            data_atual = self._avancar_para_proximo_mes(data_atual)
+        self.historico = list(zip(self._filtrar(rotulos), saldos, rendimentos))
+        if saldos:
+            self.saldo = saldos[-1]
         
         return self.historico, self.total_rendimento
     
+    def _gerar_rotulos_meses(self) -> List[str]:
+        """Gera os rótulos 'mm/aaaa' de cada mês do cálculo (data inicial até a final, inclusive)"""
+        rotulos = []
+        ano, mes = self.data_inicial.year, self.data_inicial.month
+    
+        while (ano, mes) <= (self.data_final.year, self.data_final.month):
+            rotulos.append(f"{mes:02d}/{ano}")
+            mes += 1
+            if mes > 12:
+                mes = 1
+                ano += 1
+        
+        return rotulos
+    
+    def _registrar(self, meses: int, granularidade: str) -> Optional[set]:
+        """
+        Define os meses registrados pela granularidade e os guarda em `meses_registrados`.
+        
+        As linhas trimestrais e anuais são os meses de fim de trimestre/ano
+        civil, mais o último mês do cálculo, sempre registrado.
+        
+        Args:
+            meses: Número de meses do cálculo
+            granularidade: "mensal", "trimestral", "anual" ou "final"
+        
+        Returns:
+            Índices (0 = primeiro mês) dos meses registrados, ou None para todos
+        
+        Raises:
+            ValueError: Se a granularidade for desconhecida
+        """
+        if granularidade not in self.GRANULARIDADES:
+            raise ValueError(
+                f"Granularidade desconhecida: {granularidade}. "
+                f"Use uma de: {', '.join(self.GRANULARIDADES)}."
+            )
+        
+        intervalo = self.GRANULARIDADES[granularidade]
+        if intervalo == 1:
+            self.meses_registrados = list(range(meses))
+            return None
+        
+        mes_inicial = self.data_inicial.month
+        self.meses_registrados = [
+            indice for indice in range(meses)
+            if indice == meses - 1 or (intervalo is not None and (mes_inicial + indice) % intervalo == 0)
+        ]
+        return set(self.meses_registrados)
+    
+    def _filtrar(self, valores: List) -> List:
+        """Mantém apenas os valores dos meses registrados no último cálculo"""
+        if len(self.meses_registrados) == len(valores):
+            return valores
+        return [valores[indice] for indice in self.meses_registrados]
+    
+    def _tabela_cobre_periodo(self, meses: int) -> bool:
+        """Verifica se a tabela de fatores pode ser usada: aritmética float, mesma taxa e horizonte coberto"""
+        return (self.tabela_fatores is not None and
+                isinstance(self.aritmetica, AritmeticaFloat) and
+                self.tabela_fatores.taxa_mensal == self.taxa_cdi_mensal and
+                self.tabela_fatores.cobre(meses))
+    
+    def _serie_com_tabela(self, meses: int, registrar: Optional[set] = None
+                          ) -> Tuple[List[float], List[float], float]:
+        """
+        Calcula a série consultando a tabela de fatores: o saldo de cada mês
+        é obtido diretamente, sem depender do saldo do mês anterior, e apenas
+        os meses registrados (e o último, para o total) são consultados.
+        """
+        tabela = self.tabela_fatores
+        saldos = []
+        rendimentos = []
+        saldo = self.valor_inicial
+        
+        consultados = range(1, meses + 1) if registrar is None else [indice + 1 for indice in sorted(registrar)]
+        for mes in consultados:
+            saldo = tabela.saldo(mes, self.valor_inicial, self.aporte_mensal)
+            saldos.append(round(saldo, 2))
+            rendimentos.append(round(saldo * self.taxa_cdi_mensal, 2))
+        
+        # Rendimento total = saldo final - tudo o que foi aportado
+        aportes = meses - 1 if self.valor_inicial > 0 else meses
+        total_rendimento = saldo - self.valor_inicial - self.aporte_mensal * aportes
+        
+        return saldos, rendimentos, total_rendimento
+    
     def _inicializar_calculo(self) -> None:
         """Reinicia os valores para um novo cálculo"""
         self.saldo = self.valor_inicial
@@ -65,52 +190,18 @@ class CalculadoraRendimento:
         if self.data_final <= self.data_inicial:
             raise ValueError("A data final deve ser posterior à data inicial")
     
-    def _processar_mes(self, data_atual: datetime) -> None:
-        """Processa o cálculo de rendimento para um mês específico"""
-        self._aplicar_aporte_mensal(data_atual)
-        self._aplicar_rendimento_mensal()
-        self._registrar_no_historico(data_atual)
-    
-    def _aplicar_aporte_mensal(self, data_atual: datetime) -> None:
-        """Aplica o aporte mensal ao saldo, exceto no primeiro mês com valor inicial"""
-        eh_primeiro_mes = (data_atual.month == self.data_inicial.month and 
-                           data_atual.year == self.data_inicial.year)
-        
-        if not (eh_primeiro_mes and self.valor_inicial > 0):
-            self.saldo += self.aporte_mensal
-    
-    def _aplicar_rendimento_mensal(self) -> None:
-        """Calcula e aplica o rendimento mensal ao saldo"""
-        rendimento = self.saldo * self.taxa_cdi_mensal
-        self.saldo += rendimento
-        self.total_rendimento += rendimento
-    
-    def _registrar_no_historico(self, data_atual: datetime) -> None:
-        """Registra o saldo e rendimento do mês atual no histórico"""
-        self.historico.append((
-            data_atual.strftime('%m/%Y'),
-            round(self.saldo, 2),
-            round(self.saldo * self.taxa_cdi_mensal, 2)
-        ))
-    
-    def _avancar_para_proximo_mes(self, data_atual: datetime) -> datetime:
-        """Retorna a data do próximo mês"""
-        mes = data_atual.month + 1
-        ano = data_atual.year
-        
-        if mes > 12:
-            mes = 1
-            ano += 1
-            
-        return datetime(ano, mes, 1)
-    
-    def calcular_impostos_resgate(self, considerar_ir: bool = True, considerar_iof: bool = True) -> Tuple[List[Tuple[str, float, float, float]], float]:
+    def calcular_impostos_resgate(self, considerar_ir: bool = True, considerar_iof: bool = True,
+                                  produto: Optional[str] = None, granularidade: str = "mensal"
+                                  ) -> Tuple[List[Tuple[str, float, float, float]], float]:
         """
         Calcula os impostos que seriam pagos para resgatar o dinheiro a cada mês.
         
         Args:
             considerar_ir: Se deve considerar Imposto de Renda no cálculo
             considerar_iof: Se deve considerar IOF para resgates em menos de 30 dias
+            produto: Produto do investimento (ex: "CDB", "LCI"); produtos isentos não pagam IR
+            granularidade: Meses registrados no histórico (ver `GRANULARIDADES`);
+                o total considera sempre todos os meses
             
         Returns:
             Tupla contendo:
@@ -123,118 +214,139 @@ class CalculadoraRendimento:
         # Valida as datas
         self._validar_datas()
         
-        data_atual = self.data_inicial
-        
-        # Lista para armazenar os resultados de impostos de resgate
-        historico_impostos = []
+        rotulos = self._gerar_rotulos_meses()
+        aliquotas_ir, aliquotas_iof = self._aliquotas_por_mes(len(rotulos), considerar_ir, considerar_iof, produto)
         
-        # Total de impostos que seriam pagos no período
-        total_impostos = 0.0
+        saldos, impostos, total_impostos = self.aritmetica.serie_resgate(
+            self.valor_inicial,
+            self.aporte_mensal,
+            self.aritmetica.preparar_taxa(self.taxa_cdi_anual),
+            aliquotas_ir,
+            aliquotas_iof,
+            self._registrar(len(rotulos), granularidade)
+        )
         
-        # Controle dos dias decorridos para cálculo das alíquotas de IR e IOF
-        dias_decorridos = 0
-        
-        while data_atual <= self.data_final:
-            # Aplica o rendimento mensal
-            rendimento = self.saldo * self.taxa_cdi_mensal
-            self.saldo += rendimento
-            
-            # Arredonda o saldo para 2 casas decimais
-            self.saldo = round(self.saldo, 2)
+        if saldos:
+            self.saldo = saldos[-1]
             
-            # Calcula os dias decorridos para determinação de alíquotas
-            dias_decorridos += 30  # Aproximação - mês comercial de 30 dias
-            
-            # Calcula o lucro sobre o qual incide IR (rendimento)
-            lucro = rendimento
-            
-            # Calcula a alíquota de IR com base no prazo
-            aliquota_ir = self._calcular_aliquota_ir(dias_decorridos) if considerar_ir else 0
-            
-            # Calcula o valor do IR
-            imposto_renda = lucro * (aliquota_ir / 100) if considerar_ir else 0
-            
-            # Calcula o IOF (apenas para resgates até 30 dias)
-            iof = self._calcular_iof(dias_decorridos, lucro) if considerar_iof else 0
-            
-            # Imposto total
-            imposto_total = imposto_renda + iof
-            imposto_total = round(imposto_total, 2)
-            total_impostos += imposto_total
-            
-            # Armazena os dados do mês
-            mes_ano = data_atual.strftime('%m/%Y')
-            historico_impostos.append((
-                mes_ano,
-                self.saldo,
-                imposto_total,
-                aliquota_ir
-            ))
-            
-            # Avança para o próximo mês
-            data_atual = self._avancar_para_proximo_mes(data_atual)
-            
-            # Adiciona o aporte mensal para o próximo mês, usando a mesma lógica do método calcular
-            if data_atual <= self.data_final:
-                eh_primeiro_mes = (data_atual.month == self.data_inicial.month and 
-                               data_atual.year == self.data_inicial.year)
-                
-                if not (eh_primeiro_mes and self.valor_inicial > 0):
-                    self.saldo += self.aporte_mensal
-        
-        # Arredonda o total de impostos para 2 casas decimais
-        total_impostos = round(total_impostos, 2)
+        historico_impostos = list(zip(self._filtrar(rotulos), saldos, impostos, self._filtrar(aliquotas_ir)))
         
         return historico_impostos, total_impostos
     
-    def _calcular_aliquota_ir(self, dias_decorridos: int) -> float:
+    def calcular_completo(self, considerar_ir: bool = True, considerar_iof: bool = True,
+                          produto: Optional[str] = None, granularidade: str = "mensal") -> SerieCompleta:
         """
-        Calcula a alíquota de IR com base no tempo do investimento.
+        Calcula rendimento e impostos de resgate em uma única passada.
+        
+        O saldo segue a mesma composição de `calcular`; para cada mês são obtidos
+        o rendimento bruto, a alíquota de IR, o IOF, o imposto e o valor líquido.
         
         Args:
-            dias_decorridos: Dias decorridos desde o início do investimento
+            considerar_ir: Se deve considerar Imposto de Renda no cálculo
+            considerar_iof: Se deve considerar IOF para resgates em menos de 30 dias
+            produto: Produto do investimento (ex: "CDB", "LCI"); produtos isentos não pagam IR
+            granularidade: Meses registrados nas colunas (ver `GRANULARIDADES`);
+                os totais consideram sempre todos os meses
             
         Returns:
-            Alíquota de IR em percentual
+            Colunas mensais (mês/ano, saldo, rendimento, alíquota IR, IOF, imposto,
+            valor líquido) e totais do período
         """
-        # Alíquotas regressivas de IR para investimentos em Renda Fixa (em %)
-        if dias_decorridos <= 180:  # Até 180 dias
-            return 22.5
-        elif dias_decorridos <= 360:  # De 181 a 360 dias
-            return 20.0
-        elif dias_decorridos <= 720:  # De 361 a 720 dias
-            return 17.5
-        else:  # Acima de 720 dias
-            return 15.0
+        self._inicializar_calculo()
+        self._validar_datas()
+        
+        rotulos = self._gerar_rotulos_meses()
+        aliquotas_ir, aliquotas_iof = self._aliquotas_por_mes(len(rotulos), considerar_ir, considerar_iof, produto)
+        
+        serie = self.aritmetica.serie_completa(
+            self.valor_inicial,
+            self.aporte_mensal,
+            self.aritmetica.preparar_taxa(self.taxa_cdi_anual),
+            aliquotas_ir,
+            aliquotas_iof,
+            self._registrar(len(rotulos), granularidade)
+        )
+        
+        serie.rotulos = self._filtrar(rotulos)
+        serie.aliquotas_ir = self._filtrar(aliquotas_ir)
+        
+        self.total_rendimento = serie.total_rendimento
+        if serie.saldos:
+            self.saldo = serie.saldos[-1]
+        self.historico = list(zip(serie.rotulos, serie.saldos, serie.rendimentos))
+        
+        return serie
     
-    def _calcular_iof(self, dias_decorridos: int, rendimento: float) -> float:
+    def calcular_completo_variantes(self, taxas_cdi_anuais: List[float], isentos_ir: List[bool],
+                                   considerar_ir: bool = True,
+                                   considerar_iof: bool = True,
+                                   produtos: Optional[List[Optional[str]]] = None) -> List[SerieCompleta]:
         """
-        Calcula o IOF com base no tempo do investimento e no rendimento.
-        IOF é cobrado apenas nos primeiros 30 dias, com alíquotas regressivas.
+        Calcula o cálculo completo de várias variantes de taxa sobre o mesmo plano.
+        
+        Valor inicial, aportes, meses e faixas de IR/IOF são os desta calculadora e
+        são montados uma única vez; cada variante difere apenas na taxa anual
+        efetiva e na isenção de IR.
         
         Args:
-            dias_decorridos: Dias decorridos desde o início do investimento
-            rendimento: Rendimento sobre o qual incide o IOF
-            
+            taxas_cdi_anuais: Taxa anual efetiva (%) de cada variante
+            isentos_ir: Se cada variante é isenta de IR
+            considerar_ir: Se deve considerar Imposto de Renda no cálculo
+            considerar_iof: Se deve considerar IOF para resgates em menos de 30 dias
+            produtos: Produto de cada variante (ex: "LCI"); isenções seguem as regras tributárias
+        
         Returns:
-            Valor do IOF
+            Uma SerieCompleta por variante, com os mesmos rótulos de meses
         """
-        # IOF só é cobrado nos primeiros 30 dias
-        if dias_decorridos > 30:
-            return 0.0
+        self._inicializar_calculo()
+        self._validar_datas()
+        
+        rotulos = self._gerar_rotulos_meses()
+        aliquotas_ir, aliquotas_iof = self._aliquotas_por_mes(len(rotulos), considerar_ir, considerar_iof)
+        sem_ir = [0] * len(rotulos)
+        
+        # Alíquotas de IR por produto, montadas uma vez por produto distinto
+        por_produto = {None: aliquotas_ir}
+        for produto in produtos or []:
+            if produto not in por_produto:
+                por_produto[produto] = self._aliquotas_por_mes(len(rotulos), considerar_ir, False, produto)[0]
         
-        # Tabela regressiva de IOF
-        aliquotas_iof = [
-            96, 93, 90, 86, 83, 80, 76, 73, 70, 66, 63, 60, 56, 53, 50, 46, 
-            43, 40, 36, 33, 30, 26, 23, 20, 16, 13, 10, 6, 3, 0
+        aliquotas_ir_variantes = [
+            sem_ir if isento else por_produto[produto]
+            for isento, produto in zip(isentos_ir, produtos or [None] * len(isentos_ir))
         ]
         
-        # A posição no array é o dia - 1 (pois o array começa em 0)
-        # Limitamos a 29 para evitar acesso fora do array
-        dia_indice = min(dias_decorridos - 1, 29)
-        aliquota = aliquotas_iof[dia_indice] / 100
+        series = self.aritmetica.series_completas(
+            self.valor_inicial,
+            self.aporte_mensal,
+            [self.aritmetica.preparar_taxa(taxa) for taxa in taxas_cdi_anuais],
+            aliquotas_ir_variantes,
+            aliquotas_iof
+        )
         
-        return rendimento * aliquota
+        for serie, aliquotas_ir_variante in zip(series, aliquotas_ir_variantes):
+            serie.rotulos = rotulos
+            serie.aliquotas_ir = aliquotas_ir_variante
+        
+        return series
+    
+    def _aliquotas_por_mes(self, meses: int, considerar_ir: bool, considerar_iof: bool,
+                           produto: Optional[str] = None) -> Tuple[List[float], List[float]]:
+        """
+        Calcula as alíquotas de IR e IOF (em %) de cada mês do cálculo.
+        Usa a aproximação de mês comercial de 30 dias e as regras tributárias
+        vigentes em cada mês; alíquotas são zeradas quando o imposto não é
+        considerado ou o produto é isento.
+        """
+        regras = self.regras_tributarias or RegistroRegrasTributarias.obter()
+        return regras.aliquotas_por_mes(
+            self.data_inicial.year,
+            self.data_inicial.month,
+            meses,
+            considerar_ir=considerar_ir,
+            considerar_iof=considerar_iof,
+            produto=produto
+        )
     
     def obter_saldo_final(self) -> float:
         """Retorna o saldo final após o cálculo."""
@@ -0,0 +1,161 @@
+import math
+import os
+from typing import Container, List, Optional, Tuple
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+# Núcleos compilados habilitados (com o pacote `numba` instalado)
+HABILITADO = numba is not None and os.environ.get("NUCLEO_JIT", "1") == "1"
+
+# Constante de Veltkamp (2**27 + 1): divide um double em duas metades de até 26 bits
+_DIVISOR_VELTKAMP = 134217729.0
+
+# Acima deste valor, x * 100 não tem mais parte fracionária representável e
+# `arredondar_centavos` deixa de ser exato; o núcleo devolve o cálculo ao Python
+LIMITE_EXATO = 2.0 ** 52 / 100
+
+
+def _compilar(funcao):
+    """Compila a função com o Numba na primeira chamada (sem Numba, a função Python é mantida)"""
+    if not HABILITADO:
+        return funcao
+    return numba.njit(cache=True, nogil=True)(funcao)
+
+
+@_compilar
+def arredondar_centavos(x: float) -> float:
+    """
+    Arredonda para 2 casas com o mesmo resultado, bit a bit, de `round(x, 2)`.
+
+    O `round` do CPython arredonda o valor binário exato de x (empates para o
+    par); arredondar `x * 100` não basta, pois o produto já vem arredondado.
+    O erro do produto é recuperado exatamente (produto de Dekker) para decidir
+    os empates e os vizinhos de empate, e a divisão final por 100 é correta,
+    como a conversão decimal -> double do CPython. Válido para |x| < LIMITE_EXATO.
+    """
+    produto = x * 100.0
+    partes = _DIVISOR_VELTKAMP * x
+    alta = partes - (partes - x)
+    baixa = x - alta
+    erro = (alta * 100.0 - produto) + baixa * 100.0
+
+    inteiro = math.floor(produto)
+    fracao = produto - inteiro
+    if fracao > 0.5 or (fracao == 0.5 and (erro > 0.0 or (erro == 0.0 and inteiro % 2.0 != 0.0))):
+        inteiro += 1.0
+
+    resultado = inteiro / 100.0
+    if resultado == 0.0:
+        # round preserva o sinal do zero (round(-0.001, 2) == -0.0)
+        resultado = math.copysign(0.0, x)
+    return resultado
+
+
+@_compilar
+def _serie_resgate(valor_inicial, aporte_mensal, taxa, aliquotas_ir, aliquotas_iof,
+                   registrar, saldos, impostos):
+    """
+    Laço de `AritmeticaFloat.serie_resgate` sobre arrays, com as mesmas operações na mesma ordem.
+
+    Grava os meses marcados em `registrar` em `saldos` e `impostos` e devolve
+    (meses gravados, total de impostos arredondado), ou (-1, 0.0) se algum
+    valor sair da faixa em que o arredondamento é exato.
+    """
+    saldo = valor_inicial
+    total_impostos = 0.0
+    gravados = 0
+    ultimo_mes = len(aliquotas_ir) - 1
+
+    for mes in range(len(aliquotas_ir)):
+        rendimento = saldo * taxa
+        saldo += rendimento
+        if not abs(saldo) < LIMITE_EXATO:
+            return -1, 0.0
+        saldo = arredondar_centavos(saldo)
+
+        imposto_renda = rendimento * (aliquotas_ir[mes] / 100)
+        iof = rendimento * (aliquotas_iof[mes] / 100)
+        soma_impostos = imposto_renda + iof
+        if not abs(soma_impostos) < LIMITE_EXATO:
+            return -1, 0.0
+        imposto_total = arredondar_centavos(soma_impostos)
+        total_impostos += imposto_total
+
+        if registrar[mes]:
+            saldos[gravados] = saldo
+            impostos[gravados] = imposto_total
+            gravados += 1
+
+        if mes < ultimo_mes:
+            saldo += aporte_mensal
+
+    if not abs(total_impostos) < LIMITE_EXATO:
+        return -1, 0.0
+    return gravados, arredondar_centavos(total_impostos)
+
+
+class NucleoCompilado:
+    """
+    Núcleos compilados (Numba) para os laços que não podem ser vetorizados.
+
+    No resgate, o saldo de cada mês é arredondado antes de render no mês
+    seguinte, então a série só pode ser calculada mês a mês. Com o pacote
+    opcional `numba` instalado, esse laço roda compilado, com resultados
+    idênticos bit a bit aos do laço em Python; sem ele (ou com NUCLEO_JIT=0),
+    o laço em Python é usado. Horizontes curtos ficam no Python, onde o custo
+    de montar os arrays não compensa.
+    """
+
+    MINIMO_MESES = int(os.environ.get("NUCLEO_JIT_MINIMO_MESES", 60))
+
+    @staticmethod
+    def disponivel() -> bool:
+        """Se os núcleos compilados estão habilitados"""
+        return HABILITADO
+
+    @classmethod
+    def usar(cls, meses: int) -> bool:
+        """Se um cálculo de `meses` meses deve usar o núcleo compilado"""
+        return HABILITADO and meses >= cls.MINIMO_MESES
+
+    @classmethod
+    def compilar(cls) -> None:
+        """Compila os núcleos (ou carrega do cache em disco), para que a primeira requisição não pague a compilação"""
+        if HABILITADO:
+            cls.serie_resgate(1000.0, 100.0, 0.01, [22.5, 22.5], [96.0, 0.0], None)
+
+    @staticmethod
+    def serie_resgate(valor_inicial: float, aporte_mensal: float, taxa: float,
+                      aliquotas_ir: List[float], aliquotas_iof: List[float],
+                      registrar: Optional[Container[int]] = None
+                      ) -> Optional[Tuple[List[float], List[float], float]]:
+        """
+        Versão compilada de `AritmeticaFloat.serie_resgate` (mesmos argumentos e retorno).
+
+        Returns:
+            Tupla (saldos, impostos de cada mês, total de impostos), ou None se
+            algum valor sair da faixa exata do núcleo (o chamador usa o laço em Python)
+        """
+        import numpy as np
+
+        meses = len(aliquotas_ir)
+        if registrar is None:
+            mascara = np.ones(meses, dtype=np.bool_)
+        else:
+            mascara = np.zeros(meses, dtype=np.bool_)
+            mascara[[mes for mes in range(meses) if mes in registrar]] = True
+        saldos = np.empty(meses, dtype=np.float64)
+        impostos = np.empty(meses, dtype=np.float64)
+
+        gravados, total_impostos = _serie_resgate(
+            float(valor_inicial), float(aporte_mensal), float(taxa),
+            np.asarray(aliquotas_ir, dtype=np.float64), np.asarray(aliquotas_iof, dtype=np.float64),
+            mascara, saldos, impostos
+        )
+        if gravados < 0:
+            return None
+        return saldos[:gravados].tolist(), impostos[:gravados].tolist(), total_impostos
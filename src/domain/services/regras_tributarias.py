@@ -0,0 +1,247 @@
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from array import array
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class RegraTributaria:
+    """
+    Versão compilada das regras tributárias vigentes a partir de uma data.
+
+    As faixas do arquivo de regras são expandidas em tabelas indexadas pelo
+    número de dias decorridos: a alíquota de um mês é uma única consulta ao
+    array, sem percorrer faixas. Dias além do fim da tabela usam o último valor.
+    """
+    versao: str
+    vigente_desde: date
+    aliquotas_ir: array
+    aliquotas_iof: array
+    produtos_isentos_ir: FrozenSet[str] = field(default_factory=frozenset)
+
+    def aliquota_ir(self, dias_decorridos: int) -> float:
+        """Retorna a alíquota de IR (%) para o número de dias decorridos"""
+        tabela = self.aliquotas_ir
+        return tabela[dias_decorridos] if dias_decorridos < len(tabela) else tabela[-1]
+
+    def aliquota_iof(self, dias_decorridos: int) -> float:
+        """Retorna a alíquota de IOF (%) para o número de dias decorridos"""
+        tabela = self.aliquotas_iof
+        return tabela[dias_decorridos] if dias_decorridos < len(tabela) else tabela[-1]
+
+    def isento_ir(self, produto: Optional[str]) -> bool:
+        """Indica se o produto é isento de IR nesta versão"""
+        return produto is not None and produto.upper() in self.produtos_isentos_ir
+
+    @classmethod
+    def compilar(cls, definicao: Dict[str, Any]) -> "RegraTributaria":
+        """
+        Compila uma versão do arquivo de regras.
+
+        Formato:
+            versao: Identificação da versão
+            vigente_desde: Data (AAAA-MM-DD) a partir da qual a versão vale
+            ir: Faixas [{"ate_dias": N, "aliquota": %}, ...] em ordem crescente;
+                a última faixa tem "ate_dias": null (sem limite)
+            iof_por_dia: Alíquota de IOF (%) do dia 1 em diante; depois do
+                último dia, o IOF é zero
+            produtos_isentos_ir: Produtos sem IR (ex: ["LCI", "LCA"])
+
+        Args:
+            definicao: Versão decodificada do JSON
+
+        Returns:
+            Regra compilada
+
+        Raises:
+            ValueError: Se a definição for inválida
+        """
+        try:
+            versao = str(definicao["versao"])
+            vigente_desde = date.fromisoformat(definicao["vigente_desde"])
+            faixas_ir = definicao["ir"]
+            iof_por_dia = [float(aliquota) for aliquota in definicao.get("iof_por_dia", [])]
+            isentos = frozenset(str(produto).upper() for produto in definicao.get("produtos_isentos_ir", []))
+        except (KeyError, TypeError, ValueError) as erro:
+            raise ValueError(f"Versão de regras tributárias inválida: {erro}")
+
+        return cls(
+            versao=versao,
+            vigente_desde=vigente_desde,
+            aliquotas_ir=cls._compilar_faixas_ir(versao, faixas_ir),
+            aliquotas_iof=cls._compilar_iof(iof_por_dia),
+            produtos_isentos_ir=isentos
+        )
+
+    @staticmethod
+    def _compilar_faixas_ir(versao: str, faixas: List[Dict[str, Any]]) -> array:
+        """Expande as faixas de IR em uma alíquota por dia (0 até o último limite + 1)"""
+        if not faixas or faixas[-1].get("ate_dias") is not None:
+            raise ValueError(f"Regras {versao}: a última faixa de IR deve ter 'ate_dias' nulo")
+
+        tabela = array('d')
+        for faixa in faixas:
+            aliquota = float(faixa["aliquota"])
+            limite = faixa.get("ate_dias")
+            if limite is None:
+                # Uma posição para "acima do último limite"; dias além dela usam o último valor
+                tabela.append(aliquota)
+                break
+            if int(limite) < len(tabela):
+                raise ValueError(f"Regras {versao}: faixas de IR fora de ordem")
+            tabela.extend([aliquota] * (int(limite) + 1 - len(tabela)))
+        return tabela
+
+    @staticmethod
+    def _compilar_iof(iof_por_dia: List[float]) -> array:
+        """Monta a tabela de IOF indexada pelo dia (o dia 0 usa a alíquota do dia 1; após o último dia, zero)"""
+        if not iof_por_dia:
+            return array('d', [0.0])
+        return array('d', [iof_por_dia[0]] + iof_por_dia + [0.0])
+
+
+class RegrasTributarias:
+    """
+    Conjunto versionado de regras tributárias, ordenado por início de vigência.
+
+    A versão aplicada a um mês é a vigente na data do resgate (primeiro dia do
+    mês). Os meses de um cálculo são percorridos em ordem, então a troca de
+    versão é um avanço de ponteiro e cada mês custa uma consulta por tabela.
+    """
+
+    def __init__(self, versoes: List[RegraTributaria]):
+        if not versoes:
+            raise ValueError("As regras tributárias devem ter ao menos uma versão")
+        self.versoes = sorted(versoes, key=lambda regra: regra.vigente_desde)
+        self._inicios = [regra.vigente_desde for regra in self.versoes]
+
+    @classmethod
+    def de_dados(cls, dados: Dict[str, Any]) -> "RegrasTributarias":
+        """
+        Compila todas as versões de um arquivo de regras decodificado.
+
+        Raises:
+            ValueError: Se alguma versão for inválida
+        """
+        versoes = dados.get("versoes") if isinstance(dados, dict) else None
+        if not isinstance(versoes, list):
+            raise ValueError("O arquivo de regras tributárias deve ter a lista 'versoes'")
+        return cls([RegraTributaria.compilar(versao) for versao in versoes])
+
+    def vigente_em(self, data: date) -> RegraTributaria:
+        """
+        Retorna a versão vigente na data (a primeira versão, se a data for anterior a todas).
+        """
+        indice = bisect.bisect_right(self._inicios, data) - 1
+        return self.versoes[max(indice, 0)]
+
+    def aliquotas_por_mes(self, ano_inicial: int, mes_inicial: int, meses: int,
+                          considerar_ir: bool = True, considerar_iof: bool = True,
+                          produto: Optional[str] = None) -> Tuple[List[float], List[float]]:
+        """
+        Calcula as alíquotas de IR e IOF (em %) de cada mês de um cálculo.
+
+        Usa a aproximação de mês comercial de 30 dias (o mês k tem 30 x k dias
+        decorridos); alíquotas são zeradas quando o imposto não é considerado ou
+        o produto é isento na versão vigente no mês.
+
+        Args:
+            ano_inicial: Ano do primeiro mês
+            mes_inicial: Mês do primeiro mês (1-12)
+            meses: Quantidade de meses
+            considerar_ir: Se deve considerar Imposto de Renda
+            considerar_iof: Se deve considerar IOF
+            produto: Produto do investimento (ex: "CDB", "LCI")
+
+        Returns:
+            Tupla (alíquotas de IR, alíquotas de IOF), uma por mês
+        """
+        aliquotas_ir: List[float] = []
+        aliquotas_iof: List[float] = []
+
+        proxima = bisect.bisect_right(self._inicios, date(ano_inicial, mes_inicial, 1))
+        regra = self.versoes[max(proxima - 1, 0)]
+        ir_mes = considerar_ir and not regra.isento_ir(produto)
+
+        ano, mes = ano_inicial, mes_inicial
+        for indice in range(meses):
+            # Avança para a próxima versão quando a vigência dela começa
+            while proxima < len(self.versoes) and date(ano, mes, 1) >= self._inicios[proxima]:
+                regra = self.versoes[proxima]
+                ir_mes = considerar_ir and not regra.isento_ir(produto)
+                proxima += 1
+
+            dias = 30 * (indice + 1)
+            aliquotas_ir.append(regra.aliquota_ir(dias) if ir_mes else 0)
+            aliquotas_iof.append(regra.aliquota_iof(dias) if considerar_iof else 0)
+
+            mes += 1
+            if mes > 12:
+                mes = 1
+                ano += 1
+
+        return aliquotas_ir, aliquotas_iof
+
+
+class RegistroRegrasTributarias:
+    """
+    Regras tributárias compartilhadas pelo processo, carregadas de um arquivo JSON.
+
+    O arquivo é compilado uma vez e relido quando sua data de modificação muda
+    (verificada no máximo a cada `INTERVALO_VERIFICACAO`), de modo que uma
+    mudança na legislação é aplicada editando o arquivo, sem novo deploy. Um
+    arquivo inválido é ignorado e as últimas regras válidas continuam em uso.
+    """
+
+    ARQUIVO = os.environ.get(
+        "REGRAS_TRIBUTARIAS_ARQUIVO",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "regras_tributarias.json")
+    )
+    INTERVALO_VERIFICACAO = float(os.environ.get("REGRAS_TRIBUTARIAS_VERIFICACAO_SEGUNDOS", 60))
+
+    _regras: Optional[RegrasTributarias] = None
+    _modificado_em: Optional[float] = None
+    _verificar_apos = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def obter(cls) -> RegrasTributarias:
+        """
+        Obtém as regras compiladas, relendo o arquivo se ele tiver mudado.
+
+        Raises:
+            ValueError: Se nenhuma versão válida das regras puder ser carregada
+        """
+        agora = time.monotonic()
+        if cls._regras is not None and agora < cls._verificar_apos:
+            return cls._regras
+
+        with cls._lock:
+            if cls._regras is None or agora >= cls._verificar_apos:
+                cls._verificar_apos = agora + cls.INTERVALO_VERIFICACAO
+                cls._recarregar_se_modificado()
+            if cls._regras is None:
+                raise ValueError(f"Não foi possível carregar as regras tributárias de {cls.ARQUIVO}")
+            return cls._regras
+
+    @classmethod
+    def _recarregar_se_modificado(cls) -> None:
+        try:
+            modificado_em = os.path.getmtime(cls.ARQUIVO)
+            if cls._regras is not None and modificado_em == cls._modificado_em:
+                return
+            with open(cls.ARQUIVO, encoding="utf-8") as arquivo:
+                regras = RegrasTributarias.de_dados(json.load(arquivo))
+        except (OSError, ValueError) as erro:
+            logging.error(f"Erro ao carregar as regras tributárias de {cls.ARQUIVO}: {str(erro)}")
+            return
+
+        cls._regras = regras
+        cls._modificado_em = modificado_em
+        logging.info(f"Regras tributárias carregadas: versões {', '.join(r.versao for r in regras.versoes)}")
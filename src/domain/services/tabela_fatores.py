@@ -0,0 +1,178 @@
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+
+class TabelaFatores:
+    """
+    Tabela de fatores acumulados para uma taxa mensal.
+
+    Guarda, para cada número de meses k até o horizonte máximo:
+        - crescimento[k] = (1 + i)^k
+        - anuidade[k] = soma de (1 + i)^j para j de 1 a k (aporte no início do mês)
+
+    Com ela, o saldo de qualquer mês é obtido com duas multiplicações e uma
+    consulta, sem compor mês a mês. A forma fechada não reproduz bit a bit a
+    composição mês a mês: o saldo registrado pode diferir em até alguns
+    centavos quando o valor cai perto da metade de um centavo, e o rendimento
+    total é derivado do saldo final (ver `RegistroTabelasFatores.HABILITADO`).
+    """
+
+    def __init__(self, taxa_mensal: float, horizonte_maximo: int):
+        """
+        Constrói a tabela de fatores.
+
+        Args:
+            taxa_mensal: Taxa mensal em fração (ex: 0.011 para 1,1% a.m.)
+            horizonte_maximo: Maior número de meses coberto pela tabela
+        """
+        self.taxa_mensal = taxa_mensal
+        self.horizonte_maximo = horizonte_maximo
+
+        self.crescimento = array('d', [1.0])
+        self.anuidade = array('d', [0.0])
+        fator = 1.0 + taxa_mensal
+        for _ in range(horizonte_maximo):
+            proximo = self.crescimento[-1] * fator
+            self.crescimento.append(proximo)
+            self.anuidade.append(self.anuidade[-1] + proximo)
+
+    def cobre(self, meses: int) -> bool:
+        """Indica se a tabela alcança o número de meses informado"""
+        return 0 <= meses <= self.horizonte_maximo
+
+    def saldo(self, meses: int, valor_inicial: float, aporte_mensal: float) -> float:
+        """
+        Calcula o saldo após um número de meses.
+
+        Segue a regra da calculadora: o aporte é feito no início de cada mês,
+        exceto no primeiro mês quando há valor inicial.
+
+        Args:
+            meses: Número de meses decorridos (1 = fim do primeiro mês)
+            valor_inicial: Valor inicial do investimento
+            aporte_mensal: Valor aportado mensalmente
+
+        Returns:
+            Saldo ao fim do mês informado
+        """
+        if valor_inicial > 0:
+            return valor_inicial * self.crescimento[meses] + aporte_mensal * self.anuidade[meses - 1]
+        return aporte_mensal * self.anuidade[meses]
+
+
+class RegistroTabelasFatores:
+    """
+    Registro de tabelas de fatores compartilhado pelo processo.
+
+    As tabelas são indexadas por (taxa CDI anual, percentual sobre CDI) e
+    mantidas em uma política LRU limitada a `MAXIMO_TABELAS` entradas.
+    Quando a taxa CDI é atualizada, as tabelas da taxa anterior são
+    descartadas e as dos percentuais mais usados são reconstruídas.
+
+    Desabilitado por padrão (TABELA_FATORES_HABILITADO=1 habilita): com as
+    tabelas, os valores deixam de ser idênticos aos do laço mês a mês.
+    """
+
+    HABILITADO = os.environ.get("TABELA_FATORES_HABILITADO", "0") == "1"
+    HORIZONTE_MAXIMO_MESES = int(os.environ.get("TABELA_FATORES_HORIZONTE_MESES", 1200))
+    MAXIMO_TABELAS = int(os.environ.get("TABELA_FATORES_MAXIMO", 64))
+    PERCENTUAIS_PRE_CALCULADOS: Tuple[float, ...] = (100.0, 110.0, 120.0)
+
+    _tabelas: "OrderedDict[Tuple[float, float], TabelaFatores]" = OrderedDict()
+    _lock = threading.Lock()
+    # Taxa CDI da última reconstrução
+    _taxa_reconstruida: Optional[float] = None
+
+    @staticmethod
+    def taxa_mensal(taxa_cdi_anual: float, percentual_sobre_cdi: float) -> float:
+        """
+        Calcula a taxa mensal efetiva com a mesma aritmética dos casos de uso,
+        garantindo que a tabela corresponda exatamente à taxa da calculadora.
+        """
+        taxa_efetiva = taxa_cdi_anual * (percentual_sobre_cdi / 100.0)
+        return taxa_efetiva / 100 / 12
+
+    @classmethod
+    def obter(cls, taxa_cdi_anual: float, percentual_sobre_cdi: float) -> Optional[TabelaFatores]:
+        """
+        Obtém (ou constrói) a tabela para a taxa efetiva informada.
+
+        Args:
+            taxa_cdi_anual: Taxa CDI anual em percentual
+            percentual_sobre_cdi: Percentual sobre o CDI
+
+        Returns:
+            Tabela de fatores, ou None se o registro estiver desativado
+        """
+        if not cls.ativo():
+            return None
+
+        chave = (taxa_cdi_anual, percentual_sobre_cdi)
+        with cls._lock:
+            tabela = cls._tabelas.get(chave)
+            if tabela is not None:
+                cls._tabelas.move_to_end(chave)
+                return tabela
+
+        # Constrói fora do lock; uma construção duplicada ocasional é inofensiva
+        tabela = TabelaFatores(
+            cls.taxa_mensal(taxa_cdi_anual, percentual_sobre_cdi),
+            cls.HORIZONTE_MAXIMO_MESES
+        )
+        with cls._lock:
+            cls._tabelas[chave] = tabela
+            cls._tabelas.move_to_end(chave)
+            while len(cls._tabelas) > cls.MAXIMO_TABELAS:
+                cls._tabelas.popitem(last=False)
+        return tabela
+
+    @classmethod
+    def reconstruir(cls, taxa_cdi_anual: float,
+                    percentuais: Optional[Iterable[float]] = None) -> None:
+        """
+        Reconstrói as tabelas para uma nova taxa CDI.
+
+        Descarta as tabelas de outras taxas CDI e pré-calcula as dos
+        percentuais mais usados.
+
+        Args:
+            taxa_cdi_anual: Nova taxa CDI anual em percentual
+            percentuais: Percentuais sobre o CDI a pré-calcular
+        """
+        with cls._lock:
+            for chave in [chave for chave in cls._tabelas if chave[0] != taxa_cdi_anual]:
+                del cls._tabelas[chave]
+
+        for percentual in percentuais or cls.PERCENTUAIS_PRE_CALCULADOS:
+            cls.obter(taxa_cdi_anual, percentual)
+        cls._taxa_reconstruida = taxa_cdi_anual
+
+    @classmethod
+    def prontas(cls, taxa_cdi_anual: float) -> bool:
+        """
+        Verifica se as tabelas dos percentuais pré-calculados já foram construídas para a taxa.
+
+        Considera a última reconstrução, e não as tabelas presentes: uma tabela
+        descartada pela política LRU é reconstruída na próxima consulta.
+
+        Args:
+            taxa_cdi_anual: Taxa CDI anual em percentual
+
+        Returns:
+            True se a última reconstrução foi dessa taxa (ou se o registro estiver desativado)
+        """
+        return not cls.ativo() or cls._taxa_reconstruida == taxa_cdi_anual
+
+    @classmethod
+    def ativo(cls) -> bool:
+        """Se as tabelas são usadas: habilitadas e com espaço para ao menos uma tabela"""
+        return cls.HABILITADO and cls.MAXIMO_TABELAS > 0
+
+    @classmethod
+    def quantidade(cls) -> int:
+        """Retorna o número de tabelas em memória"""
+        with cls._lock:
+            return len(cls._tabelas)
@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(frozen=True)
+class CotacaoCDI:
+    """
+    Objeto de valor com a taxa CDI anual e os metadados da sua obtenção.
+
+    O campo `stale` indica que o valor não está dentro da validade do cache
+    (último valor conhecido enquanto a atualização ocorre, ou valor padrão
+    quando a API do Banco Central está indisponível).
+    """
+    valor: float
+    data_atualizacao: datetime
+    fonte: str = "Banco Central do Brasil"
+    stale: bool = False
@@ -0,0 +1,83 @@
+from array import array
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class SerieIPCA:
+    """
+    Objeto de valor com a variação mensal do IPCA (%) indexada por mês.
+
+    `variacoes[0]` é a variação de (ano_inicial, mes_inicial) e cada posição
+    seguinte é o mês seguinte, sem lacunas; o mês de uma posição é obtido por
+    aritmética, sem guardar datas.
+    """
+    ano_inicial: int
+    mes_inicial: int
+    variacoes: array = field(default_factory=lambda: array('d'))
+
+    def _indice(self, ano: int, mes: int) -> int:
+        return (ano - self.ano_inicial) * 12 + mes - self.mes_inicial
+
+    @property
+    def ultimo_mes(self) -> Optional[Tuple[int, int]]:
+        """Retorna (ano, mês) da última variação conhecida, ou None se a série estiver vazia"""
+        if not self.variacoes:
+            return None
+        indice = self.mes_inicial - 1 + len(self.variacoes) - 1
+        return self.ano_inicial + indice // 12, indice % 12 + 1
+
+    def variacao(self, ano: int, mes: int) -> Optional[float]:
+        """Retorna a variação (%) do mês, ou None se o mês não estiver na série"""
+        indice = self._indice(ano, mes)
+        if 0 <= indice < len(self.variacoes):
+            return self.variacoes[indice]
+        return None
+
+    def media_recente(self, meses: int = 12) -> Optional[float]:
+        """
+        Calcula a variação mensal média (geométrica) dos últimos meses da série.
+
+        Args:
+            meses: Quantidade de meses considerados
+
+        Returns:
+            Variação mensal média em percentual, ou None se a série estiver vazia
+        """
+        recentes = self.variacoes[-meses:]
+        if not recentes:
+            return None
+        fator = 1.0
+        for variacao in recentes:
+            fator *= 1 + variacao / 100
+        return (fator ** (1 / len(recentes)) - 1) * 100
+
+    def fatores_acumulados(self, ano: int, mes: int, meses: int, projecao_mensal: float) -> array:
+        """
+        Calcula a inflação acumulada desde o mês inicial do cálculo até cada mês.
+
+        O fator do mês k é o produto de (1 + IPCA/100) dos meses 1..k, de modo que
+        valor real = valor nominal / fator, em moeda do início do cálculo. Meses
+        ainda não divulgados usam `projecao_mensal`.
+
+        Args:
+            ano: Ano do primeiro mês do cálculo
+            mes: Mês do primeiro mês do cálculo
+            meses: Quantidade de meses do cálculo
+            projecao_mensal: Variação mensal (%) usada fora da série
+
+        Returns:
+            array('d') com um fator acumulado por mês
+        """
+        fatores = array('d')
+        fator = 1.0
+        indice = self._indice(ano, mes)
+        tamanho = len(self.variacoes)
+
+        for deslocamento in range(meses):
+            atual = indice + deslocamento
+            variacao = self.variacoes[atual] if 0 <= atual < tamanho else projecao_mensal
+            fator *= 1 + variacao / 100
+            fatores.append(fator)
+
+        return fatores
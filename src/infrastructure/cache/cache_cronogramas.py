@@ -0,0 +1,83 @@
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from src.domain.entities.cronograma import Cronograma
+
+
+class CacheCronogramas:
+    """
+    Cache de cronogramas calculados, compartilhado pelo processo.
+
+    Cada cronograma fica disponível sob um handle opaco até expirar
+    (`TTL_SEGUNDOS` a partir da criação). O número de cronogramas é limitado
+    (`MAXIMO`); acima dele os menos usados recentemente são descartados.
+    """
+
+    TTL_SEGUNDOS = int(os.environ.get("CRONOGRAMA_TTL_SEGUNDOS", 900))
+    MAXIMO = int(os.environ.get("CRONOGRAMA_MAXIMO", 256))
+
+    # handle -> (cronograma, expiração em time.monotonic(), expiração em data/hora)
+    _cronogramas: "OrderedDict[str, Tuple[Cronograma, float, datetime]]" = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def armazenar(cls, cronograma: Cronograma) -> Tuple[str, datetime]:
+        """
+        Armazena um cronograma e gera o seu handle.
+
+        Args:
+            cronograma: Cronograma calculado
+
+        Returns:
+            Tupla (handle, data/hora de expiração)
+        """
+        handle = secrets.token_urlsafe(16)
+        expira_em = datetime.now() + timedelta(seconds=cls.TTL_SEGUNDOS)
+
+        with cls._lock:
+            cls._remover_expirados()
+            cls._cronogramas[handle] = (cronograma, time.monotonic() + cls.TTL_SEGUNDOS, expira_em)
+            while len(cls._cronogramas) > cls.MAXIMO:
+                cls._cronogramas.popitem(last=False)
+
+        return handle, expira_em
+
+    @classmethod
+    def obter(cls, handle: str) -> Optional[Cronograma]:
+        """
+        Obtém o cronograma de um handle.
+
+        Args:
+            handle: Handle retornado por `armazenar`
+
+        Returns:
+            Cronograma ou None se o handle não existir ou tiver expirado
+        """
+        with cls._lock:
+            item = cls._cronogramas.get(handle)
+            if item is None:
+                return None
+            if item[1] <= time.monotonic():
+                del cls._cronogramas[handle]
+                return None
+            cls._cronogramas.move_to_end(handle)
+            return item[0]
+
+    @classmethod
+    def quantidade(cls) -> int:
+        """Retorna quantos cronogramas estão em memória"""
+        with cls._lock:
+            return len(cls._cronogramas)
+
+    @classmethod
+    def _remover_expirados(cls) -> None:
+        """Descarta os cronogramas expirados (chamado com o lock adquirido)"""
+        agora = time.monotonic()
+        expirados = [handle for handle, item in cls._cronogramas.items() if item[1] <= agora]
+        for handle in expirados:
+            del cls._cronogramas[handle]
@@ -0,0 +1,150 @@
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, Optional
+
+
+class CenariosMaterializados:
+    """
+    Respostas pré-serializadas dos cenários mais pedidos, compartilhadas pelo processo.
+
+    Guarda a frequência de cada cenário (combinação de parâmetros, sem a taxa
+    CDI) e o corpo JSON dos cenários materializados, todos calculados com a
+    mesma taxa CDI e no mesmo mês de referência (os rótulos dos meses partem
+    do mês atual). Um cenário só é servido se a taxa e o mês da requisição
+    forem os da materialização; caso contrário a consulta conta como falta
+    ou, se a materialização é de uma taxa ou mês anterior, como desatualizada.
+
+    As frequências são reduzidas à metade a cada materialização (os cenários
+    populares de ontem perdem peso) e quando o número de cenários distintos
+    passa de `MAXIMO_CHAVES`, descartando os que chegam a zero.
+    """
+
+    MAXIMO_CHAVES = int(os.environ.get("MATERIALIZACAO_MAXIMO_CHAVES", 4096))
+
+    _frequencias: Counter = Counter()
+    # chave do cenário -> corpo JSON da resposta
+    _cenarios: Dict[Hashable, bytes] = {}
+    _taxa: Optional[float] = None
+    _mes: Optional[str] = None
+    _materializado_em: Optional[datetime] = None
+    _materializado_monotonic: Optional[float] = None
+    _acertos = 0
+    _faltas = 0
+    _desatualizadas = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def registrar_acesso(cls, chave: Hashable) -> None:
+        """Conta uma requisição do cenário"""
+        with cls._lock:
+            cls._frequencias[chave] += 1
+            if len(cls._frequencias) > cls.MAXIMO_CHAVES:
+                cls._envelhecer()
+
+    @classmethod
+    def mais_frequentes(cls, quantidade: int) -> List[Hashable]:
+        """
+        Retorna os cenários mais pedidos e reduz as frequências à metade.
+
+        Args:
+            quantidade: Número máximo de cenários
+
+        Returns:
+            Chaves dos cenários, do mais para o menos pedido
+        """
+        with cls._lock:
+            chaves = [chave for chave, _ in cls._frequencias.most_common(quantidade)]
+            cls._envelhecer()
+        return chaves
+
+    @classmethod
+    def obter(cls, chave: Hashable, taxa_cdi_anual: float, mes: str,
+              taxa_atual: Optional[float]) -> Optional[bytes]:
+        """
+        Obtém o corpo materializado de um cenário e contabiliza o resultado da consulta.
+
+        Args:
+            chave: Chave do cenário
+            taxa_cdi_anual: Taxa CDI da requisição
+            mes: Mês de referência da requisição ("AAAA-MM")
+            taxa_atual: Taxa CDI vigente, para distinguir uma materialização
+                desatualizada de uma taxa informada pelo cliente
+
+        Returns:
+            Corpo JSON da resposta, ou None se o cenário não estiver materializado para a taxa e o mês
+        """
+        with cls._lock:
+            corpo = cls._cenarios.get(chave)
+            if corpo is not None and taxa_cdi_anual == cls._taxa and mes == cls._mes:
+                cls._acertos += 1
+                return corpo
+            if corpo is not None and taxa_cdi_anual == taxa_atual:
+                cls._desatualizadas += 1
+            else:
+                cls._faltas += 1
+            return None
+
+    @classmethod
+    def substituir(cls, cenarios: Dict[Hashable, bytes], taxa_cdi_anual: float, mes: str) -> None:
+        """
+        Troca os cenários materializados de uma só vez.
+
+        Args:
+            cenarios: Corpo JSON de cada cenário
+            taxa_cdi_anual: Taxa CDI usada nos cálculos
+            mes: Mês de referência dos cálculos ("AAAA-MM")
+        """
+        with cls._lock:
+            cls._cenarios = cenarios
+            cls._taxa = taxa_cdi_anual
+            cls._mes = mes
+            cls._materializado_em = datetime.now()
+            cls._materializado_monotonic = time.monotonic()
+
+    @classmethod
+    def referencia(cls) -> Optional[str]:
+        """Mês de referência da materialização atual ("AAAA-MM"), ou None se nada foi materializado"""
+        return cls._mes
+
+    @classmethod
+    def estatisticas(cls, taxa_atual: Optional[float], mes: str) -> Dict[str, Any]:
+        """
+        Taxa de acerto e frescor da materialização.
+
+        Args:
+            taxa_atual: Taxa CDI vigente (None se desconhecida)
+            mes: Mês de referência atual ("AAAA-MM")
+
+        Returns:
+            Contadores de consultas, taxa de acerto, taxa e mês da materialização,
+            idade em segundos e se ela está desatualizada em relação à taxa ou ao mês
+        """
+        with cls._lock:
+            consultas = cls._acertos + cls._faltas + cls._desatualizadas
+            materializado = cls._materializado_em is not None
+            return {
+                "cenarios": len(cls._cenarios),
+                "cenarios_observados": len(cls._frequencias),
+                "consultas": consultas,
+                "acertos": cls._acertos,
+                "faltas": cls._faltas,
+                "desatualizadas": cls._desatualizadas,
+                "taxa_acerto": round(cls._acertos / consultas, 4) if consultas else None,
+                "taxa_cdi_materializada": cls._taxa,
+                "taxa_cdi_atual": taxa_atual,
+                "mes_referencia": cls._mes,
+                "materializado_em": cls._materializado_em.isoformat() if materializado else None,
+                "idade_segundos": (round(time.monotonic() - cls._materializado_monotonic, 1)
+                                   if materializado else None),
+                "desatualizado": materializado and (cls._taxa != taxa_atual or cls._mes != mes),
+            }
+
+    @classmethod
+    def _envelhecer(cls) -> None:
+        """Reduz as frequências à metade e descarta as zeradas (chamado com o lock adquirido)"""
+        cls._frequencias = Counter({
+            chave: contagem // 2 for chave, contagem in cls._frequencias.items() if contagem > 1
+        })
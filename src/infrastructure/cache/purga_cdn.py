@@ -0,0 +1,80 @@
+import logging
+import os
+import threading
+from typing import List, Optional
+
+import requests
+
+
+class PurgaCDN:
+    """
+    Gancho de purga do cache da CDN/proxy reverso.
+
+    As respostas dos GETs de cálculo levam a chave `cdi-<taxa>` no cabeçalho
+    Surrogate-Key. Quando a taxa CDI muda, as respostas calculadas com a taxa
+    anterior são invalidadas com um POST em `URL` com o corpo
+    `{"surrogate_keys": ["cdi-<taxa anterior>"]}` (e o token em
+    `Authorization: Bearer`, se configurado). Sem `URL`, a purga é apenas
+    registrada no log e as respostas expiram pelo `s-maxage`.
+    """
+
+    URL = os.environ.get("CDN_PURGA_URL", "")
+    TOKEN = os.environ.get("CDN_PURGA_TOKEN", "")
+    TIMEOUT_SEGUNDOS = float(os.environ.get("CDN_PURGA_TIMEOUT_SEGUNDOS", 5))
+
+    _taxa_anterior: Optional[float] = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def chave_cdi(taxa_cdi_anual: float) -> str:
+        """Surrogate key das respostas calculadas com a taxa CDI informada"""
+        return f"cdi-{taxa_cdi_anual:.2f}"
+
+    @classmethod
+    def notificar_cdi(cls, taxa_cdi_anual: float) -> None:
+        """
+        Observador do CDIService: purga as respostas da taxa anterior quando a taxa muda.
+
+        A purga é enviada em segundo plano, sem atrasar a atualização do CDI.
+
+        Args:
+            taxa_cdi_anual: Taxa CDI anual atualizada
+        """
+        with cls._lock:
+            anterior, cls._taxa_anterior = cls._taxa_anterior, taxa_cdi_anual
+        if anterior is None or cls.chave_cdi(anterior) == cls.chave_cdi(taxa_cdi_anual):
+            return
+
+        chaves = [cls.chave_cdi(anterior)]
+        threading.Thread(target=cls.purgar, args=(chaves,), name="purga-cdn", daemon=True).start()
+
+    @classmethod
+    def purgar(cls, chaves: List[str]) -> bool:
+        """
+        Solicita a purga das respostas marcadas com as surrogate keys.
+
+        Args:
+            chaves: Surrogate keys a invalidar
+
+        Returns:
+            True se a purga foi aceita (ou não há CDN configurada), False em caso de falha
+        """
+        if not cls.URL:
+            logging.info(f"Purga de cache sem CDN configurada (CDN_PURGA_URL): {' '.join(chaves)}")
+            return True
+
+        cabecalhos = {"Authorization": f"Bearer {cls.TOKEN}"} if cls.TOKEN else {}
+        try:
+            resposta = requests.post(
+                cls.URL,
+                json={"surrogate_keys": chaves},
+                headers=cabecalhos,
+                timeout=cls.TIMEOUT_SEGUNDOS
+            )
+            resposta.raise_for_status()
+        except requests.RequestException as erro:
+            logging.error(f"Falha ao purgar o cache da CDN ({' '.join(chaves)}): {str(erro)}")
+            return False
+
+        logging.info(f"Cache da CDN purgado: {' '.join(chaves)}")
+        return True
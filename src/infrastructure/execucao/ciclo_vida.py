@@ -0,0 +1,66 @@
+import logging
+import os
+import threading
+from typing import Optional
+
+
+class CicloVida:
+    """
+    Estado do ciclo de vida do processo, usado pelas sondas de saúde.
+
+    - Aquecido: a rotina de aquecimento da inicialização terminou (caches
+      preenchidos e caminhos de cálculo exercitados).
+    - Encerrando: o processo recebeu SIGTERM e está drenando as conexões;
+      a sonda de prontidão passa a responder 503 para que o balanceador
+      deixe de enviar tráfego antes de o servidor fechar o socket.
+    """
+
+    # Tempo entre o SIGTERM e o fechamento do socket, para o balanceador perceber a prontidão 503
+    ATRASO_DRENAGEM_SEGUNDOS = float(os.environ.get("DRENAGEM_ATRASO_SEGUNDOS", 5))
+    # Tempo máximo para as requisições em andamento terminarem depois do fechamento do socket
+    TIMEOUT_DRENAGEM_SEGUNDOS = int(os.environ.get("DRENAGEM_TIMEOUT_SEGUNDOS", 30))
+
+    _aquecido = threading.Event()
+    _encerrando = threading.Event()
+    _erro_aquecimento: Optional[str] = None
+
+    @classmethod
+    def aquecido(cls) -> bool:
+        """Se a rotina de aquecimento já terminou"""
+        return cls._aquecido.is_set()
+
+    @classmethod
+    def encerrando(cls) -> bool:
+        """Se o processo está drenando as conexões para encerrar"""
+        return cls._encerrando.is_set()
+
+    @classmethod
+    def erro_aquecimento(cls) -> Optional[str]:
+        """Mensagem do erro ocorrido no aquecimento, se houver"""
+        return cls._erro_aquecimento
+
+    @classmethod
+    def marcar_aquecido(cls, erro: Optional[str] = None) -> None:
+        """
+        Registra o fim da rotina de aquecimento.
+
+        Args:
+            erro: Mensagem de erro, se o aquecimento falhou (a instância fica pronta
+                mesmo assim: o aquecimento só antecipa trabalho que as requisições fariam)
+        """
+        cls._erro_aquecimento = erro
+        cls._aquecido.set()
+
+    @classmethod
+    def iniciar_encerramento(cls) -> bool:
+        """
+        Marca o início do encerramento (prontidão passa a responder 503).
+
+        Returns:
+            True na primeira chamada; False se o encerramento já tinha começado
+        """
+        if cls._encerrando.is_set():
+            return False
+        cls._encerrando.set()
+        logging.info("Encerramento iniciado: prontidão indisponível, drenando conexões")
+        return True
@@ -0,0 +1,117 @@
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class ExecutorSaturadoError(Exception):
+    """Lançada quando o pool de cálculos e sua fila de espera estão cheios"""
+
+
+class ExecutorCalculos:
+    """
+    Camada de execução dos cálculos fora do event loop.
+
+    Cálculos baratos (custo até `LIMITE_CUSTO_INLINE`) rodam diretamente no
+    handler; os demais vão para um pool limitado de threads ou processos. Há no
+    máximo `TRABALHADORES + LIMITE_FILA` cálculos pendentes: acima disso a
+    chamada é rejeitada com `ExecutorSaturadoError`, para que a API responda 503
+    em vez de acumular requisições e travar o `/health`.
+    """
+
+    TIPO = os.environ.get("EXECUTOR_TIPO", "thread")  # "thread" ou "processo"
+    TRABALHADORES = int(os.environ.get("EXECUTOR_TRABALHADORES", os.cpu_count() or 1))
+    LIMITE_FILA = int(os.environ.get("EXECUTOR_LIMITE_FILA", 32))
+    LIMITE_CUSTO_INLINE = int(os.environ.get("EXECUTOR_LIMITE_CUSTO_INLINE", 120))
+
+    _pool: Optional[Executor] = None
+    _pendentes = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def _obter_pool(cls) -> Executor:
+        """Cria o pool na primeira utilização"""
+        with cls._lock:
+            if cls._pool is None:
+                if cls.TIPO == "processo":
+                    cls._pool = ProcessPoolExecutor(max_workers=cls.TRABALHADORES)
+                else:
+                    cls._pool = ThreadPoolExecutor(
+                        max_workers=cls.TRABALHADORES,
+                        thread_name_prefix="calculo"
+                    )
+            return cls._pool
+
+    @classmethod
+    def _reservar_vaga(cls) -> None:
+        with cls._lock:
+            if cls._pendentes >= cls.TRABALHADORES + cls.LIMITE_FILA:
+                raise ExecutorSaturadoError(
+                    "Servidor sobrecarregado: muitos cálculos em andamento. Tente novamente em instantes."
+                )
+            cls._pendentes += 1
+
+    @classmethod
+    def _liberar_vaga(cls) -> None:
+        with cls._lock:
+            cls._pendentes -= 1
+
+    @classmethod
+    async def executar(cls, funcao: Callable[..., Any], *args: Any, custo: int = 0) -> Any:
+        """
+        Executa a função inline ou no pool, conforme o custo estimado.
+
+        Args:
+            funcao: Função a executar (deve ser serializável no modo "processo")
+            *args: Argumentos da função
+            custo: Custo estimado do cálculo (ver EstimadorCusto)
+
+        Returns:
+            Resultado da função
+
+        Raises:
+            ExecutorSaturadoError: Se não houver vaga no pool nem na fila
+        """
+        if custo <= cls.LIMITE_CUSTO_INLINE:
+            return funcao(*args)
+
+        cls._reservar_vaga()
+        try:
+            futuro = cls._obter_pool().submit(functools.partial(funcao, *args))
+        except BaseException:
+            cls._liberar_vaga()
+            raise
+        # A vaga é liberada quando o trabalho termina no pool, e não quando quem
+        # aguarda desiste: um cálculo cancelado continua ocupando o trabalhador
+        futuro.add_done_callback(lambda _: cls._liberar_vaga())
+        return await asyncio.wrap_future(futuro)
+
+    @classmethod
+    def aquecer(cls, funcao: Callable[[], Any]) -> None:
+        """
+        Cria o pool e executa a função uma vez por trabalhador, para que o
+        primeiro cálculo real não pague a criação dos processos/threads nem
+        a importação dos módulos de cálculo.
+
+        Args:
+            funcao: Função sem argumentos (deve ser serializável no modo "processo")
+        """
+        pool = cls._obter_pool()
+        for futuro in [pool.submit(funcao) for _ in range(cls.TRABALHADORES)]:
+            futuro.result()
+
+    @classmethod
+    def pendentes(cls) -> int:
+        """Retorna quantos cálculos estão em execução ou na fila do pool"""
+        with cls._lock:
+            return cls._pendentes
+
+    @classmethod
+    def encerrar(cls) -> None:
+        """Aguarda os cálculos em andamento e encerra o pool"""
+        with cls._lock:
+            pool, cls._pool = cls._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
@@ -0,0 +1,94 @@
+import os
+from typing import Any, Dict, Sequence
+
+from src.infrastructure.exportacao.escritores import Bloco, Coluna, FormatoIndisponivelError
+
+
+class SerializadorMsgPack:
+    """
+    Serializa respostas da API em MessagePack (mesma estrutura do JSON).
+
+    Requer o pacote opcional `msgpack`.
+    """
+
+    MEDIA_TYPE = "application/msgpack"
+
+    @staticmethod
+    def disponivel() -> bool:
+        try:
+            import msgpack  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    @staticmethod
+    def serializar(dados: Any) -> bytes:
+        """
+        Serializa dados já convertidos para tipos JSON (ver `jsonable_encoder`).
+
+        Raises:
+            FormatoIndisponivelError: Se o pacote `msgpack` não estiver instalado
+        """
+        try:
+            import msgpack
+        except ImportError:
+            raise FormatoIndisponivelError("MessagePack indisponível: instale o pacote 'msgpack'")
+        return msgpack.packb(dados, use_bin_type=True)
+
+
+class SerializadorArrow:
+    """
+    Serializa colunas em um stream Arrow IPC (um record batch), que o
+    consumidor carrega sem cópia em um DataFrame (pyarrow, pandas, polars).
+
+    Os valores de resumo do cálculo vão nos metadados do esquema. Requer o
+    pacote opcional `pyarrow`.
+    """
+
+    MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+    # Compressão dos buffers ("lz4", "zstd" ou vazio para nenhuma)
+    COMPRESSAO = os.environ.get("ARROW_COMPRESSAO", "")
+
+    @staticmethod
+    def disponivel() -> bool:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    @classmethod
+    def serializar(cls, colunas: Sequence[Coluna], bloco: Bloco, metadados: Dict[str, Any]) -> bytes:
+        """
+        Serializa um bloco de colunas.
+
+        Args:
+            colunas: Colunas (nome, tipo), na ordem de saída
+            bloco: Valores de cada coluna
+            metadados: Valores de resumo, gravados como texto nos metadados do esquema
+
+        Returns:
+            Stream Arrow IPC
+
+        Raises:
+            FormatoIndisponivelError: Se o pacote `pyarrow` não estiver instalado
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise FormatoIndisponivelError("Arrow indisponível: instale o pacote 'pyarrow'")
+
+        tipos = {"int": pa.int32(), "float": pa.float64(), "str": pa.string()}
+        esquema = pa.schema(
+            [(nome, tipos[tipo]) for nome, tipo in colunas],
+            metadata={chave: str(valor) for chave, valor in metadados.items() if valor is not None}
+        )
+        lote = pa.record_batch([pa.array(bloco[nome], type=esquema.field(nome).type) for nome, _ in colunas],
+                               schema=esquema)
+
+        saida = pa.BufferOutputStream()
+        opcoes = pa.ipc.IpcWriteOptions(compression=cls.COMPRESSAO or None)
+        with pa.ipc.new_stream(saida, esquema, options=opcoes) as escritor:
+            escritor.write_batch(lote)
+        return saida.getvalue().to_pybytes()
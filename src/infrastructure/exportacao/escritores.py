@@ -0,0 +1,190 @@
+import csv
+import io
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+
+# Bloco de linhas em colunas: nome da coluna -> valores (todas as listas com o mesmo tamanho)
+Bloco = Dict[str, List[Any]]
+
+# Coluna de saída: (nome, tipo), com tipo "int", "float" ou "str"
+Coluna = Tuple[str, str]
+
+
+class FormatoIndisponivelError(Exception):
+    """Lançada quando o pacote opcional necessário para um formato não está instalado"""
+
+
+def criar_escritor(formato: str, dialeto_csv: str = "excel_br"):
+    """
+    Cria o escritor de um formato de exportação.
+
+    Args:
+        formato: "csv", "xlsx" ou "parquet"
+        dialeto_csv: Dialeto usado no formato CSV
+
+    Returns:
+        EscritorCSV (método `gerar`), EscritorXLSX ou EscritorParquet (método `escrever`)
+
+    Raises:
+        ValueError: Se o formato for desconhecido
+    """
+    if formato == "csv":
+        return EscritorCSV(dialeto_csv)
+    if formato == "xlsx":
+        return EscritorXLSX()
+    if formato == "parquet":
+        return EscritorParquet()
+    raise ValueError(f"Formato de exportação inválido: {formato}. Use 'csv', 'xlsx' ou 'parquet'.")
+
+
+class EscritorCSV:
+    """
+    Gera CSV em pedaços, um por bloco, para envio em streaming.
+
+    Dialetos:
+        - "excel_br": separador ';', vírgula decimal e BOM UTF-8 (abre direto no Excel em português)
+        - "rfc4180": separador ',' e ponto decimal
+    """
+
+    DIALETOS = ("excel_br", "rfc4180")
+    # O Response do Starlette acrescenta "; charset=utf-8" aos tipos text/*
+    MEDIA_TYPE = "text/csv"
+    EXTENSAO = "csv"
+
+    def __init__(self, dialeto: str = "excel_br"):
+        if dialeto not in self.DIALETOS:
+            raise ValueError(f"Dialeto de CSV inválido: {dialeto}. Use 'excel_br' ou 'rfc4180'.")
+        self.dialeto = dialeto
+
+    def gerar(self, colunas: Sequence[Coluna], blocos: Iterable[Bloco]) -> Iterator[str]:
+        """
+        Gera o CSV: o cabeçalho e depois o texto de cada bloco.
+
+        Args:
+            colunas: Colunas (nome, tipo), na ordem de saída
+            blocos: Blocos de linhas (consumidos sob demanda)
+
+        Yields:
+            Pedaços do arquivo CSV
+        """
+        yield self.cabecalho(colunas)
+        for bloco in blocos:
+            yield self.texto(colunas, bloco)
+
+    def cabecalho(self, colunas: Sequence[Coluna]) -> str:
+        """Início do arquivo: o BOM (no dialeto "excel_br") e a linha com os nomes das colunas"""
+        buffer, escritor = self._criar_escritor()
+        escritor.writerow([nome for nome, _ in colunas])
+        return ("\ufeff" if self.dialeto == "excel_br" else "") + buffer.getvalue()
+
+    def texto(self, colunas: Sequence[Coluna], bloco: Bloco) -> str:
+        """Linhas de um bloco em CSV"""
+        buffer, escritor = self._criar_escritor()
+        valores = []
+        for nome, tipo in colunas:
+            if self.dialeto == "excel_br" and tipo == "float":
+                valores.append([str(valor).replace(".", ",") for valor in bloco[nome]])
+            else:
+                valores.append(bloco[nome])
+        escritor.writerows(zip(*valores))
+        return buffer.getvalue()
+
+    def _criar_escritor(self):
+        buffer = io.StringIO()
+        separador = ";" if self.dialeto == "excel_br" else ","
+        return buffer, csv.writer(buffer, delimiter=separador, lineterminator="\r\n")
+
+
+class EscritorXLSX:
+    """
+    Escreve XLSX com o modo write-only do openpyxl (linhas gravadas em disco à
+    medida que são adicionadas, sem manter a planilha em memória).
+    """
+
+    MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    EXTENSAO = "xlsx"
+    NOME_PLANILHA = "Cronograma"
+
+    @staticmethod
+    def verificar_disponivel() -> None:
+        """
+        Raises:
+            FormatoIndisponivelError: Se o pacote `openpyxl` não estiver instalado
+        """
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            raise FormatoIndisponivelError("Exportação XLSX indisponível: instale o pacote 'openpyxl'")
+
+    def escrever(self, caminho: str, colunas: Sequence[Coluna], blocos: Iterable[Bloco]) -> None:
+        """
+        Escreve os blocos em uma planilha.
+
+        Args:
+            caminho: Arquivo de destino
+            colunas: Colunas (nome, tipo), na ordem de saída
+            blocos: Blocos de linhas (consumidos sob demanda)
+        """
+        self.verificar_disponivel()
+        from openpyxl import Workbook
+
+        planilha = Workbook(write_only=True)
+        aba = planilha.create_sheet(self.NOME_PLANILHA)
+        nomes = [nome for nome, _ in colunas]
+        aba.append(nomes)
+        for bloco in blocos:
+            for linha in zip(*(bloco[nome] for nome in nomes)):
+                aba.append(linha)
+        planilha.save(caminho)
+
+
+class EscritorParquet:
+    """
+    Escreve Parquet com o pyarrow, acumulando linhas até `LINHAS_POR_GRUPO`
+    antes de gravar cada row group (memória limitada a um grupo).
+    """
+
+    MEDIA_TYPE = "application/vnd.apache.parquet"
+    EXTENSAO = "parquet"
+    LINHAS_POR_GRUPO = int(os.environ.get("EXPORTACAO_PARQUET_LINHAS_POR_GRUPO", 65536))
+
+    @staticmethod
+    def verificar_disponivel() -> None:
+        """
+        Raises:
+            FormatoIndisponivelError: Se o pacote `pyarrow` não estiver instalado
+        """
+        try:
+            import pyarrow  # noqa: F401
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            raise FormatoIndisponivelError("Exportação Parquet indisponível: instale o pacote 'pyarrow'")
+
+    def escrever(self, caminho: str, colunas: Sequence[Coluna], blocos: Iterable[Bloco]) -> None:
+        """
+        Escreve os blocos em um arquivo Parquet.
+
+        Args:
+            caminho: Arquivo de destino
+            colunas: Colunas (nome, tipo), na ordem de saída
+            blocos: Blocos de linhas (consumidos sob demanda)
+        """
+        self.verificar_disponivel()
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        tipos = {"int": pa.int32(), "float": pa.float64(), "str": pa.string()}
+        esquema = pa.schema([(nome, tipos[tipo]) for nome, tipo in colunas])
+        nomes = [nome for nome, _ in colunas]
+
+        pendentes: Dict[str, List[Any]] = {nome: [] for nome in nomes}
+        with pq.ParquetWriter(caminho, esquema) as escritor:
+            for bloco in blocos:
+                for nome in nomes:
+                    pendentes[nome].extend(bloco[nome])
+                if len(pendentes[nomes[0]]) >= self.LINHAS_POR_GRUPO:
+                    escritor.write_table(pa.table(pendentes, schema=esquema))
+                    pendentes = {nome: [] for nome in nomes}
+            if pendentes[nomes[0]]:
+                escritor.write_table(pa.table(pendentes, schema=esquema))
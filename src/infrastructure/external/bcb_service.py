@@ -1,26 +1,130 @@
+import os
+import random
+import threading
+import time
 import requests
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional
+
+from src.domain.value_objects.cotacao_cdi import CotacaoCDI
+
+
+class CircuitBreaker:
+    """
+    Disjuntor para chamadas a serviços externos.
+    
+    Abre após um número de falhas consecutivas, rejeitando chamadas até que o
+    tempo de abertura expire. Depois disso permite uma única chamada de teste
+    (semiaberto): sucesso fecha o circuito, falha o reabre.
+    """
+    
+    FECHADO = "fechado"
+    ABERTO = "aberto"
+    SEMI_ABERTO = "semi_aberto"
+    
+    def __init__(self, limite_falhas: int, tempo_abertura: timedelta):
+        """
+        Inicializa o disjuntor.
+        
+        Args:
+            limite_falhas: Falhas consecutivas necessárias para abrir o circuito
+            tempo_abertura: Tempo que o circuito permanece aberto
+        """
+        self.limite_falhas = limite_falhas
+        self.tempo_abertura = tempo_abertura
+        self._falhas_consecutivas = 0
+        self._aberto_em: Optional[datetime] = None
+        self._teste_em_andamento = False
+        self._lock = threading.Lock()
+    
+    @property
+    def estado(self) -> str:
+        """Retorna o estado atual do circuito"""
+        with self._lock:
+            return self._estado_atual()
+    
+    def _estado_atual(self) -> str:
+        if self._aberto_em is None:
+            return self.FECHADO
+        if datetime.now() - self._aberto_em >= self.tempo_abertura:
+            return self.SEMI_ABERTO
+        return self.ABERTO
+    
+    def permite_chamada(self) -> bool:
+        """
+        Indica se uma chamada pode ser feita agora.
+        No estado semiaberto, apenas a primeira chamada é liberada.
+        """
+        with self._lock:
+            estado = self._estado_atual()
+            if estado == self.FECHADO:
+                return True
+            if estado == self.SEMI_ABERTO and not self._teste_em_andamento:
+                self._teste_em_andamento = True
+                return True
+            return False
+    
+    def registrar_sucesso(self) -> None:
+        """Fecha o circuito e zera o contador de falhas"""
+        with self._lock:
+            self._falhas_consecutivas = 0
+            self._aberto_em = None
+            self._teste_em_andamento = False
+    
+    def registrar_falha(self) -> None:
+        """Contabiliza uma falha, abrindo o circuito quando o limite é atingido"""
+        with self._lock:
+            self._falhas_consecutivas += 1
+            if self._teste_em_andamento or self._falhas_consecutivas >= self.limite_falhas:
+                self._aberto_em = datetime.now()
+            self._teste_em_andamento = False
 
 
 class CDIService:
     """
     Serviço responsável por consultar a taxa CDI atualizada do Banco Central do Brasil.
     Implementa um mecanismo de cache para evitar chamadas desnecessárias à API.
+    
+    A consulta é protegida por um circuit breaker, novas tentativas com backoff
+    e jitter dentro de um orçamento de latência, cache negativo de falhas e
+    stale-while-revalidate: com o cache expirado, o último valor conhecido é
+    devolvido imediatamente enquanto a atualização roda em segundo plano.
     """
     
-    # Constantes
-    BCB_API_URL = "https://api.bcb.gov.br/dados/serie/bcdata.sgs.12/dados/ultimos/30?formato=json"
-    TEMPO_VALIDADE_CACHE = timedelta(hours=24)
+    # Constantes (sobrescrevíveis por variáveis de ambiente, ex: para testes de carga)
+    BCB_API_URL = os.environ.get(
+        "BCB_API_URL",
+        "https://api.bcb.gov.br/dados/serie/bcdata.sgs.12/dados/ultimos/30?formato=json"
+    )
+    TEMPO_VALIDADE_CACHE = timedelta(seconds=int(os.environ.get("CDI_CACHE_TTL_SEGUNDOS", 24 * 60 * 60)))
+    TIMEOUT_REQUISICAO = float(os.environ.get("BCB_TIMEOUT_SEGUNDOS", 10))
     VALOR_CDI_PADRAO = 13.25  # Valor de fallback caso a API não esteja disponível
     
+    # Resiliência
+    ORCAMENTO_LATENCIA_SEGUNDOS = float(os.environ.get("BCB_ORCAMENTO_SEGUNDOS", 3))
+    TENTATIVAS_MAXIMAS = int(os.environ.get("BCB_TENTATIVAS", 3))
+    BACKOFF_BASE_SEGUNDOS = 0.1
+    TEMPO_CACHE_NEGATIVO = timedelta(seconds=int(os.environ.get("BCB_CACHE_NEGATIVO_SEGUNDOS", 60)))
+    
     # Estrutura de cache
     _cache: Dict[str, Any] = {
         'valor': None,
         'timestamp': None,
+        'falha_ate': None,
     }
     
+    _circuit_breaker = CircuitBreaker(
+        limite_falhas=int(os.environ.get("BCB_LIMITE_FALHAS", 3)),
+        tempo_abertura=timedelta(seconds=int(os.environ.get("BCB_CIRCUITO_ABERTO_SEGUNDOS", 60)))
+    )
+    # Funções notificadas com a nova taxa sempre que o cache é atualizado
+    _observadores: List[Callable[[float], None]] = []
+    
+    _lock_consulta = threading.Lock()
+    _lock_agendamento = threading.Lock()
+    _atualizacao_em_andamento = threading.Event()
+    
     @classmethod
     def obter_cdi_anual(cls) -> float:
         """
@@ -29,15 +133,91 @@ class CDIService:
         Returns:
             float: Valor anual do CDI em percentual (ex: 13.25 para 13.25%)
         """
+        return cls.obter_cotacao().valor
+    
+    @classmethod
+    def obter_cotacao(cls) -> CotacaoCDI:
+        """
+        Obtém a taxa CDI anual com a indicação de frescor do valor.
+        
+        Returns:
+            CotacaoCDI: Taxa, data da última atualização e flag `stale`
+        """
         valor_em_cache = cls._obter_valor_do_cache()
         
         if valor_em_cache is not None:
-            return valor_em_cache
+            return CotacaoCDI(valor=valor_em_cache, data_atualizacao=cls._cache['timestamp'])
             
-        try:
-            return cls._consultar_api_bcb()
-        except Exception as erro:
-            return cls._tratar_erro_api(erro)
+        # Stale-while-revalidate: serve o último valor conhecido e atualiza em segundo plano
+        if cls._cache['valor'] is not None:
+            cls._agendar_atualizacao()
+            return CotacaoCDI(
+                valor=cls._cache['valor'],
+                data_atualizacao=cls._cache['timestamp'],
+                stale=True
+            )
+        
+        # Sem nenhum valor conhecido: consulta síncrona (uma por vez)
+        valor_atualizado = None
+        with cls._lock_consulta:
+            valor_em_cache = cls._obter_valor_do_cache()
+            if valor_em_cache is None:
+                valor_em_cache = valor_atualizado = cls._atualizar()
+        # Fora do lock: quem aguarda a consulta não espera pelos observadores
+        if valor_atualizado is not None:
+            cls._notificar_observadores(valor_atualizado)
+        
+        if valor_em_cache is None:
+            return cls._cotacao_padrao()
+        return CotacaoCDI(valor=valor_em_cache, data_atualizacao=cls._cache['timestamp'])
+    
+    @classmethod
+    def valor_em_cache(cls) -> Optional[float]:
+        """
+        Retorna o último valor conhecido da taxa (mesmo expirado), sem consultar a API.
+        
+        Returns:
+            Optional[float]: Taxa CDI anual, ou None se nenhuma consulta teve sucesso
+        """
+        return cls._cache['valor']
+    
+    @classmethod
+    def estado_cache(cls) -> str:
+        """
+        Indica o estado do cache da taxa, sem consultar a API (usado pela sonda de prontidão).
+        
+        Returns:
+            str: "atualizado" (valor válido), "desatualizado" (valor expirado, servido
+                enquanto é revalidado), "indisponivel" (a consulta falhou e o valor
+                padrão é usado) ou "vazio" (nenhuma consulta feita ainda)
+        """
+        if cls._obter_valor_do_cache() is not None:
+            return "atualizado"
+        if cls._cache['valor'] is not None:
+            return "desatualizado"
+        if cls._cache['falha_ate'] is not None:
+            return "indisponivel"
+        return "vazio"
+    
+    @classmethod
+    def registrar_observador(cls, observador: Callable[[float], None]) -> None:
+        """
+        Registra uma função chamada com a nova taxa a cada atualização do CDI.
+        
+        Args:
+            observador: Função que recebe a taxa CDI anual atualizada
+        """
+        if observador not in cls._observadores:
+            cls._observadores.append(observador)
+    
+    @classmethod
+    def _notificar_observadores(cls, valor: float) -> None:
+        """Notifica os observadores; falhas de um observador não afetam a consulta"""
+        for observador in list(cls._observadores):
+            try:
+                observador(valor)
+            except Exception as erro:
+                logging.error(f"Erro ao notificar atualização do CDI: {str(erro)}")
     
     @classmethod
     def _obter_valor_do_cache(cls) -> Optional[float]:
@@ -56,11 +236,66 @@ class CDIService:
             
         return None
     
+    @classmethod
+    def _agendar_atualizacao(cls) -> None:
+        """Dispara a atualização do cache em segundo plano, se nenhuma estiver em andamento"""
+        if cls._falha_em_cache() or cls._atualizacao_em_andamento.is_set():
+            return
+        
+        with cls._lock_agendamento:
+            if cls._atualizacao_em_andamento.is_set():
+                return
+            cls._atualizacao_em_andamento.set()
+        
+        threading.Thread(target=cls._atualizar_em_segundo_plano, daemon=True).start()
+    
+    @classmethod
+    def _atualizar_em_segundo_plano(cls) -> None:
+        valor_atualizado = None
+        try:
+            with cls._lock_consulta:
+                if cls._obter_valor_do_cache() is None:
+                    valor_atualizado = cls._atualizar()
+        finally:
+            cls._atualizacao_em_andamento.clear()
+        if valor_atualizado is not None:
+            cls._notificar_observadores(valor_atualizado)
+    
+    @classmethod
+    def _atualizar(cls) -> Optional[float]:
+        """
+        Consulta a API respeitando o cache negativo e o circuit breaker.
+        Deve ser chamado com `_lock_consulta` adquirido; quem chama notifica
+        os observadores com o novo valor depois de liberar o lock.
+        
+        Returns:
+            Optional[float]: Novo valor do CDI, ou None se a consulta falhou ou foi evitada
+        """
+        if cls._falha_em_cache() or not cls._circuit_breaker.permite_chamada():
+            return None
+        
+        try:
+            return cls._consultar_api_bcb()
+        except Exception as erro:
+            cls._cache['falha_ate'] = datetime.now() + cls.TEMPO_CACHE_NEGATIVO
+            cls._tratar_erro_api(erro)
+            return None
+    
+    @classmethod
+    def _falha_em_cache(cls) -> bool:
+        """Indica se uma falha recente ainda impede novas consultas (cache negativo)"""
+        falha_ate = cls._cache['falha_ate']
+        return falha_ate is not None and datetime.now() < falha_ate
+    
     @classmethod
     def _consultar_api_bcb(cls) -> float:
         """
         Consulta a API do Banco Central para obter o valor atualizado do CDI.
         
+        Faz novas tentativas com backoff exponencial e jitter enquanto houver
+        orçamento de latência. O circuit breaker conta a consulta como um todo:
+        uma falha só é registrada quando as tentativas se esgotam.
+        
         Returns:
             float: Valor anual do CDI em percentual
             
@@ -68,13 +303,31 @@ class CDIService:
             requests.RequestException: Erro na comunicação com a API
             ValueError: Erro no formato ou ausência de dados na resposta
         """
-        resposta = cls._fazer_requisicao_api()
-        return cls._processar_resposta_api(resposta)
+        prazo = time.monotonic() + cls.ORCAMENTO_LATENCIA_SEGUNDOS
+        
+        for tentativa in range(cls.TENTATIVAS_MAXIMAS):
+            timeout = min(cls.TIMEOUT_REQUISICAO, prazo - time.monotonic())
+            try:
+                resposta = cls._fazer_requisicao_api(timeout)
+                valor = cls._processar_resposta_api(resposta)
+                cls._circuit_breaker.registrar_sucesso()
+                return valor
+            except Exception:
+                espera = random.uniform(0, cls.BACKOFF_BASE_SEGUNDOS * (2 ** tentativa))
+                ultima = tentativa == cls.TENTATIVAS_MAXIMAS - 1
+                if (ultima or time.monotonic() + espera >= prazo
+                        or not cls._circuit_breaker.permite_chamada()):
+                    cls._circuit_breaker.registrar_falha()
+                    raise
+                time.sleep(espera)
+        
+        cls._circuit_breaker.registrar_falha()
+        raise RuntimeError("Nenhuma tentativa de consulta ao Banco Central foi realizada")
     
     @classmethod
-    def _fazer_requisicao_api(cls) -> Dict:
+    def _fazer_requisicao_api(cls, timeout: Optional[float] = None) -> Dict:
         """Executa a requisição HTTP para a API do Banco Central"""
-        resposta = requests.get(cls.BCB_API_URL, timeout=10)
+        resposta = requests.get(cls.BCB_API_URL, timeout=timeout or cls.TIMEOUT_REQUISICAO)
         resposta.raise_for_status()
         return resposta.json()
     
@@ -89,7 +342,7 @@ class CDIService:
         Returns:
             float: Taxa anual calculada do CDI
         """
-        if not dados or 'valor' not in dados[-1]:
+        if not dados or not isinstance(dados, list) or 'valor' not in dados[-1]:
             raise ValueError("Dados do CDI não encontrados na resposta da API")
         
         # Converte taxa diária para anual (252 dias úteis)
@@ -106,6 +359,17 @@ class CDIService:
         """Atualiza o cache com o novo valor e timestamp"""
         cls._cache['valor'] = valor
         cls._cache['timestamp'] = datetime.now()
+        cls._cache['falha_ate'] = None
+    
+    @classmethod
+    def _cotacao_padrao(cls) -> CotacaoCDI:
+        """Cotação com o valor padrão, usada quando nenhum valor foi obtido da API"""
+        return CotacaoCDI(
+            valor=cls.VALOR_CDI_PADRAO,
+            data_atualizacao=datetime.now(),
+            fonte="Valor padrão (API do Banco Central indisponível)",
+            stale=True
+        )
     
     @classmethod
     def _tratar_erro_api(cls, erro: Exception) -> float:
@@ -121,10 +385,8 @@ class CDIService:
         """
         if isinstance(erro, requests.RequestException):
             logging.error(f"Erro na requisição à API do Banco Central: {str(erro)}")
-            print(f"Erro ao conectar com a API do Banco Central: {str(erro)}")
         else:
             logging.error(f"Erro ao processar resposta da API: {str(erro)}")
-            print(f"Erro ao processar dados de CDI: {str(erro)}")
             
-        print(f"Usando valor padrão de {cls.VALOR_CDI_PADRAO}% para o CDI anual")
-        return cls.VALOR_CDI_PADRAO 
\ No newline at end of file
+        logging.warning(f"Usando valor padrão de {cls.VALOR_CDI_PADRAO}% para o CDI anual")
+        return cls.VALOR_CDI_PADRAO 
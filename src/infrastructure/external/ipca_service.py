@@ -0,0 +1,200 @@
+import json
+import logging
+import os
+import threading
+from array import array
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List
+
+import requests
+
+from src.domain.value_objects.serie_ipca import SerieIPCA
+
+
+class IPCAService:
+    """
+    Serviço responsável por obter a série mensal do IPCA (SGS 433).
+
+    A série é persistida em um arquivo local e atualizada de forma incremental:
+    só os meses posteriores ao último mês gravado são pedidos ao Banco Central,
+    no máximo uma vez por `TEMPO_VALIDADE_CACHE`. Com `IPCA_FIXTURE`, um arquivo
+    no formato do SGS substitui a API (desenvolvimento local e testes).
+    """
+
+    # Constantes (sobrescrevíveis por variáveis de ambiente)
+    BCB_IPCA_URL = os.environ.get(
+        "BCB_IPCA_URL",
+        "https://api.bcb.gov.br/dados/serie/bcdata.sgs.433/dados?formato=json"
+    )
+    ARQUIVO_SERIE = os.environ.get("IPCA_ARQUIVO", os.path.join("dados", "ipca_433.json"))
+    ARQUIVO_FIXTURE = os.environ.get("IPCA_FIXTURE")
+    DATA_INICIAL_SERIE = os.environ.get("IPCA_DATA_INICIAL", "01/01/2000")
+    TEMPO_VALIDADE_CACHE = timedelta(seconds=int(os.environ.get("IPCA_CACHE_TTL_SEGUNDOS", 24 * 60 * 60)))
+    TEMPO_CACHE_NEGATIVO = timedelta(seconds=int(os.environ.get("BCB_CACHE_NEGATIVO_SEGUNDOS", 60)))
+    TIMEOUT_REQUISICAO = float(os.environ.get("BCB_TIMEOUT_SEGUNDOS", 10))
+
+    # Projeção para meses ainda não divulgados: valor configurado (% ao mês) ou média dos últimos 12 meses
+    PROJECAO_MENSAL = os.environ.get("IPCA_PROJECAO_MENSAL")
+    MESES_MEDIA_PROJECAO = 12
+    PROJECAO_MENSAL_PADRAO = 0.33  # ~4% ao ano, usado se a série estiver vazia
+
+    _cache: Dict[str, Any] = {
+        'serie': None,
+        'valido_ate': None,
+    }
+    _lock = threading.Lock()
+
+    @classmethod
+    def obter_serie(cls) -> SerieIPCA:
+        """
+        Obtém a série do IPCA, atualizando-a se o cache tiver expirado.
+
+        Returns:
+            SerieIPCA: Variações mensais conhecidas (pode estar vazia se nunca foi possível obtê-las)
+        """
+        with cls._lock:
+            agora = datetime.now()
+            if cls._cache['serie'] is not None and agora < cls._cache['valido_ate']:
+                return cls._cache['serie']
+
+            serie = cls._cache['serie'] or cls._carregar_arquivo()
+            validade = cls.TEMPO_VALIDADE_CACHE
+            try:
+                atualizada = cls._atualizar_incrementalmente(serie)
+                if len(atualizada.variacoes) != len(serie.variacoes):
+                    cls._salvar_arquivo(atualizada)
+                serie = atualizada
+            except (requests.RequestException, ValueError, OSError) as erro:
+                logging.error(f"Erro ao atualizar a série do IPCA: {str(erro)}")
+                validade = cls.TEMPO_CACHE_NEGATIVO
+
+            cls._cache['serie'] = serie
+            cls._cache['valido_ate'] = agora + validade
+            return serie
+
+    @classmethod
+    def projecao_mensal(cls, serie: SerieIPCA) -> float:
+        """
+        Retorna a variação mensal (%) usada para os meses fora da série.
+
+        Args:
+            serie: Série do IPCA conhecida
+
+        Returns:
+            IPCA_PROJECAO_MENSAL, a média dos últimos meses da série ou o valor padrão
+        """
+        if cls.PROJECAO_MENSAL is not None:
+            return float(cls.PROJECAO_MENSAL)
+        media = serie.media_recente(cls.MESES_MEDIA_PROJECAO)
+        return media if media is not None else cls.PROJECAO_MENSAL_PADRAO
+
+    @classmethod
+    def _atualizar_incrementalmente(cls, serie: SerieIPCA) -> SerieIPCA:
+        """Busca apenas os meses posteriores ao último mês da série"""
+        hoje = date.today()
+        # O IPCA de um mês é divulgado no mês seguinte: o mais recente possível é o do mês anterior
+        mes_anterior = (hoje.year, hoje.month - 1) if hoje.month > 1 else (hoje.year - 1, 12)
+
+        ultimo = serie.ultimo_mes
+        if ultimo is None:
+            data_inicial = datetime.strptime(cls.DATA_INICIAL_SERIE, "%d/%m/%Y").date()
+        elif ultimo >= mes_anterior:
+            return serie
+        else:
+            ano, mes = ultimo
+            data_inicial = date(ano + mes // 12, mes % 12 + 1, 1)
+
+        return cls._mesclar(serie, cls._buscar_registros(data_inicial, hoje))
+
+    @classmethod
+    def _buscar_registros(cls, data_inicial: date, data_final: date) -> List[Dict[str, str]]:
+        """
+        Obtém os registros {data, valor} do SGS (ou do fixture) a partir de `data_inicial`.
+        """
+        if cls.ARQUIVO_FIXTURE:
+            with open(cls.ARQUIVO_FIXTURE, encoding="utf-8") as arquivo:
+                registros = json.load(arquivo)
+            return [
+                registro for registro in registros
+                if data_inicial <= datetime.strptime(registro['data'], "%d/%m/%Y").date() <= data_final
+            ]
+
+        resposta = requests.get(
+            cls.BCB_IPCA_URL,
+            params={
+                "dataInicial": data_inicial.strftime("%d/%m/%Y"),
+                "dataFinal": data_final.strftime("%d/%m/%Y"),
+            },
+            timeout=cls.TIMEOUT_REQUISICAO
+        )
+        # O SGS responde 404 quando não há registros no período
+        if resposta.status_code == 404:
+            return []
+        resposta.raise_for_status()
+
+        dados = resposta.json()
+        if not isinstance(dados, list):
+            raise ValueError("Resposta inesperada da API do IPCA")
+        return dados
+
+    @staticmethod
+    def _mesclar(serie: SerieIPCA, registros: List[Dict[str, str]]) -> SerieIPCA:
+        """
+        Acrescenta à série os registros posteriores ao seu último mês.
+
+        Raises:
+            ValueError: Se um registro for inválido ou houver lacuna entre os meses
+        """
+        ano_inicial, mes_inicial = serie.ano_inicial, serie.mes_inicial
+        variacoes = array('d', serie.variacoes)
+
+        for registro in registros:
+            data = datetime.strptime(registro['data'], "%d/%m/%Y")
+            valor = float(registro['valor'])
+
+            if not variacoes:
+                ano_inicial, mes_inicial = data.year, data.month
+            indice = (data.year - ano_inicial) * 12 + data.month - mes_inicial
+
+            if indice < len(variacoes):
+                continue
+            if indice > len(variacoes):
+                raise ValueError(f"Lacuna na série do IPCA antes de {registro['data']}")
+            variacoes.append(valor)
+
+        return SerieIPCA(ano_inicial=ano_inicial, mes_inicial=mes_inicial, variacoes=variacoes)
+
+    @classmethod
+    def _carregar_arquivo(cls) -> SerieIPCA:
+        """Carrega a série persistida localmente (série vazia se o arquivo não existir)"""
+        hoje = date.today()
+        try:
+            with open(cls.ARQUIVO_SERIE, encoding="utf-8") as arquivo:
+                dados = json.load(arquivo)
+            return SerieIPCA(
+                ano_inicial=int(dados['ano_inicial']),
+                mes_inicial=int(dados['mes_inicial']),
+                variacoes=array('d', dados['variacoes'])
+            )
+        except FileNotFoundError:
+            return SerieIPCA(ano_inicial=hoje.year, mes_inicial=hoje.month)
+        except (OSError, ValueError, KeyError, TypeError) as erro:
+            logging.error(f"Erro ao carregar a série do IPCA de {cls.ARQUIVO_SERIE}: {str(erro)}")
+            return SerieIPCA(ano_inicial=hoje.year, mes_inicial=hoje.month)
+
+    @classmethod
+    def _salvar_arquivo(cls, serie: SerieIPCA) -> None:
+        """Grava a série de forma atômica (arquivo temporário + rename)"""
+        diretorio = os.path.dirname(cls.ARQUIVO_SERIE)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+
+        temporario = f"{cls.ARQUIVO_SERIE}.{os.getpid()}.tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump({
+                "ano_inicial": serie.ano_inicial,
+                "mes_inicial": serie.mes_inicial,
+                "variacoes": list(serie.variacoes),
+                "atualizado_em": datetime.now().isoformat(),
+            }, arquivo)
+        os.replace(temporario, cls.ARQUIVO_SERIE)
@@ -0,0 +1,191 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+class FilaJobsMemoria:
+    """
+    Fila de jobs, estados e partes de resultado na memória do processo.
+
+    Atende uma única instância da API (com vários workers do uvicorn, cada
+    processo tem a sua fila; use o backend Redis). Jobs concluídos são
+    descartados após o prazo definido em `expirar`.
+    """
+
+    # Operações sem E/S: podem ser chamadas diretamente no event loop
+    BLOQUEANTE = False
+
+    def __init__(self):
+        self._fila: Deque[Tuple[str, Dict[str, Any]]] = deque()
+        self._estados: Dict[str, Dict[str, Any]] = {}
+        self._partes: Dict[str, List[List[List[Any]]]] = {}
+        self._cancelados = set()
+        self._expiracoes: Dict[str, float] = {}
+        self._condicao = threading.Condition()
+
+    def enfileirar(self, job_id: str, tarefa: Dict[str, Any]) -> None:
+        """Coloca um job no fim da fila"""
+        with self._condicao:
+            self._fila.append((job_id, tarefa))
+            self._condicao.notify()
+
+    def retirar(self, timeout: float) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Retira o próximo job da fila, esperando até `timeout` segundos.
+
+        Returns:
+            Tupla (id do job, tarefa) ou None se a fila continuar vazia
+        """
+        with self._condicao:
+            if not self._fila:
+                self._condicao.wait(timeout)
+            return self._fila.popleft() if self._fila else None
+
+    def tamanho(self) -> int:
+        """Retorna quantos jobs aguardam na fila"""
+        with self._condicao:
+            return len(self._fila)
+
+    def salvar_estado(self, job_id: str, estado: Dict[str, Any]) -> None:
+        with self._condicao:
+            self._remover_expirados()
+            self._estados[job_id] = dict(estado)
+
+    def obter_estado(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._condicao:
+            self._remover_expirados()
+            estado = self._estados.get(job_id)
+            return dict(estado) if estado is not None else None
+
+    def adicionar_parte(self, job_id: str, linhas: List[List[Any]]) -> None:
+        """Acrescenta uma parte (bloco de linhas) ao resultado do job"""
+        with self._condicao:
+            self._partes.setdefault(job_id, []).append(linhas)
+
+    def obter_parte(self, job_id: str, indice: int) -> Optional[List[List[Any]]]:
+        with self._condicao:
+            partes = self._partes.get(job_id, [])
+            return partes[indice] if 0 <= indice < len(partes) else None
+
+    def cancelar(self, job_id: str) -> None:
+        """Sinaliza o cancelamento ao trabalhador que estiver executando o job"""
+        with self._condicao:
+            self._cancelados.add(job_id)
+
+    def cancelado(self, job_id: str) -> bool:
+        with self._condicao:
+            return job_id in self._cancelados
+
+    def expirar(self, job_id: str, segundos: float) -> None:
+        """Programa o descarte do estado e do resultado do job"""
+        with self._condicao:
+            self._expiracoes[job_id] = time.monotonic() + segundos
+
+    def _remover_expirados(self) -> None:
+        """Descarta os jobs expirados (chamado com o lock adquirido)"""
+        agora = time.monotonic()
+        for job_id in [job_id for job_id, expira in self._expiracoes.items() if expira <= agora]:
+            del self._expiracoes[job_id]
+            self._estados.pop(job_id, None)
+            self._partes.pop(job_id, None)
+            self._cancelados.discard(job_id)
+
+
+class FilaJobsRedis:
+    """
+    Fila de jobs compartilhada via Redis, para escalar os trabalhadores em
+    várias instâncias (`python -m src.interfaces.cli.trabalhador_jobs`).
+
+    A fila é uma lista (LPUSH/BRPOP), o estado de cada job um valor JSON e o
+    resultado uma lista de partes JSON; tudo expira junto com o job.
+    """
+
+    URL = os.environ.get("JOBS_REDIS_URL", "redis://localhost:6379/0")
+    PREFIXO = os.environ.get("JOBS_REDIS_PREFIXO", "jobs:")
+    TTL_PARTES_SEGUNDOS = 86400
+
+    # Operações fazem E/S de rede: devem ser chamadas fora do event loop
+    BLOQUEANTE = True
+
+    def __init__(self, url: Optional[str] = None):
+        # Dependência opcional: só é importada quando o backend Redis é escolhido
+        import redis
+
+        self._cliente = redis.Redis.from_url(url or self.URL)
+
+    def enfileirar(self, job_id: str, tarefa: Dict[str, Any]) -> None:
+        self._cliente.lpush(self.PREFIXO + "fila", json.dumps([job_id, tarefa]))
+
+    def retirar(self, timeout: float) -> Optional[Tuple[str, Dict[str, Any]]]:
+        item = self._cliente.brpop([self.PREFIXO + "fila"], timeout=max(1, int(timeout)))
+        if item is None:
+            return None
+        job_id, tarefa = json.loads(item[1])
+        return job_id, tarefa
+
+    def tamanho(self) -> int:
+        return self._cliente.llen(self.PREFIXO + "fila")
+
+    def salvar_estado(self, job_id: str, estado: Dict[str, Any]) -> None:
+        chave = self.PREFIXO + "estado:" + job_id
+        # Mantém a expiração já programada para o job
+        self._cliente.set(chave, json.dumps(estado), keepttl=True)
+
+    def obter_estado(self, job_id: str) -> Optional[Dict[str, Any]]:
+        valor = self._cliente.get(self.PREFIXO + "estado:" + job_id)
+        return json.loads(valor) if valor is not None else None
+
+    def adicionar_parte(self, job_id: str, linhas: List[List[Any]]) -> None:
+        chave = self.PREFIXO + "partes:" + job_id
+        pipeline = self._cliente.pipeline()
+        pipeline.rpush(chave, json.dumps(linhas))
+        # Partes de um job abandonado (trabalhador interrompido) também expiram
+        pipeline.expire(chave, self.TTL_PARTES_SEGUNDOS)
+        pipeline.execute()
+
+    def obter_parte(self, job_id: str, indice: int) -> Optional[List[List[Any]]]:
+        if indice < 0:
+            return None
+        valor = self._cliente.lindex(self.PREFIXO + "partes:" + job_id, indice)
+        return json.loads(valor) if valor is not None else None
+
+    def cancelar(self, job_id: str) -> None:
+        self._cliente.set(self.PREFIXO + "cancelado:" + job_id, "1", ex=86400)
+
+    def cancelado(self, job_id: str) -> bool:
+        return bool(self._cliente.exists(self.PREFIXO + "cancelado:" + job_id))
+
+    def expirar(self, job_id: str, segundos: float) -> None:
+        segundos = max(1, int(segundos))
+        for sufixo in ("estado:", "partes:", "cancelado:"):
+            self._cliente.expire(self.PREFIXO + sufixo + job_id, segundos)
+
+
+def criar_fila_jobs(backend: Optional[str] = None):
+    """
+    Cria a fila de jobs configurada.
+
+    Args:
+        backend: "memoria" ou "redis" (padrão: variável JOBS_BACKEND)
+
+    Returns:
+        Fila com os métodos `enfileirar`, `retirar`, `salvar_estado`, `obter_estado`,
+        `adicionar_parte`, `obter_parte`, `cancelar`, `cancelado` e `expirar`
+
+    Raises:
+        ValueError: Se o backend for desconhecido
+    """
+    backend = backend or os.environ.get("JOBS_BACKEND", "memoria")
+    if backend == "memoria":
+        return FilaJobsMemoria()
+    if backend == "redis":
+        try:
+            return FilaJobsRedis()
+        except ImportError:
+            logging.error("Pacote 'redis' não instalado; usando fila de jobs em memória")
+            return FilaJobsMemoria()
+    raise ValueError(f"Backend de jobs inválido: {backend}. Use 'memoria' ou 'redis'.")
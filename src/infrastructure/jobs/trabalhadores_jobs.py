@@ -0,0 +1,110 @@
+import logging
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+# Função que executa um job: (id do job, tarefa, pool de processos)
+ExecutorJob = Callable[[str, Dict[str, Any], Executor], None]
+
+
+class TrabalhadoresJobs:
+    """
+    Trabalhadores que retiram jobs da fila e os executam.
+
+    Cada trabalhador é uma thread que executa um job por vez; os cálculos das
+    partes vão para um pool de processos compartilhado, separado do pool das
+    requisições (ExecutorCalculos), para que jobs grandes não disputem vagas
+    com os cálculos interativos. Com `JOBS_TRABALHADORES=0` a API apenas
+    enfileira, e os jobs são executados por instâncias dedicadas
+    (`python -m src.interfaces.cli.trabalhador_jobs`, backend Redis).
+    """
+
+    TRABALHADORES = int(os.environ.get("JOBS_TRABALHADORES", 1))
+    PROCESSOS = int(os.environ.get("JOBS_PROCESSOS", os.cpu_count() or 1))
+
+    # Intervalo (segundos) em que os trabalhadores verificam o pedido de encerramento
+    INTERVALO_ESPERA = 1.0
+
+    _threads: List[threading.Thread] = []
+    _pool: Optional[Executor] = None
+    _parar = threading.Event()
+    _lock = threading.Lock()
+
+    @classmethod
+    def iniciar(cls, fila, executar: ExecutorJob, trabalhadores: Optional[int] = None,
+                processos: Optional[int] = None) -> None:
+        """
+        Inicia os trabalhadores em segundo plano (não faz nada se já iniciados
+        ou se não houver trabalhadores configurados).
+
+        Args:
+            fila: Fila de jobs (ver criar_fila_jobs)
+            executar: Função que executa um job
+            trabalhadores: Threads trabalhadoras (padrão: JOBS_TRABALHADORES)
+            processos: Processos do pool de cálculo (padrão: JOBS_PROCESSOS)
+        """
+        trabalhadores = cls.TRABALHADORES if trabalhadores is None else trabalhadores
+        with cls._lock:
+            if cls._threads or trabalhadores <= 0:
+                return
+            cls._parar.clear()
+            cls._pool = ProcessPoolExecutor(max_workers=max(1, processos or cls.PROCESSOS))
+            cls._threads = [
+                threading.Thread(
+                    target=cls._trabalhar,
+                    args=(fila, executar, cls._pool),
+                    name=f"trabalhador-jobs-{indice}",
+                    daemon=True
+                )
+                for indice in range(trabalhadores)
+            ]
+            for thread in cls._threads:
+                thread.start()
+        logging.info(f"{trabalhadores} trabalhador(es) de jobs iniciado(s)")
+
+    @classmethod
+    def executar_em_primeiro_plano(cls, fila, executar: ExecutorJob, trabalhadores: Optional[int] = None,
+                                   processos: Optional[int] = None) -> None:
+        """Inicia os trabalhadores e bloqueia até `encerrar` ser chamado (ex: por Ctrl+C)"""
+        cls.iniciar(fila, executar, trabalhadores, processos)
+        try:
+            while not cls._parar.wait(cls.INTERVALO_ESPERA):
+                pass
+        except KeyboardInterrupt:
+            logging.info("Encerrando os trabalhadores de jobs")
+        finally:
+            cls.encerrar()
+
+    @classmethod
+    def encerrar(cls) -> None:
+        """
+        Para de retirar jobs e encerra o pool; o job em andamento em cada
+        trabalhador é concluído antes.
+        """
+        cls._parar.set()
+        with cls._lock:
+            threads, cls._threads = cls._threads, []
+            pool, cls._pool = cls._pool, None
+        for thread in threads:
+            thread.join()
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    @classmethod
+    def _trabalhar(cls, fila, executar: ExecutorJob, pool: Executor) -> None:
+        """Laço de um trabalhador: retira e executa jobs até o encerramento"""
+        while not cls._parar.is_set():
+            try:
+                item = fila.retirar(cls.INTERVALO_ESPERA)
+            except Exception:
+                logging.exception("Erro ao retirar job da fila")
+                cls._parar.wait(cls.INTERVALO_ESPERA)
+                continue
+            if item is None:
+                continue
+            job_id, tarefa = item
+            try:
+                executar(job_id, tarefa, pool)
+            except Exception:
+                logging.exception(f"Erro inesperado no job {job_id}")
@@ -0,0 +1,144 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class ArmazemTokensMemoria:
+    """
+    Baldes de tokens por cliente mantidos na memória do processo.
+
+    Cada balde guarda (tokens, instante da última atualização) e é reabastecido
+    de forma contínua no momento do consumo. O número de clientes é limitado
+    (LRU) para que uma varredura de IPs não esgote a memória.
+    """
+
+    MAXIMO_CLIENTES = int(os.environ.get("LIMITE_TAXA_MAXIMO_CLIENTES", 10000))
+
+    # Consumo sem E/S: pode ser chamado diretamente no event loop
+    BLOQUEANTE = False
+
+    def __init__(self):
+        self._baldes: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consumir(self, chave: str, custo: float, capacidade: float, reposicao: float) -> float:
+        """
+        Tenta consumir `custo` tokens do balde do cliente.
+
+        Args:
+            chave: Identificação do cliente
+            custo: Tokens a consumir
+            capacidade: Tamanho máximo do balde
+            reposicao: Tokens repostos por segundo
+
+        Returns:
+            0 se a requisição foi admitida; caso contrário, segundos até haver tokens suficientes
+        """
+        agora = time.monotonic()
+        with self._lock:
+            tokens, instante = self._baldes.pop(chave, (capacidade, agora))
+            tokens = min(capacidade, tokens + (agora - instante) * reposicao)
+
+            espera = 0.0
+            if tokens >= custo:
+                tokens -= custo
+            else:
+                espera = (custo - tokens) / reposicao
+
+            self._baldes[chave] = (tokens, agora)
+            while len(self._baldes) > self.MAXIMO_CLIENTES:
+                self._baldes.popitem(last=False)
+
+        return espera
+
+
+class ArmazemTokensRedis:
+    """
+    Baldes de tokens compartilhados entre instâncias via Redis.
+
+    O reabastecimento e o consumo são feitos atomicamente por um script Lua,
+    usando o relógio do próprio Redis. Se o Redis estiver indisponível, a
+    requisição é admitida (fail-open) para não derrubar a API junto.
+    """
+
+    URL = os.environ.get("LIMITE_TAXA_REDIS_URL", "redis://localhost:6379/0")
+    PREFIXO = os.environ.get("LIMITE_TAXA_REDIS_PREFIXO", "limite_taxa:")
+
+    # Consumo faz E/S de rede: deve ser chamado fora do event loop
+    BLOQUEANTE = True
+
+    SCRIPT = """
+local capacidade = tonumber(ARGV[1])
+local reposicao = tonumber(ARGV[2])
+local custo = tonumber(ARGV[3])
+local relogio = redis.call('TIME')
+local agora = tonumber(relogio[1]) + tonumber(relogio[2]) / 1000000
+local estado = redis.call('HMGET', KEYS[1], 'tokens', 'instante')
+local tokens = tonumber(estado[1]) or capacidade
+local instante = tonumber(estado[2]) or agora
+tokens = math.min(capacidade, tokens + math.max(0, agora - instante) * reposicao)
+local espera = 0
+if tokens >= custo then
+    tokens = tokens - custo
+else
+    espera = (custo - tokens) / reposicao
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'instante', tostring(agora))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacidade / reposicao) + 1)
+return tostring(espera)
+"""
+
+    def __init__(self, url: Optional[str] = None):
+        # Dependência opcional: só é importada quando o backend Redis é escolhido
+        import redis
+
+        self._cliente = redis.Redis.from_url(url or self.URL, socket_timeout=0.2)
+        self._script = self._cliente.register_script(self.SCRIPT)
+
+    def consumir(self, chave: str, custo: float, capacidade: float, reposicao: float) -> float:
+        """
+        Tenta consumir `custo` tokens do balde do cliente.
+
+        Args:
+            chave: Identificação do cliente
+            custo: Tokens a consumir
+            capacidade: Tamanho máximo do balde
+            reposicao: Tokens repostos por segundo
+
+        Returns:
+            0 se a requisição foi admitida; caso contrário, segundos até haver tokens suficientes
+        """
+        try:
+            espera = self._script(keys=[self.PREFIXO + chave], args=[capacidade, reposicao, custo])
+            return float(espera)
+        except Exception as erro:
+            logging.error(f"Erro ao consultar o limite de taxa no Redis: {str(erro)}")
+            return 0.0
+
+
+def criar_armazem_tokens(backend: Optional[str] = None):
+    """
+    Cria o armazém de baldes de tokens configurado.
+
+    Args:
+        backend: "memoria" ou "redis" (padrão: variável LIMITE_TAXA_BACKEND)
+
+    Returns:
+        Armazém com o método `consumir`
+
+    Raises:
+        ValueError: Se o backend for desconhecido
+    """
+    backend = backend or os.environ.get("LIMITE_TAXA_BACKEND", "memoria")
+    if backend == "memoria":
+        return ArmazemTokensMemoria()
+    if backend == "redis":
+        try:
+            return ArmazemTokensRedis()
+        except ImportError:
+            logging.error("Pacote 'redis' não instalado; usando limite de taxa em memória")
+            return ArmazemTokensMemoria()
+    raise ValueError(f"Backend de limite de taxa inválido: {backend}. Use 'memoria' ou 'redis'.")
@@ -0,0 +1,118 @@
+import csv
+import itertools
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.infrastructure.exportacao.escritores import FormatoIndisponivelError
+
+
+class LeitorPlanos:
+    """
+    Lê os planos de um arquivo CSV ou Parquet em blocos, sem carregar o
+    arquivo inteiro em memória.
+
+    No CSV, o separador (',' ou ';') é detectado pelo cabeçalho e o BOM é
+    ignorado. Parquet requer o pacote opcional `pyarrow`.
+    """
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self.parquet = caminho.lower().endswith((".parquet", ".pq"))
+
+    def total(self) -> Optional[int]:
+        """Retorna o número de planos, quando conhecido sem ler o arquivo (Parquet)"""
+        if not self.parquet:
+            return None
+        return self._abrir_parquet().metadata.num_rows
+
+    def blocos(self, tamanho_bloco: int, pular: int = 0) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Lê os planos em blocos.
+
+        Args:
+            tamanho_bloco: Planos por bloco
+            pular: Planos iniciais a ignorar (retomada de um lote interrompido)
+
+        Yields:
+            Listas de planos (coluna -> valor)
+
+        Raises:
+            FormatoIndisponivelError: Se o arquivo for Parquet e o `pyarrow` não estiver instalado
+        """
+        linhas = self._linhas_parquet(tamanho_bloco) if self.parquet else self._linhas_csv()
+        linhas = itertools.islice(linhas, pular, None)
+        while True:
+            bloco = list(itertools.islice(linhas, tamanho_bloco))
+            if not bloco:
+                return
+            yield bloco
+
+    def _linhas_csv(self) -> Iterator[Dict[str, Any]]:
+        with open(self.caminho, encoding="utf-8-sig", newline="") as arquivo:
+            cabecalho = arquivo.readline()
+            separador = ";" if cabecalho.count(";") > cabecalho.count(",") else ","
+            arquivo.seek(0)
+            yield from csv.DictReader(arquivo, delimiter=separador)
+
+    def _linhas_parquet(self, tamanho_lote: int) -> Iterator[Dict[str, Any]]:
+        for lote in self._abrir_parquet().iter_batches(batch_size=tamanho_lote):
+            yield from lote.to_pylist()
+
+    def _abrir_parquet(self):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise FormatoIndisponivelError("Leitura de Parquet indisponível: instale o pacote 'pyarrow'")
+        return pq.ParquetFile(self.caminho)
+
+
+@dataclass
+class ProgressoLote:
+    """
+    Ponto de retomada de um recálculo em lote, gravado após cada bloco escrito.
+
+    Attributes:
+        entrada: Arquivo de planos do lote
+        linhas_processadas: Planos já escritos no arquivo de saída
+        bytes_saida: Tamanho do arquivo de saída após o último bloco confirmado
+            (na retomada, o que estiver além disso é descartado)
+        erros: Planos com erro até aqui
+        taxa_cdi_anual: Taxa CDI resolvida no início do lote
+        data_referencia: Mês inicial dos cálculos (AAAA-MM-DD), fixado no início do lote
+    """
+    entrada: str
+    linhas_processadas: int
+    bytes_saida: int
+    erros: int
+    taxa_cdi_anual: float
+    data_referencia: str
+
+    @classmethod
+    def carregar(cls, caminho: str) -> Optional["ProgressoLote"]:
+        """
+        Lê o ponto de retomada.
+
+        Returns:
+            Progresso gravado, ou None se o arquivo não existir
+
+        Raises:
+            ValueError: Se o arquivo estiver corrompido
+        """
+        if not os.path.exists(caminho):
+            return None
+        try:
+            with open(caminho, encoding="utf-8") as arquivo:
+                return cls(**json.load(arquivo))
+        except (TypeError, json.JSONDecodeError) as erro:
+            raise ValueError(f"Arquivo de progresso inválido ({caminho}): {erro}")
+
+    def salvar(self, caminho: str) -> None:
+        """Grava o ponto de retomada de forma atômica (arquivo temporário + rename)"""
+        temporario = caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump(asdict(self), arquivo)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, caminho)
@@ -0,0 +1,144 @@
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from src.infrastructure.observabilidade.rastreamento import Rastreamento
+
+
+class FormatadorJSON(logging.Formatter):
+    """
+    Formata cada registro como uma linha JSON.
+
+    Campos: timestamp, nivel, logger, mensagem, request_id (se houver), os
+    campos de `extra={"campos": {...}}` e a exceção formatada (se houver).
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        dados = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "mensagem": record.getMessage(),
+        }
+
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            dados["request_id"] = request_id
+
+        campos = getattr(record, "campos", None)
+        if campos:
+            dados.update(campos)
+
+        if record.exc_info:
+            dados["excecao"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            dados["excecao"] = record.exc_text
+
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+
+class FiltroRequestId(logging.Filter):
+    """Anexa ao registro o request ID da requisição em andamento"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = Rastreamento.request_id_atual()
+        return True
+
+
+class FilaLogHandler(QueueHandler):
+    """
+    QueueHandler que nunca bloqueia quem registra o log.
+
+    A formatação e a escrita ficam com o QueueListener, em uma thread própria.
+    Com a fila cheia o registro é descartado (e contado) em vez de segurar o
+    event loop. A exceção é formatada aqui, pois o traceback não atravessa a fila.
+    """
+
+    def __init__(self, fila: queue.Queue):
+        super().__init__(fila)
+        self.descartados = 0
+        self._formatador_excecao = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self._formatador_excecao.formatException(record.exc_info)
+
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.descartados += 1
+
+
+class ConfiguracaoLogs:
+    """
+    Configuração dos logs da aplicação.
+
+    O logger raiz passa a ter um único handler, não bloqueante, que enfileira os
+    registros; um QueueListener os formata (JSON por padrão) e escreve na saída
+    padrão em segundo plano.
+    """
+
+    FORMATO = os.environ.get("LOG_FORMATO", "json")
+    NIVEL = os.environ.get("LOG_NIVEL", "INFO").upper()
+    TAMANHO_FILA = int(os.environ.get("LOG_TAMANHO_FILA", 10000))
+
+    FORMATO_TEXTO = "%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"
+
+    _listener: Optional[QueueListener] = None
+    _handler: Optional[FilaLogHandler] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def configurar(cls) -> None:
+        """Instala o handler em fila no logger raiz (chamadas repetidas não fazem nada)"""
+        with cls._lock:
+            if cls._listener is not None:
+                return
+
+            saida = logging.StreamHandler(sys.stdout)
+            if cls.FORMATO == "json":
+                saida.setFormatter(FormatadorJSON())
+            else:
+                saida.setFormatter(logging.Formatter(cls.FORMATO_TEXTO))
+
+            fila: queue.Queue = queue.Queue(maxsize=cls.TAMANHO_FILA)
+            handler = FilaLogHandler(fila)
+            handler.addFilter(FiltroRequestId())
+
+            raiz = logging.getLogger()
+            for anterior in list(raiz.handlers):
+                raiz.removeHandler(anterior)
+            raiz.addHandler(handler)
+            raiz.setLevel(cls.NIVEL)
+
+            cls._handler = handler
+            cls._listener = QueueListener(fila, saida, respect_handler_level=True)
+            cls._listener.start()
+
+    @classmethod
+    def encerrar(cls) -> None:
+        """Escreve os registros pendentes e para a thread de escrita"""
+        with cls._lock:
+            listener, cls._listener = cls._listener, None
+        if listener is not None:
+            listener.stop()
+
+    @classmethod
+    def descartados(cls) -> int:
+        """Retorna quantos registros foram descartados por fila cheia"""
+        return cls._handler.descartados if cls._handler is not None else 0
@@ -0,0 +1,339 @@
+import asyncio
+import os
+import signal
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class PerfilEmAndamentoError(Exception):
+    """Lançada quando já há uma coleta de perfil em andamento"""
+
+
+def _arquivo_legivel(arquivo: str) -> str:
+    """Caminho relativo ao projeto ou ao site-packages (ou só o nome do arquivo)"""
+    marcador = "site-packages" + os.sep
+    if marcador in arquivo:
+        return arquivo.split(marcador, 1)[1]
+    if arquivo.startswith(os.getcwd() + os.sep):
+        return os.path.relpath(arquivo)
+    return os.path.basename(arquivo)
+
+
+class AmostradorPilhas:
+    """
+    Profiler por amostragem: a cada intervalo, lê a pilha de todas as threads
+    do processo (`sys._current_frames`) e conta cada pilha distinta.
+
+    Iniciado na thread principal (a do event loop no uvicorn) em sistemas com
+    `setitimer`, amostra no sinal SIGPROF, disparado a cada intervalo de tempo
+    de CPU do processo: o handler roda na thread principal entre duas
+    instruções, então a pilha do event loop é lida onde ela está. Nos demais
+    casos uma thread amostra a cada intervalo de tempo real; ela só obtém o
+    GIL quando a thread em execução o libera, o que favorece os pontos de E/S
+    e de espera nas pilhas das outras threads.
+
+    O código amostrado não é instrumentado. Em EXECUTOR_TIPO=processo os
+    cálculos rodam em outros processos e aparecem apenas como espera no pool.
+    """
+
+    # Funções em que uma thread está apenas esperando (folha da pilha): descartadas sem `ociosas`
+    FOLHAS_OCIOSAS = {
+        ("selectors.py", "select"),
+        ("threading.py", "wait"),
+        ("threading.py", "_wait_for_tstate_lock"),
+        ("queue.py", "get"),
+        ("thread.py", "_worker"),
+    }
+
+    def __init__(self, intervalo_segundos: float, incluir_ociosas: bool = False):
+        self.intervalo_segundos = intervalo_segundos
+        self.incluir_ociosas = incluir_ociosas
+        self.amostras = 0
+        self._contagens: Counter = Counter()
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._handler_anterior: Any = None
+        self._por_sinal = False
+
+    def iniciar(self) -> None:
+        """Inicia a amostragem (por sinal, se possível, ou em uma thread)"""
+        self._por_sinal = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+        if self._por_sinal:
+            self._handler_anterior = signal.signal(signal.SIGPROF, self._ao_sinal)
+            signal.setitimer(signal.ITIMER_PROF, self.intervalo_segundos, self.intervalo_segundos)
+            return
+        self._thread = threading.Thread(target=self._amostrar_em_thread, name="perfil", daemon=True)
+        self._thread.start()
+
+    def parar(self) -> str:
+        """
+        Para a amostragem.
+
+        Returns:
+            Pilhas colapsadas (uma linha "thread;quadro;...;quadro contagem" por pilha,
+            da raiz para a folha), no formato do flamegraph.pl, speedscope e similares
+        """
+        if self._por_sinal:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._handler_anterior or signal.SIG_DFL)
+        else:
+            self._parar.set()
+            if self._thread is not None:
+                self._thread.join()
+
+        rotulos: Dict[Any, str] = {}
+        linhas = []
+        for (thread, codigos), contagem in self._contagens.items():
+            quadros = [thread]
+            for codigo in codigos:
+                if codigo not in rotulos:
+                    rotulos[codigo] = self._rotulo(codigo)
+                quadros.append(rotulos[codigo])
+            linhas.append(f"{';'.join(quadros)} {contagem}")
+        linhas.sort()
+        return "\n".join(linhas) + ("\n" if linhas else "")
+
+    def _ao_sinal(self, _sinal: int, quadro: Any) -> None:
+        # A pilha da thread principal é a interrompida (`quadro`), não a do próprio handler
+        self._amostrar(threading.get_ident(), quadro)
+
+    def _amostrar_em_thread(self) -> None:
+        while not self._parar.wait(self.intervalo_segundos):
+            self._amostrar(threading.get_ident(), None)
+
+    def _amostrar(self, propria: int, quadro_proprio: Any) -> None:
+        """Conta a pilha atual de cada thread (a de `propria` é `quadro_proprio`, se houver)"""
+        nomes = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, quadro in sys._current_frames().items():
+            if ident == propria:
+                quadro = quadro_proprio
+            codigos = []
+            while quadro is not None:
+                codigos.append(quadro.f_code)
+                quadro = quadro.f_back
+            if not codigos or (not self.incluir_ociosas and self._ociosa(codigos[0])):
+                continue
+            codigos.reverse()
+            self._contagens[(nomes.get(ident, str(ident)), tuple(codigos))] += 1
+        self.amostras += 1
+
+    @classmethod
+    def _ociosa(cls, codigo: Any) -> bool:
+        return (os.path.basename(codigo.co_filename), codigo.co_name) in cls.FOLHAS_OCIOSAS
+
+    @staticmethod
+    def _rotulo(codigo: Any) -> str:
+        """Rótulo do quadro: função (arquivo:linha da definição), sem ";" """
+        rotulo = f"{codigo.co_name} ({_arquivo_legivel(codigo.co_filename)}:{codigo.co_firstlineno})"
+        return rotulo.replace(";", ",")
+
+
+class RastreadorAlocacoes:
+    """
+    Alocações por endpoint com tracemalloc.
+
+    A requisição rastreada compara um snapshot do início com um do fim e
+    acumula, por linha de código, a memória alocada durante a requisição e
+    ainda viva ao final (objetos retidos em caches, respostas em montagem etc.).
+    Uma requisição é rastreada por vez (cada snapshot custa milissegundos no
+    event loop); as que começam enquanto outra é rastreada passam sem registro,
+    mas suas alocações podem entrar na diferença da rastreada.
+    """
+
+    def __init__(self):
+        self.requisicoes: Counter = Counter()
+        # endpoint -> (arquivo, linha) -> [bytes, blocos]
+        self._alocacoes: Dict[str, Dict[Tuple[str, int], List[int]]] = {}
+        self._ja_rastreando = False
+        self._ocupado = False
+        # Alocações do próprio rastreamento, desconsideradas
+        self._ignorados = {tracemalloc.__file__, __file__}
+
+    def iniciar(self) -> None:
+        """Liga o tracemalloc (mantém ligado ao parar se já estava, ex: PYTHONTRACEMALLOC)"""
+        self._ja_rastreando = tracemalloc.is_tracing()
+        if not self._ja_rastreando:
+            tracemalloc.start()
+
+    def iniciar_requisicao(self) -> Optional[tracemalloc.Snapshot]:
+        """
+        Começa a rastrear uma requisição, se nenhuma outra estiver sendo rastreada.
+
+        Returns:
+            Snapshot inicial (a ser passado a `registrar`), ou None se a requisição não for rastreada
+        """
+        if self._ocupado or not tracemalloc.is_tracing():
+            return None
+        self._ocupado = True
+        return tracemalloc.take_snapshot()
+
+    def registrar(self, endpoint: str, antes: tracemalloc.Snapshot) -> None:
+        """
+        Acumula no endpoint as alocações feitas desde `antes` e libera o rastreamento.
+
+        Args:
+            endpoint: Identificação do endpoint (ex: "POST /api/v1/calcular_completo")
+            antes: Snapshot devolvido por `iniciar_requisicao`
+        """
+        try:
+            if not tracemalloc.is_tracing():
+                return
+            self.requisicoes[endpoint] += 1
+            sitios = self._alocacoes.setdefault(endpoint, {})
+            for estatistica in tracemalloc.take_snapshot().compare_to(antes, "lineno"):
+                quadro = estatistica.traceback[0]
+                if estatistica.size_diff <= 0 or quadro.filename in self._ignorados:
+                    continue
+                acumulado = sitios.setdefault((quadro.filename, quadro.lineno), [0, 0])
+                acumulado[0] += estatistica.size_diff
+                acumulado[1] += max(estatistica.count_diff, 0)
+        finally:
+            self._ocupado = False
+
+    def parar(self, maximo_sitios: int) -> Dict[str, Any]:
+        """
+        Desliga o tracemalloc e monta o relatório.
+
+        Args:
+            maximo_sitios: Quantidade de linhas de código listadas por endpoint
+
+        Returns:
+            Por endpoint: número de requisições rastreadas e as linhas que mais alocaram
+        """
+        if not self._ja_rastreando:
+            tracemalloc.stop()
+        relatorio = {}
+        for endpoint, sitios in sorted(self._alocacoes.items()):
+            maiores = sorted(sitios.items(), key=lambda item: item[1][0], reverse=True)[:maximo_sitios]
+            requisicoes = self.requisicoes[endpoint]
+            relatorio[endpoint] = {
+                "requisicoes": requisicoes,
+                "sitios": [
+                    {
+                        "arquivo": _arquivo_legivel(arquivo),
+                        "linha": linha,
+                        "kb_total": round(tamanho / 1024, 1),
+                        "kb_por_requisicao": round(tamanho / 1024 / requisicoes, 2),
+                        "blocos": blocos,
+                    }
+                    for (arquivo, linha), (tamanho, blocos) in maiores
+                ],
+            }
+        return relatorio
+
+
+class Perfilador:
+    """
+    Coleta de perfil sob demanda sobre o tráfego real (endpoint `/debug/profile`).
+
+    Modos:
+        - "cpu": amostragem de pilhas durante a janela (AmostradorPilhas)
+        - "memoria": alocações por endpoint com tracemalloc (RastreadorAlocacoes)
+
+    Fora de uma coleta não há thread de amostragem nem tracemalloc ligado; o
+    middleware de rastreamento só consulta `rastreador_alocacoes()`. Uma coleta
+    por vez por processo.
+    """
+
+    TOKEN = os.environ.get("DEBUG_TOKEN", "")
+    MAXIMO_SEGUNDOS = float(os.environ.get("DEBUG_PERFIL_MAXIMO_SEGUNDOS", 60))
+    INTERVALO_PADRAO_MS = float(os.environ.get("DEBUG_PERFIL_INTERVALO_MS", 5))
+    MODOS = ("cpu", "memoria")
+
+    _em_andamento = threading.Lock()
+    _rastreador: Optional[RastreadorAlocacoes] = None
+
+    @classmethod
+    def habilitado(cls) -> bool:
+        """Se o endpoint de perfil está habilitado (DEBUG_TOKEN definido)"""
+        return bool(cls.TOKEN)
+
+    @classmethod
+    def rastreador_alocacoes(cls) -> Optional[RastreadorAlocacoes]:
+        """Rastreador da coleta de memória em andamento, se houver"""
+        return cls._rastreador
+
+    @classmethod
+    def validar(cls, modo: str, segundos: float, intervalo_ms: float) -> None:
+        """
+        Valida os parâmetros da coleta.
+
+        Raises:
+            ValueError: Se algum parâmetro for inválido
+        """
+        if modo not in cls.MODOS:
+            raise ValueError(f"Modo de perfil inválido: {modo}. Use: {', '.join(cls.MODOS)}.")
+        if not 0 < segundos <= cls.MAXIMO_SEGUNDOS:
+            raise ValueError(f"A duração deve estar entre 0 e {cls.MAXIMO_SEGUNDOS:g} segundos.")
+        if not 1 <= intervalo_ms <= 1000:
+            raise ValueError("O intervalo de amostragem deve estar entre 1 e 1000 ms.")
+
+    @classmethod
+    async def coletar_cpu(cls, segundos: float, intervalo_ms: Optional[float] = None,
+                          incluir_ociosas: bool = False) -> Tuple[str, int]:
+        """
+        Amostra as pilhas de todas as threads durante a janela.
+
+        Args:
+            segundos: Duração da coleta
+            intervalo_ms: Intervalo entre amostras (padrão: DEBUG_PERFIL_INTERVALO_MS)
+            incluir_ociosas: Mantém as pilhas de threads apenas esperando
+
+        Returns:
+            Tupla (pilhas colapsadas, número de amostras)
+
+        Raises:
+            ValueError: Se algum parâmetro for inválido
+            PerfilEmAndamentoError: Se já houver uma coleta em andamento
+        """
+        intervalo_ms = intervalo_ms or cls.INTERVALO_PADRAO_MS
+        cls.validar("cpu", segundos, intervalo_ms)
+        cls._reservar()
+        try:
+            amostrador = AmostradorPilhas(intervalo_ms / 1000, incluir_ociosas)
+            amostrador.iniciar()
+            try:
+                await asyncio.sleep(segundos)
+            finally:
+                pilhas = amostrador.parar()
+            return pilhas, amostrador.amostras
+        finally:
+            cls._em_andamento.release()
+
+    @classmethod
+    async def coletar_memoria(cls, segundos: float, maximo_sitios: int = 10) -> Dict[str, Any]:
+        """
+        Rastreia as alocações das requisições atendidas durante a janela.
+
+        Args:
+            segundos: Duração da coleta
+            maximo_sitios: Linhas de código listadas por endpoint
+
+        Returns:
+            Relatório por endpoint (ver RastreadorAlocacoes.parar)
+
+        Raises:
+            ValueError: Se algum parâmetro for inválido
+            PerfilEmAndamentoError: Se já houver uma coleta em andamento
+        """
+        cls.validar("memoria", segundos, cls.INTERVALO_PADRAO_MS)
+        cls._reservar()
+        try:
+            rastreador = RastreadorAlocacoes()
+            rastreador.iniciar()
+            cls._rastreador = rastreador
+            try:
+                await asyncio.sleep(segundos)
+            finally:
+                cls._rastreador = None
+            return rastreador.parar(maximo_sitios)
+        finally:
+            cls._em_andamento.release()
+
+    @classmethod
+    def _reservar(cls) -> None:
+        if not cls._em_andamento.acquire(blocking=False):
+            raise PerfilEmAndamentoError("Já há uma coleta de perfil em andamento neste processo.")
@@ -0,0 +1,194 @@
+import contextvars
+import logging
+import os
+import random
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Etapa medida: (nome, início em ns desde a época, fim em ns desde a época)
+Etapa = Tuple[str, int, int]
+
+
+@dataclass
+class ContextoRequisicao:
+    """Estado de rastreamento de uma requisição HTTP"""
+    request_id: str
+    amostrada: bool
+    inicio_ns: int
+    etapas: List[Etapa] = field(default_factory=list)
+
+    def duracoes_ms(self) -> Dict[str, float]:
+        """Soma a duração (ms) das etapas registradas, por nome"""
+        duracoes: Dict[str, float] = {}
+        for nome, inicio, fim in self.etapas:
+            duracoes[nome] = duracoes.get(nome, 0.0) + (fim - inicio) / 1e6
+        return {nome: round(duracao, 3) for nome, duracao in duracoes.items()}
+
+
+_contexto: "contextvars.ContextVar[Optional[ContextoRequisicao]]" = contextvars.ContextVar(
+    "contexto_requisicao", default=None
+)
+
+
+class Rastreamento:
+    """
+    Rastreamento por requisição: request ID e tempo de cada etapa do cálculo.
+
+    O contexto da requisição vive em uma ContextVar, então fica disponível em
+    qualquer ponto do handler sem ser passado como argumento. Só uma fração das
+    requisições (RASTREAMENTO_AMOSTRAGEM) tem as etapas registradas; nas demais
+    `etapa` e `registrar_etapas` não fazem nada além de ler a ContextVar.
+
+    Com OTEL_HABILITADO=1 e o pacote `opentelemetry-api` instalado, as
+    requisições amostradas também geram spans OpenTelemetry (um por requisição
+    e um por etapa), exportados pelo SDK configurado na aplicação.
+    """
+
+    AMOSTRAGEM = float(os.environ.get("RASTREAMENTO_AMOSTRAGEM", 0.1))
+    OTEL_HABILITADO = os.environ.get("OTEL_HABILITADO", "0") == "1"
+    NOME_TRACER = "calculadora_rendimento"
+
+    _tracer: Any = None
+    _tracer_carregado = False
+
+    @classmethod
+    def iniciar(cls, request_id: Optional[str] = None) -> Tuple[ContextoRequisicao, contextvars.Token]:
+        """
+        Abre o contexto de uma requisição, sorteando se ela será amostrada.
+
+        Args:
+            request_id: ID recebido do cliente (padrão: 16 dígitos hexadecimais aleatórios)
+
+        Returns:
+            Tupla (contexto, token usado em `finalizar`)
+        """
+        contexto = ContextoRequisicao(
+            request_id=request_id or os.urandom(8).hex(),
+            amostrada=random.random() < cls.AMOSTRAGEM,
+            inicio_ns=time.time_ns()
+        )
+        return contexto, _contexto.set(contexto)
+
+    @staticmethod
+    def finalizar(token: contextvars.Token) -> None:
+        """Fecha o contexto aberto por `iniciar`"""
+        _contexto.reset(token)
+
+    @staticmethod
+    def contexto_atual() -> Optional[ContextoRequisicao]:
+        """Retorna o contexto da requisição em andamento, se houver"""
+        return _contexto.get()
+
+    @staticmethod
+    def request_id_atual() -> Optional[str]:
+        """Retorna o request ID da requisição em andamento, se houver"""
+        contexto = _contexto.get()
+        return contexto.request_id if contexto is not None else None
+
+    @classmethod
+    @contextmanager
+    def etapa(cls, nome: str) -> Iterator[None]:
+        """
+        Mede o bloco como uma etapa da requisição (somente se ela for amostrada).
+
+        Args:
+            nome: Nome da etapa (ex: "cdi")
+        """
+        contexto = _contexto.get()
+        if contexto is None or not contexto.amostrada:
+            yield
+            return
+
+        inicio = time.time_ns()
+        try:
+            yield
+        finally:
+            cls._registrar(contexto, (nome, inicio, time.time_ns()))
+
+    @classmethod
+    def registrar_etapas(cls, etapas: Iterable[Etapa]) -> None:
+        """
+        Registra etapas medidas em outro lugar (ex: em um trabalhador do pool de cálculos).
+
+        Args:
+            etapas: Tuplas (nome, início, fim) com instantes em ns desde a época
+        """
+        contexto = _contexto.get()
+        if contexto is None or not contexto.amostrada:
+            return
+        for etapa in etapas:
+            cls._registrar(contexto, etapa)
+
+    @classmethod
+    def registrar_desde_inicio(cls, nome: str) -> None:
+        """Registra como etapa o tempo entre o início da requisição e agora"""
+        contexto = _contexto.get()
+        if contexto is not None and contexto.amostrada:
+            cls._registrar(contexto, (nome, contexto.inicio_ns, time.time_ns()))
+
+    @classmethod
+    def registrar_desde_ultima_etapa(cls, nome: str) -> None:
+        """Registra como etapa o tempo entre o fim da última etapa registrada e agora"""
+        contexto = _contexto.get()
+        if contexto is not None and contexto.amostrada and contexto.etapas:
+            cls._registrar(contexto, (nome, contexto.etapas[-1][2], time.time_ns()))
+
+    @classmethod
+    @contextmanager
+    def span_requisicao(cls, nome: str, atributos: Dict[str, Any]) -> Iterator[None]:
+        """
+        Abre o span OpenTelemetry da requisição (pai dos spans das etapas).
+
+        Não faz nada se a requisição não for amostrada ou se o OpenTelemetry
+        estiver desabilitado ou não instalado.
+
+        Args:
+            nome: Nome do span (ex: "POST /api/v1/calcular_completo")
+            atributos: Atributos do span
+        """
+        contexto = _contexto.get()
+        tracer = cls._obter_tracer() if contexto is not None and contexto.amostrada else None
+        if tracer is None:
+            yield
+            return
+
+        with tracer.start_as_current_span(nome, attributes=atributos) as span:
+            span.set_attribute("request_id", contexto.request_id)
+            yield
+
+    @classmethod
+    def _registrar(cls, contexto: ContextoRequisicao, etapa: Etapa) -> None:
+        contexto.etapas.append(etapa)
+        tracer = cls._obter_tracer()
+        if tracer is not None:
+            nome, inicio, fim = etapa
+            tracer.start_span(nome, start_time=inicio).end(end_time=fim)
+
+    @classmethod
+    def _obter_tracer(cls) -> Any:
+        """Carrega o tracer OpenTelemetry na primeira chamada (None se indisponível)"""
+        if not cls._tracer_carregado:
+            cls._tracer_carregado = True
+            if cls.OTEL_HABILITADO:
+                try:
+                    from opentelemetry import trace
+                    cls._tracer = trace.get_tracer(cls.NOME_TRACER)
+                except ImportError:
+                    logging.error("Pacote 'opentelemetry-api' não instalado; spans desabilitados")
+        return cls._tracer
+
+    @classmethod
+    def encerrar(cls) -> None:
+        """Exporta os spans pendentes do SDK OpenTelemetry antes de o processo terminar"""
+        if cls._tracer is None:
+            return
+        try:
+            from opentelemetry import trace
+            provedor = trace.get_tracer_provider()
+            if hasattr(provedor, "force_flush"):
+                provedor.force_flush()
+        except Exception as erro:
+            logging.error(f"Erro ao exportar os spans pendentes: {str(erro)}")
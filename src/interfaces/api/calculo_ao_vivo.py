@@ -0,0 +1,89 @@
+import asyncio
+import os
+from typing import Any, Dict, List, Optional
+
+from src.interfaces.api.dtos.rendimento_dtos import (
+    CalculoJurosSaqueRequestDTO as CalculoResgateRequestDTO,
+    verificar_opcoes_aplicaveis
+)
+
+
+class SessaoCalculoAoVivo:
+    """
+    Estado de uma conexão do canal de recálculo ao vivo (/ws/calculo).
+
+    Guarda os parâmetros acumulados pelos patches do cliente e o último
+    resultado enviado, para que cada recálculo devolva apenas os valores do
+    resumo e as linhas do informe mensal que mudaram. Os patches apenas
+    sinalizam `alterado`; o recálculo é feito por uma única tarefa da conexão,
+    depois de `DEBOUNCE_SEGUNDOS` sem novos patches, e um resultado superado
+    por um patch mais recente é descartado sem ser enviado. Ao desconectar,
+    um cálculo em andamento não é interrompido: a tarefa termina depois dele.
+    """
+
+    DEBOUNCE_SEGUNDOS = float(os.environ.get("WS_CALCULO_DEBOUNCE_MS", 75)) / 1000
+    TAMANHO_MAXIMO_MENSAGEM = int(os.environ.get("WS_CALCULO_TAMANHO_MAXIMO_MENSAGEM", 8192))
+
+    def __init__(self):
+        self.parametros: Dict[str, Any] = {}
+        self.pendente: Optional[CalculoResgateRequestDTO] = None
+        self.seq_pendente: Any = None
+        self.alterado = asyncio.Event()
+        self.resumo: Dict[str, Any] = {}
+        self.linhas: List[Dict[str, Any]] = []
+        # Cálculo despachado e ainda não concluído / conexão encerrada pelo cliente
+        self.calculando = False
+        self.encerrada = False
+
+    def aplicar_patch(self, patch: Dict[str, Any], seq: Any) -> None:
+        """
+        Aplica um patch aos parâmetros e agenda o recálculo.
+
+        Campos com valor nulo voltam ao padrão. Se os parâmetros resultantes
+        forem inválidos, o estado não muda. `campos` não se aplica ao canal
+        (as respostas já são diferenças).
+
+        Args:
+            patch: Campos alterados (mesmos nomes de `/calcular_completo`)
+            seq: Identificador do patch, devolvido na resposta correspondente
+
+        Raises:
+            pydantic.ValidationError: Se os parâmetros resultantes forem inválidos
+            ValueError: Se o patch informar `campos`
+        """
+        parametros = {**self.parametros, **patch}
+        parametros = {campo: valor for campo, valor in parametros.items() if valor is not None}
+        pendente = CalculoResgateRequestDTO(**parametros)
+        verificar_opcoes_aplicaveis(pendente, ("campos",), "/ws/calculo")
+        self.pendente = pendente
+        self.parametros = parametros
+        self.seq_pendente = seq
+        self.alterado.set()
+
+    def diferenca(self, resposta: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compara uma resposta de `/calcular_completo` com a última enviada e
+        passa a considerá-la como enviada.
+
+        Args:
+            resposta: Resposta serializada (com `informe_mensal`)
+
+        Returns:
+            Dicionário com `resumo` (campos alterados; removidos como null),
+            `linhas` (índice -> linha, apenas as alteradas ou novas) e
+            `total_linhas` (o cliente descarta as linhas além desse total)
+        """
+        linhas = resposta.pop("informe_mensal", [])
+        resumo = {campo: valor for campo, valor in resposta.items() if self.resumo.get(campo) != valor}
+        resumo.update({campo: None for campo in self.resumo if campo not in resposta})
+
+        anteriores = self.linhas
+        alteradas = {
+            str(indice): linha
+            for indice, linha in enumerate(linhas)
+            if indice >= len(anteriores) or anteriores[indice] != linha
+        }
+
+        self.resumo = resposta
+        self.linhas = linhas
+        return {"resumo": resumo, "linhas": alteradas, "total_linhas": len(linhas)}
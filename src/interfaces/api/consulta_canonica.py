@@ -0,0 +1,133 @@
+import os
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, Dict, Optional, Tuple, Type
+from urllib.parse import urlencode
+
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+from starlette.datastructures import QueryParams
+
+from src.domain.value_objects.cotacao_cdi import CotacaoCDI
+from src.infrastructure.cache.purga_cdn import PurgaCDN
+
+
+class ConsultaCanonica:
+    """
+    Parâmetros de cálculo em query string, na forma canônica para cache.
+
+    A forma canônica tem os parâmetros em ordem alfabética, sem os que têm o
+    valor padrão e com números e booleanos escritos de um único jeito (`10000`,
+    `13.25`, `false`). Duas consultas com os mesmos parâmetros resultam na
+    mesma URL, e portanto na mesma entrada de cache da CDN. Listas (`campos`)
+    são escritas separadas por vírgula, em ordem alfabética.
+    """
+
+    @staticmethod
+    def interpretar(parametros: QueryParams, modelo: Type[BaseModel]) -> Tuple[BaseModel, str]:
+        """
+        Valida a query string com o DTO do cálculo e gera a sua forma canônica.
+
+        Args:
+            parametros: Parâmetros da query string
+            modelo: DTO da requisição POST equivalente
+
+        Returns:
+            Tupla (DTO validado, query string canônica)
+
+        Raises:
+            RequestValidationError: Se houver parâmetros desconhecidos, repetidos ou inválidos (422)
+        """
+        campos: Dict[str, Any] = {}
+        for nome, valor in parametros.multi_items():
+            if nome not in modelo.model_fields:
+                raise RequestValidationError([{
+                    "loc": ("query", nome), "msg": "Parâmetro desconhecido", "type": "value_error"
+                }])
+            if nome in campos:
+                raise RequestValidationError([{
+                    "loc": ("query", nome), "msg": "Parâmetro repetido", "type": "value_error"
+                }])
+            campos[nome] = valor
+
+        try:
+            dto = modelo(**campos)
+        except ValidationError as erro:
+            raise RequestValidationError(
+                [{**detalhe, "loc": ("query",) + tuple(detalhe["loc"])} for detalhe in erro.errors()]
+            )
+
+        alterados = dto.model_dump(exclude_defaults=True)
+        canonica = urlencode(
+            [(nome, ConsultaCanonica._formatar(alterados[nome])) for nome in sorted(alterados)], safe=","
+        )
+        return dto, canonica
+
+    @staticmethod
+    def _formatar(valor: Any) -> str:
+        """Escreve um valor na forma canônica"""
+        if isinstance(valor, bool):
+            return "true" if valor else "false"
+        if isinstance(valor, float):
+            return str(int(valor)) if valor.is_integer() else repr(valor)
+        if isinstance(valor, Enum):
+            return str(valor.value)
+        if isinstance(valor, list):
+            return ",".join(sorted(str(item) for item in valor))
+        return str(valor)
+
+
+class PoliticaCacheCalculo:
+    """
+    Cabeçalhos de cache das respostas dos GETs de cálculo.
+
+    O resultado depende apenas dos parâmetros, da taxa CDI (quando não
+    informada) e do mês corrente (início do cálculo). A CDN guarda a resposta
+    por até `S_MAXAGE` segundos, nunca além da meia-noite (a taxa é diária), e
+    a marca com Surrogate-Key: `calculos`, o mês de referência e, quando a
+    taxa vem do Banco Central, `cdi-<taxa>`, purgada pelo PurgaCDN quando a
+    taxa muda. Respostas com a taxa padrão (Banco Central indisponível) ficam
+    em cache por pouco tempo.
+    """
+
+    MAX_AGE = int(os.environ.get("CACHE_CALCULO_MAX_AGE", 60))
+    S_MAXAGE = int(os.environ.get("CACHE_CALCULO_S_MAXAGE", 3600))
+    S_MAXAGE_STALE = int(os.environ.get("CACHE_CALCULO_S_MAXAGE_STALE", 60))
+    STALE_WHILE_REVALIDATE = int(os.environ.get("CACHE_CALCULO_STALE_WHILE_REVALIDATE", 60))
+
+    # Validade do redirecionamento para a URL canônica (depende apenas da query string)
+    MAX_AGE_REDIRECIONAMENTO = 86400
+
+    @classmethod
+    def cabecalhos(cls, cotacao: Optional[CotacaoCDI], agora: Optional[datetime] = None) -> Dict[str, str]:
+        """
+        Gera os cabeçalhos de cache de uma resposta de cálculo.
+
+        Args:
+            cotacao: Cotação do CDI usada no cálculo, ou None se a taxa foi informada na consulta
+            agora: Data e hora da resposta (padrão: agora)
+
+        Returns:
+            Cabeçalhos Cache-Control e Surrogate-Key
+        """
+        agora = agora or datetime.now()
+        meia_noite = datetime.combine(agora.date() + timedelta(days=1), datetime.min.time())
+        s_maxage = cls.S_MAXAGE_STALE if cotacao is not None and cotacao.stale else cls.S_MAXAGE
+        s_maxage = max(0, min(s_maxage, int((meia_noite - agora).total_seconds())))
+
+        chaves = ["calculos", f"mes-{agora:%Y-%m}"]
+        if cotacao is not None:
+            chaves.append(PurgaCDN.chave_cdi(cotacao.valor))
+
+        return {
+            "Cache-Control": (
+                f"public, max-age={min(cls.MAX_AGE, s_maxage)}, s-maxage={s_maxage}, "
+                f"stale-while-revalidate={cls.STALE_WHILE_REVALIDATE}"
+            ),
+            "Surrogate-Key": " ".join(chaves),
+        }
+
+    @classmethod
+    def cabecalhos_redirecionamento(cls) -> Dict[str, str]:
+        """Cabeçalhos de cache do redirecionamento para a URL canônica"""
+        return {"Cache-Control": f"public, max-age={cls.MAX_AGE_REDIRECIONAMENTO}"}
@@ -1,29 +1,330 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import Dict
+import asyncio
+import functools
+import hmac
+import json
+import logging
+import math
+import os
+import tempfile
+import time
+from datetime import date
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, RedirectResponse, StreamingResponse
+from pydantic import ValidationError
+from starlette.background import BackgroundTask
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from src.interfaces.api.dtos.rendimento_dtos import (
     CalculoRendimentoRequestDTO,
     CalculoRendimentoResponseDTO,
     CalculoJurosSaqueRequestDTO as CalculoResgateRequestDTO,
-    CalculoResgateResponseDTO
+    CalculoResgateResponseDTO,
+    CalculoCompletoResponseDTO,
+    verificar_opcoes_aplicaveis
 )
 from src.interfaces.api.dtos.cdi_dtos import TaxaCDIResponseDTO
+from src.interfaces.api.dtos.comparacao_dtos import ComparacaoRequestDTO, ComparacaoResponseDTO
+from src.interfaces.api.dtos.exportacao_dtos import DialetoCSV, ExportacaoLoteRequestDTO, FormatoExportacao
+from src.interfaces.api.dtos.jobs_dtos import (
+    JobLoteRequestDTO,
+    JobParteResponseDTO,
+    JobResponseDTO,
+    JobVarreduraRequestDTO
+)
+from src.interfaces.api.dtos.cronograma_dtos import (
+    CronogramaCriadoResponseDTO,
+    LinhaCronogramaDTO,
+    IntervaloCronogramaResponseDTO,
+    LimiarCronogramaResponseDTO
+)
 
+from src.interfaces.api.calculo_ao_vivo import SessaoCalculoAoVivo
+from src.interfaces.api.consulta_canonica import ConsultaCanonica, PoliticaCacheCalculo
+from src.interfaces.api.materializacao import MaterializacaoCenarios
+from src.interfaces.api.middlewares.limite_taxa import LimiteTaxaMiddleware
+from src.interfaces.api.negociacao_conteudo import NegociacaoConteudo
+from src.interfaces.api.projecao_campos import ProjecaoCampos
+from src.interfaces.api.validacao_condicional import ValidacaoCondicional
 from src.interfaces.converters.dto_converters import DTOConverter
+from src.domain.entities.models import (
+    ParametrosCalculoRendimento,
+    ParametrosCalculoJurosSaque as ParametrosCalculoResgate,
+    ParametrosComparacao
+)
 from src.application.rendimento_use_case import RendimentoUseCase
+from src.application.resgate_use_case import ResgateUseCase
+from src.application.calculo_completo_use_case import CalculoCompletoUseCase
+from src.application.comparacao_use_case import ComparacaoUseCase
+from src.application.cronograma_use_case import CronogramaUseCase, CronogramaNaoEncontradoError
+from src.application.cronograma_arrow_use_case import CronogramaArrowUseCase
+from src.application.exportacao_use_case import ExportacaoUseCase
+from src.application.jobs_use_case import FilaJobsCheiaError, JobNaoEncontradoError, JobsUseCase
+from src.application.aquecimento_use_case import AquecimentoUseCase
+from src.application.estimativa_custo import EstimadorCusto
 from src.infrastructure.external.bcb_service import CDIService
+from src.infrastructure.external.ipca_service import IPCAService
+from src.infrastructure.execucao.executor_calculos import ExecutorCalculos, ExecutorSaturadoError
+from src.infrastructure.exportacao.binarios import SerializadorArrow, SerializadorMsgPack
+from src.infrastructure.exportacao.escritores import EscritorCSV, FormatoIndisponivelError, criar_escritor
+from src.infrastructure.observabilidade.perfil import Perfilador, PerfilEmAndamentoError
+from src.infrastructure.observabilidade.rastreamento import Rastreamento
 
 
 router = APIRouter(tags=["cálculos financeiros"])
 
+# Segundos sugeridos ao cliente no Retry-After quando o pool de cálculos está cheio
+RETRY_AFTER_SATURADO = "1"
+
+# Espera (segundos) entre tentativas de obter vaga no pool durante a transmissão de um CSV
+ESPERA_VAGA_STREAMING = 0.05
+
+# Diretório dos arquivos XLSX/Parquet temporários (padrão: o do sistema)
+DIRETORIO_EXPORTACAO = os.environ.get("EXPORTACAO_DIRETORIO_TEMPORARIO") or None
+
+# Formatos binários documentados nos endpoints de cálculo (negociados pelo cabeçalho Accept)
+RESPOSTAS_BINARIAS = {
+    200: {
+        "content": {
+            SerializadorMsgPack.MEDIA_TYPE: {},
+            SerializadorArrow.MEDIA_TYPE: {},
+        }
+    },
+    406: {"description": "Nenhum formato aceito pelo cliente está disponível"},
+}
+
+# Segundos sugeridos ao cliente no Retry-After quando a fila de jobs está cheia
+RETRY_AFTER_FILA_JOBS = "30"
+
+# Intervalo (segundos) entre consultas ao estado do job no fluxo de eventos e entre pings sem mudanças
+INTERVALO_EVENTOS_JOB = float(os.environ.get("JOBS_INTERVALO_EVENTOS", 0.5))
+INTERVALO_PING_EVENTOS = 15.0
+
+
+# Opções dos DTOs de cálculo que só os endpoints de cálculo aplicam: o formato da resposta e
+# os valores reais (IPCA), que os demais endpoints não calculam
+OPCOES_EXCLUSIVAS_CALCULO = ("campos", "granularidade", "ajustar_inflacao")
+
+
+def _verificar_opcoes(dto: Any, opcoes: Tuple[str, ...], destino: str) -> None:
+    """
+    Rejeita opções do DTO de cálculo que o endpoint não aplica (ver `verificar_opcoes_aplicaveis`).
+    
+    Raises:
+        HTTPException: 400 se alguma das opções tiver sido informada
+    """
+    try:
+        verificar_opcoes_aplicaveis(dto, opcoes, destino)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def _medir_etapas(calcular: Callable[[Any], Any], converter: Optional[Callable[[Any], Any]],
+                  argumento: Any) -> Tuple[Any, Tuple]:
+    """
+    Executa o caso de uso e a conversão para DTO, medindo cada etapa.
+    
+    Os tempos voltam junto com o resultado porque o trabalhador pode estar em
+    outro processo, fora do contexto de rastreamento da requisição.
+    
+    Returns:
+        Tupla (resultado, etapas no formato (nome, início, fim) em ns desde a época)
+    """
+    inicio = time.time_ns()
+    resultado = calcular(argumento)
+    fim_calculo = time.time_ns()
+    if converter is None:
+        return resultado, (("calculo", inicio, fim_calculo),)
+    
+    resultado = converter(resultado)
+    return resultado, (("calculo", inicio, fim_calculo), ("conversao", fim_calculo, time.time_ns()))
+
+
+def _executar_calculo_rendimento(parametros: ParametrosCalculoRendimento) -> Tuple[CalculoRendimentoResponseDTO, Tuple]:
+    """Cálculo de rendimento + conversão para DTO (executado no pool de cálculos)"""
+    return _medir_etapas(RendimentoUseCase.calcular_rendimento, DTOConverter.to_calculo_response, parametros)
+
+
+def _executar_calculo_resgate(parametros: ParametrosCalculoRendimento) -> Tuple[CalculoResgateResponseDTO, Tuple]:
+    """Cálculo de resgate + conversão para DTO (executado no pool de cálculos)"""
+    return _medir_etapas(ResgateUseCase.calcular_impostos_resgate, DTOConverter.to_resgate_response, parametros)
+
+
+def _executar_calculo_completo(parametros: ParametrosCalculoRendimento) -> Tuple[CalculoCompletoResponseDTO, Tuple]:
+    """Cálculo completo + conversão para DTO (executado no pool de cálculos)"""
+    return _medir_etapas(CalculoCompletoUseCase.calcular_completo, DTOConverter.to_completo_response, parametros)
+
+
+def _executar_comparacao(parametros: ParametrosComparacao) -> Tuple[ComparacaoResponseDTO, Tuple]:
+    """Comparação de cenários + conversão para DTO (executado no pool de cálculos)"""
+    return _medir_etapas(ComparacaoUseCase.comparar, DTOConverter.to_comparacao_response, parametros)
+
+
+def _executar_cronograma(parametros: ParametrosCalculoRendimento) -> Tuple[Any, Tuple]:
+    """Cálculo do cronograma (executado no pool de cálculos)"""
+    return _medir_etapas(CronogramaUseCase.calcular, None, parametros)
+
+
+async def _despachar_calculo(funcao, parametros: ParametrosCalculoRendimento, operacao: str,
+                             argumento: Any = None, lote: int = 1) -> Any:
+    """
+    Resolve a taxa CDI e despacha o cálculo para o ExecutorCalculos.
+    
+    A taxa é obtida antes do despacho (em uma thread, pois a consulta ao Banco
+    Central é bloqueante) para que os trabalhadores do pool, inclusive em modo
+    processo, não consultem a API nem dependam do cache deste processo. Se o
+    ajuste pela inflação for pedido, a série do IPCA também é atualizada antes.
+    
+    Args:
+        funcao: Função que executa o caso de uso e converte o resultado (ver `_medir_etapas`)
+        parametros: Parâmetros do plano (taxa resolvida e custo estimado a partir deles)
+        operacao: Operação usada na estimativa de custo
+        argumento: Argumento passado à função (padrão: `parametros`)
+        lote: Quantidade de cálculos sobre o mesmo plano
+    
+    Raises:
+        HTTPException: 503 se o pool de cálculos e sua fila estiverem cheios
+    """
+    # Leitura do corpo, validação do DTO e conversão para o modelo de domínio
+    Rastreamento.registrar_desde_inicio("validacao")
+    
+    loop = asyncio.get_running_loop()
+    if parametros.taxa_cdi_anual is None:
+        with Rastreamento.etapa("cdi"):
+            parametros.taxa_cdi_anual = await loop.run_in_executor(None, CDIService.obter_cdi_anual)
+    if parametros.ajustar_inflacao:
+        # Atualiza a série do IPCA (rede/disco) fora do event loop
+        with Rastreamento.etapa("ipca"):
+            await loop.run_in_executor(None, IPCAService.obter_serie)
+    
+    try:
+        despacho = time.time_ns()
+        resultado, etapas = await ExecutorCalculos.executar(
+            funcao,
+            parametros if argumento is None else argumento,
+            custo=EstimadorCusto.estimar(parametros, operacao, lote)
+        )
+        # Espera pelo trabalhador do pool (zero quando o cálculo roda inline)
+        Rastreamento.registrar_etapas((("fila", despacho, etapas[0][1]),) + etapas)
+        return resultado
+    except ExecutorSaturadoError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": RETRY_AFTER_SATURADO}
+        )
+
+
+def _executar_arrow_rendimento(parametros: ParametrosCalculoRendimento) -> Tuple[bytes, Tuple]:
+    """Cronograma de rendimento em Arrow IPC (executado no pool de cálculos)"""
+    return _medir_etapas(_serializar_arrow_rendimento, None, parametros)
+
+
+def _executar_arrow_resgate(parametros: ParametrosCalculoRendimento) -> Tuple[bytes, Tuple]:
+    """Cronograma de resgate em Arrow IPC (executado no pool de cálculos)"""
+    return _medir_etapas(_serializar_arrow_resgate, None, parametros)
+
+
+def _executar_arrow_completo(parametros: ParametrosCalculoRendimento) -> Tuple[bytes, Tuple]:
+    """Cronograma completo em Arrow IPC (executado no pool de cálculos)"""
+    return _medir_etapas(_serializar_arrow_completo, None, parametros)
+
+
+def _serializar_arrow_rendimento(parametros: ParametrosCalculoRendimento) -> bytes:
+    return CronogramaArrowUseCase.serializar(parametros, "rendimento")
+
+
+def _serializar_arrow_resgate(parametros: ParametrosCalculoRendimento) -> bytes:
+    return CronogramaArrowUseCase.serializar(parametros, "resgate")
+
+
+def _serializar_arrow_completo(parametros: ParametrosCalculoRendimento) -> bytes:
+    return CronogramaArrowUseCase.serializar(parametros, "completo")
+
+
+# Função do pool que gera a resposta Arrow de cada operação
+EXECUTORES_ARROW = {
+    "rendimento": _executar_arrow_rendimento,
+    "resgate": _executar_arrow_resgate,
+    "completo": _executar_arrow_completo,
+}
+
+
+# DTO de resposta de cada operação (campos aceitos em `campos`)
+MODELOS_RESPOSTA = {
+    "rendimento": CalculoRendimentoResponseDTO,
+    "resgate": CalculoResgateResponseDTO,
+    "completo": CalculoCompletoResponseDTO,
+}
+
+
+async def _responder_calculo(request: Request, response: Response, funcao,
+                             parametros: ParametrosCalculoRendimento, operacao: str,
+                             campos: Optional[List[str]] = None) -> Any:
+    """
+    Executa o cálculo e responde no formato negociado pelo cabeçalho Accept.
+    
+    JSON e MessagePack usam o DTO de resposta, reduzido aos `campos` pedidos;
+    Arrow monta as colunas direto da calculadora, sem DTO. Em JSON sem
+    `campos`, os cenários materializados são respondidos da memória (ver
+    `MaterializacaoCenarios`). A resposta varia com o Accept (`Vary: Accept`).
+    
+    Raises:
+        ValueError: Se algum dos `campos` não existir na resposta
+        HTTPException: 406 se nenhum formato aceito pelo cliente estiver disponível
+    """
+    formato = NegociacaoConteudo.escolher(request.headers.get("accept"))
+    if formato is None:
+        raise HTTPException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail="Formatos disponíveis: " + ", ".join(
+                NegociacaoConteudo.TIPOS[formato][0] for formato in NegociacaoConteudo.disponiveis()
+            )
+        )
+    
+    if formato == "arrow":
+        corpo = await _despachar_calculo(EXECUTORES_ARROW[operacao], parametros, operacao)
+        return Response(corpo, media_type=SerializadorArrow.MEDIA_TYPE, headers={"Vary": "Accept"})
+    
+    if formato == "json" and campos is None:
+        corpo = MaterializacaoCenarios.consultar(operacao, parametros)
+        if corpo is not None:
+            return Response(corpo, media_type="application/json", headers={"Vary": "Accept"})
+    
+    selecao = None
+    if campos is not None:
+        modelo = MODELOS_RESPOSTA[operacao]
+        ProjecaoCampos.validar(campos, modelo)
+        selecao = ProjecaoCampos.incluir(campos, modelo)
+        if not ProjecaoCampos.inclui_linhas(campos, modelo):
+            # Sem o informe na resposta, o cálculo registra apenas o último mês
+            parametros.granularidade = "final"
+    
+    resultado = await _despachar_calculo(funcao, parametros, operacao)
+    if formato == "msgpack":
+        with Rastreamento.etapa("serializacao"):
+            corpo = SerializadorMsgPack.serializar(jsonable_encoder(resultado, include=selecao, exclude_none=True))
+        return Response(corpo, media_type=SerializadorMsgPack.MEDIA_TYPE, headers={"Vary": "Accept"})
+    
+    if selecao is not None:
+        with Rastreamento.etapa("serializacao"):
+            return JSONResponse(jsonable_encoder(resultado, include=selecao, exclude_none=True),
+                                headers={"Vary": "Accept"})
+    
+    response.headers["Vary"] = "Accept"
+    return resultado
+
 
 @router.post(
     "/calcular_rendimento", 
     response_model=CalculoRendimentoResponseDTO,
     summary="Calcula rendimentos de investimento",
-    status_code=status.HTTP_200_OK
+    status_code=status.HTTP_200_OK,
+    response_model_exclude_none=True,
+    responses=RESPOSTAS_BINARIAS
 )
-async def calcular_rendimento(request_dto: CalculoRendimentoRequestDTO) -> CalculoRendimentoResponseDTO:
+async def calcular_rendimento(request_dto: CalculoRendimentoRequestDTO, request: Request, response: Response) -> CalculoRendimentoResponseDTO:
     """
     Calcula o rendimento de um investimento com base nos parâmetros fornecidos.
     
@@ -33,6 +334,8 @@ async def calcular_rendimento(request_dto: CalculoRendimentoRequestDTO) -> Calcu
     - **ano_final**: Ano final para o cálculo
     - **mes_final**: Mês final para o cálculo (1-12)
     - **taxa_cdi_anual**: (Opcional) Taxa de CDI anual. Se não fornecida, usa a taxa atual.
+    - **granularidade**: (Opcional) 'mensal' (padrão), 'trimestral' ou 'anual'
+    - **campos**: (Opcional) Campos da resposta; sem colunas do informe, apenas os totais
     
     Returns:
         CalculoRendimentoResponseDTO: Detalhes do cálculo, incluindo o informe mensal e totais
@@ -41,18 +344,19 @@ async def calcular_rendimento(request_dto: CalculoRendimentoRequestDTO) -> Calcu
         # Converte DTO para modelo de domínio
         parametros_calculo = DTOConverter.to_parametros_calculo(request_dto)
         
-        # Executa o cálculo usando o caso de uso
-        resultado = RendimentoUseCase.calcular_rendimento(parametros_calculo)
-        
-        # Converte resultado do domínio para DTO de resposta
-        return DTOConverter.to_calculo_response(resultado)
+        # Executa o cálculo (inline ou no pool, conforme o custo) no formato pedido em Accept
+        return await _responder_calculo(
+            request, response, _executar_calculo_rendimento, parametros_calculo, "rendimento", request_dto.campos
+        )
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, 
             detail=str(e)
         )
-    except Exception as e:
-        # Em um sistema real, registraria o erro em log
+    except Exception:
+        logging.exception("Erro interno em /calcular_rendimento")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Erro interno ao processar a solicitação"
@@ -63,9 +367,11 @@ async def calcular_rendimento(request_dto: CalculoRendimentoRequestDTO) -> Calcu
     "/calcular_resgate", 
     response_model=CalculoResgateResponseDTO,
     summary="Calcula impostos de resgate",
-    status_code=status.HTTP_200_OK
+    status_code=status.HTTP_200_OK,
+    response_model_exclude_none=True,
+    responses=RESPOSTAS_BINARIAS
 )
-async def calcular_resgate(request_dto: CalculoResgateRequestDTO) -> CalculoResgateResponseDTO:
+async def calcular_resgate(request_dto: CalculoResgateRequestDTO, request: Request, response: Response) -> CalculoResgateResponseDTO:
     """
     Calcula os impostos que seriam pagos para resgatar o dinheiro a cada mês.
     
@@ -77,6 +383,8 @@ async def calcular_resgate(request_dto: CalculoResgateRequestDTO) -> CalculoResg
     - **taxa_cdi_anual**: (Opcional) Taxa de CDI anual. Se não fornecida, usa a taxa atual.
     - **considerar_ir**: (Opcional) Se deve considerar o IR (padrão: True)
     - **considerar_iof**: (Opcional) Se deve considerar o IOF (padrão: True)
+    - **granularidade**: (Opcional) 'mensal' (padrão), 'trimestral' ou 'anual'
+    - **campos**: (Opcional) Campos da resposta; sem colunas do informe, apenas os totais
     
     Returns:
         CalculoResgateResponseDTO: Detalhes do cálculo, incluindo o informe mensal e impostos de resgate
@@ -85,45 +393,883 @@ async def calcular_resgate(request_dto: CalculoResgateRequestDTO) -> CalculoResg
         # Converte DTO para modelo de domínio
         parametros_calculo = DTOConverter.to_parametros_resgate(request_dto)
         
-        # Executa o cálculo usando o caso de uso
-        from src.application.resgate_use_case import ResgateUseCase
-        resultado = ResgateUseCase.calcular_impostos_resgate(parametros_calculo)
+        # Executa o cálculo (inline ou no pool, conforme o custo) no formato pedido em Accept
+        return await _responder_calculo(
+            request, response, _executar_calculo_resgate, parametros_calculo, "resgate", request_dto.campos
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, 
+            detail=str(e)
+        )
+    except Exception:
+        logging.exception("Erro interno em /calcular_resgate")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao processar a solicitação"
+        )
+
+
+async def _calcular_por_consulta(request: Request, response: Response, modelo, calcular):
+    """
+    Executa um cálculo pedido via GET, com os parâmetros na query string.
+    
+    Consultas fora da forma canônica são redirecionadas (308) para a URL
+    canônica, para que a CDN guarde uma única cópia por combinação de
+    parâmetros; a resposta leva os cabeçalhos de cache da PoliticaCacheCalculo.
+    
+    Args:
+        request: Requisição GET
+        response: Resposta (recebe os cabeçalhos de cache)
+        modelo: DTO da requisição POST equivalente
+        calcular: Handler POST equivalente
+    """
+    request_dto, canonica = ConsultaCanonica.interpretar(request.query_params, modelo)
+    if request.url.query != canonica:
+        return RedirectResponse(
+            f"{request.url.path}?{canonica}",
+            status_code=status.HTTP_308_PERMANENT_REDIRECT,
+            headers=PoliticaCacheCalculo.cabecalhos_redirecionamento()
+        )
+    
+    # A cotação usada no cálculo define a surrogate key da resposta
+    cotacao = None
+    if request_dto.taxa_cdi_anual is None:
+        with Rastreamento.etapa("cdi"):
+            cotacao = await asyncio.get_running_loop().run_in_executor(None, CDIService.obter_cotacao)
+        request_dto.taxa_cdi_anual = cotacao.valor
+    
+    resultado = await calcular(request_dto, request, response)
+    # Respostas binárias são devolvidas prontas (ver `_responder_calculo`)
+    destino = resultado if isinstance(resultado, Response) else response
+    destino.headers.update(PoliticaCacheCalculo.cabecalhos(cotacao))
+    return resultado
+
+
+@router.get(
+    "/calcular_rendimento",
+    response_model=CalculoRendimentoResponseDTO,
+    summary="Calcula rendimentos de investimento (cacheável)",
+    status_code=status.HTTP_200_OK,
+    response_model_exclude_none=True,
+    responses={**RESPOSTAS_BINARIAS, 308: {"description": "Redirecionamento para a URL canônica"}}
+)
+async def consultar_rendimento(
+    request: Request,
+    response: Response,
+    valor_inicial: float = Query(..., description="Valor inicial do investimento"),
+    aporte_mensal: float = Query(..., description="Valor aportado mensalmente"),
+    ano_final: int = Query(..., description="Ano final para o cálculo"),
+    mes_final: int = Query(..., description="Mês final para o cálculo (1-12)"),
+    taxa_cdi_anual: Optional[float] = Query(None, description="Taxa de CDI anual; se omitida, usa a taxa atual"),
+    percentual_sobre_cdi: Optional[float] = Query(None, description="Percentual sobre o CDI (padrão: 100)"),
+    aritmetica: Optional[str] = Query(None, description="Aritmética monetária: 'float' ou 'centavos'"),
+    ajustar_inflacao: Optional[bool] = Query(None, description="Inclui os valores reais (IPCA)"),
+    granularidade: Optional[str] = Query(None, description="'mensal' (padrão), 'trimestral' ou 'anual'"),
+    campos: Optional[str] = Query(None, description="Campos da resposta, separados por vírgula")
+) -> CalculoRendimentoResponseDTO:
+    """
+    Mesmo cálculo de `POST /calcular_rendimento`, com os parâmetros na query
+    string, para ser guardado em cache por CDNs e proxies reversos.
+    
+    A URL canônica tem os parâmetros em ordem alfabética, sem os de valor
+    padrão e com números sem zeros supérfluos (`valor_inicial=10000`); outras
+    formas recebem `308` para a canônica. A resposta traz `Cache-Control` e
+    `Surrogate-Key` (com a versão `cdi-<taxa>` quando a taxa não é informada).
+    """
+    return await _calcular_por_consulta(request, response, CalculoRendimentoRequestDTO, calcular_rendimento)
+
+
+@router.get(
+    "/calcular_resgate",
+    response_model=CalculoResgateResponseDTO,
+    summary="Calcula impostos de resgate (cacheável)",
+    status_code=status.HTTP_200_OK,
+    response_model_exclude_none=True,
+    responses={**RESPOSTAS_BINARIAS, 308: {"description": "Redirecionamento para a URL canônica"}}
+)
+async def consultar_resgate(
+    request: Request,
+    response: Response,
+    valor_inicial: float = Query(..., description="Valor inicial do investimento"),
+    aporte_mensal: float = Query(..., description="Valor aportado mensalmente"),
+    ano_final: int = Query(..., description="Ano final para o cálculo"),
+    mes_final: int = Query(..., description="Mês final para o cálculo (1-12)"),
+    taxa_cdi_anual: Optional[float] = Query(None, description="Taxa de CDI anual; se omitida, usa a taxa atual"),
+    percentual_sobre_cdi: Optional[float] = Query(None, description="Percentual sobre o CDI (padrão: 100)"),
+    considerar_ir: Optional[bool] = Query(None, description="Considera o IR (padrão: true)"),
+    considerar_iof: Optional[bool] = Query(None, description="Considera o IOF (padrão: true)"),
+    aritmetica: Optional[str] = Query(None, description="Aritmética monetária: 'float' ou 'centavos'"),
+    ajustar_inflacao: Optional[bool] = Query(None, description="Inclui os valores reais (IPCA)"),
+    produto: Optional[str] = Query(None, description="Produto do investimento (ex: CDB, LCI, LCA)"),
+    granularidade: Optional[str] = Query(None, description="'mensal' (padrão), 'trimestral' ou 'anual'"),
+    campos: Optional[str] = Query(None, description="Campos da resposta, separados por vírgula")
+) -> CalculoResgateResponseDTO:
+    """
+    Mesmo cálculo de `POST /calcular_resgate`, com os parâmetros na query
+    string, para ser guardado em cache por CDNs e proxies reversos (ver
+    `GET /calcular_rendimento`).
+    """
+    return await _calcular_por_consulta(request, response, CalculoResgateRequestDTO, calcular_resgate)
+
+
+@router.post(
+    "/calcular_completo", 
+    response_model=CalculoCompletoResponseDTO,
+    summary="Calcula rendimentos e impostos de resgate em uma única chamada",
+    status_code=status.HTTP_200_OK,
+    response_model_exclude_none=True,
+    responses=RESPOSTAS_BINARIAS
+)
+async def calcular_completo(request_dto: CalculoResgateRequestDTO, request: Request, response: Response) -> CalculoCompletoResponseDTO:
+    """
+    Calcula, em uma única passada, o rendimento bruto e os impostos de resgate de cada mês.
+    
+    Recebe os mesmos parâmetros de `/calcular_resgate` e substitui a sequência
+    `/calcular_rendimento` + `/calcular_resgate` usada pela página.
+    
+    Parameters:
+    - **valor_inicial**: Valor inicial do investimento
+    - **aporte_mensal**: Valor aportado mensalmente
+    - **ano_final**: Ano final para o cálculo
+    - **mes_final**: Mês final para o cálculo (1-12)
+    - **taxa_cdi_anual**: (Opcional) Taxa de CDI anual. Se não fornecida, usa a taxa atual.
+    - **considerar_ir**: (Opcional) Se deve considerar o IR (padrão: True)
+    - **considerar_iof**: (Opcional) Se deve considerar o IOF (padrão: True)
+    - **granularidade**: (Opcional) 'mensal' (padrão), 'trimestral' ou 'anual'
+    - **campos**: (Opcional) Campos da resposta; sem colunas do informe, apenas os totais
+    
+    Returns:
+        CalculoCompletoResponseDTO: Rendimento, alíquota de IR, IOF, imposto e valor líquido de cada mês
+    """
+    try:
+        # Converte DTO para modelo de domínio
+        parametros_calculo = DTOConverter.to_parametros_resgate(request_dto)
+        
+        # Executa o cálculo (inline ou no pool, conforme o custo) no formato pedido em Accept
+        return await _responder_calculo(
+            request, response, _executar_calculo_completo, parametros_calculo, "completo", request_dto.campos
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, 
+            detail=str(e)
+        )
+    except Exception:
+        logging.exception("Erro interno em /calcular_completo")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao processar a solicitação"
+        )
+
+
+@router.websocket("/ws/calculo")
+async def calculo_ao_vivo(websocket: WebSocket):
+    """
+    Canal de recálculo ao vivo para interfaces com controles deslizantes.
+    
+    O cliente envia patches de parâmetros (mesmos campos de `/calcular_completo`):
+    `{"tipo": "parametros", "seq": 1, "parametros": {"aporte_mensal": 600}}`.
+    Depois de uma pausa sem novos patches, o servidor recalcula e responde
+    `{"tipo": "diff", "seq": 1, "resumo": {...}, "linhas": {"0": {...}}, "total_linhas": 24}`
+    apenas com os valores do resumo e as linhas que mudaram. Patches inválidos
+    recebem `{"tipo": "erro", "seq": 1, "status": 422, "detail": [...]}`.
+    
+    Cada recálculo consome o seu custo do limite de taxa do cliente; sem
+    tokens, a resposta é `{"tipo": "erro", "status": 429, "retry_after": 1, ...}`
+    e o cálculo só é refeito com o próximo patch.
+    """
+    await websocket.accept()
+    sessao = SessaoCalculoAoVivo()
+    envio = asyncio.Lock()
+    
+    async def enviar(mensagem: Dict[str, Any]) -> None:
+        async with envio:
+            try:
+                await websocket.send_json(mensagem)
+            except (RuntimeError, OSError):
+                # Conexão já encerrada: o laço de recepção encerra a sessão
+                pass
+    
+    consumir = websocket.scope.get(LimiteTaxaMiddleware.CHAVE_ESCOPO)
+    tarefa = asyncio.create_task(_recalcular_ao_vivo(sessao, enviar, consumir))
+    try:
+        while True:
+            texto = await websocket.receive_text()
+            seq = None
+            try:
+                if len(texto) > sessao.TAMANHO_MAXIMO_MENSAGEM:
+                    raise ValueError("Mensagem muito grande")
+                try:
+                    mensagem = json.loads(texto)
+                except ValueError:
+                    raise ValueError("Mensagem inválida: JSON malformado")
+                if not isinstance(mensagem, dict) or mensagem.get("tipo") != "parametros":
+                    raise ValueError("Mensagem inválida: use {\"tipo\": \"parametros\", \"parametros\": {...}}")
+                seq = mensagem.get("seq")
+                patch = mensagem.get("parametros")
+                if not isinstance(patch, dict):
+                    raise ValueError("O campo 'parametros' deve ser um objeto")
+                sessao.aplicar_patch(patch, seq)
+            except ValidationError as e:
+                await enviar({"tipo": "erro", "seq": seq, "status": 422, "detail": jsonable_encoder(e.errors())})
+            except ValueError as e:
+                await enviar({"tipo": "erro", "seq": seq, "status": 400, "detail": str(e)})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if sessao.calculando:
+            # O cálculo despachado termina (e libera sua vaga no pool) antes da tarefa
+            sessao.encerrada = True
+        else:
+            tarefa.cancel()
+
+
+async def _recalcular_ao_vivo(sessao: SessaoCalculoAoVivo, enviar: Callable[[Dict[str, Any]], Any],
+                             consumir: Optional[Callable[[float], Any]] = None) -> None:
+    """
+    Tarefa de recálculo de uma conexão de `/ws/calculo`.
+    
+    Há no máximo um cálculo em andamento por conexão: patches que chegam
+    durante a pausa reiniciam a espera, e um resultado que fica desatualizado
+    durante o cálculo é descartado (o próximo ciclo recalcula com os
+    parâmetros mais recentes). O custo de cada cálculo é consumido com
+    `consumir` (do LimiteTaxaMiddleware; None sem limite de taxa).
+    """
+    while not sessao.encerrada:
+        await sessao.alterado.wait()
+        sessao.alterado.clear()
+        await asyncio.sleep(sessao.DEBOUNCE_SEGUNDOS)
+        if sessao.alterado.is_set():
+            continue
+        
+        requisicao, seq = sessao.pendente, sessao.seq_pendente
+        try:
+            parametros_calculo = DTOConverter.to_parametros_resgate(requisicao)
+            if consumir is not None:
+                espera = await consumir(EstimadorCusto.estimar(parametros_calculo, "completo"))
+                if espera > 0:
+                    await enviar({"tipo": "erro", "seq": seq, "status": 429,
+                                  "detail": "Limite de requisições excedido. Tente novamente em instantes.",
+                                  "retry_after": max(1, math.ceil(espera))})
+                    continue
+            sessao.calculando = True
+            try:
+                resposta = await _despachar_calculo(_executar_calculo_completo, parametros_calculo, "completo")
+            finally:
+                sessao.calculando = False
+        except HTTPException as e:
+            await enviar({"tipo": "erro", "seq": seq, "status": e.status_code, "detail": e.detail})
+            continue
+        except ValueError as e:
+            await enviar({"tipo": "erro", "seq": seq, "status": 400, "detail": str(e)})
+            continue
+        except Exception:
+            logging.exception("Erro interno em /ws/calculo")
+            await enviar({"tipo": "erro", "seq": seq, "status": 500,
+                          "detail": "Erro interno ao processar a solicitação"})
+            continue
+        
+        if sessao.encerrada or sessao.alterado.is_set():
+            continue
+        
+        diferenca = sessao.diferenca(jsonable_encoder(resposta, exclude_none=True))
+        await enviar({"tipo": "diff", "seq": seq, **diferenca})
+
+
+@router.post(
+    "/comparar",
+    response_model=ComparacaoResponseDTO,
+    summary="Compara variantes de taxa sobre o mesmo plano de aportes",
+    status_code=status.HTTP_200_OK
+)
+async def comparar_cenarios(request_dto: ComparacaoRequestDTO) -> ComparacaoResponseDTO:
+    """
+    Compara, em um único cálculo, variantes de taxa sobre o mesmo plano.
+    
+    Exemplo: "100% do CDI x 110% do CDI x LCI 90% isenta de IR" com os mesmos aportes.
+    
+    Parameters:
+    - **base**: Plano base (mesmos parâmetros de `/calcular_completo`)
+    - **variantes**: Lista de variantes, cada uma com `nome`, `percentual_sobre_cdi`,
+      `taxa_cdi_anual` e `isento_ir` opcionais (campos omitidos usam o plano base)
+    
+    Returns:
+        ComparacaoResponseDTO: Séries alinhadas de cada variante e diferenças em relação à primeira
+    """
+    try:
+        # Converte DTO para modelo de domínio
+        _verificar_opcoes(request_dto.base, OPCOES_EXCLUSIVAS_CALCULO, "base de /comparar")
+        parametros_comparacao = DTOConverter.to_parametros_comparacao(request_dto)
         
-        # Converte resultado do domínio para DTO de resposta
-        return DTOConverter.to_resgate_response(resultado)
+        # Executa a comparação (inline ou no pool, conforme o custo) e converte para DTO
+        return await _despachar_calculo(
+            _executar_comparacao,
+            parametros_comparacao.base,
+            "comparar",
+            argumento=parametros_comparacao,
+            lote=len(parametros_comparacao.variantes)
+        )
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, 
             detail=str(e)
         )
-    except Exception as e:
-        # Em um sistema real, registraria o erro em log
+    except Exception:
+        logging.exception("Erro interno em /comparar")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Erro interno ao processar a solicitação"
         )
 
 
+@router.post(
+    "/cronogramas",
+    response_model=CronogramaCriadoResponseDTO,
+    summary="Calcula um plano e mantém o cronograma no servidor para consultas",
+    status_code=status.HTTP_201_CREATED
+)
+async def criar_cronograma(request_dto: CalculoResgateRequestDTO) -> CronogramaCriadoResponseDTO:
+    """
+    Calcula o plano uma única vez (cálculo completo) e guarda o cronograma sob um handle.
+    
+    O handle é usado nas consultas `/cronogramas/{handle}/...` e expira após
+    o tempo configurado em `CRONOGRAMA_TTL_SEGUNDOS`.
+    
+    Parameters:
+    - Os mesmos de `/calcular_completo`
+    
+    Returns:
+        CronogramaCriadoResponseDTO: Handle, validade e resumo do cronograma
+    """
+    try:
+        _verificar_opcoes(request_dto, OPCOES_EXCLUSIVAS_CALCULO, "/cronogramas")
+        parametros_calculo = DTOConverter.to_parametros_resgate(request_dto)
+        
+        # Calcula (inline ou no pool) e guarda o cronograma neste processo
+        cronograma = await _despachar_calculo(_executar_cronograma, parametros_calculo, "completo")
+        handle, expira_em = CronogramaUseCase.registrar(cronograma)
+        
+        return DTOConverter.to_cronograma_criado(handle, expira_em, cronograma)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, 
+            detail=str(e)
+        )
+    except Exception:
+        logging.exception("Erro interno em /cronogramas")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao processar a solicitação"
+        )
+
+
+async def _calcular_csv_plano(plano: ParametrosCalculoResgate, numero: Optional[int], dialeto: str,
+                             aguardar: bool = False) -> str:
+    """
+    Calcula as linhas CSV de um plano no ExecutorCalculos.
+    
+    Args:
+        aguardar: Com o pool cheio, espera por uma vaga em vez de lançar o erro
+            (no meio da transmissão já não é possível responder 503)
+    
+    Raises:
+        ExecutorSaturadoError: Se o pool estiver cheio e `aguardar` for falso
+    """
+    while True:
+        try:
+            return await ExecutorCalculos.executar(
+                ExportacaoUseCase.gerar_csv_plano, plano, numero, dialeto,
+                custo=EstimadorCusto.estimar(plano, "completo")
+            )
+        except ExecutorSaturadoError:
+            if not aguardar:
+                raise
+            await asyncio.sleep(ESPERA_VAGA_STREAMING)
+
+
+async def _transmitir_csv(planos: List[ParametrosCalculoResgate], lote: bool, dialeto: str, primeiro: str):
+    """Pedaços do CSV: o cabeçalho com o primeiro plano (já calculado) e depois cada plano"""
+    yield ExportacaoUseCase.cabecalho_csv(lote, dialeto) + primeiro
+    for numero, plano in enumerate(planos[1:], start=2):
+        yield await _calcular_csv_plano(plano, numero if lote else None, dialeto, aguardar=True)
+
+
+def _resposta_csv(conteudo, nome_arquivo: str) -> StreamingResponse:
+    """
+    Resposta em streaming de um CSV para download (/exportar e resultado de jobs).
+    
+    O Content-Type é "text/csv; charset=utf-8": o charset é acrescentado uma
+    única vez pelo Starlette, por isso EscritorCSV.MEDIA_TYPE não pode trazê-lo.
+    """
+    return StreamingResponse(
+        conteudo,
+        media_type=EscritorCSV.MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{nome_arquivo}"'}
+    )
+
+
+async def _exportar(planos: List[ParametrosCalculoResgate], formato: str, dialeto: str, lote: bool):
+    """
+    Valida os planos e responde com o arquivo exportado.
+    
+    O CSV é enviado em streaming, calculado plano a plano no ExecutorCalculos
+    enquanto é transmitido (o primeiro plano antes da resposta, para que um
+    pool cheio ainda resulte em 503). XLSX e Parquet são escritos em um
+    arquivo temporário pelo ExecutorCalculos (memória limitada a um plano por
+    vez) e enviados com FileResponse.
+    
+    Raises:
+        HTTPException: 400 (parâmetros inválidos), 501 (pacote do formato não
+            instalado) ou 503 (pool de cálculos cheio)
+    """
+    try:
+        if formato != "csv":
+            criar_escritor(formato).verificar_disponivel()
+        # Validação e consulta da taxa CDI (bloqueante) fora do event loop
+        await asyncio.get_running_loop().run_in_executor(None, ExportacaoUseCase.preparar, planos)
+    except FormatoIndisponivelError as e:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    Rastreamento.registrar_desde_inicio("validacao")
+    
+    nome_arquivo = f"cronograma{'_lote' if lote else ''}_{date.today().isoformat()}.{formato}"
+    escritor = criar_escritor(formato, dialeto)
+    
+    if formato == "csv":
+        try:
+            primeiro = await _calcular_csv_plano(planos[0], 1 if lote else None, dialeto)
+        except ExecutorSaturadoError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": RETRY_AFTER_SATURADO}
+            )
+        return _resposta_csv(_transmitir_csv(planos, lote, dialeto, primeiro), nome_arquivo)
+    
+    descritor, caminho = tempfile.mkstemp(suffix=f".{formato}", dir=DIRETORIO_EXPORTACAO)
+    os.close(descritor)
+    try:
+        with Rastreamento.etapa("exportacao"):
+            await ExecutorCalculos.executar(
+                ExportacaoUseCase.exportar_arquivo,
+                formato,
+                planos,
+                lote,
+                caminho,
+                custo=sum(EstimadorCusto.estimar(plano, "completo") for plano in planos)
+            )
+    except ExecutorSaturadoError as e:
+        os.remove(caminho)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": RETRY_AFTER_SATURADO}
+        )
+    except Exception:
+        os.remove(caminho)
+        logging.exception(f"Erro interno ao exportar {formato}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erro interno ao processar a solicitação"
+        )
+    
+    # O arquivo temporário é removido depois de enviado
+    return FileResponse(
+        caminho,
+        media_type=escritor.MEDIA_TYPE,
+        filename=nome_arquivo,
+        background=BackgroundTask(os.remove, caminho)
+    )
+
+
+@router.post(
+    "/exportar/{formato}",
+    summary="Exporta o cronograma de um plano em CSV, XLSX ou Parquet",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse
+)
+async def exportar_cronograma(
+    formato: FormatoExportacao,
+    request_dto: CalculoResgateRequestDTO,
+    dialeto: DialetoCSV = Query(DialetoCSV.excel_br,
+        description="Dialeto do CSV: 'excel_br' (';', vírgula decimal e BOM) ou 'rfc4180' (',' e ponto decimal)")
+):
+    """
+    Calcula o plano (cálculo completo) e devolve o cronograma mensal como arquivo.
+    
+    Parameters:
+    - **formato**: `csv` (streaming), `xlsx` (requer `openpyxl`) ou `parquet` (requer `pyarrow`)
+    - Corpo: os mesmos parâmetros de `/calcular_completo`
+    
+    Returns:
+        Arquivo com as colunas mes, mes_ano, valor_total, rendimento_mensal,
+        aliquota_ir, iof, imposto_resgate e valor_liquido
+    """
+    _verificar_opcoes(request_dto, OPCOES_EXCLUSIVAS_CALCULO, "/exportar")
+    return await _exportar(
+        [DTOConverter.to_parametros_resgate(request_dto)], formato.value, dialeto.value, lote=False
+    )
+
+
+@router.post(
+    "/exportar/lote/{formato}",
+    summary="Exporta os cronogramas de vários planos em um único arquivo",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse
+)
+async def exportar_lote(
+    formato: FormatoExportacao,
+    request_dto: ExportacaoLoteRequestDTO,
+    dialeto: DialetoCSV = Query(DialetoCSV.excel_br,
+        description="Dialeto do CSV: 'excel_br' (';', vírgula decimal e BOM) ou 'rfc4180' (',' e ponto decimal)")
+):
+    """
+    Calcula cada plano e devolve todos os cronogramas em um único arquivo, com
+    a coluna `plano` (1 = primeiro plano da lista). Parquet é o formato indicado
+    para lotes grandes.
+    
+    Parameters:
+    - **formato**: `csv` (streaming), `xlsx` (requer `openpyxl`) ou `parquet` (requer `pyarrow`)
+    - **planos**: Lista de planos com os parâmetros de `/calcular_completo`
+    """
+    for numero, plano in enumerate(request_dto.planos, start=1):
+        _verificar_opcoes(plano, OPCOES_EXCLUSIVAS_CALCULO, f"/exportar/lote (plano {numero})")
+    return await _exportar(
+        [DTOConverter.to_parametros_resgate(plano) for plano in request_dto.planos],
+        formato.value,
+        dialeto.value,
+        lote=True
+    )
+
+
+async def _operacao_job(funcao: Callable[..., Any], *args: Any, bloqueante: bool = False) -> Any:
+    """
+    Executa uma operação do JobsUseCase, traduzindo os erros para HTTP.
+    
+    Operações na fila Redis (ou que consultam a taxa CDI) rodam fora do event loop.
+    
+    Raises:
+        HTTPException: 400 (parâmetros inválidos), 404 (job inexistente ou
+            expirado) ou 503 (fila de jobs cheia)
+    """
+    try:
+        if bloqueante or JobsUseCase.fila().BLOQUEANTE:
+            return await asyncio.get_running_loop().run_in_executor(None, functools.partial(funcao, *args))
+        return funcao(*args)
+    except JobNaoEncontradoError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except FilaJobsCheiaError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": RETRY_AFTER_FILA_JOBS}
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post(
+    "/jobs/lote",
+    response_model=JobResponseDTO,
+    summary="Enfileira o recálculo de uma lista grande de planos",
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def submeter_job_lote(request_dto: JobLoteRequestDTO) -> JobResponseDTO:
+    """
+    Enfileira o recálculo de até `JOBS_MAXIMO_ITENS` planos e responde imediatamente.
+    
+    Cada plano é resumido em uma linha (as mesmas colunas do recálculo em lote
+    pela linha de comando). Acompanhe o progresso em `/jobs/{job_id}` ou
+    `/jobs/{job_id}/eventos` e baixe o resultado parte a parte em
+    `/jobs/{job_id}/resultado/{parte}` ou inteiro em `/jobs/{job_id}/resultado`.
+    
+    Parameters:
+    - **planos**: Planos com id, valor_inicial, aporte_mensal, ano_final, mes_final e opcionais
+    """
+    estado = await _operacao_job(JobsUseCase.submeter_lote, request_dto.planos, bloqueante=True)
+    return JobResponseDTO(**estado)
+
+
+@router.post(
+    "/jobs/varredura",
+    response_model=JobResponseDTO,
+    summary="Enfileira uma varredura de parâmetros sobre um plano base",
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def submeter_job_varredura(request_dto: JobVarreduraRequestDTO) -> JobResponseDTO:
+    """
+    Enfileira um plano para cada combinação dos valores dos eixos (produto
+    cartesiano, na ordem informada) e responde imediatamente.
+    
+    As linhas do resultado trazem os valores dos eixos seguidos do resumo do plano.
+    
+    Parameters:
+    - **base**: Plano base, com os parâmetros de `/calcular_completo`
+    - **eixos**: Campo -> lista de valores (valor_inicial, aporte_mensal,
+      percentual_sobre_cdi, taxa_cdi_anual, ano_final ou mes_final)
+    """
+    _verificar_opcoes(request_dto.base, OPCOES_EXCLUSIVAS_CALCULO, "base de /jobs/varredura")
+    estado = await _operacao_job(
+        JobsUseCase.submeter_varredura, request_dto.base.model_dump(), request_dto.eixos, bloqueante=True
+    )
+    return JobResponseDTO(**estado)
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobResponseDTO,
+    summary="Consulta o estado e o progresso de um job",
+    status_code=status.HTTP_200_OK
+)
+async def consultar_job(job_id: str) -> JobResponseDTO:
+    """
+    Retorna o status (na_fila, executando, concluido, falhou ou cancelado),
+    os planos processados e as partes do resultado já disponíveis.
+    """
+    return JobResponseDTO(**await _operacao_job(JobsUseCase.consultar, job_id))
+
+
+@router.get(
+    "/jobs/{job_id}/eventos",
+    summary="Acompanha o progresso de um job (Server-Sent Events)",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse
+)
+async def eventos_job(job_id: str):
+    """
+    Envia um evento `progresso` (estado do job em JSON) sempre que o job
+    avança e um evento `fim` quando ele termina, encerrando o fluxo.
+    """
+    estado = await _operacao_job(JobsUseCase.consultar, job_id)
+    
+    async def eventos():
+        anterior = None
+        ultimo_envio = time.monotonic()
+        while True:
+            try:
+                atual = estado if anterior is None else await _operacao_job(JobsUseCase.consultar, job_id)
+            except HTTPException:
+                # Job expirado durante o acompanhamento
+                return
+            if atual["status"] in JobsUseCase.STATUS_FINAIS:
+                yield f"event: fim\ndata: {json.dumps(atual)}\n\n"
+                return
+            if atual != anterior:
+                yield f"event: progresso\ndata: {json.dumps(atual)}\n\n"
+                anterior = atual
+                ultimo_envio = time.monotonic()
+            elif time.monotonic() - ultimo_envio >= INTERVALO_PING_EVENTOS:
+                # Comentário SSE: mantém a conexão aberta em proxies
+                yield ": ping\n\n"
+                ultimo_envio = time.monotonic()
+            await asyncio.sleep(INTERVALO_EVENTOS_JOB)
+    
+    return StreamingResponse(
+        eventos(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get(
+    "/jobs/{job_id}/resultado/{parte}",
+    response_model=JobParteResponseDTO,
+    summary="Obtém uma parte do resultado de um job",
+    status_code=status.HTTP_200_OK
+)
+async def obter_parte_job(job_id: str, parte: int) -> JobParteResponseDTO:
+    """
+    Retorna as linhas da parte `parte` (0 = primeira), disponível assim que
+    calculada, mesmo com o job ainda em execução.
+    
+    Responde 409 se a parte ainda não foi calculada e 404 se ela não existe.
+    """
+    estado, linhas = await _operacao_job(JobsUseCase.parte, job_id, parte)
+    if linhas is None:
+        if estado["status"] in JobsUseCase.STATUS_FINAIS or parte < 0:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"O job tem {estado['partes']} partes (0 a {estado['partes'] - 1})"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Parte {parte} ainda não calculada ({estado['partes']} disponíveis)"
+        )
+    return JobParteResponseDTO(
+        job_id=job_id,
+        parte=parte,
+        partes=estado["partes"],
+        status=estado["status"],
+        colunas=[nome for nome, _ in estado["colunas"]],
+        linhas=linhas
+    )
+
+
+@router.get(
+    "/jobs/{job_id}/resultado",
+    summary="Baixa o resultado completo de um job em CSV",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse
+)
+async def baixar_resultado_job(
+    job_id: str,
+    dialeto: DialetoCSV = Query(DialetoCSV.excel_br,
+        description="Dialeto do CSV: 'excel_br' (';', vírgula decimal e BOM) ou 'rfc4180' (',' e ponto decimal)")
+):
+    """
+    Transmite todas as partes do resultado em um único CSV, na ordem dos planos.
+    
+    Disponível quando o job termina (em um job cancelado ou com falha, contém
+    as partes calculadas até a interrupção); antes disso responde 409.
+    """
+    estado = await _operacao_job(JobsUseCase.consultar, job_id)
+    if estado["status"] not in JobsUseCase.STATUS_FINAIS:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job ainda não terminou ({estado['processados']}/{estado['total']} planos)"
+        )
+    
+    return _resposta_csv(JobsUseCase.gerar_csv(job_id, dialeto.value), f"job_{job_id}.csv")
+
+
+@router.delete(
+    "/jobs/{job_id}",
+    response_model=JobResponseDTO,
+    summary="Cancela um job",
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def cancelar_job(job_id: str) -> JobResponseDTO:
+    """
+    Solicita o cancelamento: um job na fila é descartado e um job em execução
+    para depois da parte em andamento. As partes já calculadas continuam disponíveis.
+    """
+    return JobResponseDTO(**await _operacao_job(JobsUseCase.cancelar, job_id))
+
+
+def _consultar_cronograma(consulta, *args):
+    """Executa uma consulta ao cronograma, traduzindo os erros para HTTP"""
+    try:
+        return consulta(*args)
+    except CronogramaNaoEncontradoError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, 
+            detail=str(e)
+        )
+
+
+@router.get(
+    "/cronogramas/{handle}/meses/{mes}",
+    response_model=LinhaCronogramaDTO,
+    response_model_exclude_none=True,
+    summary="Consulta um mês do cronograma",
+    status_code=status.HTTP_200_OK
+)
+async def consultar_mes_cronograma(handle: str, mes: int) -> LinhaCronogramaDTO:
+    """
+    Retorna os valores do mês `mes` do plano (1 = primeiro mês).
+    """
+    informe = _consultar_cronograma(CronogramaUseCase.consultar_mes, handle, mes)
+    return DTOConverter.to_linha_cronograma(mes, informe)
+
+
+@router.get(
+    "/cronogramas/{handle}/intervalo",
+    response_model=IntervaloCronogramaResponseDTO,
+    response_model_exclude_none=True,
+    summary="Consulta um intervalo de meses do cronograma",
+    status_code=status.HTTP_200_OK
+)
+async def consultar_intervalo_cronograma(
+    handle: str,
+    inicio: int = Query(..., description="Primeiro mês do intervalo (1 = primeiro mês do plano)", ge=1),
+    fim: int = Query(..., description="Último mês do intervalo (inclusive)", ge=1)
+) -> IntervaloCronogramaResponseDTO:
+    """
+    Retorna os valores dos meses `inicio` a `fim` (inclusive).
+    """
+    informes = _consultar_cronograma(CronogramaUseCase.consultar_intervalo, handle, inicio, fim)
+    return IntervaloCronogramaResponseDTO(
+        handle=handle,
+        linhas=[
+            DTOConverter.to_linha_cronograma(mes, informe)
+            for mes, informe in enumerate(informes, start=inicio)
+        ]
+    )
+
+
+@router.get(
+    "/cronogramas/{handle}/limiar",
+    response_model=LimiarCronogramaResponseDTO,
+    response_model_exclude_none=True,
+    summary="Busca o primeiro mês em que um valor do cronograma atinge o limiar",
+    status_code=status.HTTP_200_OK
+)
+async def buscar_limiar_cronograma(
+    handle: str,
+    valor: float = Query(..., description="Limiar procurado"),
+    coluna: str = Query("valor_liquido", description="Coluna pesquisada: 'valor_total' ou 'valor_liquido'")
+) -> LimiarCronogramaResponseDTO:
+    """
+    Retorna o primeiro mês em que `coluna` é maior ou igual a `valor`
+    (busca binária sobre a coluna), ou sem `linha` se o limiar não for atingido.
+    """
+    mes = _consultar_cronograma(CronogramaUseCase.buscar_limiar, handle, coluna, valor)
+    linha = None
+    if mes is not None:
+        informe = _consultar_cronograma(CronogramaUseCase.consultar_mes, handle, mes)
+        linha = DTOConverter.to_linha_cronograma(mes, informe)
+    
+    return LimiarCronogramaResponseDTO(handle=handle, coluna=coluna, valor=valor, linha=linha)
+
+
 @router.get(
     "/cdi_atual",
     summary="Obtém a taxa CDI atual",
     response_model=TaxaCDIResponseDTO,
-    status_code=status.HTTP_200_OK
+    status_code=status.HTTP_200_OK,
+    responses={304: {"description": "A taxa não mudou desde o ETag informado em If-None-Match"}}
 )
-async def obter_cdi_atual() -> TaxaCDIResponseDTO:
+async def obter_cdi_atual(request: Request, response: Response) -> TaxaCDIResponseDTO:
     """
     Retorna o valor atual da taxa CDI anual em percentual.
     
     O valor é obtido da API do Banco Central do Brasil e atualizado diariamente.
+    Quando `stale` é verdadeiro, o valor é o último conhecido (atualização em andamento)
+    ou o valor padrão (API do Banco Central indisponível).
+    
+    A resposta traz um ETag; com `If-None-Match` igual ao ETag atual, a
+    resposta é `304` sem corpo (o cliente revalida o valor que já tem).
     
     Returns:
         TaxaCDIResponseDTO: Informações sobre a taxa CDI atual
     """
     try:
-        valor_cdi = CDIService.obter_cdi_anual()
-        return DTOConverter.to_cdi_response(valor_cdi)
+        cotacao = CDIService.obter_cotacao()
+        resultado = DTOConverter.to_cdi_response(cotacao)
+        
+        cabecalhos = {"ETag": ValidacaoCondicional.etag(resultado), "Cache-Control": "no-cache"}
+        if ValidacaoCondicional.corresponde(request.headers.get("if-none-match"), cabecalhos["ETag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabecalhos)
+        
+        response.headers.update(cabecalhos)
+        return resultado
     except Exception as e:
-        # Em um sistema de produção, registraria o erro em log
+        logging.exception("Erro ao consultar a taxa CDI")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao consultar taxa CDI: {str(e)}"
@@ -139,5 +1285,108 @@ async def health_check() -> Dict[str, str]:
     """
     Endpoint para verificação de saúde/disponibilidade da aplicação.
     Útil para monitoramento e health checks.
+    
+    Equivale a `/health/live`; para saber se a instância pode receber tráfego use `/health/ready`.
+    """
+    return {"status": "ok"} 
+
+
+@router.get(
+    "/health/live",
+    summary="Sonda de vida (liveness)",
+    status_code=status.HTTP_200_OK
+)
+async def health_live() -> Dict[str, str]:
+    """
+    Responde enquanto o processo e o event loop estiverem respondendo.
+    
+    Não depende de serviços externos nem do aquecimento: uma falha aqui
+    indica que o processo deve ser reiniciado.
     """
-    return {"status": "ok"} 
\ No newline at end of file
+    return {"status": "ok"}
+
+
+@router.get(
+    "/health/ready",
+    summary="Sonda de prontidão (readiness)",
+    status_code=status.HTTP_200_OK,
+    responses={503: {"description": "Instância aquecendo ou encerrando; não envie tráfego"}}
+)
+async def health_ready() -> JSONResponse:
+    """
+    Indica se a instância pode receber tráfego.
+    
+    Responde 200 depois que o aquecimento da inicialização terminou (taxa CDI
+    consultada, tabelas de fatores construídas e caminhos de cálculo
+    exercitados) e 503 antes disso ou durante o encerramento (SIGTERM), com
+    o resultado de cada verificação.
+    """
+    pronta, verificacoes = AquecimentoUseCase.verificar_prontidao()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if pronta else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": "pronta" if pronta else "indisponivel", "verificacoes": verificacoes}
+    ) 
+
+
+@router.get(
+    "/metricas",
+    summary="Métricas da instância",
+    status_code=status.HTTP_200_OK
+)
+async def metricas() -> Dict[str, Any]:
+    """
+    Métricas deste processo (cada worker do uvicorn tem as suas).
+    
+    Em `materializacao`: cenários materializados, consultas (acertos, faltas
+    e desatualizadas, quando a materialização ainda é da taxa CDI ou do mês
+    anterior), taxa de acerto e a taxa, o mês e a idade da materialização.
+    """
+    return {"materializacao": MaterializacaoCenarios.estatisticas()}
+
+
+@router.get("/debug/profile", include_in_schema=False)
+async def perfil_sob_demanda(
+    request: Request,
+    segundos: float = Query(10, description="Duração da coleta"),
+    modo: str = Query("cpu", description="'cpu' (pilhas amostradas) ou 'memoria' (alocações por endpoint)"),
+    intervalo_ms: Optional[float] = Query(None, description="Intervalo entre amostras no modo 'cpu'"),
+    ociosas: bool = Query(False, description="Inclui as threads apenas esperando no modo 'cpu'"),
+    sitios: int = Query(10, ge=1, le=100, description="Linhas de código por endpoint no modo 'memoria'")
+) -> Response:
+    """
+    Coleta um perfil do processo sobre o tráfego real durante `segundos`.
+    
+    Exige `Authorization: Bearer <DEBUG_TOKEN>`; sem DEBUG_TOKEN definido o
+    endpoint não existe (404). No modo "cpu" a resposta são as pilhas
+    colapsadas (uma por linha, com a contagem de amostras), prontas para o
+    flamegraph.pl ou o speedscope; no modo "memoria", as linhas de código que
+    mais alocaram por endpoint. Cada processo (worker do uvicorn) tem seu perfil.
+    """
+    if not Perfilador.habilitado():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    autorizacao = request.headers.get("authorization", "")
+    if not hmac.compare_digest(autorizacao.encode("utf-8"), f"Bearer {Perfilador.TOKEN}".encode("utf-8")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token de depuração inválido",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    
+    try:
+        Perfilador.validar(modo, segundos, intervalo_ms or Perfilador.INTERVALO_PADRAO_MS)
+        if modo == "memoria":
+            relatorio = await Perfilador.coletar_memoria(segundos, sitios)
+            return JSONResponse({"segundos": segundos, "endpoints": relatorio})
+        
+        pilhas, amostras = await Perfilador.coletar_cpu(segundos, intervalo_ms, ociosas)
+        return PlainTextResponse(
+            pilhas,
+            headers={
+                "Content-Disposition": 'attachment; filename="perfil.folded"',
+                "X-Amostras": str(amostras),
+            }
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except PerfilEmAndamentoError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
@@ -12,6 +12,9 @@ class TaxaCDIResponseDTO(BaseModel):
     fonte: str = Field(..., 
         description="Fonte da informação",
         example="Banco Central do Brasil")
+    stale: bool = Field(False,
+        description="Indica que o valor está fora da validade do cache (último valor conhecido ou valor padrão)",
+        example=False)
     
     class Config:
         title = "Taxa CDI Atual"
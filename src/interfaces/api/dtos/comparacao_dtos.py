@@ -0,0 +1,142 @@
+from pydantic import BaseModel, Field, validator
+from typing import List, Optional
+
+from src.interfaces.api.dtos.rendimento_dtos import CalculoJurosSaqueRequestDTO, validar_nome_produto
+from src.application.comparacao_use_case import ComparacaoUseCase
+
+
+class VarianteRequestDTO(BaseModel):
+    """DTO para receber uma variante da comparação de cenários"""
+    nome: Optional[str] = Field(None,
+        description="Nome da variante (padrão: gerado a partir do percentual e da isenção)",
+        example="LCI 90% do CDI")
+    percentual_sobre_cdi: Optional[float] = Field(None,
+        description="Percentual sobre o CDI (padrão: o do plano base)",
+        ge=0,
+        example=90.0)
+    taxa_cdi_anual: Optional[float] = Field(None,
+        description="Taxa de CDI anual em percentual (padrão: a do plano base ou a atual)",
+        example=13.25)
+    isento_ir: bool = Field(False,
+        description="Se a variante é isenta de IR",
+        example=False)
+    produto: Optional[str] = Field(None,
+        description="Produto da variante (padrão: o do plano base); produtos isentos pelas regras tributárias vigentes não pagam IR",
+        example="LCI")
+
+    @validator('produto')
+    def validar_produto(cls, v):
+        return validar_nome_produto(v)
+
+    class Config:
+        title = "Variante da Comparação"
+        description = "Sobrescritas de taxa e isenção em relação ao plano base"
+
+
+class ComparacaoRequestDTO(BaseModel):
+    """DTO para receber os dados da comparação de cenários"""
+    base: CalculoJurosSaqueRequestDTO = Field(...,
+        description="Plano base: valor inicial, aportes, prazo e impostos considerados")
+    variantes: List[VarianteRequestDTO] = Field(...,
+        description="Variantes a comparar (a primeira é a referência das diferenças)")
+
+    @validator('variantes')
+    def validar_variantes(cls, v):
+        if not v:
+            raise ValueError("Informe ao menos uma variante")
+        if len(v) > ComparacaoUseCase.MAXIMO_VARIANTES:
+            raise ValueError(f"A comparação aceita no máximo {ComparacaoUseCase.MAXIMO_VARIANTES} variantes")
+        return v
+
+    class Config:
+        title = "Parâmetros para Comparação de Cenários"
+        description = "Plano base e variantes de taxa a comparar"
+
+
+class ResultadoVarianteDTO(BaseModel):
+    """DTO para enviar as séries de uma variante, alinhadas aos meses da comparação"""
+    nome: str = Field(...,
+        description="Nome da variante",
+        example="110% do CDI")
+    taxa_cdi_utilizada: float = Field(...,
+        description="Taxa de CDI anual utilizada",
+        example=13.25)
+    percentual_sobre_cdi: float = Field(...,
+        description="Percentual sobre o CDI utilizado",
+        example=110.0)
+    isento_ir: bool = Field(...,
+        description="Se a variante é isenta de IR",
+        example=False)
+    valor_total: List[float] = Field(...,
+        description="Valor total (bruto) acumulado em cada mês")
+    rendimento_mensal: List[float] = Field(...,
+        description="Rendimento bruto de cada mês")
+    aliquota_ir: List[float] = Field(...,
+        description="Alíquota de IR (%) de cada mês")
+    imposto_resgate: List[float] = Field(...,
+        description="Impostos (IR + IOF) sobre o rendimento de cada mês")
+    valor_liquido: List[float] = Field(...,
+        description="Valor total menos os impostos acumulados até cada mês")
+    total_rendimento: float = Field(...,
+        description="Valor total de rendimentos brutos no período",
+        example=12500.75)
+    total_impostos: float = Field(...,
+        description="Valor total de impostos no período",
+        example=5250.75)
+    rendimento_bruto: float = Field(...,
+        description="Saldo final menos o valor aplicado",
+        example=12501.00)
+    rendimento_liquido: float = Field(...,
+        description="Rendimento bruto menos os impostos",
+        example=7250.25)
+
+    class Config:
+        title = "Resultado de uma Variante"
+        description = "Séries mensais e totais de uma variante"
+
+
+class DiferencaVarianteDTO(BaseModel):
+    """DTO para enviar as diferenças de uma variante em relação à referência"""
+    nome: str = Field(...,
+        description="Nome da variante",
+        example="110% do CDI")
+    valor_total: List[float] = Field(...,
+        description="Diferença do valor total em cada mês (variante - referência)")
+    valor_liquido: List[float] = Field(...,
+        description="Diferença do valor líquido em cada mês (variante - referência)")
+    rendimento_liquido: float = Field(...,
+        description="Diferença do rendimento líquido no período (variante - referência)",
+        example=1520.30)
+
+    class Config:
+        title = "Diferenças de uma Variante"
+        description = "Colunas de diferença em relação à primeira variante"
+
+
+class ComparacaoResponseDTO(BaseModel):
+    """DTO para enviar o resultado da comparação de cenários"""
+    meses: List[str] = Field(...,
+        description="Meses da comparação no formato 'mês/ano' (comuns a todas as variantes)")
+    referencia: str = Field(...,
+        description="Nome da variante usada como referência nas diferenças",
+        example="100% do CDI")
+    variantes: List[ResultadoVarianteDTO] = Field(...,
+        description="Resultado de cada variante, na ordem da requisição")
+    diferencas: List[DiferencaVarianteDTO] = Field(...,
+        description="Diferenças de cada variante em relação à referência")
+    valor_total_aplicado: float = Field(...,
+        description="Valor total investido (inicial + aportes)",
+        example=82000.00)
+    considera_ir: bool = Field(...,
+        description="Se o cálculo considerou o Imposto de Renda",
+        example=True)
+    considera_iof: bool = Field(...,
+        description="Se o cálculo considerou o IOF",
+        example=True)
+    data_calculo: str = Field(...,
+        description="Data e hora do cálculo no formato DD/MM/AAAA HH:MM",
+        example="15/07/2024 10:30")
+
+    class Config:
+        title = "Resultado da Comparação de Cenários"
+        description = "Séries alinhadas de cada variante e colunas de diferença"
@@ -0,0 +1,80 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+from src.interfaces.api.dtos.rendimento_dtos import InformeCompletoDTO
+
+
+class CronogramaCriadoResponseDTO(BaseModel):
+    """DTO para enviar o handle de um cronograma calculado"""
+    handle: str = Field(...,
+        description="Identificador do cronograma para as consultas seguintes",
+        example="q6X0mO1lq2yQ7mYH3cJb9w")
+    expira_em: datetime = Field(...,
+        description="Data e hora em que o handle deixa de ser válido")
+    meses: int = Field(...,
+        description="Quantidade de meses do cronograma",
+        example=72)
+    primeiro_mes: str = Field(...,
+        description="Mês e ano do mês 1 do cronograma",
+        example="janeiro/2025")
+    ultimo_mes: str = Field(...,
+        description="Mês e ano do último mês do cronograma",
+        example="dezembro/2030")
+    total_rendimento: float = Field(...,
+        description="Valor total de rendimentos brutos no período",
+        example=12500.75)
+    total_impostos: float = Field(...,
+        description="Valor total de impostos no período",
+        example=5250.75)
+    valor_total_aplicado: float = Field(...,
+        description="Valor total investido (inicial + aportes)",
+        example=82000.00)
+    taxa_cdi_utilizada: float = Field(...,
+        description="Taxa de CDI anual utilizada no cálculo",
+        example=13.25)
+
+    class Config:
+        title = "Cronograma Calculado"
+        description = "Handle e resumo de um cronograma mantido no servidor"
+
+
+class LinhaCronogramaDTO(InformeCompletoDTO):
+    """DTO para representar um mês do cronograma"""
+    mes: int = Field(...,
+        description="Número do mês no plano (1 = primeiro mês)",
+        example=12)
+
+    class Config:
+        title = "Mês do Cronograma"
+        description = "Rendimento bruto e impostos de resgate de um mês do cronograma"
+
+
+class IntervaloCronogramaResponseDTO(BaseModel):
+    """DTO para enviar um intervalo de meses do cronograma"""
+    handle: str = Field(...,
+        description="Identificador do cronograma")
+    linhas: List[LinhaCronogramaDTO] = Field(...,
+        description="Meses do intervalo solicitado")
+
+    class Config:
+        title = "Intervalo do Cronograma"
+        description = "Meses consecutivos de um cronograma"
+
+
+class LimiarCronogramaResponseDTO(BaseModel):
+    """DTO para enviar o resultado da busca por limiar"""
+    handle: str = Field(...,
+        description="Identificador do cronograma")
+    coluna: str = Field(...,
+        description="Coluna pesquisada ('valor_total' ou 'valor_liquido')",
+        example="valor_liquido")
+    valor: float = Field(...,
+        description="Limiar pesquisado",
+        example=100000.0)
+    linha: Optional[LinhaCronogramaDTO] = Field(None,
+        description="Primeiro mês em que a coluna atinge o limiar (ausente se não atingir)")
+
+    class Config:
+        title = "Busca por Limiar"
+        description = "Primeiro mês em que um valor do cronograma atinge o limiar"
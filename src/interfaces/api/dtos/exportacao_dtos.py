@@ -0,0 +1,38 @@
+from enum import Enum
+from pydantic import BaseModel, Field, validator
+from typing import List
+
+from src.interfaces.api.dtos.rendimento_dtos import CalculoJurosSaqueRequestDTO
+from src.application.exportacao_use_case import ExportacaoUseCase
+
+
+class FormatoExportacao(str, Enum):
+    """Formatos de arquivo da exportação"""
+    csv = "csv"
+    xlsx = "xlsx"
+    parquet = "parquet"
+
+
+class DialetoCSV(str, Enum):
+    """Dialetos do CSV exportado"""
+    excel_br = "excel_br"
+    rfc4180 = "rfc4180"
+
+
+class ExportacaoLoteRequestDTO(BaseModel):
+    """DTO para receber os planos de uma exportação em lote"""
+    planos: List[CalculoJurosSaqueRequestDTO] = Field(...,
+        description="Planos a exportar (mesmos parâmetros de `/calcular_completo`); "
+                    "no arquivo, a coluna `plano` indica a posição do plano na lista (1 = primeiro)")
+
+    @validator('planos')
+    def validar_planos(cls, v):
+        if not v:
+            raise ValueError("Informe ao menos um plano")
+        if len(v) > ExportacaoUseCase.MAXIMO_PLANOS:
+            raise ValueError(f"A exportação aceita no máximo {ExportacaoUseCase.MAXIMO_PLANOS} planos")
+        return v
+
+    class Config:
+        title = "Parâmetros para Exportação em Lote"
+        description = "Lista de planos exportados em um único arquivo"
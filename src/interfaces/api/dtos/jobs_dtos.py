@@ -0,0 +1,87 @@
+from pydantic import BaseModel, Field, validator
+from typing import Any, Dict, List, Optional
+
+from src.interfaces.api.dtos.rendimento_dtos import CalculoJurosSaqueRequestDTO
+from src.application.jobs_use_case import JobsUseCase
+
+
+class JobLoteRequestDTO(BaseModel):
+    """DTO para receber os planos de um job de recálculo em lote"""
+    planos: List[Dict[str, Any]] = Field(...,
+        description="Planos com as colunas do recálculo em lote (id, valor_inicial, aporte_mensal, "
+                    "ano_final, mes_final e, opcionalmente, percentual_sobre_cdi, taxa_cdi_anual, "
+                    "considerar_ir, considerar_iof, produto e aritmetica); planos inválidos saem "
+                    "no resultado com a coluna `erro` preenchida",
+        example=[{"id": "cliente-1", "valor_inicial": 10000.0, "aporte_mensal": 1000.0,
+                  "ano_final": 2030, "mes_final": 12}])
+
+    @validator('planos')
+    def validar_planos(cls, v):
+        if not v:
+            raise ValueError("Informe ao menos um plano")
+        if len(v) > JobsUseCase.MAXIMO_ITENS:
+            raise ValueError(f"Um job aceita no máximo {JobsUseCase.MAXIMO_ITENS} planos")
+        return v
+
+    class Config:
+        title = "Parâmetros do Job de Lote"
+        description = "Lista de planos recalculados em segundo plano"
+
+
+class JobVarreduraRequestDTO(BaseModel):
+    """DTO para receber um job de varredura de parâmetros"""
+    base: CalculoJurosSaqueRequestDTO = Field(...,
+        description="Plano base (mesmos parâmetros de `/calcular_completo`)")
+    eixos: Dict[str, List[float]] = Field(...,
+        description="Valores de cada campo variado; é calculado um plano para cada combinação. "
+                    "Campos aceitos: " + ", ".join(JobsUseCase.EIXOS_VARREDURA),
+        example={"aporte_mensal": [500.0, 1000.0, 1500.0], "percentual_sobre_cdi": [90.0, 100.0, 110.0]})
+
+    @validator('eixos')
+    def validar_eixos(cls, v):
+        if not v:
+            raise ValueError("Informe ao menos um eixo")
+        for campo, valores in v.items():
+            if campo not in JobsUseCase.EIXOS_VARREDURA:
+                raise ValueError(f"Eixo inválido: {campo}")
+            if not valores:
+                raise ValueError(f"O eixo {campo} não tem valores")
+        return v
+
+    class Config:
+        title = "Parâmetros do Job de Varredura"
+        description = "Plano base e eixos de valores da varredura"
+
+
+class JobResponseDTO(BaseModel):
+    """DTO para retornar o estado de um job"""
+    job_id: str = Field(..., description="Identificador do job")
+    tipo: str = Field(..., description="Tipo do job: lote ou varredura")
+    status: str = Field(..., description="na_fila, executando, concluido, falhou ou cancelado")
+    total: int = Field(..., description="Total de planos do job")
+    processados: int = Field(..., description="Planos já calculados")
+    erros: int = Field(..., description="Planos com erro até aqui")
+    partes: int = Field(..., description="Partes do resultado já disponíveis")
+    tamanho_parte: int = Field(..., description="Planos por parte do resultado")
+    colunas: List[List[str]] = Field(..., description="Colunas das linhas do resultado: [nome, tipo]")
+    taxa_cdi_anual: float = Field(..., description="Taxa CDI anual usada nos planos que não informam a própria")
+    criado_em: str = Field(..., description="Data e hora da submissão")
+    iniciado_em: Optional[str] = Field(None, description="Data e hora do início da execução")
+    concluido_em: Optional[str] = Field(None, description="Data e hora do fim da execução")
+    erro: Optional[str] = Field(None, description="Motivo da falha, quando o status é falhou")
+
+    class Config:
+        title = "Estado do Job"
+
+
+class JobParteResponseDTO(BaseModel):
+    """DTO para retornar uma parte do resultado de um job"""
+    job_id: str = Field(..., description="Identificador do job")
+    parte: int = Field(..., description="Índice da parte (0 = primeira)")
+    partes: int = Field(..., description="Partes disponíveis até agora")
+    status: str = Field(..., description="Status do job")
+    colunas: List[str] = Field(..., description="Nomes das colunas das linhas")
+    linhas: List[List[Any]] = Field(..., description="Linhas da parte, na ordem dos planos")
+
+    class Config:
+        title = "Parte do Resultado do Job"
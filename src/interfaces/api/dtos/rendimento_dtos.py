@@ -1,7 +1,62 @@
+import re
+from enum import Enum
+
 from pydantic import BaseModel, Field, validator
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from datetime import datetime
 
+from src.application.estimativa_custo import EstimadorCusto
+
+
+def validar_nome_produto(produto: Optional[str]) -> Optional[str]:
+    """Normaliza o nome do produto (maiúsculas) e rejeita nomes fora do formato esperado"""
+    if produto is None:
+        return None
+    produto = produto.strip().upper()
+    if not re.fullmatch(r"[A-Z0-9_]{1,40}", produto):
+        raise ValueError("O produto deve conter apenas letras, números e '_' (ex: CDB, LCI, LCA)")
+    return produto
+
+
+def verificar_opcoes_aplicaveis(dto: BaseModel, opcoes: Sequence[str], destino: str) -> None:
+    """
+    Rejeita as opções do DTO de cálculo que o endpoint de destino não aplica.
+    
+    Os DTOs de cálculo são reaproveitados por outros endpoints (comparação,
+    exportação, jobs etc.); uma opção informada ali com valor diferente do
+    padrão seria ignorada em silêncio.
+    
+    Args:
+        dto: DTO da requisição
+        opcoes: Campos do DTO que o destino não aplica
+        destino: Endpoint (ou parte da requisição) usado na mensagem de erro
+    
+    Raises:
+        ValueError: Se alguma das opções tiver valor diferente do padrão
+    """
+    informadas = [opcao for opcao in opcoes if getattr(dto, opcao) != type(dto).model_fields[opcao].default]
+    if informadas:
+        raise ValueError(f"Opções não disponíveis em {destino}: {', '.join(informadas)}.")
+
+
+def validar_lista_campos(campos) -> Optional[List[str]]:
+    """Aceita os campos em lista ou separados por vírgula (query string) e os normaliza (sem repetição, em ordem)"""
+    if campos is None:
+        return None
+    if isinstance(campos, str):
+        campos = campos.split(",")
+    campos = sorted({str(campo).strip() for campo in campos} - {""})
+    if not campos:
+        raise ValueError("Informe ao menos um campo")
+    return campos
+
+
+class Granularidade(str, Enum):
+    """Intervalo entre as linhas do informe mensal"""
+    MENSAL = "mensal"
+    TRIMESTRAL = "trimestral"
+    ANUAL = "anual"
+
 
 class CalculoRendimentoRequestDTO(BaseModel):
     """DTO para receber dados da requisição de cálculo de rendimento"""
@@ -29,6 +84,18 @@ class CalculoRendimentoRequestDTO(BaseModel):
         description="Percentual sobre o CDI (ex: 100% = CDI puro, 120% = CDI + 20%)",
         ge=0,
         example=100.0)
+    aritmetica: Optional[str] = Field(None,
+        description="Aritmética monetária: 'float' (padrão) ou 'centavos' (ponto fixo em centavos inteiros, com arredondamento explícito em cada etapa)",
+        example="centavos")
+    ajustar_inflacao: bool = Field(False,
+        description="Se deve incluir os valores reais (deflacionados pelo IPCA, em moeda do primeiro mês)",
+        example=False)
+    granularidade: Granularidade = Field(Granularidade.MENSAL,
+        description="Linhas do informe: 'mensal' (todos os meses), 'trimestral' ou 'anual' (fim de cada trimestre/ano civil e o último mês); os totais consideram todos os meses",
+        example="anual")
+    campos: Optional[List[str]] = Field(None,
+        description="Campos da resposta (totais e/ou colunas do informe; 'informe_mensal' inclui todas as colunas). Sem colunas do informe, a resposta traz apenas os totais",
+        example=["valor_total", "total_rendimento"])
     
     @validator('valor_inicial')
     def validar_valor_inicial(cls, v):
@@ -41,8 +108,15 @@ class CalculoRendimentoRequestDTO(BaseModel):
         ano_atual = datetime.now().year
         if v < ano_atual:
             raise ValueError(f"O ano final deve ser igual ou posterior a {ano_atual}")
+        ano_maximo = ano_atual + EstimadorCusto.HORIZONTE_MAXIMO_MESES // 12
+        if v > ano_maximo:
+            raise ValueError(f"O ano final deve ser igual ou anterior a {ano_maximo}")
         return v
     
+    @validator('campos', pre=True)
+    def validar_campos(cls, v):
+        return validar_lista_campos(v)
+    
     class Config:
         title = "Parâmetros para Cálculo de Rendimento"
         description = "Dados necessários para calcular rendimento financeiro"
@@ -59,6 +133,9 @@ class InformeRendimentoDTO(BaseModel):
     rendimento_mensal: float = Field(..., 
         description="Rendimento obtido no mês",
         example=112.50)
+    valor_total_real: Optional[float] = Field(None,
+        description="Valor total deflacionado pelo IPCA (presente quando ajustar_inflacao é verdadeiro)",
+        example=10987.40)
     
     class Config:
         title = "Informe Mensal de Rendimento"
@@ -84,6 +161,9 @@ class CalculoRendimentoResponseDTO(BaseModel):
     data_calculo: str = Field(..., 
         description="Data e hora do cálculo no formato DD/MM/AAAA HH:MM",
         example="15/07/2024 10:30")
+    ipca_projetado_mensal: Optional[float] = Field(None,
+        description="IPCA mensal (%) projetado para os meses ainda não divulgados (presente quando ajustar_inflacao é verdadeiro)",
+        example=0.38)
     
     class Config:
         title = "Resultado do Cálculo de Rendimento"
@@ -122,6 +202,21 @@ class CalculoJurosSaqueRequestDTO(BaseModel):
     considerar_iof: Optional[bool] = Field(True,
         description="Se deve considerar o IOF para resgates em menos de 30 dias",
         example=True)
+    aritmetica: Optional[str] = Field(None,
+        description="Aritmética monetária: 'float' (padrão) ou 'centavos' (ponto fixo em centavos inteiros, com arredondamento explícito em cada etapa)",
+        example="centavos")
+    ajustar_inflacao: bool = Field(False,
+        description="Se deve incluir os valores reais (deflacionados pelo IPCA, em moeda do primeiro mês)",
+        example=False)
+    produto: Optional[str] = Field(None,
+        description="Produto do investimento (ex: CDB, LCI, LCA); produtos isentos pelas regras tributárias vigentes não pagam IR",
+        example="CDB")
+    granularidade: Granularidade = Field(Granularidade.MENSAL,
+        description="Linhas do informe: 'mensal' (todos os meses), 'trimestral' ou 'anual' (fim de cada trimestre/ano civil e o último mês); os totais consideram todos os meses",
+        example="anual")
+    campos: Optional[List[str]] = Field(None,
+        description="Campos da resposta (totais e/ou colunas do informe; 'informe_mensal' inclui todas as colunas). Sem colunas do informe, a resposta traz apenas os totais",
+        example=["valor_total", "total_rendimento"])
     
     @validator('valor_inicial')
     def validar_valor_inicial(cls, v):
@@ -134,8 +229,19 @@ class CalculoJurosSaqueRequestDTO(BaseModel):
         ano_atual = datetime.now().year
         if v < ano_atual:
             raise ValueError(f"O ano final deve ser igual ou posterior a {ano_atual}")
+        ano_maximo = ano_atual + EstimadorCusto.HORIZONTE_MAXIMO_MESES // 12
+        if v > ano_maximo:
+            raise ValueError(f"O ano final deve ser igual ou anterior a {ano_maximo}")
         return v
     
+    @validator('produto')
+    def validar_produto(cls, v):
+        return validar_nome_produto(v)
+    
+    @validator('campos', pre=True)
+    def validar_campos(cls, v):
+        return validar_lista_campos(v)
+    
     class Config:
         title = "Parâmetros para Cálculo de Resgate"
         description = "Dados necessários para calcular os impostos e valores líquidos de resgate"
@@ -155,6 +261,9 @@ class InformeResgateDTO(BaseModel):
     aliquota_ir: float = Field(...,
         description="Alíquota de IR aplicada no período (%)",
         example=22.5)
+    valor_total_real: Optional[float] = Field(None,
+        description="Valor total deflacionado pelo IPCA (presente quando ajustar_inflacao é verdadeiro)",
+        example=10987.40)
     
     class Config:
         title = "Informe Mensal de Resgate"
@@ -192,7 +301,88 @@ class CalculoResgateResponseDTO(BaseModel):
     data_calculo: str = Field(..., 
         description="Data e hora do cálculo no formato DD/MM/AAAA HH:MM",
         example="15/07/2024 10:30")
+    ipca_projetado_mensal: Optional[float] = Field(None,
+        description="IPCA mensal (%) projetado para os meses ainda não divulgados (presente quando ajustar_inflacao é verdadeiro)",
+        example=0.38)
     
     class Config:
         title = "Resultado do Cálculo de Resgate"
-        description = "Resultado detalhado do cálculo de impostos e valores líquidos para resgate do investimento" 
\ No newline at end of file
+        description = "Resultado detalhado do cálculo de impostos e valores líquidos para resgate do investimento" 
+
+
+class InformeCompletoDTO(BaseModel):
+    """DTO para representar um item do informe mensal do cálculo completo"""
+    mes_ano: str = Field(..., 
+        description="Mês e ano no formato 'mês/ano'",
+        example="janeiro/2024")
+    valor_total: float = Field(..., 
+        description="Valor total (bruto) acumulado no período",
+        example=11112.50)
+    rendimento_mensal: float = Field(..., 
+        description="Rendimento obtido no mês, com o mesmo valor de /calcular_rendimento",
+        example=112.50)
+    aliquota_ir: float = Field(...,
+        description="Alíquota de IR aplicada no período (%)",
+        example=22.5)
+    iof: float = Field(...,
+        description="IOF incidente sobre o rendimento do mês",
+        example=0.0)
+    imposto_resgate: float = Field(..., 
+        description="Impostos que seriam pagos no resgate (IR + IOF) sobre o rendimento do mês",
+        example=25.31)
+    valor_liquido: float = Field(...,
+        description="Valor total menos os impostos acumulados até o mês",
+        example=11087.19)
+    valor_total_real: Optional[float] = Field(None,
+        description="Valor total deflacionado pelo IPCA (presente quando ajustar_inflacao é verdadeiro)",
+        example=10987.40)
+    valor_liquido_real: Optional[float] = Field(None,
+        description="Valor líquido deflacionado pelo IPCA (presente quando ajustar_inflacao é verdadeiro)",
+        example=10962.90)
+    
+    class Config:
+        title = "Informe Mensal Completo"
+        description = "Rendimento bruto e impostos de resgate de um mês específico"
+
+
+class CalculoCompletoResponseDTO(BaseModel):
+    """DTO para enviar resultado do cálculo completo (rendimento e resgate)"""
+    informe_mensal: List[InformeCompletoDTO] = Field(..., 
+        description="Lista de informes mensais com rendimentos, impostos e valores líquidos")
+    total_rendimento: float = Field(..., 
+        description="Valor total de rendimentos brutos no período",
+        example=12500.75)
+    total_impostos: float = Field(..., 
+        description="Valor total de impostos no período",
+        example=5250.75)
+    rendimento_liquido: float = Field(...,
+        description="Valor total dos rendimentos menos os impostos",
+        example=7250.25)
+    rendimento_bruto: float = Field(...,
+        description="Valor total dos rendimentos antes do desconto dos impostos",
+        example=12501.00)
+    valor_total_aplicado: float = Field(..., 
+        description="Valor total investido (inicial + aportes)",
+        example=82000.00)
+    taxa_cdi_utilizada: float = Field(..., 
+        description="Taxa de CDI anual utilizada no cálculo",
+        example=13.25)
+    percentual_sobre_cdi: float = Field(..., 
+        description="Percentual sobre o CDI utilizado no cálculo",
+        example=100.0)
+    considera_ir: bool = Field(...,
+        description="Se o cálculo considerou o Imposto de Renda",
+        example=True)
+    considera_iof: bool = Field(...,
+        description="Se o cálculo considerou o IOF",
+        example=True)
+    data_calculo: str = Field(..., 
+        description="Data e hora do cálculo no formato DD/MM/AAAA HH:MM",
+        example="15/07/2024 10:30")
+    ipca_projetado_mensal: Optional[float] = Field(None,
+        description="IPCA mensal (%) projetado para os meses ainda não divulgados (presente quando ajustar_inflacao é verdadeiro)",
+        example=0.38)
+    
+    class Config:
+        title = "Resultado do Cálculo Completo"
+        description = "Rendimentos e impostos de resgate de cada mês, calculados em uma única passada"
\ No newline at end of file
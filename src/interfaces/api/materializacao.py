@@ -0,0 +1,238 @@
+import logging
+import os
+import threading
+import time
+from dataclasses import fields
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.domain.entities.models import ParametrosCalculoRendimento, ParametrosCalculoJurosSaque as ParametrosCalculoResgate
+from src.application.rendimento_use_case import RendimentoUseCase
+from src.application.resgate_use_case import ResgateUseCase
+from src.application.calculo_completo_use_case import CalculoCompletoUseCase
+from src.interfaces.converters.dto_converters import DTOConverter
+from src.infrastructure.cache.cenarios_materializados import CenariosMaterializados
+from src.infrastructure.external.bcb_service import CDIService
+
+
+# Caso de uso e conversão para DTO de cada operação
+CALCULOS = {
+    "rendimento": (RendimentoUseCase.calcular_rendimento, DTOConverter.to_calculo_response),
+    "resgate": (ResgateUseCase.calcular_impostos_resgate, DTOConverter.to_resgate_response),
+    "completo": (CalculoCompletoUseCase.calcular_completo, DTOConverter.to_completo_response),
+}
+
+# Modelo de parâmetros de cada operação (para reconstruir o plano a partir da chave)
+MODELOS_PARAMETROS = {
+    "rendimento": ParametrosCalculoRendimento,
+    "resgate": ParametrosCalculoResgate,
+    "completo": ParametrosCalculoResgate,
+}
+
+
+class MaterializacaoCenarios:
+    """
+    Materialização dos cenários de cálculo mais pedidos.
+
+    Cada requisição JSON de cálculo (sem `campos`, sem ajuste pela inflação e
+    sem data inicial) conta para a frequência do seu cenário. Quando o
+    CDIService obtém uma nova taxa, os `TOP_N` cenários mais pedidos, mais os
+    cenários padrão da página (`SEMENTES`), são recalculados em segundo plano
+    com a nova taxa e guardados já serializados; as requisições desses cenários
+    com a taxa vigente (omitida ou igual à atual, como a página envia) são
+    respondidas da memória, sem passar pelo pool de cálculos. Na virada do mês
+    os cenários são recalculados, pois os rótulos partem do mês atual.
+    MATERIALIZACAO_TOP_N=0 desliga a materialização.
+    """
+
+    TOP_N = int(os.environ.get("MATERIALIZACAO_TOP_N", 32))
+    # Valores padrão do formulário da página
+    VALOR_INICIAL_PADRAO = 10000.0
+    APORTE_MENSAL_PADRAO = 1000.0
+    # Percentuais do CDI e prazos (anos) comuns, semeados antes de haver tráfego
+    PERCENTUAIS_SEMENTES = (100.0, 110.0, 120.0)
+    HORIZONTES_SEMENTES = (1, 2, 5, 10)
+
+    _lock = threading.Lock()
+    _em_andamento = False
+    _pendente: Optional[float] = None
+
+    @staticmethod
+    def habilitada() -> bool:
+        """Se a materialização está habilitada"""
+        return MaterializacaoCenarios.TOP_N > 0
+
+    @staticmethod
+    def chave(operacao: str, parametros: ParametrosCalculoRendimento) -> Optional[Hashable]:
+        """
+        Chave do cenário de uma requisição: a operação e os parâmetros, exceto a taxa CDI.
+
+        Returns:
+            Chave do cenário, ou None se o cenário não puder ser materializado
+            (data inicial informada ou ajuste pela inflação, que depende da série do IPCA)
+        """
+        if parametros.data_inicial is not None or parametros.ajustar_inflacao:
+            return None
+        return (operacao,) + tuple(
+            (campo.name, getattr(parametros, campo.name))
+            for campo in fields(parametros) if campo.name != "taxa_cdi_anual"
+        )
+
+    @classmethod
+    def consultar(cls, operacao: str, parametros: ParametrosCalculoRendimento) -> Optional[bytes]:
+        """
+        Conta a requisição e obtém a resposta materializada do seu cenário.
+
+        Não bloqueia: a taxa vigente vem do cache do CDIService (sem taxa em
+        cache, a requisição segue o caminho normal).
+
+        Returns:
+            Corpo JSON da resposta, ou None se o cenário não estiver materializado
+        """
+        if not cls.habilitada():
+            return None
+        chave = cls.chave(operacao, parametros)
+        if chave is None:
+            return None
+        CenariosMaterializados.registrar_acesso(chave)
+
+        taxa_atual = cls._taxa_atual()
+        mes = cls._mes_atual()
+        if taxa_atual is not None and CenariosMaterializados.referencia() not in (None, mes):
+            # Virada do mês: recalcula os cenários com os novos rótulos
+            cls.agendar(taxa_atual)
+
+        taxa = parametros.taxa_cdi_anual if parametros.taxa_cdi_anual is not None else taxa_atual
+        if taxa is None:
+            return None
+        return CenariosMaterializados.obter(chave, taxa, mes, taxa_atual)
+
+    @classmethod
+    def notificar_cdi(cls, taxa_cdi_anual: float) -> None:
+        """
+        Observador do CDIService: recalcula os cenários com a nova taxa em segundo plano.
+
+        Args:
+            taxa_cdi_anual: Taxa CDI anual atualizada
+        """
+        if cls.habilitada():
+            cls.agendar(taxa_cdi_anual)
+
+    @classmethod
+    def agendar(cls, taxa_cdi_anual: float) -> None:
+        """
+        Dispara a materialização em segundo plano; com uma em andamento, a taxa
+        fica pendente e é materializada em seguida (apenas a mais recente).
+        """
+        with cls._lock:
+            if cls._em_andamento:
+                cls._pendente = taxa_cdi_anual
+                return
+            cls._em_andamento = True
+        threading.Thread(target=cls._executar, args=(taxa_cdi_anual,), name="materializacao", daemon=True).start()
+
+    @classmethod
+    def materializar(cls, taxa_cdi_anual: float) -> int:
+        """
+        Calcula e serializa os cenários mais pedidos com a taxa informada.
+
+        Cenários que deixaram de ser válidos (prazo já encerrado) são ignorados.
+
+        Args:
+            taxa_cdi_anual: Taxa CDI anual
+
+        Returns:
+            Número de cenários materializados
+        """
+        inicio = time.perf_counter()
+        mes = cls._mes_atual()
+        cenarios: Dict[Hashable, bytes] = {}
+        for chave in cls._selecionar():
+            operacao, campos = chave[0], dict(chave[1:])
+            parametros = MODELOS_PARAMETROS[operacao](taxa_cdi_anual=taxa_cdi_anual, **campos)
+            calcular, converter = CALCULOS[operacao]
+            try:
+                resultado = converter(calcular(parametros))
+            except ValueError:
+                continue
+            # Mesmo corpo que o FastAPI gera para o response_model com response_model_exclude_none
+            cenarios[chave] = JSONResponse(jsonable_encoder(resultado, exclude_none=True)).body
+
+        CenariosMaterializados.substituir(cenarios, taxa_cdi_anual, mes)
+        logging.info(
+            f"{len(cenarios)} cenários materializados com CDI {taxa_cdi_anual:g}% "
+            f"em {(time.perf_counter() - inicio) * 1000:.0f} ms"
+        )
+        return len(cenarios)
+
+    @classmethod
+    def estatisticas(cls) -> Dict[str, Any]:
+        """Taxa de acerto e frescor dos cenários materializados (ver `CenariosMaterializados.estatisticas`)"""
+        return {
+            "habilitada": cls.habilitada(),
+            **CenariosMaterializados.estatisticas(cls._taxa_atual(), cls._mes_atual()),
+        }
+
+    @classmethod
+    def sementes(cls) -> List[Hashable]:
+        """
+        Cenários materializados mesmo sem tráfego: o formulário padrão da página
+        (janeiro do próximo ano) e os percentuais e prazos comuns, no cálculo completo.
+        """
+        hoje = datetime.now()
+        prazos: List[Tuple[int, int, float]] = [(hoje.year + 1, 1, 100.0)]
+        prazos += [
+            (hoje.year + anos, hoje.month, percentual)
+            for percentual in cls.PERCENTUAIS_SEMENTES
+            for anos in cls.HORIZONTES_SEMENTES
+        ]
+        return [
+            cls.chave("completo", ParametrosCalculoResgate(
+                valor_inicial=cls.VALOR_INICIAL_PADRAO,
+                aporte_mensal=cls.APORTE_MENSAL_PADRAO,
+                ano_final=ano_final,
+                mes_final=mes_final,
+                percentual_sobre_cdi=percentual
+            ))
+            for ano_final, mes_final, percentual in prazos
+        ]
+
+    @classmethod
+    def _selecionar(cls) -> List[Hashable]:
+        """Os `TOP_N` cenários mais pedidos, completados pelas sementes"""
+        chaves = CenariosMaterializados.mais_frequentes(cls.TOP_N)
+        for semente in cls.sementes():
+            if semente not in chaves:
+                chaves.append(semente)
+        return chaves
+
+    @classmethod
+    def _executar(cls, taxa_cdi_anual: float) -> None:
+        """Materializa a taxa e as que ficarem pendentes enquanto isso"""
+        while True:
+            try:
+                cls.materializar(taxa_cdi_anual)
+            except Exception:
+                logging.exception("Erro ao materializar os cenários de cálculo")
+            with cls._lock:
+                if cls._pendente is None:
+                    cls._em_andamento = False
+                    return
+                taxa_cdi_anual, cls._pendente = cls._pendente, None
+
+    @staticmethod
+    def _taxa_atual() -> Optional[float]:
+        """
+        Taxa CDI vigente sem bloquear: None se ainda não houver taxa obtida da API
+        (a cotação expirada é servida e revalidada em segundo plano pelo CDIService)
+        """
+        if CDIService.estado_cache() not in ("atualizado", "desatualizado"):
+            return None
+        return CDIService.obter_cotacao().valor
+
+    @staticmethod
+    def _mes_atual() -> str:
+        return datetime.now().strftime("%Y-%m")
@@ -0,0 +1,205 @@
+import json
+import math
+import os
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl
+
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.application.estimativa_custo import EstimadorCusto
+from src.infrastructure.limite_taxa.armazem_tokens import criar_armazem_tokens
+
+
+class LimiteTaxaMiddleware:
+    """
+    Middleware ASGI de admissão: limite de taxa por cliente ponderado pelo custo.
+
+    Cada cliente (cabeçalho X-API-Key ou, na falta dele, o IP) tem um balde de
+    tokens medido em "meses calculados". As rotas de cálculo consomem o custo
+    estimado pelo EstimadorCusto a partir do corpo da requisição, que é lido
+    aqui e repassado intacto à aplicação (nos GETs de cálculo, a partir da
+    query string); as demais rotas da API consomem 1.
+    Sem tokens suficientes a resposta é 429 com Retry-After.
+
+    Nos WebSockets da API, cada cliente tem no máximo `MAXIMO_CONEXOES_WS`
+    conexões abertas por processo (as excedentes são recusadas antes do
+    handshake), e o handler recebe no escopo (`CHAVE_ESCOPO`) a função que
+    consome o custo de cada cálculo do balde do cliente.
+    """
+
+    HABILITADO = os.environ.get("LIMITE_TAXA_HABILITADO", "1") == "1"
+    CAPACIDADE = float(os.environ.get("LIMITE_TAXA_CAPACIDADE", 10000))
+    REPOSICAO_POR_SEGUNDO = float(os.environ.get("LIMITE_TAXA_REPOSICAO", 1000))
+    CONFIAR_PROXY = os.environ.get("LIMITE_TAXA_CONFIAR_PROXY", "0") == "1"
+    TAMANHO_MAXIMO_CORPO = int(os.environ.get("LIMITE_TAXA_TAMANHO_MAXIMO_CORPO", 65536))
+    TAMANHO_MAXIMO_CORPO_LOTE = int(os.environ.get("LIMITE_TAXA_TAMANHO_MAXIMO_CORPO_LOTE", 1048576))
+    TAMANHO_MAXIMO_CORPO_JOB = int(os.environ.get("LIMITE_TAXA_TAMANHO_MAXIMO_CORPO_JOB", 16777216))
+    MAXIMO_CONEXOES_WS = int(os.environ.get("LIMITE_TAXA_MAXIMO_CONEXOES_WS", 4))
+
+    # Chave do escopo ASGI com a função `consumir(custo) -> espera em segundos` do cliente
+    CHAVE_ESCOPO = "limite_taxa.consumir"
+
+    PREFIXO_API = "/api/"
+
+    # Rotas de cálculo e a operação usada na estimativa de custo
+    OPERACOES = {
+        "/api/v1/calcular_rendimento": "rendimento",
+        "/api/v1/calcular_resgate": "resgate",
+        "/api/v1/calcular_completo": "completo",
+        "/api/v1/cronogramas": "completo",
+        "/api/v1/comparar": "comparar",
+        **{f"/api/v1/exportar/{formato}": "completo" for formato in ("csv", "xlsx", "parquet")},
+        **{f"/api/v1/exportar/lote/{formato}": "lote" for formato in ("csv", "xlsx", "parquet")},
+        "/api/v1/jobs/lote": "job_lote",
+        "/api/v1/jobs/varredura": "job_varredura",
+    }
+
+    # Rotas que nunca são limitadas (monitoramento)
+    ISENTAS = {
+        "/api/v1/health",
+        "/api/v1/health/live",
+        "/api/v1/health/ready",
+        "/api/v1/metricas",
+    }
+
+    def __init__(self, app: ASGIApp, armazem=None):
+        self.app = app
+        self.armazem = armazem or criar_armazem_tokens()
+        # cliente -> WebSockets abertos neste processo
+        self._conexoes_ws: Dict[str, int] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        caminho = scope.get("path", "")
+        if (not self.HABILITADO or scope["type"] not in ("http", "websocket")
+                or not caminho.startswith(self.PREFIXO_API) or caminho in self.ISENTAS):
+            await self.app(scope, receive, send)
+            return
+
+        if scope["type"] == "websocket":
+            await self._admitir_websocket(scope, receive, send)
+            return
+
+        custo = 1
+        operacao = self.OPERACOES.get(caminho)
+        if operacao is not None and scope.get("method") == "POST":
+            limite = self._tamanho_maximo_corpo(operacao)
+            mensagens = await self._ler_corpo(receive, limite)
+            if mensagens is None:
+                await JSONResponse(
+                    {"detail": "Corpo da requisição muito grande"}, status_code=413
+                )(scope, receive, send)
+                return
+
+            custo = EstimadorCusto.estimar_requisicao(operacao, self._decodificar(mensagens))
+            receive = self._repetir(mensagens, receive)
+        elif operacao is not None and scope.get("method") == "GET":
+            # GETs de cálculo (cacheáveis): os parâmetros estão na query string
+            parametros = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+            custo = EstimadorCusto.estimar_requisicao(operacao, parametros)
+
+        espera = await self._consumir(self._identificar_cliente(scope), min(custo, self.CAPACIDADE))
+        if espera > 0:
+            await JSONResponse(
+                {"detail": "Limite de requisições excedido. Tente novamente em instantes."},
+                status_code=429,
+                headers={"Retry-After": str(max(1, math.ceil(espera)))}
+            )(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    async def _admitir_websocket(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Limita as conexões do cliente e repassa ao handler a função de consumo do balde"""
+        cliente = self._identificar_cliente(scope)
+        if self._conexoes_ws.get(cliente, 0) >= self.MAXIMO_CONEXOES_WS:
+            # Fechar antes do handshake recusa a conexão (HTTP 403)
+            await send({"type": "websocket.close", "code": 1008})
+            return
+
+        async def consumir(custo: float) -> float:
+            return await self._consumir(cliente, min(custo, self.CAPACIDADE))
+
+        self._conexoes_ws[cliente] = self._conexoes_ws.get(cliente, 0) + 1
+        try:
+            await self.app({**scope, self.CHAVE_ESCOPO: consumir}, receive, send)
+        finally:
+            self._conexoes_ws[cliente] -= 1
+            if not self._conexoes_ws[cliente]:
+                del self._conexoes_ws[cliente]
+
+    def _tamanho_maximo_corpo(self, operacao: str) -> int:
+        """Limite do corpo da requisição: listas de planos aceitam corpos maiores"""
+        if operacao == "job_lote":
+            return self.TAMANHO_MAXIMO_CORPO_JOB
+        if operacao == "lote":
+            return self.TAMANHO_MAXIMO_CORPO_LOTE
+        return self.TAMANHO_MAXIMO_CORPO
+
+    async def _consumir(self, cliente: str, custo: float) -> float:
+        if self.armazem.BLOQUEANTE:
+            return await run_in_threadpool(
+                self.armazem.consumir, cliente, custo, self.CAPACIDADE, self.REPOSICAO_POR_SEGUNDO
+            )
+        return self.armazem.consumir(cliente, custo, self.CAPACIDADE, self.REPOSICAO_POR_SEGUNDO)
+
+    def _identificar_cliente(self, scope: Scope) -> str:
+        """Identifica o cliente pela chave de API ou pelo IP de origem"""
+        cabecalhos = dict(scope.get("headers") or [])
+
+        chave_api = cabecalhos.get(b"x-api-key")
+        if chave_api:
+            return "chave:" + chave_api.decode("latin-1")
+
+        if self.CONFIAR_PROXY and b"x-forwarded-for" in cabecalhos:
+            return "ip:" + cabecalhos[b"x-forwarded-for"].decode("latin-1").split(",")[0].strip()
+
+        cliente = scope.get("client")
+        return "ip:" + (cliente[0] if cliente else "desconhecido")
+
+    async def _ler_corpo(self, receive: Receive, limite: int) -> Optional[List[Message]]:
+        """
+        Lê todas as mensagens do corpo da requisição.
+
+        Args:
+            receive: Canal de recepção ASGI
+            limite: Tamanho máximo do corpo em bytes
+
+        Returns:
+            Mensagens recebidas, ou None se o corpo exceder o limite
+        """
+        mensagens = []
+        tamanho = 0
+        while True:
+            mensagem = await receive()
+            mensagens.append(mensagem)
+            if mensagem["type"] != "http.request":
+                break
+            tamanho += len(mensagem.get("body", b""))
+            if tamanho > limite:
+                return None
+            if not mensagem.get("more_body", False):
+                break
+        return mensagens
+
+    @staticmethod
+    def _decodificar(mensagens: List[Message]) -> Dict[str, Any]:
+        corpo = b"".join(m.get("body", b"") for m in mensagens if m["type"] == "http.request")
+        try:
+            dados = json.loads(corpo)
+        except ValueError:
+            return {}
+        return dados if isinstance(dados, dict) else {}
+
+    @staticmethod
+    def _repetir(mensagens: List[Message], receive: Receive) -> Receive:
+        """Cria um `receive` que entrega primeiro as mensagens já lidas"""
+        pendentes = list(mensagens)
+
+        async def receber() -> Message:
+            if pendentes:
+                return pendentes.pop(0)
+            return await receive()
+
+        return receber
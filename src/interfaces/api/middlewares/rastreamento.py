@@ -0,0 +1,112 @@
+import logging
+import os
+import re
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infrastructure.observabilidade.perfil import Perfilador
+from src.infrastructure.observabilidade.rastreamento import ContextoRequisicao, Rastreamento
+
+
+class RastreamentoMiddleware:
+    """
+    Middleware ASGI de rastreamento e log de acesso.
+
+    Atribui a cada requisição um request ID (o do cabeçalho X-Request-ID, se
+    válido, ou um novo), devolvido no mesmo cabeçalho da resposta e anexado a
+    todos os logs emitidos durante a requisição. Ao final, registra uma linha de
+    acesso com status, duração e tempo de cada etapa no logger "acesso": sempre
+    para erros 5xx e requisições lentas, e para a fração amostrada das demais.
+
+    Durante uma coleta de perfil de memória (`/debug/profile?modo=memoria`),
+    também registra as alocações de cada requisição no endpoint correspondente.
+    """
+
+    CABECALHO = "x-request-id"
+    LIMIAR_LENTO_MS = float(os.environ.get("RASTREAMENTO_LENTO_MS", 1000))
+
+    # IDs aceitos do cliente (evita injeção de conteúdo arbitrário nos logs)
+    REQUEST_ID_VALIDO = re.compile(r"^[A-Za-z0-9._\-]{1,64}$")
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.logger = logging.getLogger("acesso")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        contexto, token = Rastreamento.iniciar(self._request_id_recebido(scope))
+        cabecalho = (self.CABECALHO.encode("latin-1"), contexto.request_id.encode("latin-1"))
+        status_resposta = 500
+
+        async def enviar(mensagem: Message) -> None:
+            nonlocal status_resposta
+            if mensagem["type"] == "http.response.start":
+                status_resposta = mensagem["status"]
+                if status_resposta < 400:
+                    # Após a última etapa do handler vêm a validação do response_model e a serialização
+                    Rastreamento.registrar_desde_ultima_etapa("serializacao")
+                mensagem = {**mensagem, "headers": list(mensagem.get("headers", [])) + [cabecalho]}
+            await send(mensagem)
+
+        metodo, caminho = scope.get("method", ""), scope.get("path", "")
+        rastreador = Perfilador.rastreador_alocacoes()
+        snapshot_inicial = rastreador.iniciar_requisicao() if rastreador is not None else None
+        try:
+            if contexto.amostrada:
+                with Rastreamento.span_requisicao(f"{metodo} {caminho}",
+                                                  {"http.method": metodo, "http.target": caminho}):
+                    await self.app(scope, receive, enviar)
+            else:
+                await self.app(scope, receive, enviar)
+        finally:
+            Rastreamento.finalizar(token)
+            self._registrar_acesso(contexto, metodo, caminho, status_resposta)
+            if snapshot_inicial is not None:
+                rastreador.registrar(f"{metodo} {self._rota(scope, caminho)}", snapshot_inicial)
+
+    def _request_id_recebido(self, scope: Scope) -> str:
+        """Retorna o X-Request-ID enviado pelo cliente, se válido"""
+        for nome, valor in scope.get("headers", []):
+            if nome == b"x-request-id":
+                valor = valor.decode("latin-1")
+                return valor if self.REQUEST_ID_VALIDO.match(valor) else ""
+        return ""
+
+    @staticmethod
+    def _rota(scope: Scope, caminho: str) -> str:
+        """Caminho com os parâmetros de rota no lugar dos valores (ex: /jobs/{job_id})"""
+        for nome, valor in scope.get("path_params", {}).items():
+            caminho = caminho.replace(f"/{valor}", f"/{{{nome}}}", 1)
+        return caminho
+
+    def _registrar_acesso(self, contexto: ContextoRequisicao, metodo: str,
+                          caminho: str, status_resposta: int) -> None:
+        """Emite a linha de acesso se a requisição for amostrada, lenta ou com erro"""
+        duracao_ms = (time.time_ns() - contexto.inicio_ns) / 1e6
+        lenta = duracao_ms >= self.LIMIAR_LENTO_MS
+        if not (contexto.amostrada or lenta or status_resposta >= 500):
+            return
+
+        if status_resposta >= 500:
+            nivel = logging.ERROR
+        elif lenta:
+            nivel = logging.WARNING
+        else:
+            nivel = logging.INFO
+
+        campos = {
+            "request_id": contexto.request_id,
+            "metodo": metodo,
+            "caminho": caminho,
+            "status": status_resposta,
+            "duracao_ms": round(duracao_ms, 3),
+            "amostrada": contexto.amostrada,
+        }
+        if contexto.etapas:
+            campos["etapas_ms"] = contexto.duracoes_ms()
+
+        self.logger.log(nivel, "%s %s %s", metodo, caminho, status_resposta, extra={"campos": campos})
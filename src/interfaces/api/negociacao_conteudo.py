@@ -0,0 +1,90 @@
+from typing import Dict, List, Optional, Tuple
+
+from src.infrastructure.exportacao.binarios import SerializadorArrow, SerializadorMsgPack
+
+
+class NegociacaoConteudo:
+    """
+    Negociação do formato da resposta dos endpoints de cálculo pelo cabeçalho Accept.
+
+    Formatos:
+        - "json": padrão (sem Accept, `*/*` ou `application/json`)
+        - "msgpack": `application/msgpack` (mesma estrutura do JSON; requer `msgpack`)
+        - "arrow": `application/vnd.apache.arrow.stream` (cronograma em colunas; requer `pyarrow`)
+
+    Formatos cujo pacote não está instalado não são oferecidos; se nenhum
+    formato aceito pelo cliente estiver disponível, a resposta é 406.
+    """
+
+    # Formato -> tipos de mídia aceitos no Accept (o primeiro é o da resposta)
+    TIPOS = {
+        "json": ("application/json",),
+        "msgpack": (SerializadorMsgPack.MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack"),
+        "arrow": (SerializadorArrow.MEDIA_TYPE,),
+    }
+
+    # Ordem de preferência do servidor em caso de empate
+    PREFERENCIA = ("json", "msgpack", "arrow")
+
+    @classmethod
+    def disponiveis(cls) -> List[str]:
+        """Formatos com os pacotes necessários instalados"""
+        verificacoes = {
+            "json": True,
+            "msgpack": SerializadorMsgPack.disponivel(),
+            "arrow": SerializadorArrow.disponivel(),
+        }
+        return [formato for formato in cls.PREFERENCIA if verificacoes[formato]]
+
+    @classmethod
+    def escolher(cls, accept: Optional[str]) -> Optional[str]:
+        """
+        Escolhe o formato da resposta.
+
+        Args:
+            accept: Valor do cabeçalho Accept
+
+        Returns:
+            "json", "msgpack" ou "arrow", ou None se nenhum formato aceito estiver disponível
+        """
+        if not accept or not accept.strip():
+            return "json"
+
+        aceitos = cls._interpretar(accept)
+        melhor, melhor_peso = None, (0.0, -1)
+        for formato in cls.disponiveis():
+            peso = max((cls._peso(tipo, aceitos) for tipo in cls.TIPOS[formato]), default=(0.0, -1))
+            if peso[0] > 0 and peso > melhor_peso:
+                melhor, melhor_peso = formato, peso
+        return melhor
+
+    @staticmethod
+    def _interpretar(accept: str) -> Dict[str, float]:
+        """Converte o Accept em tipo de mídia -> qualidade (q)"""
+        aceitos: Dict[str, float] = {}
+        for item in accept.split(","):
+            partes = [parte.strip() for parte in item.split(";")]
+            if not partes[0]:
+                continue
+            qualidade = 1.0
+            for parametro in partes[1:]:
+                nome, _, valor = parametro.partition("=")
+                if nome.strip() == "q":
+                    try:
+                        qualidade = float(valor)
+                    except ValueError:
+                        qualidade = 0.0
+            aceitos[partes[0].lower()] = qualidade
+        return aceitos
+
+    @staticmethod
+    def _peso(tipo: str, aceitos: Dict[str, float]) -> Tuple[float, int]:
+        """
+        Qualidade atribuída pelo cliente a um tipo de mídia, com a especificidade
+        da regra correspondente (o tipo exato prevalece sobre `tipo/*` e `*/*`).
+        """
+        principal = tipo.split("/")[0]
+        for especificidade, regra in ((2, tipo), (1, f"{principal}/*"), (0, "*/*")):
+            if regra in aceitos:
+                return aceitos[regra], especificidade
+        return 0.0, -1
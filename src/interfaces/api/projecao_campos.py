@@ -0,0 +1,66 @@
+from typing import Any, Dict, List, Set, Type, get_args
+
+from pydantic import BaseModel
+
+
+class ProjecaoCampos:
+    """
+    Seleção dos campos da resposta dos endpoints de cálculo (`campos`).
+
+    Os nomes pedidos podem ser campos de resumo (ex: `total_rendimento`) ou
+    colunas do informe mensal (ex: `valor_total`); `informe_mensal` inclui
+    todas as colunas. As linhas do informe sempre trazem `mes_ano`. Sem
+    nenhuma coluna do informe, a resposta traz apenas o resumo.
+    """
+
+    LINHAS = "informe_mensal"
+    COLUNA_MES = "mes_ano"
+
+    @classmethod
+    def colunas(cls, modelo: Type[BaseModel]) -> Set[str]:
+        """Colunas das linhas do informe mensal do DTO de resposta"""
+        modelo_linha = get_args(modelo.model_fields[cls.LINHAS].annotation)[0]
+        return set(modelo_linha.model_fields)
+
+    @classmethod
+    def validar(cls, campos: List[str], modelo: Type[BaseModel]) -> None:
+        """
+        Verifica se os campos pedidos existem na resposta.
+
+        Args:
+            campos: Campos pedidos
+            modelo: DTO de resposta do endpoint
+
+        Raises:
+            ValueError: Se algum campo não existir na resposta
+        """
+        validos = set(modelo.model_fields) | cls.colunas(modelo)
+        desconhecidos = [campo for campo in campos if campo not in validos]
+        if desconhecidos:
+            raise ValueError(
+                f"Campos desconhecidos: {', '.join(desconhecidos)}. "
+                f"Use: {', '.join(sorted(validos))}."
+            )
+
+    @classmethod
+    def inclui_linhas(cls, campos: List[str], modelo: Type[BaseModel]) -> bool:
+        """Se a resposta projetada traz as linhas do informe mensal"""
+        return cls.LINHAS in campos or bool(cls.colunas(modelo) & set(campos))
+
+    @classmethod
+    def incluir(cls, campos: List[str], modelo: Type[BaseModel]) -> Dict[str, Any]:
+        """
+        Monta a seleção de campos no formato `include` do pydantic.
+
+        Args:
+            campos: Campos pedidos (já validados)
+            modelo: DTO de resposta do endpoint
+
+        Returns:
+            Seleção para `jsonable_encoder`/`dict(include=...)`
+        """
+        selecao: Dict[str, Any] = {campo: True for campo in campos if campo in modelo.model_fields}
+        colunas = cls.colunas(modelo) & set(campos)
+        if colunas and cls.LINHAS not in campos:
+            selecao[cls.LINHAS] = {"__all__": colunas | {cls.COLUNA_MES}}
+        return selecao
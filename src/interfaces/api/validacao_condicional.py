@@ -0,0 +1,51 @@
+import hashlib
+import json
+from typing import Any, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+
+class ValidacaoCondicional:
+    """
+    ETag e requisições condicionais (If-None-Match -> 304).
+
+    O ETag é o hash do corpo JSON da resposta: o cliente que já tem a mesma
+    representação a revalida sem recebê-la de novo.
+    """
+
+    @staticmethod
+    def etag(conteudo: Any) -> str:
+        """
+        Gera o ETag (forte) de um conteúdo de resposta.
+
+        Args:
+            conteudo: DTO ou dados da resposta
+
+        Returns:
+            ETag entre aspas
+        """
+        corpo = json.dumps(jsonable_encoder(conteudo), sort_keys=True, separators=(",", ":"))
+        return '"' + hashlib.sha256(corpo.encode("utf-8")).hexdigest()[:32] + '"'
+
+    @staticmethod
+    def corresponde(if_none_match: Optional[str], etag: str) -> bool:
+        """
+        Verifica se o cliente já tem a representação (comparação fraca, RFC 9110).
+
+        Args:
+            if_none_match: Valor do cabeçalho If-None-Match
+            etag: ETag da representação atual
+
+        Returns:
+            True se a resposta pode ser 304
+        """
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        opaco = etag[2:] if etag.startswith("W/") else etag
+        for candidato in if_none_match.split(","):
+            candidato = candidato.strip()
+            if (candidato[2:] if candidato.startswith("W/") else candidato) == opaco:
+                return True
+        return False
@@ -0,0 +1,243 @@
+"""
+Recálculo em lote das projeções de planos de clientes, sem a API.
+
+Lê os planos de um arquivo CSV ou Parquet (colunas id, valor_inicial,
+aporte_mensal, ano_final, mes_final e, opcionalmente, percentual_sobre_cdi,
+taxa_cdi_anual, considerar_ir, considerar_iof, produto e aritmetica), distribui
+blocos de planos entre processos e grava um CSV com uma linha de resumo por
+plano, na ordem da entrada.
+
+A taxa CDI é consultada uma única vez (ou informada em --taxa-cdi). Após cada
+bloco escrito, o progresso é gravado em `<saida>.progresso.json`: se o lote for
+interrompido, a mesma linha de comando retoma do último bloco confirmado, com a
+mesma taxa e o mesmo mês de referência.
+
+Uso:
+    python -m src.interfaces.cli.recalculo_lote --entrada planos.parquet \\
+        --saida projecoes.csv --processos 8 --tamanho-bloco 2000
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date, datetime
+from typing import Deque, Dict, List, Optional, TextIO, Tuple
+
+from src.application.recalculo_lote_use_case import RecalculoLoteUseCase
+from src.domain.services.regras_tributarias import RegistroRegrasTributarias
+from src.infrastructure.external.bcb_service import CDIService
+from src.infrastructure.lote.arquivos_lote import LeitorPlanos, ProgressoLote
+
+
+class _ResultadoImediato:
+    """Resultado de um bloco executado no próprio processo (--processos 1)"""
+
+    def __init__(self, valor):
+        self._valor = valor
+
+    def done(self) -> bool:
+        return True
+
+    def result(self):
+        return self._valor
+
+
+class RecalculoLote:
+    """
+    Orquestra um recálculo em lote: leitura em blocos, pool de processos,
+    escrita em ordem e gravação do progresso.
+
+    Mantém no máximo `processos x BLOCOS_POR_PROCESSO` blocos em andamento, de
+    modo que a memória não depende do tamanho do arquivo de entrada.
+    """
+
+    BLOCOS_POR_PROCESSO = 2
+
+    def __init__(self, entrada: str, saida: str, processos: int, tamanho_bloco: int,
+                 taxa_cdi: Optional[float] = None, recomecar: bool = False,
+                 intervalo_relatorio: float = 10.0):
+        self.entrada = entrada
+        self.saida = saida
+        self.arquivo_progresso = saida + ".progresso.json"
+        self.processos = max(1, processos)
+        self.tamanho_bloco = max(1, tamanho_bloco)
+        self.taxa_cdi = taxa_cdi
+        self.recomecar = recomecar
+        self.intervalo_relatorio = intervalo_relatorio
+
+    def executar(self) -> Dict:
+        """
+        Executa o lote até o fim do arquivo de entrada.
+
+        Returns:
+            Relatório de vazão (ver `_relatorio`)
+
+        Raises:
+            ValueError: Se o progresso gravado for de outro arquivo de entrada
+        """
+        # Falha cedo se as regras tributárias não puderem ser carregadas
+        RegistroRegrasTributarias.obter()
+
+        leitor = LeitorPlanos(self.entrada)
+        progresso, arquivo = self._abrir_saida()
+        linhas_iniciais = progresso.linhas_processadas
+        total = leitor.total()
+        data_referencia = datetime.fromisoformat(progresso.data_referencia)
+
+        inicio = time.monotonic()
+        proximo_relatorio = inicio + self.intervalo_relatorio
+        escritor = csv.writer(arquivo, lineterminator="\n")
+        pendentes: Deque[Tuple[int, Future]] = deque()
+        janela = self.processos * self.BLOCOS_POR_PROCESSO
+        pool = ProcessPoolExecutor(max_workers=self.processos) if self.processos > 1 else None
+
+        def confirmar_mais_antigo() -> None:
+            quantidade, futuro = pendentes.popleft()
+            resultados, erros = futuro.result()
+            escritor.writerows(resultados)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+            progresso.linhas_processadas += quantidade
+            progresso.erros += erros
+            progresso.bytes_saida = os.fstat(arquivo.fileno()).st_size
+            progresso.salvar(self.arquivo_progresso)
+
+        try:
+            for bloco in leitor.blocos(self.tamanho_bloco, pular=progresso.linhas_processadas):
+                argumentos = (bloco, progresso.taxa_cdi_anual, data_referencia)
+                if pool is None:
+                    futuro = _ResultadoImediato(RecalculoLoteUseCase.processar_bloco(*argumentos))
+                else:
+                    futuro = pool.submit(RecalculoLoteUseCase.processar_bloco, *argumentos)
+                pendentes.append((len(bloco), futuro))
+
+                # Escreve na ordem da entrada; só bloqueia quando a janela enche
+                while pendentes and (len(pendentes) >= janela or pendentes[0][1].done()):
+                    confirmar_mais_antigo()
+
+                if time.monotonic() >= proximo_relatorio:
+                    self._imprimir_andamento(progresso, linhas_iniciais, total, inicio)
+                    proximo_relatorio = time.monotonic() + self.intervalo_relatorio
+
+            while pendentes:
+                confirmar_mais_antigo()
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+            arquivo.close()
+
+        relatorio = self._relatorio(progresso, linhas_iniciais, time.monotonic() - inicio)
+        os.remove(self.arquivo_progresso)
+        return relatorio
+
+    def _abrir_saida(self) -> Tuple[ProgressoLote, TextIO]:
+        """
+        Retoma o lote a partir do progresso gravado ou começa um novo.
+
+        Na retomada, o arquivo de saída é truncado no último bloco confirmado.
+        """
+        progresso = None if self.recomecar else ProgressoLote.carregar(self.arquivo_progresso)
+
+        if progresso is not None:
+            if os.path.abspath(progresso.entrada) != os.path.abspath(self.entrada):
+                raise ValueError(
+                    f"{self.arquivo_progresso} é de outro lote ({progresso.entrada}). "
+                    f"Use --recomecar para descartá-lo."
+                )
+            with open(self.saida, "r+b") as arquivo:
+                arquivo.truncate(progresso.bytes_saida)
+            print(f"Retomando após {progresso.linhas_processadas} planos "
+                  f"(CDI {progresso.taxa_cdi_anual}%, referência {progresso.data_referencia})", file=sys.stderr)
+            return progresso, open(self.saida, "a", encoding="utf-8", newline="")
+
+        taxa_cdi = self.taxa_cdi if self.taxa_cdi is not None else CDIService.obter_cdi_anual()
+        arquivo = open(self.saida, "w", encoding="utf-8", newline="")
+        csv.writer(arquivo, lineterminator="\n").writerow(RecalculoLoteUseCase.COLUNAS_SAIDA)
+        arquivo.flush()
+
+        progresso = ProgressoLote(
+            entrada=os.path.abspath(self.entrada),
+            linhas_processadas=0,
+            bytes_saida=os.fstat(arquivo.fileno()).st_size,
+            erros=0,
+            taxa_cdi_anual=taxa_cdi,
+            data_referencia=date.today().replace(day=1).isoformat()
+        )
+        progresso.salvar(self.arquivo_progresso)
+        return progresso, arquivo
+
+    def _imprimir_andamento(self, progresso: ProgressoLote, linhas_iniciais: int,
+                            total: Optional[int], inicio: float) -> None:
+        """Exibe o andamento do lote no stderr"""
+        decorrido = time.monotonic() - inicio
+        vazao = (progresso.linhas_processadas - linhas_iniciais) / decorrido if decorrido > 0 else 0.0
+        andamento = f"{progresso.linhas_processadas}"
+        if total:
+            restantes = total - progresso.linhas_processadas
+            eta = f", ETA {restantes / vazao:.0f}s" if vazao > 0 else ""
+            andamento += f"/{total} ({100 * progresso.linhas_processadas / total:.1f}%{eta})"
+        print(f"{andamento} planos | {vazao:.0f} planos/s | {progresso.erros} erros", file=sys.stderr)
+
+    def _relatorio(self, progresso: ProgressoLote, linhas_iniciais: int, duracao: float) -> Dict:
+        """Consolida o relatório de vazão da execução"""
+        processadas = progresso.linhas_processadas - linhas_iniciais
+        return {
+            "entrada": progresso.entrada,
+            "saida": os.path.abspath(self.saida),
+            "planos": progresso.linhas_processadas,
+            "planos_nesta_execucao": processadas,
+            "retomado_apos": linhas_iniciais,
+            "erros": progresso.erros,
+            "duracao_segundos": round(duracao, 2),
+            "vazao_planos_por_segundo": round(processadas / duracao, 1) if duracao > 0 else 0.0,
+            "processos": self.processos,
+            "tamanho_bloco": self.tamanho_bloco,
+            "taxa_cdi_anual": progresso.taxa_cdi_anual,
+            "data_referencia": progresso.data_referencia,
+        }
+
+
+def imprimir_relatorio(relatorio: Dict) -> None:
+    """Exibe o relatório final no terminal"""
+    print(f"Planos: {relatorio['planos']} ({relatorio['planos_nesta_execucao']} nesta execução, "
+          f"{relatorio['erros']} com erro)")
+    print(f"Duração: {relatorio['duracao_segundos']}s | vazão: {relatorio['vazao_planos_por_segundo']} planos/s | "
+          f"processos: {relatorio['processos']} | bloco: {relatorio['tamanho_bloco']}")
+    print(f"CDI: {relatorio['taxa_cdi_anual']}% | referência: {relatorio['data_referencia']} | "
+          f"saída: {relatorio['saida']}")
+
+
+def main(argumentos: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Recálculo em lote das projeções de planos")
+    parser.add_argument("--entrada", required=True, help="Arquivo de planos (.csv ou .parquet)")
+    parser.add_argument("--saida", required=True, help="CSV de resultados (um resumo por plano)")
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--tamanho-bloco", type=int, default=2000, help="Planos por bloco enviado aos processos")
+    parser.add_argument("--taxa-cdi", type=float, help="Taxa CDI anual (%%); padrão: consulta ao Banco Central")
+    parser.add_argument("--recomecar", action="store_true", help="Ignora o progresso gravado e recomeça o lote")
+    parser.add_argument("--intervalo-relatorio", type=float, default=10.0, help="Segundos entre linhas de andamento")
+    parser.add_argument("--saida-json", help="Arquivo para gravar o relatório em JSON")
+    args = parser.parse_args(argumentos)
+
+    relatorio = RecalculoLote(
+        entrada=args.entrada,
+        saida=args.saida,
+        processos=args.processos,
+        tamanho_bloco=args.tamanho_bloco,
+        taxa_cdi=args.taxa_cdi,
+        recomecar=args.recomecar,
+        intervalo_relatorio=args.intervalo_relatorio
+    ).executar()
+    imprimir_relatorio(relatorio)
+
+    if args.saida_json:
+        with open(args.saida_json, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
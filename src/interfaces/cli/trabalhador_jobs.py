@@ -0,0 +1,46 @@
+"""
+Trabalhador dedicado de jobs assíncronos, para executar os jobs submetidos à
+API em outras instâncias.
+
+Requer a fila compartilhada (JOBS_BACKEND=redis e JOBS_REDIS_URL iguais aos da
+API); na API, JOBS_TRABALHADORES=0 deixa a execução apenas para os
+trabalhadores dedicados. Encerre com Ctrl+C: o job em andamento é concluído.
+
+Uso:
+    JOBS_BACKEND=redis python -m src.interfaces.cli.trabalhador_jobs --trabalhadores 2 --processos 8
+"""
+import argparse
+import logging
+import os
+import sys
+from typing import List, Optional
+
+from src.application.jobs_use_case import JobsUseCase
+from src.domain.services.regras_tributarias import RegistroRegrasTributarias
+from src.infrastructure.jobs.fila_jobs import FilaJobsMemoria
+from src.infrastructure.jobs.trabalhadores_jobs import TrabalhadoresJobs
+
+
+def main(argumentos: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Trabalhador de jobs assíncronos")
+    parser.add_argument("--trabalhadores", type=int, default=1, help="Jobs executados simultaneamente")
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 1,
+                        help="Processos do pool de cálculo compartilhado pelos jobs")
+    args = parser.parse_args(argumentos)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    fila = JobsUseCase.fila()
+    if isinstance(fila, FilaJobsMemoria):
+        print("A fila de jobs em memória não é compartilhada com a API: use JOBS_BACKEND=redis",
+              file=sys.stderr)
+        sys.exit(2)
+
+    # Falha cedo se as regras tributárias não puderem ser carregadas
+    RegistroRegrasTributarias.obter()
+
+    TrabalhadoresJobs.executar_em_primeiro_plano(fila, JobsUseCase.executar, args.trabalhadores, args.processos)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from src.interfaces.api.dtos.rendimento_dtos import (
     CalculoRendimentoRequestDTO, 
@@ -7,17 +7,36 @@ from src.interfaces.api.dtos.rendimento_dtos import (
     InformeRendimentoDTO,
     CalculoJurosSaqueRequestDTO as CalculoResgateRequestDTO,
     CalculoResgateResponseDTO,
-    InformeResgateDTO
+    InformeResgateDTO,
+    CalculoCompletoResponseDTO,
+    InformeCompletoDTO
 )
 from src.interfaces.api.dtos.cdi_dtos import TaxaCDIResponseDTO
+from src.interfaces.api.dtos.comparacao_dtos import (
+    ComparacaoRequestDTO,
+    ComparacaoResponseDTO,
+    ResultadoVarianteDTO,
+    DiferencaVarianteDTO
+)
+from src.interfaces.api.dtos.cronograma_dtos import (
+    CronogramaCriadoResponseDTO,
+    LinhaCronogramaDTO
+)
 
+from src.domain.value_objects.cotacao_cdi import CotacaoCDI
+from src.domain.entities.cronograma import Cronograma
 from src.domain.entities.models import (
     ParametrosCalculoRendimento,
     ParametrosCalculoJurosSaque as ParametrosCalculoResgate,
     InformeRendimentoMensal,
     InformeResgateMensal,
+    InformeCompletoMensal,
     ResultadoCalculoRendimento,
-    ResultadoCalculoResgate
+    ResultadoCalculoResgate,
+    ResultadoCalculoCompleto,
+    ParametrosComparacao,
+    ParametrosVariante,
+    ResultadoComparacao
 )
 
 
@@ -44,7 +63,10 @@ class DTOConverter:
             ano_final=dto.ano_final,
             mes_final=dto.mes_final,
             taxa_cdi_anual=dto.taxa_cdi_anual,
-            percentual_sobre_cdi=dto.percentual_sobre_cdi or 100.0
+            percentual_sobre_cdi=dto.percentual_sobre_cdi or 100.0,
+            aritmetica=dto.aritmetica,
+            ajustar_inflacao=dto.ajustar_inflacao,
+            granularidade=dto.granularidade.value
         )
     
     @staticmethod
@@ -66,7 +88,11 @@ class DTOConverter:
             taxa_cdi_anual=dto.taxa_cdi_anual,
             percentual_sobre_cdi=dto.percentual_sobre_cdi or 100.0,
             considerar_ir=dto.considerar_ir,
-            considerar_iof=dto.considerar_iof
+            considerar_iof=dto.considerar_iof,
+            aritmetica=dto.aritmetica,
+            ajustar_inflacao=dto.ajustar_inflacao,
+            produto=dto.produto,
+            granularidade=dto.granularidade.value
         )
     
     @staticmethod
@@ -85,7 +111,8 @@ class DTOConverter:
             InformeRendimentoDTO(
                 mes_ano=informe.mes_ano_formatado,
                 valor_total=round(informe.saldo, 2),
-                rendimento_mensal=round(informe.rendimento, 2)
+                rendimento_mensal=round(informe.rendimento, 2),
+                valor_total_real=DTOConverter._arredondar_opcional(informe.saldo_real)
             )
             for informe in resultado.informes_mensais
         ]
@@ -97,7 +124,8 @@ class DTOConverter:
             valor_total_aplicado=round(resultado.valor_total_aplicado, 2),
             taxa_cdi_utilizada=resultado.taxa_cdi_utilizada,
             percentual_sobre_cdi=resultado.percentual_sobre_cdi,
-            data_calculo=resultado.data_calculo_formatada
+            data_calculo=resultado.data_calculo_formatada,
+            ipca_projetado_mensal=resultado.ipca_projetado_mensal
         )
     
     @staticmethod
@@ -117,7 +145,8 @@ class DTOConverter:
                 mes_ano=informe.mes_ano_formatado,
                 valor_total=round(informe.saldo, 2),
                 imposto_resgate=round(informe.imposto, 2),
-                aliquota_ir=informe.aliquota_ir
+                aliquota_ir=informe.aliquota_ir,
+                valor_total_real=DTOConverter._arredondar_opcional(informe.saldo_real)
             )
             for informe in resultado.informes_mensais
         ]
@@ -133,24 +162,200 @@ class DTOConverter:
             percentual_sobre_cdi=resultado.percentual_sobre_cdi,
             considera_ir=resultado.considera_ir,
             considera_iof=resultado.considera_iof,
+            data_calculo=resultado.data_calculo_formatada,
+            ipca_projetado_mensal=resultado.ipca_projetado_mensal
+        )
+    
+    @staticmethod
+    def to_completo_response(resultado: ResultadoCalculoCompleto) -> CalculoCompletoResponseDTO:
+        """
+        Converte um resultado de cálculo completo do domínio para o DTO de resposta da API.
+        
+        Args:
+            resultado: Resultado de cálculo completo do domínio
+            
+        Returns:
+            DTO formatado para resposta da API
+        """
+        # Converte informes mensais
+        informes_dto = [
+            InformeCompletoDTO(
+                mes_ano=informe.mes_ano_formatado,
+                valor_total=round(informe.saldo, 2),
+                rendimento_mensal=round(informe.rendimento, 2),
+                aliquota_ir=informe.aliquota_ir,
+                iof=round(informe.iof, 2),
+                imposto_resgate=round(informe.imposto, 2),
+                valor_liquido=round(informe.valor_liquido, 2),
+                valor_total_real=DTOConverter._arredondar_opcional(informe.saldo_real),
+                valor_liquido_real=DTOConverter._arredondar_opcional(informe.valor_liquido_real)
+            )
+            for informe in resultado.informes_mensais
+        ]
+        
+        # Monta o DTO de resposta
+        return CalculoCompletoResponseDTO(
+            informe_mensal=informes_dto,
+            total_rendimento=round(resultado.total_rendimento, 2),
+            total_impostos=round(resultado.total_impostos, 2),
+            rendimento_liquido=round(resultado.rendimento_liquido, 2),
+            rendimento_bruto=round(resultado.rendimento_bruto, 2),
+            valor_total_aplicado=round(resultado.valor_total_aplicado, 2),
+            taxa_cdi_utilizada=resultado.taxa_cdi_utilizada,
+            percentual_sobre_cdi=resultado.percentual_sobre_cdi,
+            considera_ir=resultado.considera_ir,
+            considera_iof=resultado.considera_iof,
+            data_calculo=resultado.data_calculo_formatada,
+            ipca_projetado_mensal=resultado.ipca_projetado_mensal
+        )
+    
+    @staticmethod
+    def to_cronograma_criado(handle: str, expira_em: datetime, cronograma: Cronograma) -> CronogramaCriadoResponseDTO:
+        """
+        Cria o DTO de resposta com o handle e o resumo de um cronograma.
+        
+        Args:
+            handle: Handle do cronograma em cache
+            expira_em: Data e hora de expiração do handle
+            cronograma: Cronograma calculado
+        
+        Returns:
+            DTO formatado para resposta da API
+        """
+        return CronogramaCriadoResponseDTO(
+            handle=handle,
+            expira_em=expira_em,
+            meses=len(cronograma),
+            primeiro_mes=cronograma.data_do_mes(1).strftime("%B/%Y"),
+            ultimo_mes=cronograma.data_do_mes(len(cronograma)).strftime("%B/%Y"),
+            total_rendimento=round(cronograma.total_rendimento, 2),
+            total_impostos=round(cronograma.total_impostos, 2),
+            valor_total_aplicado=round(cronograma.valor_total_aplicado, 2),
+            taxa_cdi_utilizada=cronograma.taxa_cdi_utilizada
+        )
+    
+    @staticmethod
+    def to_linha_cronograma(mes: int, informe: InformeCompletoMensal) -> LinhaCronogramaDTO:
+        """
+        Converte um mês do cronograma para o DTO de resposta da API.
+        
+        Args:
+            mes: Número do mês no plano (1 = primeiro mês)
+            informe: Valores do mês
+        
+        Returns:
+            DTO formatado para resposta da API
+        """
+        return LinhaCronogramaDTO(
+            mes=mes,
+            mes_ano=informe.mes_ano_formatado,
+            valor_total=round(informe.saldo, 2),
+            rendimento_mensal=round(informe.rendimento, 2),
+            aliquota_ir=informe.aliquota_ir,
+            iof=round(informe.iof, 2),
+            imposto_resgate=round(informe.imposto, 2),
+            valor_liquido=round(informe.valor_liquido, 2)
+        )
+    
+    @staticmethod
+    def to_parametros_comparacao(dto: ComparacaoRequestDTO) -> ParametrosComparacao:
+        """
+        Converte um DTO de requisição para o modelo de parâmetros da comparação de cenários.
+        
+        Args:
+            dto: DTO da requisição de comparação
+        
+        Returns:
+            Modelo de domínio com o plano base e as variantes
+        """
+        return ParametrosComparacao(
+            base=DTOConverter.to_parametros_resgate(dto.base),
+            variantes=[
+                ParametrosVariante(
+                    nome=variante.nome,
+                    percentual_sobre_cdi=variante.percentual_sobre_cdi,
+                    taxa_cdi_anual=variante.taxa_cdi_anual,
+                    isento_ir=variante.isento_ir,
+                    produto=variante.produto
+                )
+                for variante in dto.variantes
+            ]
+        )
+    
+    @staticmethod
+    def to_comparacao_response(resultado: ResultadoComparacao) -> ComparacaoResponseDTO:
+        """
+        Converte um resultado de comparação de cenários do domínio para o DTO de resposta da API.
+        
+        Args:
+            resultado: Resultado da comparação do domínio
+        
+        Returns:
+            DTO formatado para resposta da API, com as diferenças em relação à primeira variante
+        """
+        variantes_dto = [
+            ResultadoVarianteDTO(
+                nome=variante.nome,
+                taxa_cdi_utilizada=variante.taxa_cdi_utilizada,
+                percentual_sobre_cdi=variante.percentual_sobre_cdi,
+                isento_ir=variante.isento_ir,
+                valor_total=[round(valor, 2) for valor in variante.serie.saldos],
+                rendimento_mensal=[round(valor, 2) for valor in variante.serie.rendimentos],
+                aliquota_ir=list(variante.serie.aliquotas_ir),
+                imposto_resgate=[round(valor, 2) for valor in variante.serie.impostos],
+                valor_liquido=[round(valor, 2) for valor in variante.serie.valores_liquidos],
+                total_rendimento=round(variante.serie.total_rendimento, 2),
+                total_impostos=round(variante.serie.total_impostos, 2),
+                rendimento_bruto=round(variante.rendimento_bruto, 2),
+                rendimento_liquido=round(variante.rendimento_liquido, 2)
+            )
+            for variante in resultado.variantes
+        ]
+        
+        # Diferenças calculadas sobre os valores já arredondados da resposta
+        referencia = variantes_dto[0]
+        diferencas_dto = [
+            DiferencaVarianteDTO(
+                nome=variante.nome,
+                valor_total=[round(a - b, 2) for a, b in zip(variante.valor_total, referencia.valor_total)],
+                valor_liquido=[round(a - b, 2) for a, b in zip(variante.valor_liquido, referencia.valor_liquido)],
+                rendimento_liquido=round(variante.rendimento_liquido - referencia.rendimento_liquido, 2)
+            )
+            for variante in variantes_dto
+        ]
+        
+        return ComparacaoResponseDTO(
+            meses=[data.strftime("%B/%Y") for data in resultado.datas],
+            referencia=referencia.nome,
+            variantes=variantes_dto,
+            diferencas=diferencas_dto,
+            valor_total_aplicado=round(resultado.valor_total_aplicado, 2),
+            considera_ir=resultado.considera_ir,
+            considera_iof=resultado.considera_iof,
             data_calculo=resultado.data_calculo_formatada
         )
     
     @staticmethod
-    def to_cdi_response(cdi_valor: float) -> TaxaCDIResponseDTO:
+    def _arredondar_opcional(valor: Optional[float]) -> Optional[float]:
+        """Arredonda para 2 casas valores opcionais (None permanece None)"""
+        return round(valor, 2) if valor is not None else None
+    
+    @staticmethod
+    def to_cdi_response(cotacao: CotacaoCDI) -> TaxaCDIResponseDTO:
         """
         Cria um DTO de resposta com informações da taxa CDI.
         
         Args:
-            cdi_valor: Valor da taxa CDI anual
+            cotacao: Cotação do CDI obtida pelo serviço
             
         Returns:
             DTO formatado para resposta da API
         """
         return TaxaCDIResponseDTO(
-            cdi_anual=cdi_valor,
-            data_atualizacao=datetime.now(),
-            fonte="Banco Central do Brasil"
+            cdi_anual=cotacao.valor,
+            data_atualizacao=cotacao.data_atualizacao,
+            fonte=cotacao.fonte,
+            stale=cotacao.stale
         )
     
     @staticmethod
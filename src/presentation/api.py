@@ -1,11 +1,49 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from src.interfaces.api.controllers import router as api_router
+from src.interfaces.api.middlewares.limite_taxa import LimiteTaxaMiddleware
+from src.interfaces.api.middlewares.rastreamento import RastreamentoMiddleware
+from src.interfaces.api.materializacao import MaterializacaoCenarios
+from src.domain.services.tabela_fatores import RegistroTabelasFatores
+from src.domain.services.regras_tributarias import RegistroRegrasTributarias
+from src.infrastructure.external.bcb_service import CDIService
+from src.infrastructure.execucao.executor_calculos import ExecutorCalculos
+from src.infrastructure.cache.purga_cdn import PurgaCDN
+from src.infrastructure.jobs.trabalhadores_jobs import TrabalhadoresJobs
+from src.application.jobs_use_case import JobsUseCase
+from src.application.aquecimento_use_case import AquecimentoUseCase
+from src.infrastructure.execucao.ciclo_vida import CicloVida
+from src.infrastructure.observabilidade.logs import ConfiguracaoLogs
+from src.infrastructure.observabilidade.rastreamento import Rastreamento
 import os
+from typing import List
 
 # Obter o tipo de app da variável de ambiente
 app_type = os.environ.get("APP_TYPE", "api")
 
+# Origens com acesso à API via CORS, separadas por vírgula ("*" libera todas, sem credenciais)
+CORS_ORIGENS_PADRAO = (
+    "https://web-calculo-rendimento.onrender.com,"
+    "https://site-calculo-rendimento.onrender.com,"
+    "http://localhost:8080,"
+    "http://127.0.0.1:8080"
+)
+
+# Tempo (segundos) que o navegador reaproveita a resposta do preflight
+CORS_MAX_AGE = int(os.environ.get("CORS_MAX_AGE", 86400))
+
+
+def _origens_cors() -> List[str]:
+    """
+    Lê as origens permitidas de CORS_ORIGENS.
+    
+    Returns:
+        Lista de origens (sem espaços e sem "/" final)
+    """
+    valor = os.environ.get("CORS_ORIGENS", CORS_ORIGENS_PADRAO)
+    return [origem.strip().rstrip("/") for origem in valor.split(",") if origem.strip()]
+
+
 def create_api() -> FastAPI:
     """
     Cria e configura a aplicação FastAPI.
@@ -13,6 +51,9 @@ def create_api() -> FastAPI:
     Returns:
         FastAPI: Aplicação configurada com rotas e middlewares
     """
+    # Logs estruturados gravados em segundo plano (não bloqueiam o event loop)
+    ConfiguracaoLogs.configurar()
+    
     # Cria a aplicação FastAPI com configurações
     app = FastAPI(
         title="API de Cálculo de Rendimentos",
@@ -22,22 +63,61 @@ def create_api() -> FastAPI:
         redoc_url="/redoc",
     )
     
-    # Configuração de CORS para permitir requisições do frontend
+    # Limite de taxa por cliente ponderado pelo custo do cálculo
+    # (adicionado antes do CORS para que as respostas 429 também tenham os cabeçalhos CORS)
+    app.add_middleware(LimiteTaxaMiddleware)
+    
+    # Configuração de CORS para o frontend servido em outra origem (no modo combinado
+    # o site usa a mesma origem e não precisa de CORS); o preflight fica em cache no
+    # navegador por CORS_MAX_AGE segundos
+    origens = _origens_cors()
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=[
-            "https://web-calculo-rendimento.onrender.com",  # URL específica do seu site
-            "http://localhost:8080",  # Para desenvolvimento local
-            "*"  # Opcional: permite todas as origens
-        ],
-        allow_credentials=True,
-        allow_methods=["*"],
+        allow_origins=origens,
+        # Credenciais não podem ser combinadas com a origem curinga "*"
+        allow_credentials="*" not in origens,
+        allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
         allow_headers=["*"],
+        expose_headers=["X-Request-ID", "ETag"],
+        max_age=CORS_MAX_AGE,
     )
     
+    # Request ID, tempos por etapa e log de acesso (o mais externo, para cobrir também 429 e 503)
+    app.add_middleware(RastreamentoMiddleware)
+    
     # Adiciona as rotas da API
     app.include_router(api_router, prefix="/api/v1")
     
+    # Compila as regras tributárias na inicialização (um arquivo inválido impede a subida)
+    RegistroRegrasTributarias.obter()
+    
+    # Reconstrói as tabelas de fatores sempre que a taxa CDI for atualizada
+    CDIService.registrar_observador(RegistroTabelasFatores.reconstruir)
+    
+    # Purga da CDN as respostas de cálculo da taxa anterior quando a taxa CDI muda
+    CDIService.registrar_observador(PurgaCDN.notificar_cdi)
+    
+    # Recalcula em segundo plano os cenários mais pedidos com a nova taxa CDI
+    CDIService.registrar_observador(MaterializacaoCenarios.notificar_cdi)
+    
+    # Aquecimento em segundo plano: a sonda de prontidão (/health/ready) responde 503 até ele terminar
+    app.add_event_handler("startup", AquecimentoUseCase.iniciar)
+    
+    # Trabalhadores de jobs assíncronos (JOBS_TRABALHADORES=0 deixa a execução para instâncias dedicadas);
+    # ao desligar, terminam o job em andamento
+    app.add_event_handler("startup", lambda: TrabalhadoresJobs.iniciar(JobsUseCase.fila(), JobsUseCase.executar))
+    app.add_event_handler("shutdown", TrabalhadoresJobs.encerrar)
+    
+    # Prontidão indisponível durante o desligamento (também quando o servidor não drena pelo SIGTERM)
+    app.add_event_handler("shutdown", CicloVida.iniciar_encerramento)
+    
+    # Aguarda os cálculos em andamento e libera o pool ao desligar o servidor
+    app.add_event_handler("shutdown", ExecutorCalculos.encerrar)
+    
+    # Exporta os spans e escreve os logs pendentes ao desligar
+    app.add_event_handler("shutdown", Rastreamento.encerrar)
+    app.add_event_handler("shutdown", ConfiguracaoLogs.encerrar)
+    
     return app
 
 # Instância da aplicação para ser usada pelo servidor ASGI
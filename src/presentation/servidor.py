@@ -0,0 +1,53 @@
+import asyncio
+import logging
+import signal
+from types import FrameType
+from typing import Optional
+
+import uvicorn
+
+from src.infrastructure.execucao.ciclo_vida import CicloVida
+
+
+class ServidorComDrenagem(uvicorn.Server):
+    """
+    Servidor uvicorn que drena as conexões antes de encerrar.
+
+    No primeiro SIGTERM a sonda de prontidão passa a responder 503 e o
+    servidor continua atendendo por `CicloVida.ATRASO_DRENAGEM_SEGUNDOS`,
+    tempo para o balanceador tirar a instância da rotação. Depois disso o
+    uvicorn fecha o socket (não aceita novas conexões), aguarda as requisições
+    em andamento por até `CicloVida.TIMEOUT_DRENAGEM_SEGUNDOS` e executa os
+    handlers de shutdown da aplicação (jobs, pool de cálculos, logs e spans).
+    SIGINT (Ctrl+C) e um segundo sinal encerram sem o atraso.
+    """
+
+    def handle_exit(self, sig: int, frame: Optional[FrameType]) -> None:
+        primeiro_sinal = CicloVida.iniciar_encerramento()
+        if sig == signal.SIGTERM and primeiro_sinal and CicloVida.ATRASO_DRENAGEM_SEGUNDOS > 0:
+            logging.info(f"SIGTERM recebido; fechando o socket em {CicloVida.ATRASO_DRENAGEM_SEGUNDOS:g} s")
+            asyncio.get_event_loop().call_later(
+                CicloVida.ATRASO_DRENAGEM_SEGUNDOS, super().handle_exit, sig, frame
+            )
+            return
+        super().handle_exit(sig, frame)
+
+    @classmethod
+    def executar(cls, app: str, host: str, port: int, **opcoes) -> None:
+        """
+        Executa o servidor até receber o sinal de encerramento.
+
+        Args:
+            app: Aplicação no formato "modulo:atributo"
+            host: Endereço de escuta
+            port: Porta de escuta
+            **opcoes: Demais opções de `uvicorn.Config`
+        """
+        config = uvicorn.Config(
+            app,
+            host=host,
+            port=port,
+            timeout_graceful_shutdown=CicloVida.TIMEOUT_DRENAGEM_SEGUNDOS,
+            **opcoes
+        )
+        cls(config).run()
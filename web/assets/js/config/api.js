@@ -2,14 +2,35 @@
  * Módulo de configuração e comunicação com a API
  */
 export const API = {
+    /**
+     * Origens em que o site é servido separado da API (cada cálculo paga o preflight CORS)
+     */
+    origensSeparadas: {
+        'http://localhost:8080': 'http://localhost:8000/api/v1',
+        'http://127.0.0.1:8080': 'http://localhost:8000/api/v1',
+        'https://web-calculo-rendimento.onrender.com': 'https://api-calculo-rendimento.onrender.com/api/v1',
+        'https://site-calculo-rendimento.onrender.com': 'https://api-calculo-rendimento.onrender.com/api/v1'
+    },
+    
     /**
      * Determina a URL base da API com base no ambiente
      * @returns {string} URL base da API
      */
     getBaseUrl() {
-        return (window.location.hostname === 'localhost' || window.location.hostname === '127.0.0.1')
-            ? 'http://localhost:8000/api/v1'
-            : 'https://api-calculo-rendimento.onrender.com/api/v1';
+        // No modo combinado (APP_TYPE=combinado) site e API estão na mesma origem:
+        // sem preflight CORS e reaproveitando a conexão que carregou a página
+        return this.origensSeparadas[window.location.origin] || '/api/v1';
+    },
+    
+    /**
+     * Converte a URL (absoluta ou relativa à página) de um endpoint em URL de WebSocket
+     * @param {string} url - URL HTTP do endpoint
+     * @returns {string} URL ws:// ou wss://
+     */
+    getWsUrl(url) {
+        const absoluta = new URL(url, window.location.href);
+        absoluta.protocol = absoluta.protocol === 'https:' ? 'wss:' : 'ws:';
+        return absoluta.toString();
     },
     
     /**
@@ -25,29 +46,118 @@ export const API = {
         this.endpoints = {
             calcularRendimento: `${baseUrl}/calcular_rendimento`,
             calcularResgate: `${baseUrl}/calcular_resgate`,
+            calcularCompleto: `${baseUrl}/calcular_completo`,
+            exportarCsv: `${baseUrl}/exportar/csv`,
+            wsCalculo: this.getWsUrl(`${baseUrl}/ws/calculo`),
             cdiAtual: `${baseUrl}/cdi_atual`
         };
     },
     
     /**
-     * Realiza chamada à API
+     * Requisições em andamento, por método + URL + corpo (deduplicação)
+     */
+    emAndamento: new Map(),
+    
+    /**
+     * Última representação recebida de cada GET com ETag: URL -> { etag, dados }
+     */
+    validadores: new Map(),
+    
+    /**
+     * Realiza chamada à API.
+     * Chamadas idênticas simultâneas compartilham a mesma requisição; cada chamada
+     * pode ser cancelada pelo seu `signal`, e a requisição só é abortada quando todas
+     * as chamadas que a compartilham forem canceladas. GETs com representação
+     * conhecida são revalidados com If-None-Match (304 reaproveita os dados).
      * @param {string} endpoint - Endpoint da API a ser chamado
      * @param {Object} options - Opções da requisição fetch
      * @returns {Promise<Object>} - Resposta da API em JSON
-     * @throws {Error} - Erro da requisição
+     * @throws {Error} - Erro da requisição (AbortError se cancelada pelo `signal`)
      */
-    async fetch(endpoint, options = {}) {
+    fetch(endpoint, options = {}) {
+        const { signal, ...opcoes } = options;
+        const chave = [opcoes.method || 'GET', endpoint, opcoes.body || ''].join(' ');
+        
+        let pendente = this.emAndamento.get(chave);
+        if (!pendente) {
+            const controlador = new AbortController();
+            const novo = { controlador, consumidores: 0 };
+            novo.promessa = this.requisitar(endpoint, { ...opcoes, signal: controlador.signal })
+                .finally(() => this.descartar(chave, novo));
+            this.emAndamento.set(chave, novo);
+            pendente = novo;
+        }
+        pendente.consumidores += 1;
+        
+        if (!signal) return pendente.promessa;
+        
+        return new Promise((resolve, reject) => {
+            const cancelar = () => {
+                pendente.consumidores -= 1;
+                if (pendente.consumidores === 0) {
+                    // Chamadas idênticas posteriores fazem uma nova requisição
+                    this.descartar(chave, pendente);
+                    pendente.controlador.abort();
+                }
+                reject(new DOMException('Requisição cancelada', 'AbortError'));
+            };
+            if (signal.aborted) {
+                cancelar();
+                return;
+            }
+            signal.addEventListener('abort', cancelar, { once: true });
+            pendente.promessa
+                .then(resolve, reject)
+                .finally(() => signal.removeEventListener('abort', cancelar));
+        });
+    },
+    
+    /**
+     * Remove uma requisição do mapa de deduplicação (se ainda for a registrada na chave)
+     * @param {string} chave - Chave da requisição
+     * @param {Object} pendente - Requisição em andamento
+     */
+    descartar(chave, pendente) {
+        if (this.emAndamento.get(chave) === pendente) {
+            this.emAndamento.delete(chave);
+        }
+    },
+    
+    /**
+     * Executa uma requisição (sem deduplicação), com revalidação por ETag nos GETs
+     * @param {string} endpoint - Endpoint da API a ser chamado
+     * @param {Object} options - Opções da requisição fetch
+     * @returns {Promise<Object>} - Resposta da API em JSON
+     */
+    async requisitar(endpoint, options) {
+        const metodo = (options.method || 'GET').toUpperCase();
+        const validador = metodo === 'GET' ? this.validadores.get(endpoint) : null;
+        if (validador) {
+            options = { ...options, headers: { ...options.headers, 'If-None-Match': validador.etag } };
+        }
+        
         try {
             const response = await fetch(endpoint, options);
             
+            if (response.status === 304 && validador) {
+                return validador.dados;
+            }
+            
             if (!response.ok) {
                 const errorData = await response.json().catch(() => ({}));
                 throw new Error(errorData.detail || `Erro ${response.status}: ${response.statusText}`);
             }
             
-            return await response.json();
+            const dados = await response.json();
+            const etag = response.headers.get('ETag');
+            if (metodo === 'GET' && etag) {
+                this.validadores.set(endpoint, { etag, dados });
+            }
+            return dados;
         } catch (error) {
-            console.error(`Erro na chamada à API (${endpoint}):`, error);
+            if (error.name !== 'AbortError') {
+                console.error(`Erro na chamada à API (${endpoint}):`, error);
+            }
             throw error;
         }
     }
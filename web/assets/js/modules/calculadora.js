@@ -2,15 +2,120 @@
  * Módulo de cálculos e operações principais
  */
 import { API } from '../config/api.js';
+import { CanalCalculo } from './canal_calculo.js';
 import { UI } from './ui.js';
 import { Validador } from './validador.js';
+import { CacheLocal } from '../utils/cache_local.js';
+import { debounce } from '../utils/helpers.js';
 
 export const Calculadora = {
     // Armazena o resultado atual para uso em exportação e outros
     resultadoAtual: null,
     
+    // Último cálculo completo e os parâmetros que o geraram
+    ultimoCalculoCompleto: null,
+    chaveUltimoCalculo: null,
+    
+    // Cálculo em andamento: { chave, controlador, promessa }
+    calculoEmAndamento: null,
+    
+    // Versão da taxa CDI atual (ETag de /cdi_atual), parte da chave dos resultados sem taxa informada
+    versaoCDI: null,
+    
+    // Visão exibida ('rendimento' ou 'resgate'), atualizada ao vivo quando o formulário muda
+    visaoAtual: null,
+    
+    // Tempo em que a taxa CDI guardada é usada sem consultar a API
+    VALIDADE_CDI_MS: 10 * 60 * 1000,
+    
+    CHAVE_CDI: 'cdi_atual',
+    
+    /**
+     * Gera a chave de cache de um cálculo: parâmetros normalizados, mês de início
+     * (o cálculo começa no mês corrente) e, se a taxa não for informada, a versão do CDI
+     * @param {Object} parametros - Parâmetros da requisição
+     * @returns {string} - Chave do cálculo
+     */
+    chaveResultado(parametros) {
+        const normalizados = Object.keys(parametros).sort().map(campo => {
+            const valor = parametros[campo];
+            return [campo, typeof valor === 'number' && Number.isNaN(valor) ? null : valor];
+        });
+        const hoje = new Date();
+        const mes = `${hoje.getFullYear()}-${String(hoje.getMonth() + 1).padStart(2, '0')}`;
+        const taxaInformada = typeof parametros.taxa_cdi_anual === 'number' && !Number.isNaN(parametros.taxa_cdi_anual);
+        
+        return JSON.stringify({ parametros: normalizados, mes, cdi: taxaInformada ? null : this.versaoCDI });
+    },
+    
+    /**
+     * Obtém rendimento e impostos de resgate em uma única chamada à API.
+     * Reaproveita o último resultado quando os parâmetros não mudaram, de modo que
+     * alternar entre as visões de rendimento e de resgate não gera nova requisição.
+     * Resultados já calculados vêm do cache local; um pedido com outros parâmetros
+     * cancela o cálculo anterior ainda em andamento.
+     * @param {Object} params - Parâmetros do formulário
+     * @returns {Promise<Object>} - Resposta de /calcular_completo
+     * @throws {Error} - Erro da API, ou AbortError se o cálculo foi substituído por outro
+     */
+    async obterCalculoCompleto(params) {
+        const parametros = { ...params, considerar_ir: true, considerar_iof: true };
+        const chave = this.chaveResultado(parametros);
+        
+        if (chave === this.chaveUltimoCalculo && this.ultimoCalculoCompleto) {
+            return this.ultimoCalculoCompleto;
+        }
+        if (this.calculoEmAndamento && this.calculoEmAndamento.chave === chave) {
+            return this.calculoEmAndamento.promessa;
+        }
+        
+        if (this.calculoEmAndamento) {
+            this.calculoEmAndamento.controlador.abort();
+        }
+        const controlador = new AbortController();
+        const promessa = this.consultarCalculo(parametros, chave, controlador.signal);
+        this.calculoEmAndamento = { chave, controlador, promessa };
+        
+        try {
+            return await promessa;
+        } finally {
+            if (this.calculoEmAndamento && this.calculoEmAndamento.promessa === promessa) {
+                this.calculoEmAndamento = null;
+            }
+        }
+    },
+    
+    /**
+     * Obtém um cálculo do cache local ou da API, guardando o resultado
+     * @param {Object} parametros - Parâmetros da requisição
+     * @param {string} chave - Chave do cálculo (ver `chaveResultado`)
+     * @param {AbortSignal} signal - Cancela a consulta
+     * @returns {Promise<Object>} - Resposta de /calcular_completo
+     */
+    async consultarCalculo(parametros, chave, signal) {
+        const armazenado = await CacheLocal.obter(`calculo:${chave}`);
+        let dados = armazenado ? armazenado.valor : null;
+        
+        if (!dados) {
+            dados = await API.fetch(API.endpoints.calcularCompleto, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(parametros),
+                signal
+            });
+            CacheLocal.salvar(`calculo:${chave}`, dados);
+        }
+        if (signal.aborted) {
+            throw new DOMException('Cálculo substituído', 'AbortError');
+        }
+        
+        this.ultimoCalculoCompleto = dados;
+        this.chaveUltimoCalculo = chave;
+        return dados;
+    },
+    
     /**
-     * Calcula o rendimento usando a API
+     * Calcula o rendimento usando a API (visão de rendimento do cálculo completo)
      */
     async calcularRendimento() {
         if (!Validador.validarFormulario()) return;
@@ -21,27 +126,25 @@ export const Calculadora = {
             
             const params = Validador.obterParametrosFormulario();
             
-            const dados = await API.fetch(API.endpoints.calcularRendimento, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify(params)
-            });
+            const dados = await this.obterCalculoCompleto(params);
             
             this.resultadoAtual = dados;
+            this.visaoAtual = 'rendimento';
             
             UI.preencherTabelaResultados(dados.informe_mensal, 'rendimento_mensal');
             UI.atualizarResumo(dados, false);
             UI.elements.btnExportar.disabled = false;
             
         } catch (error) {
-            UI.mostrarErro(error.message);
+            // Um cálculo cancelado foi substituído por outro, que atualiza a tela
+            if (error.name !== 'AbortError') UI.mostrarErro(error.message);
         } finally {
-            UI.mostrarLoading(false);
+            if (!this.calculoEmAndamento) UI.mostrarLoading(false);
         }
     },
     
     /**
-     * Calcula os impostos de resgate usando a API
+     * Calcula os impostos de resgate usando a API (visão de resgate do cálculo completo)
      */
     async calcularResgate() {
         if (!Validador.validarFormulario()) return;
@@ -51,36 +154,98 @@ export const Calculadora = {
             UI.prepararParaResgate();
             
             const params = Validador.obterParametrosFormulario();
-            params.considerar_ir = true;  // Valores padrão
-            params.considerar_iof = true;
             
-            const dados = await API.fetch(API.endpoints.calcularResgate, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify(params)
-            });
+            const dados = await this.obterCalculoCompleto(params);
             
             this.resultadoAtual = dados;
+            this.visaoAtual = 'resgate';
             
             UI.preencherTabelaResultados(dados.informe_mensal, 'imposto_resgate');
             UI.atualizarResumo(dados, true);
             UI.elements.btnExportar.disabled = false;
             
         } catch (error) {
-            UI.mostrarErro(error.message);
+            // Um cálculo cancelado foi substituído por outro, que atualiza a tela
+            if (error.name !== 'AbortError') UI.mostrarErro(error.message);
         } finally {
-            UI.mostrarLoading(false);
+            if (!this.calculoEmAndamento) UI.mostrarLoading(false);
         }
     },
     
     /**
-     * Busca a taxa CDI atual da API
+     * Recalcula a visão exibida pelo canal ao vivo quando um campo do formulário muda.
+     * O servidor agrupa alterações próximas e devolve só os valores e linhas alterados.
      */
-    async buscarTaxaCDI() {
+    recalcularAoVivo() {
+        if (!this.visaoAtual || !UI.elements.form.checkValidity()) return;
+        
+        if (!CanalCalculo.disponivel()) {
+            // Sem WebSocket, recalcula por HTTP quando o usuário para de digitar
+            this.agendarRecalculo();
+            return;
+        }
+        
+        if (!CanalCalculo.aoAtualizar) {
+            CanalCalculo.configurar(dados => this.exibirAoVivo(dados), mensagem => UI.mostrarErro(mensagem));
+        }
+        CanalCalculo.enviar({ ...Validador.obterParametrosFormulario(), considerar_ir: true, considerar_iof: true });
+    },
+    
+    /**
+     * Recalcula a visão atual por HTTP, após 400 ms sem novas alterações no formulário
+     */
+    agendarRecalculo: debounce(() => {
+        if (Calculadora.visaoAtual === 'resgate') {
+            Calculadora.calcularResgate();
+        } else {
+            Calculadora.calcularRendimento();
+        }
+    }, 400),
+    
+    /**
+     * Exibe um resultado recebido pelo canal ao vivo na visão atual
+     * @param {Object} dados - Resultado completo reconstruído pelo canal
+     */
+    exibirAoVivo(dados) {
+        this.resultadoAtual = dados;
+        // Os botões de cálculo voltam a consultar a API com os parâmetros do formulário
+        this.chaveUltimoCalculo = null;
+        
+        const isResgate = this.visaoAtual === 'resgate';
+        UI.preencherTabelaResultados(dados.informe_mensal, isResgate ? 'imposto_resgate' : 'rendimento_mensal');
+        UI.atualizarResumo(dados, isResgate);
+        UI.elements.btnExportar.disabled = false;
+    },
+    
+    /**
+     * Busca a taxa CDI atual da API.
+     * A taxa guardada no cache local é usada por `VALIDADE_CDI_MS`; depois disso (ou
+     * a pedido do usuário) é revalidada pelo ETag, sem baixar o valor se não mudou.
+     * @param {boolean} revalidar - Consulta a API mesmo com a taxa guardada ainda válida
+     */
+    async buscarTaxaCDI(revalidar = false) {
         try {
             UI.atualizarBotaoCDI(true);
             
-            const dados = await API.fetch(API.endpoints.cdiAtual);
+            const armazenado = await CacheLocal.obter(this.CHAVE_CDI);
+            const guardado = armazenado ? armazenado.valor : null;
+            if (guardado && guardado.etag && !API.validadores.has(API.endpoints.cdiAtual)) {
+                API.validadores.set(API.endpoints.cdiAtual, guardado);
+            }
+            
+            let dados;
+            if (guardado && !revalidar && !guardado.dados.stale &&
+                    Date.now() - armazenado.salvoEm < this.VALIDADE_CDI_MS) {
+                dados = guardado.dados;
+                this.versaoCDI = guardado.etag || String(dados.cdi_anual);
+            } else {
+                dados = await API.fetch(API.endpoints.cdiAtual);
+                const validador = API.validadores.get(API.endpoints.cdiAtual);
+                const etag = validador && validador.dados === dados ? validador.etag : null;
+                this.versaoCDI = etag || String(dados.cdi_anual);
+                CacheLocal.salvar(this.CHAVE_CDI, { etag, dados });
+            }
+            
             UI.elements.taxaCDI.value = dados.cdi_anual.toFixed(2);
             
         } catch (error) {
@@ -0,0 +1,118 @@
+/**
+ * Módulo do canal de recálculo ao vivo (WebSocket /ws/calculo)
+ */
+import { API } from '../config/api.js';
+
+export const CanalCalculo = {
+    socket: null,
+    seq: 0,
+    
+    // Últimos parâmetros enviados (o servidor recebe apenas os campos alterados)
+    parametrosEnviados: {},
+    
+    // Resultado completo reconstruído a partir das diferenças recebidas
+    resultado: null,
+    
+    // Parâmetros aguardando a abertura da conexão
+    pendentes: null,
+    
+    aoAtualizar: null,
+    aoErro: null,
+    
+    /**
+     * Indica se o navegador suporta o canal ao vivo
+     * @returns {boolean}
+     */
+    disponivel() {
+        return 'WebSocket' in window;
+    },
+    
+    /**
+     * Define os callbacks de atualização e de erro
+     * @param {Function} aoAtualizar - Recebe o resultado completo atualizado
+     * @param {Function} aoErro - Recebe a mensagem de erro
+     */
+    configurar(aoAtualizar, aoErro) {
+        this.aoAtualizar = aoAtualizar;
+        this.aoErro = aoErro;
+    },
+    
+    /**
+     * Envia os parâmetros atuais; o servidor agrupa envios próximos e responde
+     * só com o que mudou
+     * @param {Object} parametros - Parâmetros completos do formulário
+     */
+    enviar(parametros) {
+        if (!this.socket || this.socket.readyState > WebSocket.OPEN) {
+            this.conectar();
+        }
+        if (this.socket.readyState !== WebSocket.OPEN) {
+            this.pendentes = parametros;
+            return;
+        }
+        
+        const patch = {};
+        Object.entries(parametros).forEach(([campo, valor]) => {
+            if (this.parametrosEnviados[campo] !== valor) patch[campo] = valor;
+        });
+        if (Object.keys(patch).length === 0) return;
+        
+        this.seq += 1;
+        this.socket.send(JSON.stringify({ tipo: 'parametros', seq: this.seq, parametros: patch }));
+        this.parametrosEnviados = { ...parametros };
+    },
+    
+    /**
+     * Abre a conexão (uma nova conexão começa sem estado no servidor)
+     */
+    conectar() {
+        this.socket = new WebSocket(API.endpoints.wsCalculo);
+        this.parametrosEnviados = {};
+        // O servidor enviará todas as linhas na primeira resposta
+        this.resultado = null;
+        
+        this.socket.addEventListener('open', () => {
+            if (this.pendentes) {
+                const parametros = this.pendentes;
+                this.pendentes = null;
+                this.enviar(parametros);
+            }
+        });
+        this.socket.addEventListener('message', evento => this.receber(JSON.parse(evento.data)));
+        this.socket.addEventListener('close', () => {
+            this.socket = null;
+        });
+    },
+    
+    /**
+     * Aplica uma mensagem do servidor ao resultado local
+     * @param {Object} mensagem - Mensagem "diff" ou "erro"
+     */
+    receber(mensagem) {
+        if (mensagem.tipo === 'erro') {
+            const detalhe = Array.isArray(mensagem.detail)
+                ? mensagem.detail.map(erro => erro.msg).join('; ')
+                : mensagem.detail;
+            if (this.aoErro) this.aoErro(detalhe);
+            return;
+        }
+        
+        const resultado = this.resultado || { informe_mensal: [] };
+        Object.entries(mensagem.resumo).forEach(([campo, valor]) => {
+            if (valor === null) {
+                delete resultado[campo];
+            } else {
+                resultado[campo] = valor;
+            }
+        });
+        
+        const linhas = resultado.informe_mensal.slice(0, mensagem.total_linhas);
+        Object.entries(mensagem.linhas).forEach(([indice, linha]) => {
+            linhas[Number(indice)] = linha;
+        });
+        resultado.informe_mensal = linhas;
+        
+        this.resultado = resultado;
+        if (this.aoAtualizar) this.aoAtualizar(resultado);
+    }
+};
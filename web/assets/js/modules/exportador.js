@@ -1,73 +1,53 @@
 /**
  * Módulo de exportação de dados
  */
+import { API } from '../config/api.js';
 import { Calculadora } from './calculadora.js';
-import { Formatador } from './formatador.js';
+import { Validador } from './validador.js';
 
 export const Exportador = {
     /**
-     * Exporta os dados da tabela para um arquivo CSV
+     * Exporta o cronograma do cálculo atual em CSV, gerado pelo servidor
      */
-    exportarCSV() {
+    async exportarCSV() {
         if (!Calculadora.resultadoAtual) return;
         
         try {
-            // Determina se é um resultado de rendimento ou juros de saque
-            const isJurosSaque = 'total_juros_saque' in Calculadora.resultadoAtual;
-            const tipoCalculo = isJurosSaque ? 'juros_saque' : 'rendimento';
-            const campoValor = isJurosSaque ? 'juros_saque_mensal' : 'rendimento_mensal';
-            
-            // Extrai dados do resultado
-            const dados = Calculadora.resultadoAtual.informe_mensal;
-            
-            // Cria as linhas do CSV - usar BOM para garantir que o Excel reconheça o UTF-8
-            let csvContent = 'data:text/csv;charset=utf-8,\uFEFF';
-            
-            // Cabeçalho
-            const colunaDinamica = isJurosSaque ? 'Juros de Saque' : 'Rendimento';
-            csvContent += `"Mês/Ano";"Valor Total";"${colunaDinamica}"\r\n`;
-            
-            // Dados
-            dados.forEach(item => {
-                // Usar ponto e vírgula como separador e garantir valores decimais com vírgula
-                const valorTotal = Formatador.formatarDecimalCSV(item.valor_total);
-                const valorDinamico = Formatador.formatarDecimalCSV(item[campoValor]);
-                csvContent += `"${item.mes_ano}";"${valorTotal}";"${valorDinamico}"\r\n`;
+            // Mesmos parâmetros do cálculo completo exibido na tela
+            const parametros = {
+                ...Validador.obterParametrosFormulario(),
+                considerar_ir: true,
+                considerar_iof: true
+            };
+            
+            const response = await fetch(API.endpoints.exportarCsv, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(parametros)
             });
             
-            // Linha em branco antes do resumo
-            csvContent += '\r\n';
-            
-            // Resumo
-            csvContent += `"Resumo";"";""\r\n`;
-            csvContent += `"Valor Total Aplicado";"${Formatador.formatarDecimalCSV(Calculadora.resultadoAtual.valor_total_aplicado)}";"";\r\n`;
-            
-            if (isJurosSaque) {
-                csvContent += `"Total de Juros de Saque";"${Formatador.formatarDecimalCSV(Calculadora.resultadoAtual.total_juros_saque)}";"";\r\n`;
-                csvContent += `"Taxa de Juros de Saque";"${Formatador.formatarDecimalCSV(Calculadora.resultadoAtual.taxa_juros_saque)}% ao mês";"";\r\n`;
-            } else {
-                csvContent += `"Total de Rendimentos";"${Formatador.formatarDecimalCSV(Calculadora.resultadoAtual.total_rendimento)}";"";\r\n`;
+            if (!response.ok) {
+                const errorData = await response.json().catch(() => ({}));
+                throw new Error(errorData.detail || `Erro ${response.status}: ${response.statusText}`);
             }
             
-            csvContent += `"Taxa CDI Utilizada";"${Formatador.formatarDecimalCSV(Calculadora.resultadoAtual.taxa_cdi_utilizada)}% ao ano";"";\r\n`;
-            csvContent += `"Percentual sobre CDI";"${Formatador.formatarDecimalCSV(Calculadora.resultadoAtual.percentual_sobre_cdi)}%";"";\r\n`;
-            csvContent += `"Data do Cálculo";"${Calculadora.resultadoAtual.data_calculo}";"";\r\n`;
-            
-            // Cria o link para download
-            const encodedUri = encodeURI(csvContent);
+            // Download via Blob (sem limite de tamanho de URL como em data: URIs)
+            const arquivo = await response.blob();
+            const url = URL.createObjectURL(arquivo);
             const link = document.createElement('a');
-            link.setAttribute('href', encodedUri);
+            link.setAttribute('href', url);
             
             const dataAtual = new Date().toISOString().slice(0, 10);
-            link.setAttribute('download', `resultado_${tipoCalculo}_${dataAtual}.csv`);
+            link.setAttribute('download', `cronograma_${dataAtual}.csv`);
             
             document.body.appendChild(link);
             link.click();
             document.body.removeChild(link);
+            URL.revokeObjectURL(url);
             
         } catch (error) {
             console.error('Erro ao exportar CSV:', error);
             alert('Não foi possível exportar os dados. Erro: ' + error.message);
         }
     }
-}; 
\ No newline at end of file
+}; 
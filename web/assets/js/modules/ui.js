@@ -60,7 +60,7 @@ export const UI = {
     setupEventListeners() {
         this.elements.btnCalcular.addEventListener('click', () => Calculadora.calcularRendimento());
         this.elements.btnCalcularResgate.addEventListener('click', () => Calculadora.calcularResgate());
-        this.elements.btnBuscarCDI.addEventListener('click', () => Calculadora.buscarTaxaCDI());
+        this.elements.btnBuscarCDI.addEventListener('click', () => Calculadora.buscarTaxaCDI(true));
         this.elements.btnExportar.addEventListener('click', () => Exportador.exportarCSV());
         
         // Adicionar validação em tempo real nos campos
@@ -73,6 +73,9 @@ export const UI = {
                         campo.classList.remove('is-invalid');
                     }
                 });
+                
+                // Depois do primeiro cálculo, o resultado acompanha o formulário
+                campo.addEventListener('input', () => Calculadora.recalcularAoVivo());
             }
         });
     },
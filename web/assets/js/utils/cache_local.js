@@ -0,0 +1,130 @@
+/**
+ * Cache persistente no navegador (IndexedDB, ou localStorage quando indisponível)
+ *
+ * Guarda a taxa CDI e os resultados de cálculo entre visitas. É um cache de
+ * melhor esforço: falhas de armazenamento (modo privado, cota esgotada) são
+ * ignoradas e a aplicação segue consultando a API.
+ */
+export const CacheLocal = {
+    NOME_BANCO: 'calculadora-rendimentos',
+    DEPOSITO: 'cache',
+    PREFIXO: 'calculadora:',
+    
+    // Quantidade máxima de entradas; as mais antigas são descartadas
+    MAXIMO_ENTRADAS: 50,
+    
+    // Promessa do banco IndexedDB (null quando indisponível)
+    banco: null,
+    
+    /**
+     * Abre (uma única vez) o banco IndexedDB
+     * @returns {Promise<IDBDatabase|null>} - Banco aberto, ou null para usar o localStorage
+     */
+    abrir() {
+        if (this.banco) return this.banco;
+        
+        this.banco = new Promise(resolve => {
+            if (!('indexedDB' in window)) {
+                resolve(null);
+                return;
+            }
+            try {
+                const pedido = indexedDB.open(this.NOME_BANCO, 1);
+                pedido.onupgradeneeded = () => {
+                    const deposito = pedido.result.createObjectStore(this.DEPOSITO, { keyPath: 'chave' });
+                    deposito.createIndex('salvoEm', 'salvoEm');
+                };
+                pedido.onsuccess = () => resolve(pedido.result);
+                pedido.onerror = () => resolve(null);
+                pedido.onblocked = () => resolve(null);
+            } catch (error) {
+                resolve(null);
+            }
+        });
+        return this.banco;
+    },
+    
+    /**
+     * Obtém uma entrada do cache
+     * @param {string} chave - Chave da entrada
+     * @returns {Promise<{valor: *, salvoEm: number}|null>} - Entrada, ou null se ausente
+     */
+    async obter(chave) {
+        try {
+            const banco = await this.abrir();
+            if (!banco) {
+                const texto = window.localStorage.getItem(this.PREFIXO + chave);
+                return texto ? JSON.parse(texto) : null;
+            }
+            
+            return await new Promise((resolve, reject) => {
+                const pedido = banco.transaction(this.DEPOSITO).objectStore(this.DEPOSITO).get(chave);
+                pedido.onsuccess = () => resolve(pedido.result || null);
+                pedido.onerror = () => reject(pedido.error);
+            });
+        } catch (error) {
+            return null;
+        }
+    },
+    
+    /**
+     * Grava uma entrada no cache, descartando as mais antigas acima do limite
+     * @param {string} chave - Chave da entrada
+     * @param {*} valor - Valor serializável
+     */
+    async salvar(chave, valor) {
+        const entrada = { chave, valor, salvoEm: Date.now() };
+        try {
+            const banco = await this.abrir();
+            if (!banco) {
+                window.localStorage.setItem(this.PREFIXO + chave, JSON.stringify(entrada));
+                this.podarLocalStorage();
+                return;
+            }
+            
+            await new Promise((resolve, reject) => {
+                const transacao = banco.transaction(this.DEPOSITO, 'readwrite');
+                const deposito = transacao.objectStore(this.DEPOSITO);
+                deposito.put(entrada);
+                
+                const contagem = deposito.count();
+                contagem.onsuccess = () => {
+                    let excedentes = contagem.result - this.MAXIMO_ENTRADAS;
+                    if (excedentes <= 0) return;
+                    deposito.index('salvoEm').openCursor().onsuccess = evento => {
+                        const cursor = evento.target.result;
+                        if (!cursor || excedentes <= 0) return;
+                        cursor.delete();
+                        excedentes -= 1;
+                        cursor.continue();
+                    };
+                };
+                transacao.oncomplete = () => resolve();
+                transacao.onerror = () => reject(transacao.error);
+            });
+        } catch (error) {
+            console.warn('Cache local indisponível:', error);
+        }
+    },
+    
+    /**
+     * Descarta as entradas mais antigas do localStorage acima do limite
+     */
+    podarLocalStorage() {
+        const entradas = [];
+        for (let i = 0; i < window.localStorage.length; i++) {
+            const chave = window.localStorage.key(i);
+            if (!chave.startsWith(this.PREFIXO)) continue;
+            try {
+                entradas.push([chave, JSON.parse(window.localStorage.getItem(chave)).salvoEm || 0]);
+            } catch (error) {
+                entradas.push([chave, 0]);
+            }
+        }
+        
+        entradas
+            .sort((a, b) => a[1] - b[1])
+            .slice(0, Math.max(0, entradas.length - this.MAXIMO_ENTRADAS))
+            .forEach(([chave]) => window.localStorage.removeItem(chave));
+    }
+};